@@ -0,0 +1,121 @@
+"""Benchmark the per-call encoding cost of the shared ABI codec against encoding from raw ABIs.
+
+Run with `poetry run python benchmarks/bench_abi_codec.py`. The raw side reproduces how calls
+were encoded before the codec: scanning the ABI for the function and deriving its selector and
+types on every call, building a fresh `Web3` contract object for Basename registration, and
+checksumming addresses every time.
+"""
+
+import time
+from collections.abc import Callable
+
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector
+from web3 import Web3
+
+from cdp_agentkit_core.actions.abi_codec import abi_type, checksum_address, get_function_codec
+from cdp_agentkit_core.actions.register_basename import (
+    create_register_contract_method_args,
+    l2_resolver_abi,
+)
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_QUOTER_ABI
+
+CALLS = 2_000
+REPEATS = 5
+TOKEN_ADDRESS = "0x036cbd53842c5426634e7929541ec2318f3dcf7e"
+WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+BASENAME = "example.basetest.eth"
+QUOTE_ARGS = {
+    "tokenIn": WETH_ADDRESS,
+    "tokenOut": TOKEN_ADDRESS,
+    "amountIn": 10**18,
+    "fee": 10000,
+    "sqrtPriceLimitX96": 0,
+}
+
+
+def raw_encode(abi: list[dict], method: str, values: list) -> bytes:
+    """Encode a call by scanning the ABI on every call, as before the codec."""
+    function_abi = next(
+        item for item in abi if item.get("type") == "function" and item.get("name") == method
+    )
+    types = [abi_type(component) for component in function_abi["inputs"]]
+    return function_abi_to_4byte_selector(function_abi) + encode(types, values)
+
+
+def raw_register_args() -> list[str]:
+    """Encode the Basename resolver calls with a fresh Web3 contract, as before the codec."""
+    w3 = Web3()
+    resolver_contract = w3.eth.contract(abi=l2_resolver_abi)
+    name_hash = w3.ens.namehash(BASENAME)
+    return [
+        resolver_contract.encode_abi("setAddr", args=[name_hash, WETH_ADDRESS]),
+        resolver_contract.encode_abi("setName", args=[name_hash, BASENAME]),
+    ]
+
+
+def per_call_us(func: Callable[[], object], calls: int = CALLS) -> float:
+    """Return the best per-call time of several runs of a function, in microseconds."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        times.append(time.perf_counter() - start)
+    return min(times) / calls * 1e6
+
+
+def report(name: str, before: float, after: float) -> None:
+    """Print the per-call timings before and after the codec."""
+    print(
+        f"{name:<24} before {before:8.2f} us   after {after:8.2f} us   "
+        f"speedup {before / after:6.1f}x"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    balance_of = get_function_codec(WOW_ABI, "balanceOf")
+    quote = get_function_codec(UNISWAP_QUOTER_ABI, "quoteExactInputSingle")
+    quote_values = [
+        (
+            Web3.to_checksum_address(WETH_ADDRESS),
+            Web3.to_checksum_address(TOKEN_ADDRESS),
+            10**18,
+            10000,
+            0,
+        )
+    ]
+
+    print(f"{CALLS} calls, best of {REPEATS} runs")
+    report(
+        "WOW balanceOf",
+        per_call_us(
+            lambda: raw_encode(WOW_ABI, "balanceOf", [Web3.to_checksum_address(TOKEN_ADDRESS)])
+        ),
+        per_call_us(lambda: balance_of.encode_call({"account": TOKEN_ADDRESS})),
+    )
+    report(
+        "quoteExactInputSingle",
+        per_call_us(lambda: raw_encode(UNISWAP_QUOTER_ABI, "quoteExactInputSingle", quote_values)),
+        per_call_us(lambda: quote.encode_call(QUOTE_ARGS)),
+    )
+    report(
+        "checksum address",
+        per_call_us(lambda: Web3.to_checksum_address(TOKEN_ADDRESS)),
+        per_call_us(lambda: checksum_address(TOKEN_ADDRESS)),
+    )
+    report(
+        "register basename args",
+        # Building a Web3 contract per call is slow, so fewer calls are timed.
+        per_call_us(raw_register_args, CALLS // 20),
+        per_call_us(
+            lambda: create_register_contract_method_args(BASENAME, WETH_ADDRESS, is_mainnet=False),
+            CALLS // 20,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
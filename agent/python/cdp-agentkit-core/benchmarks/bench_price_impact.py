@@ -0,0 +1,95 @@
+"""Benchmark batched price impact curves against quoting each order size in a loop.
+
+Run with `poetry run python benchmarks/bench_price_impact.py`. Both sides use the same pool and
+curve state, so the numbers only compare local evaluation; a looped `get_uniswap_quote` would
+additionally pay network round trips for every order size.
+"""
+
+import time
+
+import numpy as np
+
+from cdp_agentkit_core.actions.wow.bonding_curve import bonding_curve
+from cdp_agentkit_core.actions.wow.price_impact import (
+    bonding_curve_price_impact,
+    uniswap_price_impact,
+)
+from cdp_agentkit_core.actions.wow.uniswap.swap_math import (
+    PoolState,
+    get_sqrt_ratio_at_tick,
+    swap_exact_input,
+)
+
+SIZES = 1_000
+REPEATS = 5
+CURRENT_SUPPLY = 250_000_000 * 10**18
+
+
+def build_pool_state() -> PoolState:
+    """Build a 1% pool with a full range position and a concentrated position around the price."""
+    tick_spacing = 200
+    positions = [(-887200, 887200, 10**20), (-2000, 2000, 10**21)]
+
+    tick_bitmap, liquidity_net = {}, {}
+    for tick_lower, tick_upper, liquidity in positions:
+        for tick, delta in ((tick_lower, liquidity), (tick_upper, -liquidity)):
+            compressed = tick // tick_spacing
+            word = compressed >> 8
+            tick_bitmap[word] = tick_bitmap.get(word, 0) | (1 << (compressed & 0xFF))
+            liquidity_net[tick] = liquidity_net.get(tick, 0) + delta
+
+    return PoolState(
+        sqrt_price_x96=get_sqrt_ratio_at_tick(0),
+        tick=0,
+        liquidity=sum(liquidity for _, _, liquidity in positions),
+        fee=10000,
+        tick_spacing=tick_spacing,
+        tick_bitmap=tick_bitmap,
+        liquidity_net=liquidity_net,
+    )
+
+
+def best_time(func) -> float:
+    """Return the best wall time of several runs of a function, in seconds."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(name: str, looped: float, batched: float) -> None:
+    """Print the timings of the looped and batched runs."""
+    print(
+        f"{name:<14} looped {looped * 1e3:9.2f} ms   batched {batched * 1e3:7.2f} ms   "
+        f"speedup {looped / batched:7.1f}x"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    amounts = np.geomspace(1e14, 1e20, SIZES)
+    state = build_pool_state()
+
+    print(f"{SIZES} order sizes, best of {REPEATS} runs")
+    report(
+        "uniswap v3",
+        best_time(lambda: [swap_exact_input(state, True, int(amount)) for amount in amounts]),
+        best_time(lambda: uniswap_price_impact(state, False, amounts, "buy")),
+    )
+    report(
+        "bonding curve",
+        best_time(
+            lambda: [
+                bonding_curve.get_eth_buy_quote(CURRENT_SUPPLY, int(amount)) for amount in amounts
+            ]
+        ),
+        best_time(
+            lambda: bonding_curve_price_impact(bonding_curve, CURRENT_SUPPLY, amounts, "buy")
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Process-wide ABI codec shared by all actions.
+
+Function selectors and eth_abi encoders and decoders are built once per (ABI, method) and
+reused for every call, checksummed addresses are interned, and a single Web3 instance is shared
+for the helpers that need one.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.encoding import TupleEncoder
+from eth_abi.registry import registry
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+from web3 import Web3
+
+# Maximum number of distinct ABIs whose function codecs are kept.
+MAX_CACHED_ABIS = 256
+
+
+@dataclass(frozen=True)
+class FunctionCodec:
+    """Pre-built encoder and decoder for a single contract function."""
+
+    name: str
+    selector: bytes
+    inputs: tuple[dict, ...]
+    outputs: tuple[dict, ...]
+    encoder: TupleEncoder
+    decoder: TupleDecoder
+
+    def encode_call(self, args: dict | list | tuple | None = None) -> bytes:
+        """ABI-encode the calldata for a call of the function.
+
+        Args:
+            args: The arguments by name, or in order. Numbers may be passed as strings, and
+                struct parameters may be passed with their fields flattened into the args dict.
+
+        Returns:
+            bytes: The function selector followed by the encoded arguments.
+
+        """
+        return self.selector + self.encode_args(args)
+
+    def encode_args(self, args: dict | list | tuple | None = None) -> bytes:
+        """ABI-encode the arguments of a call of the function, without the selector.
+
+        Args:
+            args: The arguments by name, or in order.
+
+        Returns:
+            bytes: The encoded arguments.
+
+        """
+        if isinstance(args, list | tuple):
+            values = args
+        else:
+            args = args or {}
+            values = [_arg_value(component, args) for component in self.inputs]
+
+        return self.encoder(
+            tuple(
+                _coerce_arg(component, value)
+                for component, value in zip(self.inputs, values, strict=True)
+            )
+        )
+
+    def decode_output(self, return_data: bytes) -> Any:
+        """ABI-decode the return data of a call of the function.
+
+        Args:
+            return_data: The raw return data.
+
+        Returns:
+            Any: The decoded value for single-output functions, otherwise a tuple of values.
+
+        """
+        decoded = self.decoder(ContextFramesBytesIO(bytes(return_data)))
+        return decoded[0] if len(decoded) == 1 else decoded
+
+
+# Function codecs by ABI identity. The ABI itself is kept alongside its codecs, so that its id
+# cannot be reused by another list while the entry exists.
+_codecs: OrderedDict[int, tuple[list[dict], dict[str, FunctionCodec]]] = OrderedDict()
+_codecs_lock = threading.Lock()
+
+
+def get_function_codec(abi: list[dict], method: str) -> FunctionCodec:
+    """Get the codec for a function of a contract ABI, building it on first use.
+
+    Args:
+        abi: The contract ABI.
+        method: The function name.
+
+    Returns:
+        FunctionCodec: The codec for the function.
+
+    Raises:
+        ValueError: If the function is not in the ABI.
+
+    """
+    key = id(abi)
+    with _codecs_lock:
+        entry = _codecs.get(key)
+        if entry is not None and entry[0] is abi:
+            _codecs.move_to_end(key)
+            codec = entry[1].get(method)
+            if codec is not None:
+                return codec
+
+    codec = _build_function_codec(abi, method)
+
+    with _codecs_lock:
+        entry = _codecs.get(key)
+        if entry is None or entry[0] is not abi:
+            entry = (abi, {})
+            _codecs[key] = entry
+        entry[1][method] = codec
+        _codecs.move_to_end(key)
+        while len(_codecs) > MAX_CACHED_ABIS:
+            _codecs.popitem(last=False)
+    return codec
+
+
+def encode_function_call(abi: list[dict], method: str, args: dict | list | tuple | None) -> str:
+    """ABI-encode the calldata for a contract call as a hex string.
+
+    Args:
+        abi: The contract ABI.
+        method: The function name.
+        args: The arguments by name, or in order.
+
+    Returns:
+        str: The 0x-prefixed calldata.
+
+    """
+    return "0x" + get_function_codec(abi, method).encode_call(args).hex()
+
+
+@lru_cache(maxsize=4096)
+def checksum_address(address: str) -> str:
+    """Get the checksummed form of an address, interned for repeated lookups.
+
+    Args:
+        address: The address, in any case.
+
+    Returns:
+        str: The EIP-55 checksummed address.
+
+    """
+    return to_checksum_address(address)
+
+
+_web3: Web3 | None = None
+_web3_lock = threading.Lock()
+
+
+def get_web3() -> Web3:
+    """Get the process-wide offline Web3 instance.
+
+    Returns:
+        Web3: The shared Web3 instance.
+
+    """
+    global _web3
+    if _web3 is None:
+        with _web3_lock:
+            if _web3 is None:
+                _web3 = Web3()
+    return _web3
+
+
+@lru_cache(maxsize=1024)
+def namehash(name: str) -> bytes:
+    """Get the ENS namehash of a name.
+
+    Args:
+        name: The name, such as `example.base.eth`
+
+    Returns:
+        bytes: The namehash.
+
+    """
+    return bytes(get_web3().ens.namehash(name))
+
+
+def abi_type(component: dict) -> str:
+    """Get the canonical type string of an ABI input or output, expanding tuples.
+
+    Args:
+        component: The ABI input or output.
+
+    Returns:
+        str: The type string, such as `uint256` or `(address,uint24)[]`.
+
+    """
+    component_type = component["type"]
+    if not component_type.startswith("tuple"):
+        return component_type
+
+    inner = ",".join(abi_type(c) for c in component["components"])
+    return f"({inner}){component_type[len('tuple') :]}"
+
+
+def _build_function_codec(abi: list[dict], method: str) -> FunctionCodec:
+    function_abi = next(
+        (item for item in abi if item.get("type") == "function" and item.get("name") == method),
+        None,
+    )
+    if function_abi is None:
+        raise ValueError(f"Method {method} not found in ABI")
+
+    inputs = tuple(function_abi.get("inputs", []))
+    outputs = tuple(function_abi.get("outputs", []))
+    return FunctionCodec(
+        name=method,
+        selector=function_abi_to_4byte_selector(function_abi),
+        inputs=inputs,
+        outputs=outputs,
+        encoder=registry.get_tuple_encoder(*(abi_type(c) for c in inputs)),
+        decoder=registry.get_tuple_decoder(*(abi_type(c) for c in outputs)),
+    )
+
+
+def _arg_value(component: dict, args: dict) -> Any:
+    name = component["name"]
+    if name in args:
+        return args[name]
+
+    # Struct parameters may be passed with their fields flattened into the args dict.
+    if component["type"] == "tuple":
+        return {c["name"]: args[c["name"]] for c in component["components"]}
+
+    raise ValueError(f"Missing argument: {name}")
+
+
+def _coerce_arg(component: dict, value: Any) -> Any:
+    component_type = component["type"]
+
+    if component_type.endswith("]"):
+        element = {**component, "type": component_type[: component_type.rindex("[")]}
+        return [_coerce_arg(element, item) for item in value]
+
+    if component_type == "tuple":
+        components = component["components"]
+        if isinstance(value, dict):
+            value = [value[c["name"]] for c in components]
+        return tuple(_coerce_arg(c, item) for c, item in zip(components, value, strict=True))
+
+    if component_type.startswith(("uint", "int")):
+        return int(value)
+    if component_type == "address":
+        return checksum_address(value)
+    if component_type == "bool":
+        return value if isinstance(value, bool) else str(value).lower() == "true"
+    if component_type.startswith("bytes") and isinstance(value, str):
+        return bytes.fromhex(value.removeprefix("0x"))
+
+    return value
@@ -0,0 +1,420 @@
+"""Lazy registry of CDP actions.
+
+Actions are registered by name with the import path of their implementing class, and the
+module is only imported when the action is first used. Other packages can add actions by
+calling `register_action`, or by declaring an entry point in the `cdp_agentkit.actions` group:
+
+    [tool.poetry.plugins."cdp_agentkit.actions"]
+    my_action = "my_package.my_action:MyAction"
+
+The description, argument JSON schema and read-only flag of the built-in actions are read from
+`builtin_actions.json`, so that toolkits can describe every action to a model without importing
+any of them. Run `make action-manifest` to regenerate the file after changing an action.
+"""
+
+import dataclasses
+import importlib
+import json
+import threading
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Any
+
+from cdp_agentkit_core.actions.cdp_action import CdpAction
+
+ENTRY_POINT_GROUP = "cdp_agentkit.actions"
+
+BUILTIN_MANIFEST_PATH = Path(__file__).with_name("builtin_actions.json")
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    """The name of an action, the import path of its `CdpAction` subclass and its metadata.
+
+    The metadata is optional. When the description is known, the action can be described to a
+    model without importing it.
+    """
+
+    name: str
+    target: str
+    description: str | None = None
+    # The JSON schema of the action's arguments.
+    args_schema: dict[str, Any] | None = None
+    read_only: bool = False
+
+    @property
+    def has_metadata(self) -> bool:
+        """Whether the action can be described without importing it."""
+        return self.description is not None
+
+    @property
+    def class_name(self) -> str:
+        """The name of the action class."""
+        return self.target.rpartition(":")[2]
+
+    def load_class(self) -> type[CdpAction]:
+        """Import the action class.
+
+        Returns:
+            type[CdpAction]: The action class.
+
+        Raises:
+            TypeError: If the target is not a `CdpAction` subclass.
+
+        """
+        module_name, _, attribute = self.target.partition(":")
+        action_class = getattr(importlib.import_module(module_name), attribute)
+        if not (isinstance(action_class, type) and issubclass(action_class, CdpAction)):
+            raise TypeError(f"{self.target} is not a CdpAction subclass")
+        return action_class
+
+
+class ActionRegistry:
+    """Registry of actions by name, which imports and instantiates each action on first use."""
+
+    def __init__(self, entry_point_group: str | None = ENTRY_POINT_GROUP):
+        self.entry_point_group = entry_point_group
+        self._specs: dict[str, ActionSpec] = {}
+        self._actions: dict[str, CdpAction] = {}
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        target: str | type[CdpAction],
+        replace: bool = False,
+        description: str | None = None,
+        args_schema: dict[str, Any] | None = None,
+        read_only: bool = False,
+    ) -> ActionSpec:
+        """Register an action.
+
+        The metadata of an action class is read from the class. For an import path, it can be
+        given, so that the action is described without importing it.
+
+        Args:
+            name: The name of the action, which must match the name of the action instance.
+            target: The action class, or its import path as `package.module:ClassName`.
+            replace: Whether to replace an action already registered under the name.
+            description: The description of the action, for an import path.
+            args_schema: The JSON schema of the action's arguments, for an import path.
+            read_only: Whether the action only reads state, for an import path.
+
+        Returns:
+            ActionSpec: The registered action spec.
+
+        Raises:
+            ValueError: If an action is already registered under the name.
+
+        """
+        if isinstance(target, type):
+            spec = dataclasses.replace(
+                action_spec(target()),
+                name=name,
+                target=f"{target.__module__}:{target.__qualname__}",
+            )
+        else:
+            spec = ActionSpec(name, target, description, args_schema, read_only)
+
+        with self._lock:
+            existing = self._specs.get(name)
+            if existing is not None and existing.target != spec.target and not replace:
+                raise ValueError(f"Action {name} is already registered to {existing.target}")
+            if existing is not None and existing.target == spec.target and not spec.has_metadata:
+                spec = existing
+            self._specs[name] = spec
+            if existing is None or existing.target != spec.target:
+                self._actions.pop(name, None)
+        return spec
+
+    def unregister(self, name: str) -> None:
+        """Remove an action from the registry.
+
+        Args:
+            name: The name of the action.
+
+        """
+        with self._lock:
+            self._specs.pop(name, None)
+            self._actions.pop(name, None)
+
+    def specs(self) -> list[ActionSpec]:
+        """Get the specs of all registered actions, without importing them.
+
+        Returns:
+            list[ActionSpec]: The action specs, in registration order.
+
+        """
+        self._load_entry_points()
+        with self._lock:
+            return list(self._specs.values())
+
+    def spec(self, name: str) -> ActionSpec:
+        """Get the spec of an action, without importing it.
+
+        Args:
+            name: The name of the action.
+
+        Returns:
+            ActionSpec: The action spec.
+
+        Raises:
+            KeyError: If no action is registered under the name.
+
+        """
+        with self._lock:
+            spec = self._specs.get(name)
+        if spec is None:
+            self._load_entry_points()
+            with self._lock:
+                spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown action: {name}")
+        return spec
+
+    def names(self) -> list[str]:
+        """Get the names of all registered actions, without importing them.
+
+        Returns:
+            list[str]: The action names, in registration order.
+
+        """
+        return [spec.name for spec in self.specs()]
+
+    def get(self, name: str) -> CdpAction:
+        """Get an action, importing and instantiating it on first use.
+
+        Args:
+            name: The name of the action.
+
+        Returns:
+            CdpAction: The action.
+
+        Raises:
+            KeyError: If no action is registered under the name.
+            ValueError: If the name of the action instance does not match the registered name.
+
+        """
+        with self._lock:
+            action = self._actions.get(name)
+            if action is not None:
+                return action
+
+            spec = self.spec(name)
+            action = spec.load_class()()
+            if action.name != name:
+                raise ValueError(
+                    f"Action {spec.target} is named {action.name}, but was registered as {name}"
+                )
+            self._actions[name] = action
+            return action
+
+    def load_all(self) -> list[CdpAction]:
+        """Get all registered actions, importing any which were not used yet.
+
+        Returns:
+            list[CdpAction]: The actions, in registration order.
+
+        """
+        return [self.get(name) for name in self.names()]
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether an action is registered under a name."""
+        return name in self.names()
+
+    def _load_entry_points(self) -> None:
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            for entry_point in entry_points(group=self.entry_point_group):
+                if entry_point.name in self._specs:
+                    print(f"Ignoring entry point for already registered action {entry_point.name}")
+                    continue
+                self._specs[entry_point.name] = ActionSpec(entry_point.name, entry_point.value)
+
+
+def action_spec(action: CdpAction) -> ActionSpec:
+    """Build the spec of an action, with its metadata.
+
+    Args:
+        action: The action.
+
+    Returns:
+        ActionSpec: The action spec.
+
+    """
+    action_class = type(action)
+    return ActionSpec(
+        name=action.name,
+        target=f"{action_class.__module__}:{action_class.__qualname__}",
+        description=action.description,
+        args_schema=action.args_schema.model_json_schema() if action.args_schema else None,
+        read_only=action.read_only,
+    )
+
+
+def build_manifest(actions: list[CdpAction]) -> dict[str, Any]:
+    """Build the manifest of the metadata of actions.
+
+    Args:
+        actions: The actions.
+
+    Returns:
+        dict[str, Any]: The manifest, with the target and metadata of each action by name.
+
+    """
+    return {
+        spec.name: {
+            "target": spec.target,
+            "description": spec.description,
+            "args_schema": spec.args_schema,
+            "read_only": spec.read_only,
+        }
+        for spec in (action_spec(action) for action in actions)
+    }
+
+
+def _with_manifest_metadata(specs: list[ActionSpec], path: Path) -> list[ActionSpec]:
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return specs
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable action manifest {path}: {e!s}")
+        return specs
+
+    described = []
+    for spec in specs:
+        metadata = manifest.get(spec.name)
+        # Metadata of another target is stale, so the action is imported to describe it.
+        if metadata is not None and metadata.get("target") == spec.target:
+            spec = dataclasses.replace(
+                spec,
+                description=metadata["description"],
+                args_schema=metadata["args_schema"],
+                read_only=metadata["read_only"],
+            )
+        described.append(spec)
+    return described
+
+
+# Built-in actions, in the order they are listed by the toolkit.
+BUILTIN_ACTIONS = [
+    ActionSpec(
+        "address_reputation", "cdp_agentkit_core.actions.address_reputation:AddressReputationAction"
+    ),
+    ActionSpec("deploy_contract", "cdp_agentkit_core.actions.deploy_contract:DeployContractAction"),
+    ActionSpec("deploy_nft", "cdp_agentkit_core.actions.deploy_nft:DeployNftAction"),
+    ActionSpec("deploy_token", "cdp_agentkit_core.actions.deploy_token:DeployTokenAction"),
+    ActionSpec("get_balance", "cdp_agentkit_core.actions.get_balance:GetBalanceAction"),
+    ActionSpec("get_balance_nft", "cdp_agentkit_core.actions.get_balance_nft:GetBalanceNftAction"),
+    ActionSpec("get_balances", "cdp_agentkit_core.actions.get_balances:GetBalancesAction"),
+    ActionSpec(
+        "get_transaction_status",
+        "cdp_agentkit_core.actions.get_transaction_status:GetTransactionStatusAction",
+    ),
+    ActionSpec(
+        "get_wallet_details", "cdp_agentkit_core.actions.get_wallet_details:GetWalletDetailsAction"
+    ),
+    ActionSpec("mint_nft", "cdp_agentkit_core.actions.mint_nft:MintNftAction"),
+    ActionSpec("morpho_deposit", "cdp_agentkit_core.actions.morpho.deposit:MorphoDepositAction"),
+    ActionSpec("morpho_withdraw", "cdp_agentkit_core.actions.morpho.withdraw:MorphoWithdrawAction"),
+    ActionSpec(
+        "portfolio_snapshot",
+        "cdp_agentkit_core.actions.portfolio_snapshot:PortfolioSnapshotAction",
+    ),
+    ActionSpec(
+        "pyth_fetch_price", "cdp_agentkit_core.actions.pyth.fetch_price:PythFetchPriceAction"
+    ),
+    ActionSpec(
+        "pyth_fetch_price_feed_id",
+        "cdp_agentkit_core.actions.pyth.fetch_price_feed_id:PythFetchPriceFeedIDAction",
+    ),
+    ActionSpec(
+        "pyth_fetch_prices", "cdp_agentkit_core.actions.pyth.fetch_prices:PythFetchPricesAction"
+    ),
+    ActionSpec(
+        "register_basename", "cdp_agentkit_core.actions.register_basename:RegisterBasenameAction"
+    ),
+    ActionSpec(
+        "request_faucet_funds",
+        "cdp_agentkit_core.actions.request_faucet_funds:RequestFaucetFundsAction",
+    ),
+    ActionSpec(
+        "superfluid_create_flow",
+        "cdp_agentkit_core.actions.superfluid.create_flow:SuperfluidCreateFlowAction",
+    ),
+    ActionSpec(
+        "superfluid_delete_flow",
+        "cdp_agentkit_core.actions.superfluid.delete_flow:SuperfluidDeleteFlowAction",
+    ),
+    ActionSpec(
+        "superfluid_update_flow",
+        "cdp_agentkit_core.actions.superfluid.update_flow:SuperfluidUpdateFlowAction",
+    ),
+    ActionSpec("trade", "cdp_agentkit_core.actions.trade:TradeAction"),
+    ActionSpec("transfer", "cdp_agentkit_core.actions.transfer:TransferAction"),
+    ActionSpec("transfer_nft", "cdp_agentkit_core.actions.transfer_nft:TransferNftAction"),
+    ActionSpec("wow_buy_token", "cdp_agentkit_core.actions.wow.buy_token:WowBuyTokenAction"),
+    ActionSpec(
+        "wow_create_token", "cdp_agentkit_core.actions.wow.create_token:WowCreateTokenAction"
+    ),
+    ActionSpec("wow_list_tokens", "cdp_agentkit_core.actions.wow.list_tokens:WowListTokensAction"),
+    ActionSpec("wow_sell_token", "cdp_agentkit_core.actions.wow.sell_token:WowSellTokenAction"),
+    ActionSpec("wrap_eth", "cdp_agentkit_core.actions.wrap_eth:WrapEthAction"),
+]
+BUILTIN_ACTIONS = _with_manifest_metadata(BUILTIN_ACTIONS, BUILTIN_MANIFEST_PATH)
+
+# Process-wide registry used by the toolkits.
+action_registry = ActionRegistry()
+for _spec in BUILTIN_ACTIONS:
+    action_registry.register(
+        _spec.name, _spec.target, False, _spec.description, _spec.args_schema, _spec.read_only
+    )
+
+
+def register_action(name: str, target: str | type[CdpAction], replace: bool = False) -> ActionSpec:
+    """Register an action in the process-wide registry.
+
+    Args:
+        name: The name of the action, which must match the name of the action instance.
+        target: The action class, or its import path as `package.module:ClassName`.
+        replace: Whether to replace an action already registered under the name.
+
+    Returns:
+        ActionSpec: The registered action spec.
+
+    """
+    return action_registry.register(name, target, replace)
+
+
+def get_action(name: str) -> CdpAction:
+    """Get an action from the process-wide registry, importing it on first use.
+
+    Args:
+        name: The name of the action, such as `get_balance`.
+
+    Returns:
+        CdpAction: The action.
+
+    """
+    return action_registry.get(name)
+
+
+def write_builtin_manifest(path: Path = BUILTIN_MANIFEST_PATH) -> None:
+    """Write the metadata of the built-in actions to their manifest.
+
+    Args:
+        path: The path of the manifest.
+
+    """
+    registry = ActionRegistry(entry_point_group=None)
+    for spec in BUILTIN_ACTIONS:
+        registry.register(spec.name, spec.target)
+    with open(path, "w") as f:
+        json.dump(build_manifest(registry.load_all()), f, indent=2)
+        f.write("\n")
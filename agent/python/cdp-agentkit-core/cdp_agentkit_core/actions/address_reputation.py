@@ -70,3 +70,4 @@ class AddressReputationAction(CdpAction):
     description: str = ADDRESS_REPUTATION_PROMPT
     args_schema: type[BaseModel] | None = AddressReputationInput
     func: Callable[..., str] = check_address_reputation
+    read_only: bool = True
@@ -0,0 +1,166 @@
+"""A local ledger of ERC20 allowances, used to skip redundant approvals.
+
+Allowances are read onchain once, batched through Multicall3, and cached per (network, token,
+owner, spender). The ledger is updated locally when an approval is submitted and when an action
+spends from an allowance, so that `approve` only sends a transaction when the allowance does not
+already cover the amount. With `approve_max` enabled, approvals are for the maximum amount, so a
+spender is approved once per token.
+
+The approve max policy is enabled with `allowance_ledger.approve_max = True`, or by setting the
+`CDP_AGENTKIT_APPROVE_MAX` environment variable to `true`.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from cdp_agentkit_core.actions.constants import ERC20_ALLOWANCE_ABI, MAX_UINT256
+from cdp_agentkit_core.actions.multicall import ContractRead, multicall_read
+
+APPROVE_MAX_ENV = "CDP_AGENTKIT_APPROVE_MAX"
+# Allowances can be changed by other wallets' transactions, so they are read again after a while.
+DEFAULT_ALLOWANCE_TTL = 60.0
+
+
+@dataclass
+class AllowanceStats:
+    """Counters of approval transactions sent and avoided."""
+
+    approvals_sent: int = 0
+    approvals_avoided: int = 0
+
+
+@dataclass
+class _Allowance:
+    amount: int
+    expires_at: float
+
+
+class AllowanceLedger:
+    """Caches ERC20 allowances and tracks them locally as they are approved and spent."""
+
+    def __init__(self, approve_max: bool = False, ttl: float = DEFAULT_ALLOWANCE_TTL):
+        self.approve_max = approve_max
+        self.ttl = ttl
+        self._allowances: dict[tuple[str, str, str, str], _Allowance] = {}
+        self._stats = AllowanceStats()
+        self._lock = threading.Lock()
+
+    def allowances(self, network_id: str, allowances: list[tuple[str, str, str]]) -> list[int]:
+        """Get allowances, reading those which are not cached in a single batch.
+
+        Args:
+            network_id: The network ID of the tokens.
+            allowances: The (token address, owner, spender) of each allowance.
+
+        Returns:
+            list[int]: The allowance of each spender, in atomic units.
+
+        """
+        keys = [_key(network_id, *allowance) for allowance in allowances]
+        values: list[int | None] = [None] * len(keys)
+        now = time.monotonic()
+        with self._lock:
+            for index, key in enumerate(keys):
+                entry = self._allowances.get(key)
+                if entry is not None and entry.expires_at > now:
+                    values[index] = entry.amount
+
+        pending = [index for index, value in enumerate(values) if value is None]
+        if pending:
+            reads = [
+                ContractRead(
+                    allowances[index][0],
+                    "allowance",
+                    ERC20_ALLOWANCE_ABI,
+                    {"owner": allowances[index][1], "spender": allowances[index][2]},
+                )
+                for index in pending
+            ]
+            for index, value in zip(pending, multicall_read(network_id, reads), strict=True):
+                values[index] = int(value)
+                self._set(keys[index], int(value))
+        return values
+
+    def allowance(self, network_id: str, token_address: str, owner: str, spender: str) -> int:
+        """Get the allowance of a spender, in atomic units."""
+        return self.allowances(network_id, [(token_address, owner, spender)])[0]
+
+    def covers(
+        self, network_id: str, token_address: str, owner: str, spender: str, amount: int
+    ) -> bool:
+        """Check whether the allowance of a spender covers an amount.
+
+        Args:
+            network_id: The network ID of the token.
+            token_address: The address of the token contract.
+            owner: The address which owns the tokens.
+            spender: The address of the spender.
+            amount: The amount to spend, in atomic units.
+
+        Returns:
+            bool: Whether the allowance covers the amount.
+
+        """
+        return self.allowance(network_id, token_address, owner, spender) >= amount
+
+    def approval_amount(self, amount: int) -> int:
+        """Get the amount to approve for spending an amount, according to the approve max policy."""
+        return MAX_UINT256 if self.approve_max else amount
+
+    def record_approval(
+        self, network_id: str, token_address: str, owner: str, spender: str, amount: int
+    ) -> None:
+        """Record a submitted approval, which sets the allowance of the spender."""
+        self._set(_key(network_id, token_address, owner, spender), amount)
+        with self._lock:
+            self._stats.approvals_sent += 1
+
+    def record_avoided_approval(self) -> None:
+        """Record an approval which was skipped because the allowance already covered it."""
+        with self._lock:
+            self._stats.approvals_avoided += 1
+
+    def spend(
+        self, network_id: str, token_address: str, owner: str, spender: str, amount: int
+    ) -> None:
+        """Decrease a cached allowance by an amount which the spender transferred.
+
+        Maximum allowances are not decreased, like in most ERC20 implementations.
+
+        """
+        key = _key(network_id, token_address, owner, spender)
+        with self._lock:
+            entry = self._allowances.get(key)
+            if entry is not None and entry.amount != MAX_UINT256:
+                entry.amount = max(0, entry.amount - amount)
+
+    def invalidate(self, network_id: str, token_address: str, owner: str, spender: str) -> None:
+        """Forget a cached allowance, so that it is read again."""
+        with self._lock:
+            self._allowances.pop(_key(network_id, token_address, owner, spender), None)
+
+    def clear(self) -> None:
+        """Forget all cached allowances and reset the counters."""
+        with self._lock:
+            self._allowances.clear()
+            self._stats = AllowanceStats()
+
+    def stats(self) -> AllowanceStats:
+        """Get the counters of approval transactions sent and avoided."""
+        with self._lock:
+            return AllowanceStats(self._stats.approvals_sent, self._stats.approvals_avoided)
+
+    def _set(self, key: tuple[str, str, str, str], amount: int) -> None:
+        with self._lock:
+            self._allowances[key] = _Allowance(amount, time.monotonic() + self.ttl)
+
+
+def _key(network_id: str, token_address: str, owner: str, spender: str) -> tuple:
+    return (network_id, token_address.lower(), owner.lower(), spender.lower())
+
+
+allowance_ledger = AllowanceLedger(
+    approve_max=os.environ.get(APPROVE_MAX_ENV, "").lower() in ("1", "true", "yes")
+)
@@ -0,0 +1,216 @@
+"""Fetch the balances of many assets across all addresses of a wallet in one pass.
+
+Assets are resolved once per network and remembered. The ERC20 balances of every address, and
+the decimals of tokens given by contract address, are read in a single Multicall3 batch, while
+the native balances of the addresses are fetched concurrently alongside it.
+"""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+
+from cdp import Asset, Wallet
+
+from cdp_agentkit_core.actions.constants import (
+    ERC20_BALANCE_ABI,
+    MULTICALL3_ABI,
+    MULTICALL3_ADDRESS,
+)
+from cdp_agentkit_core.actions.multicall import ContractRead, multicall_read
+from cdp_agentkit_core.actions.snapshot import read_snapshot
+
+MAX_BALANCE_WORKERS = 8
+
+_CONTRACT_ADDRESS = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+
+@dataclass(frozen=True)
+class ResolvedAsset:
+    """An asset ID resolved to its contract, or to the native asset if it has none."""
+
+    asset_id: str
+    contract_address: str | None = None
+    decimals: int | None = None
+
+    @property
+    def native(self) -> bool:
+        """Whether the asset is the native asset of the network."""
+        return self.contract_address is None
+
+
+@dataclass
+class WalletBalances:
+    """Balances of the addresses of a wallet, in whole units of each asset."""
+
+    # Balances by address ID, then by asset ID.
+    balances: dict[str, dict[str, Decimal]] = field(default_factory=dict)
+    # Errors by asset ID, for assets whose balances could not be fetched.
+    errors: dict[str, str] = field(default_factory=dict)
+    # The assets whose balances were fetched, with their decimals, by asset ID.
+    assets: dict[str, ResolvedAsset] = field(default_factory=dict)
+    # The block the token balances were read at, if it was pinned.
+    block_number: int | None = None
+
+
+_resolved_assets: dict[tuple[str, str], ResolvedAsset] = {}
+_resolved_assets_lock = threading.Lock()
+
+
+def resolve_asset(network_id: str, asset_id: str) -> ResolvedAsset:
+    """Resolve an asset ID, fetching it from the CDP API the first time.
+
+    Contract addresses are resolved without a request; their decimals are read onchain.
+
+    Args:
+        network_id: The network ID of the asset.
+        asset_id: The asset ID, e.g. `eth`, `usdc` or a token contract address.
+
+    Returns:
+        ResolvedAsset: The resolved asset.
+
+    """
+    if _CONTRACT_ADDRESS.match(asset_id):
+        return ResolvedAsset(asset_id, contract_address=asset_id)
+
+    key = (network_id, asset_id.lower())
+    with _resolved_assets_lock:
+        resolved = _resolved_assets.get(key)
+    if resolved is not None:
+        return resolved
+
+    asset = Asset.fetch(network_id, asset_id)
+    resolved = ResolvedAsset(asset_id, asset.contract_address, asset.decimals)
+    with _resolved_assets_lock:
+        _resolved_assets[key] = resolved
+    return resolved
+
+
+def clear_resolved_assets() -> None:
+    """Forget the resolved assets."""
+    with _resolved_assets_lock:
+        _resolved_assets.clear()
+
+
+def fetch_balances(wallet: Wallet, asset_ids: list[str], pin_block: bool = False) -> WalletBalances:
+    """Fetch the balances of assets for all addresses of a wallet.
+
+    Args:
+        wallet: The wallet to get the balances for.
+        asset_ids: The asset IDs to get the balances of.
+        pin_block: Whether to record the block the token balances are read at. The balances
+            are then read in a read snapshot, bypassing cached balances, and fail if the
+            batch cannot be executed at a single block.
+
+    Returns:
+        WalletBalances: The balances of each address, and the errors of assets which failed.
+
+    """
+    asset_ids = list(dict.fromkeys(asset_ids))
+    addresses = wallet.addresses
+    address_ids = [address.address_id for address in addresses]
+    result = WalletBalances(balances={address_id: {} for address_id in address_ids})
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(MAX_BALANCE_WORKERS, len(asset_ids) * len(address_ids)))
+    ) as executor:
+        resolutions = {
+            asset_id: executor.submit(resolve_asset, wallet.network_id, asset_id)
+            for asset_id in asset_ids
+        }
+        assets = []
+        for asset_id, resolution in resolutions.items():
+            try:
+                assets.append(resolution.result())
+            except Exception as e:
+                result.errors[asset_id] = str(e)
+
+        tokens = [asset for asset in assets if not asset.native]
+        token_balances = executor.submit(
+            _read_token_balances, wallet.network_id, tokens, address_ids, pin_block
+        )
+        native_balances = {
+            (asset.asset_id, address.address_id): executor.submit(address.balance, asset.asset_id)
+            for asset in assets
+            if asset.native
+            for address in addresses
+        }
+
+        for asset in assets:
+            if asset.native:
+                result.assets[asset.asset_id] = asset
+        for (asset_id, address_id), balance in native_balances.items():
+            try:
+                result.balances[address_id][asset_id] = balance.result()
+            except Exception as e:
+                result.errors.setdefault(asset_id, str(e))
+
+        try:
+            token_assets, balances, result.block_number = token_balances.result()
+            result.assets.update(token_assets)
+            for (asset_id, address_id), balance in balances.items():
+                result.balances[address_id][asset_id] = balance
+        except Exception as e:
+            for asset in tokens:
+                result.errors.setdefault(asset.asset_id, str(e))
+
+    # Only report complete balances for an asset.
+    for asset_id in result.errors:
+        result.assets.pop(asset_id, None)
+        for balances in result.balances.values():
+            balances.pop(asset_id, None)
+    return result
+
+
+def _read_token_balances(
+    network_id: str, tokens: list[ResolvedAsset], address_ids: list[str], pin_block: bool
+) -> tuple[dict[str, ResolvedAsset], dict[tuple[str, str], Decimal], int | None]:
+    reads = [
+        ContractRead(token.contract_address, "balanceOf", ERC20_BALANCE_ABI, {"account": address})
+        for token in tokens
+        for address in address_ids
+    ]
+    unknown_decimals = [token for token in tokens if token.decimals is None]
+    reads += [
+        ContractRead(token.contract_address, "decimals", ERC20_BALANCE_ABI)
+        for token in unknown_decimals
+    ]
+    if not pin_block:
+        if not reads:
+            return {}, {}, None
+        values = multicall_read(network_id, reads)
+        block_number = None
+    else:
+        # Read in a snapshot, so that no balance is served from the read cache, and the block
+        # is the one the batch executed at.
+        with read_snapshot(network_id) as snapshot:
+            values = multicall_read(
+                network_id,
+                reads or [ContractRead(MULTICALL3_ADDRESS, "getBlockNumber", MULTICALL3_ABI)],
+            )
+        if snapshot.block_number is None:
+            raise ValueError("could not read the token balances in a single batch")
+        block_number = snapshot.block_number
+        if not reads:
+            return {}, {}, block_number
+
+    decimals = dict(
+        zip(
+            [token.asset_id for token in unknown_decimals],
+            values[len(values) - len(unknown_decimals) :],
+            strict=True,
+        )
+    )
+    assets = {
+        token.asset_id: replace(token, decimals=int(decimals.get(token.asset_id, token.decimals)))
+        for token in tokens
+    }
+    balances = {}
+    index = 0
+    for token in tokens:
+        scale = Decimal(10) ** assets[token.asset_id].decimals
+        for address in address_ids:
+            balances[(token.asset_id, address)] = Decimal(int(values[index])) / scale
+            index += 1
+    return assets, balances, block_number
@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 
 from pydantic import BaseModel
 
@@ -10,3 +10,7 @@ class CdpAction(BaseModel):
     description: str
     args_schema: type[BaseModel] | None = None
     func: Callable[..., str]
+    # Optional native async implementation, taking the same arguments as `func`.
+    coroutine: Callable[..., Awaitable[str]] | None = None
+    # Whether the action only reads state, and never submits transactions from the wallet.
+    read_only: bool = False
@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 DEPLOY_NFT_PROMPT = """
 This tool will deploy an NFT (ERC-721) contract onchain from the wallet.
@@ -42,11 +43,13 @@ def deploy_nft(wallet: Wallet, name: str, symbol: str, base_uri: str) -> str:
 
     """
     try:
-        nft_contract = wallet.deploy_nft(name=name, symbol=symbol, base_uri=base_uri).wait()
+        nft_contract = wait_or_track(
+            wallet.deploy_nft(name=name, symbol=symbol, base_uri=base_uri), "deploy_nft"
+        )
     except Exception as e:
         return f"Error deploying NFT {e!s}"
 
-    return f"Deployed NFT Collection {name} to address {nft_contract.contract_address} on network {wallet.network_id}.\nTransaction hash for the deployment: {nft_contract.transaction.transaction_hash}\nTransaction link for the deployment: {nft_contract.transaction.transaction_link}"
+    return f"Deployed NFT Collection {name} to address {nft_contract.contract_address} on network {wallet.network_id}.\nTransaction hash for the deployment: {nft_contract.transaction.transaction_hash}\nTransaction link for the deployment: {nft_contract.transaction.transaction_link}{tracking_note(nft_contract)}"
 
 
 class DeployNftAction(CdpAction):
@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 DEPLOY_TOKEN_PROMPT = """
 This tool will deploy an ERC20 token smart contract. It takes the token name, symbol, and total supply as input.
@@ -37,11 +38,11 @@ def deploy_token(wallet: Wallet, name: str, symbol: str, total_supply: str) -> s
     try:
         token_contract = wallet.deploy_token(name=name, symbol=symbol, total_supply=total_supply)
 
-        token_contract.wait()
+        token_contract = wait_or_track(token_contract, "deploy_token")
     except Exception as e:
         return f"Error deploying token {e!s}"
 
-    return f"Deployed ERC20 token contract {name} ({symbol}) with total supply of {total_supply} tokens at address {token_contract.contract_address}. Transaction link: {token_contract.transaction.transaction_link}"
+    return f"Deployed ERC20 token contract {name} ({symbol}) with total supply of {total_supply} tokens at address {token_contract.contract_address}. Transaction link: {token_contract.transaction.transaction_link}{tracking_note(token_contract)}"
 
 
 class DeployTokenAction(CdpAction):
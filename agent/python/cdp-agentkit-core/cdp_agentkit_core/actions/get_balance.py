@@ -54,3 +54,4 @@ class GetBalanceAction(CdpAction):
     description: str = GET_BALANCE_PROMPT
     args_schema: type[BaseModel] | None = GetBalanceInput
     func: Callable[..., str] = get_balance
+    read_only: bool = True
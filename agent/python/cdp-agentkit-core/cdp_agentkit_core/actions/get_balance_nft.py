@@ -1,10 +1,11 @@
 from collections.abc import Callable
 
 from cdp import Wallet
-from cdp.smart_contract import SmartContract
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.nft_index import nft_index, sync_nft_index
+from cdp_agentkit_core.actions.read_cache import cached_read
 
 GET_BALANCE_NFT_PROMPT = """
 This tool will get the NFTs (ERC721 tokens) owned by the wallet for a specific NFT contract.
@@ -12,8 +13,16 @@ This tool will get the NFTs (ERC721 tokens) owned by the wallet for a specific N
 It takes the following inputs:
 - contract_address: The NFT contract address to check
 - address: (Optional) The address to check NFT balance for. If not provided, uses the wallet's default address
+- page: (Optional) The page of token IDs to list, for addresses owning many NFTs
+- build_index: (Optional) Whether to index the ownership of the contract from its Transfer events, so later checks are answered locally. Use it for contracts without `tokensOfOwner`, or with large collections
+- start_block: (Optional) The block the contract was deployed at, if known, to start building the index from instead of the first block
+
+Until the index of a contract is fully built, balances are read with `tokensOfOwner`.
 """
 
+# Number of token IDs listed per page.
+NFT_BALANCE_PAGE_SIZE = 100
+
 
 class GetBalanceNftInput(BaseModel):
     """Input argument schema for get NFT balance action."""
@@ -23,19 +32,38 @@ class GetBalanceNftInput(BaseModel):
         None,
         description="The address to check NFT balance for. If not provided, uses the wallet's default address",
     )
+    page: int = Field(1, ge=1, description="The page of token IDs to list, starting at 1")
+    build_index: bool = Field(
+        False,
+        description="Whether to index the ownership of the contract from its Transfer events",
+    )
+    start_block: int = Field(
+        0,
+        ge=0,
+        description="The block the contract was deployed at, if known, to start building the index from",
+    )
 
 
 def get_balance_nft(
     wallet: Wallet,
     contract_address: str,
     address: str | None = None,
+    page: int = 1,
+    build_index: bool = False,
+    start_block: int = 0,
 ) -> str:
     """Get NFT balance for a specific contract.
 
+    Contracts in the local NFT index are synced, and answered from it once it was fully built.
+    Other contracts, and contracts whose index is still partial, are read with `tokensOfOwner`.
+
     Args:
         wallet (Wallet): The wallet to check balance from.
         contract_address (str): The NFT contract address.
         address (str | None): The address to check balance for. Defaults to wallet's default address.
+        page (int): The page of token IDs to list, starting at 1.
+        build_index (bool): Whether to index the ownership of the contract from its Transfer events.
+        start_block (int): The block to start indexing from, e.g. the block the contract was deployed at.
 
     Returns:
         str: A message containing the NFT balance details.
@@ -43,16 +71,58 @@ def get_balance_nft(
     """
     try:
         check_address = address if address is not None else wallet.default_address.address_id
-
-        owned_tokens = SmartContract.read(
-            wallet.network_id, contract_address, "tokensOfOwner", args={"owner": check_address}
-        )
-
-        if not owned_tokens:
+        offset = (page - 1) * NFT_BALANCE_PAGE_SIZE
+
+        last_indexed_block = nft_index.last_indexed_block(wallet.network_id, contract_address)
+        if build_index or last_indexed_block is not None:
+            try:
+                sync_nft_index(wallet.network_id, contract_address, start_block=start_block)
+            except Exception as e:
+                print(f"Error syncing NFT index of {contract_address}: {e}")
+                last_indexed_block = nft_index.last_indexed_block(
+                    wallet.network_id, contract_address
+                )
+                if last_indexed_block is None:
+                    raise
+
+        if nft_index.is_complete(wallet.network_id, contract_address):
+            total = nft_index.count_tokens_of_owner(
+                wallet.network_id, contract_address, check_address
+            )
+            owned_tokens = nft_index.tokens_of_owner(
+                wallet.network_id,
+                contract_address,
+                check_address,
+                limit=NFT_BALANCE_PAGE_SIZE,
+                offset=offset,
+            )
+        else:
+            try:
+                all_tokens = cached_read(
+                    wallet.network_id,
+                    contract_address,
+                    "tokensOfOwner",
+                    args={"owner": check_address},
+                )
+            except Exception as e:
+                if last_indexed_block is None:
+                    raise
+                raise ValueError(
+                    f"the NFT index is only built up to block {last_indexed_block}, and "
+                    f"tokensOfOwner failed: {e}"
+                ) from e
+            total = len(all_tokens)
+            owned_tokens = all_tokens[offset : offset + NFT_BALANCE_PAGE_SIZE]
+
+        if not total:
             return f"Address {check_address} owns no NFTs in contract {contract_address}"
 
         token_list = ", ".join(str(token_id) for token_id in owned_tokens)
-        return f"Address {check_address} owns {len(owned_tokens)} NFTs in contract {contract_address}.\nToken IDs: {token_list}"
+        response = f"Address {check_address} owns {total} NFTs in contract {contract_address}.\nToken IDs: {token_list}"
+        if total > NFT_BALANCE_PAGE_SIZE:
+            pages = -(-total // NFT_BALANCE_PAGE_SIZE)
+            response += f"\nShowing page {page} of {pages}."
+        return response
 
     except Exception as e:
         return f"Error getting NFT balance for address {check_address} in contract {contract_address}: {e!s}"
@@ -65,3 +135,4 @@ class GetBalanceNftAction(CdpAction):
     description: str = GET_BALANCE_NFT_PROMPT
     args_schema: type[BaseModel] | None = GetBalanceNftInput
     func: Callable[..., str] = get_balance_nft
+    read_only: bool = True
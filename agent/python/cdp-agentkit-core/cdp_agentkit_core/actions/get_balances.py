@@ -0,0 +1,59 @@
+from collections.abc import Callable
+
+from cdp import Wallet
+from pydantic import BaseModel, Field
+
+from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.balance_engine import fetch_balances
+
+GET_BALANCES_PROMPT = """
+This tool will get the balances of several assets for all the addresses in the wallet at once.
+It takes a list of asset IDs as input. Always use 'eth' for the native asset ETH and 'usdc' for USDC.
+Use this tool instead of calling get_balance once per asset, e.g. to find out what the wallet holds.
+"""
+
+
+class GetBalancesInput(BaseModel):
+    """Input argument schema for get balances action."""
+
+    asset_ids: list[str] = Field(
+        ...,
+        min_length=1,
+        description="The asset IDs to get the balances for, e.g. `['eth', 'usdc', '0x036CbD53842c5426634e7929541eC2318f3dCF7e']`",
+    )
+
+
+def get_balances(wallet: Wallet, asset_ids: list[str]) -> str:
+    """Get the balances of several assets for all addresses in the wallet.
+
+    Args:
+        wallet (Wallet): The wallet to get the balances for.
+        asset_ids (list[str]): The asset IDs to get the balances for (e.g., "eth", "usdc", or a valid contract address like "0x036CbD53842c5426634e7929541eC2318f3dCF7e")
+
+    Returns:
+        str: A message containing the balances of all addresses in the wallet.
+
+    """
+    try:
+        balances = fetch_balances(wallet, asset_ids)
+    except Exception as e:
+        return f"Error getting balances for all addresses in the wallet {e!s}"
+
+    lines = [f"Balances for wallet {wallet.id}:"]
+    for address_id, address_balances in balances.balances.items():
+        lines.append(f"  {address_id}:")
+        lines.extend(f"    {asset_id}: {balance}" for asset_id, balance in address_balances.items())
+    if balances.errors:
+        lines.append("Errors:")
+        lines.extend(f"  {asset_id}: {error}" for asset_id, error in balances.errors.items())
+    return "\n".join(lines)
+
+
+class GetBalancesAction(CdpAction):
+    """Get wallet balances of several assets action."""
+
+    name: str = "get_balances"
+    description: str = GET_BALANCES_PROMPT
+    args_schema: type[BaseModel] | None = GetBalancesInput
+    func: Callable[..., str] = get_balances
+    read_only: bool = True
@@ -0,0 +1,71 @@
+from collections.abc import Callable
+
+from pydantic import BaseModel, Field
+
+from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import TrackedTransaction, transaction_tracker
+
+GET_TRANSACTION_STATUS_PROMPT = """
+This tool gets the status of transactions submitted by other actions, such as transfers, trades and contract invocations, which are confirmed in the background.
+
+It takes the following inputs:
+- transaction: (Optional) The tracking ID or transaction hash of the transaction. If not provided, lists the most recent transactions
+
+Important notes:
+- The status is one of 'pending', 'signed', 'broadcast', 'complete', 'failed' or 'timed_out'
+- Only transactions submitted by this agent since it started are known
+"""
+
+MAX_LISTED_TRANSACTIONS = 10
+
+
+class GetTransactionStatusInput(BaseModel):
+    """Input argument schema for get transaction status action."""
+
+    transaction: str | None = Field(
+        None,
+        description="The tracking ID or transaction hash of the transaction, e.g. `0xabc...`. Lists the most recent transactions if not provided.",
+    )
+
+
+def get_transaction_status(transaction: str | None = None) -> str:
+    """Get the status of transactions tracked in the background.
+
+    Args:
+        transaction (str | None): The tracking ID or transaction hash. Lists the most recent transactions if not provided.
+
+    Returns:
+        str: A message containing the status of the transactions.
+
+    """
+    if transaction is not None:
+        record = transaction_tracker.get(transaction)
+        if record is None:
+            return f"No tracked transaction found for {transaction}"
+        return _format_transaction(record)
+
+    records = transaction_tracker.list_transactions()[:MAX_LISTED_TRANSACTIONS]
+    if not records:
+        return "No transactions have been tracked"
+    return "Tracked transactions:\n" + "\n".join(_format_transaction(record) for record in records)
+
+
+def _format_transaction(record: TrackedTransaction) -> str:
+    line = f"- {record.id} ({record.action}): {record.status}"
+    if record.transaction_hash:
+        line += f", transaction hash {record.transaction_hash}"
+    if record.transaction_link:
+        line += f", transaction link {record.transaction_link}"
+    if record.error:
+        line += f", last error: {record.error}"
+    return line
+
+
+class GetTransactionStatusAction(CdpAction):
+    """Get transaction status action."""
+
+    name: str = "get_transaction_status"
+    description: str = GET_TRANSACTION_STATUS_PROMPT
+    args_schema: type[BaseModel] | None = GetTransactionStatusInput
+    func: Callable[..., str] = get_transaction_status
+    read_only: bool = True
@@ -30,3 +30,4 @@ class GetWalletDetailsAction(CdpAction):
     description: str = "This tool will get details about the MPC Wallet."
     args_schema: type[BaseModel] | None = GetWalletDetailsInput
     func: Callable[..., str] = get_wallet_details
+    read_only: bool = True
@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 MINT_NFT_PROMPT = """
 This tool will mint an NFT (ERC-721) to a specified destination address onchain via a contract invocation.
@@ -40,13 +41,16 @@ def mint_nft(wallet: Wallet, contract_address: str, destination: str) -> str:
     mint_args = {"to": destination, "quantity": "1"}
 
     try:
-        mint_invocation = wallet.invoke_contract(
-            contract_address=contract_address, method="mint", args=mint_args
-        ).wait()
+        mint_invocation = wait_or_track(
+            wallet.invoke_contract(
+                contract_address=contract_address, method="mint", args=mint_args
+            ),
+            "mint_nft",
+        )
     except Exception as e:
         return f"Error minting NFT {e!s}"
 
-    return f"Minted NFT from contract {contract_address} to address {destination} on network {wallet.network_id}.\nTransaction hash for the mint: {mint_invocation.transaction.transaction_hash}\nTransaction link for the mint: {mint_invocation.transaction.transaction_link}"
+    return f"Minted NFT from contract {contract_address} to address {destination} on network {wallet.network_id}.\nTransaction hash for the mint: {mint_invocation.transaction.transaction_hash}\nTransaction link for the mint: {mint_invocation.transaction.transaction_link}{tracking_note(mint_invocation)}"
 
 
 class MintNftAction(CdpAction):
@@ -5,7 +5,10 @@ from cdp import Asset, Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.allowance_ledger import allowance_ledger
 from cdp_agentkit_core.actions.morpho.constants import METAMORPHO_ABI
+from cdp_agentkit_core.actions.nonce_manager import TransactionPipeline
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note
 from cdp_agentkit_core.actions.utils import approve
 
 
@@ -70,22 +73,39 @@ def deposit_to_morpho(
 
         atomic_assets = str(int(token_asset.to_atomic_amount(Decimal(assets))))
 
-        approval_result = approve(wallet, token_address, vault_address, atomic_assets)
-        if approval_result.startswith("Error"):
-            return f"Error approving Morpho Vault as spender: {approval_result}"
-
-        deposit_args = {"assets": atomic_assets, "receiver": receiver}
-
-        invocation = wallet.invoke_contract(
-            contract_address=vault_address,
-            method="deposit",
-            abi=METAMORPHO_ABI,
-            args=deposit_args,
-        ).wait()
-
-        return f"Deposited {assets} to Morpho Vault {vault_address} with transaction hash: {invocation.transaction_hash} and transaction link: {invocation.transaction_link}"
+        # The deposit is submitted right behind the approval, so both can land in one block.
+        with TransactionPipeline(wallet) as pipeline:
+            approval_result = approve(
+                wallet, token_address, vault_address, atomic_assets, pipeline=pipeline
+            )
+            if approval_result.startswith("Error"):
+                return f"Error approving Morpho Vault as spender: {approval_result}"
+
+            deposit_args = {"assets": atomic_assets, "receiver": receiver}
+
+            pipeline.invoke_contract(
+                "morpho_deposit",
+                contract_address=vault_address,
+                method="deposit",
+                abi=METAMORPHO_ABI,
+                args=deposit_args,
+            )
+
+        invocation = pipeline.wait()[-1]
+        allowance_ledger.spend(
+            wallet.network_id,
+            token_address,
+            wallet.default_address.address_id,
+            vault_address,
+            int(atomic_assets),
+        )
+
+        return f"Deposited {assets} to Morpho Vault {vault_address} with transaction hash: {invocation.transaction_hash} and transaction link: {invocation.transaction_link}{tracking_note(invocation)}"
 
     except Exception as e:
+        allowance_ledger.invalidate(
+            wallet.network_id, token_address, wallet.default_address.address_id, vault_address
+        )
         return f"Error depositing to Morpho Vault: {e!s}"
 
 
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
 from cdp_agentkit_core.actions.morpho.constants import METAMORPHO_ABI
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 
 class MorphoWithdrawInput(BaseModel):
@@ -41,18 +42,21 @@ def withdraw_from_morpho(wallet: Wallet, vault_address: str, assets: str, receiv
         return "Error: Assets amount must be greater than 0"
 
     try:
-        invocation = wallet.invoke_contract(
-            contract_address=vault_address,
-            method="withdraw",
-            abi=METAMORPHO_ABI,
-            args={
-                "assets": assets,
-                "receiver": receiver,
-                "owner": receiver,
-            },
-        ).wait()
-
-        return f"Withdrawn {assets} from Morpho Vault {vault_address} with transaction hash: {invocation.transaction_hash} and transaction link: {invocation.transaction_link}"
+        invocation = wait_or_track(
+            wallet.invoke_contract(
+                contract_address=vault_address,
+                method="withdraw",
+                abi=METAMORPHO_ABI,
+                args={
+                    "assets": assets,
+                    "receiver": receiver,
+                    "owner": receiver,
+                },
+            ),
+            "morpho_withdraw",
+        )
+
+        return f"Withdrawn {assets} from Morpho Vault {vault_address} with transaction hash: {invocation.transaction_hash} and transaction link: {invocation.transaction_link}{tracking_note(invocation)}"
 
     except Exception as e:
         return f"Error withdrawing from Morpho Vault: {e!s}"
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+from typing import Any
+
+from cdp import SmartContract
+from eth_abi import decode
+
+from cdp_agentkit_core.actions.abi_codec import checksum_address, get_function_codec
+from cdp_agentkit_core.actions.constants import MULTICALL3_ABI, MULTICALL3_ADDRESS
+from cdp_agentkit_core.actions.read_cache import cached_read, read_cache
+from cdp_agentkit_core.actions.snapshot import current_snapshot
+
+
+@dataclass
+class ContractRead:
+    """A single read-only contract call that can be batched through Multicall3."""
+
+    contract_address: str
+    method: str
+    abi: list[dict]
+    args: dict | None = None
+
+
+def multicall_read(network_id: str, reads: list[ContractRead]) -> list[Any]:
+    """Execute a list of contract reads in a single Multicall3 `aggregate3` call.
+
+    Every read is encoded locally and sent with `allowFailure` set, so that a single failing
+    call does not revert the batch. Calls that fail inside the batch, or the whole batch if the
+    aggregate call itself fails, fall back to individual `SmartContract.read` calls. Reads that
+    are served by the read cache are not sent at all.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        reads: The contract reads to execute.
+
+    Returns:
+        list[Any]: The decoded result of each read, in the same order as `reads`.
+
+    """
+    snapshot = current_snapshot(network_id)
+
+    values: list[Any] = [None] * len(reads)
+    pending = []
+    for index, read in enumerate(reads):
+        hit, value = False, None
+        if snapshot is not None:
+            hit, value = snapshot.get(read.contract_address, read.method, read.args)
+        if not hit:
+            hit, value = read_cache.get(
+                network_id, read.contract_address, read.method, read.args, abi=read.abi
+            )
+        if hit:
+            values[index] = value
+        else:
+            pending.append(index)
+
+    if not pending:
+        return values
+
+    batch = [reads[index] for index in pending]
+    if snapshot is not None:
+        # Record the block the batch executes at, which pins the snapshot.
+        batch.append(ContractRead(MULTICALL3_ADDRESS, "getBlockNumber", MULTICALL3_ABI))
+
+    try:
+        calls = [
+            [checksum_address(read.contract_address), True, "0x" + encode_call(read).hex()]
+            for read in batch
+        ]
+        results = SmartContract.read(
+            network_id,
+            MULTICALL3_ADDRESS,
+            "aggregate3",
+            abi=MULTICALL3_ABI,
+            args={"calls": calls},
+        )
+    except Exception as error:
+        print(f"Multicall error, falling back to individual reads: {error}")
+        for index in pending:
+            values[index] = _read_single(network_id, reads[index])
+        return values
+
+    block_number = None
+    if snapshot is not None:
+        block_number = _decode_block_number(results[-1])
+        results = results[:-1]
+        if block_number is not None:
+            snapshot.observe(block_number)
+
+    for index, result in zip(pending, results, strict=True):
+        read = reads[index]
+        success, return_data = _unpack_result(result)
+        try:
+            if not success:
+                raise ValueError(f"call to {read.method} reverted")
+            value = decode_result(read, return_data)
+        except Exception:
+            values[index] = _read_single(network_id, read)
+            continue
+
+        read_cache.set(
+            network_id, read.contract_address, read.method, read.args, value, abi=read.abi
+        )
+        if snapshot is not None:
+            snapshot.set(read.contract_address, read.method, read.args, value, block_number)
+        values[index] = value
+
+    return values
+
+
+def encode_call(read: ContractRead) -> bytes:
+    """ABI-encode the calldata for a contract read.
+
+    Args:
+        read: The contract read to encode.
+
+    Returns:
+        bytes: The function selector followed by the encoded arguments.
+
+    """
+    return get_function_codec(read.abi, read.method).encode_call(read.args)
+
+
+def decode_result(read: ContractRead, return_data: bytes) -> Any:
+    """ABI-decode the return data of a contract read.
+
+    Args:
+        read: The contract read that produced the data.
+        return_data: The raw return data.
+
+    Returns:
+        Any: The decoded value for single-output methods, otherwise a tuple of values.
+
+    """
+    return get_function_codec(read.abi, read.method).decode_output(return_data)
+
+
+def _read_single(network_id: str, read: ContractRead) -> Any:
+    return cached_read(
+        network_id,
+        read.contract_address,
+        read.method,
+        abi=read.abi,
+        args=read.args,
+    )
+
+
+def _decode_block_number(result: Any) -> int | None:
+    success, return_data = _unpack_result(result)
+    if not success:
+        return None
+    return decode(["uint256"], return_data)[0]
+
+
+def _unpack_result(result: Any) -> tuple[bool, bytes]:
+    if isinstance(result, dict):
+        success, return_data = result["success"], result["returnData"]
+    else:
+        success, return_data = result
+
+    if isinstance(return_data, str):
+        return_data = bytes.fromhex(return_data.removeprefix("0x"))
+
+    return bool(success), return_data
@@ -0,0 +1,358 @@
+"""Local index of ERC721 token ownership, built from the Transfer events of each contract.
+
+Each indexed contract maps its token IDs to their current owner, and is kept up to date by
+incremental syncs from the last indexed block. Ownership lookups are then served from a local
+SQLite database, which works for contracts without `tokensOfOwner` and pages through large
+holdings instead of reading them in one call. A contract is only complete once a sync has
+reached the latest block; until then its partial index must not be used to answer lookups.
+A range with a Transfer event which cannot be parsed is not recorded, so the index never
+skips a transfer and reports wrong owners.
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from cdp import Cdp, SmartContract
+from cdp.client.api.contract_events_api import ContractEventsApi
+
+from cdp_agentkit_core.actions.abi_codec import checksum_address
+from cdp_agentkit_core.actions.constants import MULTICALL3_ABI, MULTICALL3_ADDRESS
+
+DEFAULT_NFT_INDEX_PATH = Path.home() / ".cdp_agentkit" / "nft_index.sqlite3"
+
+# Names ERC721 contracts and their events are indexed under by the CDP contract events API.
+NFT_EVENTS_PROTOCOL_NAME = "erc721"
+NFT_CONTRACT_NAME = "ERC721"
+NFT_TRANSFER_EVENT = "Transfer"
+
+# Number of blocks requested per contract events query during a sync.
+SYNC_BLOCK_RANGE = 500_000
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nft_owners (
+    network_id TEXT NOT NULL,
+    contract_address TEXT NOT NULL,
+    token_id TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    PRIMARY KEY (network_id, contract_address, token_id)
+);
+CREATE INDEX IF NOT EXISTS nft_owners_by_owner ON nft_owners (network_id, contract_address, owner);
+CREATE TABLE IF NOT EXISTS nft_sync_state (
+    network_id TEXT NOT NULL,
+    contract_address TEXT NOT NULL,
+    last_indexed_block INTEGER NOT NULL,
+    PRIMARY KEY (network_id, contract_address)
+);
+CREATE TABLE IF NOT EXISTS nft_complete_indexes (
+    network_id TEXT NOT NULL,
+    contract_address TEXT NOT NULL,
+    PRIMARY KEY (network_id, contract_address)
+);
+"""
+
+
+@dataclass
+class NftTransfer:
+    """An ERC721 token transfer, with its position in the chain."""
+
+    token_id: int
+    from_address: str
+    to_address: str
+    block_height: int
+    tx_index: int = 0
+    event_index: int = 0
+
+
+class NftIndex:
+    """SQLite index of ERC721 token owners.
+
+    Addresses are stored in lowercase, and token IDs as decimal text since they may not fit in
+    an SQLite integer. Like the WOW token registry, the database file is only created by the
+    first write.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_NFT_INDEX_PATH):
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def last_indexed_block(self, network_id: str, contract_address: str) -> int | None:
+        """Get the last block indexed for a contract.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The NFT contract address.
+
+        Returns:
+            int | None: The last indexed block, or None if the contract was never indexed.
+
+        """
+        rows = self._query(
+            "SELECT last_indexed_block FROM nft_sync_state "
+            "WHERE network_id = ? AND contract_address = ?",
+            (network_id, contract_address.lower()),
+        )
+        return rows[0][0] if rows else None
+
+    def is_complete(self, network_id: str, contract_address: str) -> bool:
+        """Check whether the index of a contract was built up to the latest block at least once.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The NFT contract address.
+
+        Returns:
+            bool: Whether the index is complete, rather than a partial first build.
+
+        """
+        rows = self._query(
+            "SELECT 1 FROM nft_complete_indexes WHERE network_id = ? AND contract_address = ?",
+            (network_id, contract_address.lower()),
+        )
+        return bool(rows)
+
+    def count_tokens_of_owner(self, network_id: str, contract_address: str, owner: str) -> int:
+        """Count the tokens of a contract owned by an address.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The NFT contract address.
+            owner: The owner address.
+
+        Returns:
+            int: The number of tokens owned.
+
+        """
+        rows = self._query(
+            "SELECT COUNT(*) FROM nft_owners "
+            "WHERE network_id = ? AND contract_address = ? AND owner = ?",
+            (network_id, contract_address.lower(), owner.lower()),
+        )
+        return rows[0][0] if rows else 0
+
+    def tokens_of_owner(
+        self,
+        network_id: str,
+        contract_address: str,
+        owner: str,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[int]:
+        """List the tokens of a contract owned by an address, in ascending order.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The NFT contract address.
+            owner: The owner address.
+            limit: Maximum number of token IDs to return, defaults to all.
+            offset: Number of token IDs to skip.
+
+        Returns:
+            list[int]: The token IDs.
+
+        """
+        rows = self._query(
+            "SELECT token_id FROM nft_owners "
+            "WHERE network_id = ? AND contract_address = ? AND owner = ? "
+            "ORDER BY LENGTH(token_id), token_id LIMIT ? OFFSET ?",
+            (
+                network_id,
+                contract_address.lower(),
+                owner.lower(),
+                -1 if limit is None else limit,
+                offset,
+            ),
+        )
+        return [int(row[0]) for row in rows]
+
+    def record_transfers(
+        self,
+        network_id: str,
+        contract_address: str,
+        transfers: list[NftTransfer],
+        last_indexed_block: int,
+        complete: bool = False,
+    ) -> None:
+        """Apply transfers in chain order and advance the sync state, in a single transaction.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The NFT contract address.
+            transfers: The transfers within the indexed blocks.
+            last_indexed_block: The last block indexed.
+            complete: Whether the last block indexed is the block the sync was run up to.
+
+        """
+        contract_address = contract_address.lower()
+        owners: dict[str, str] = {}
+        for transfer in sorted(
+            transfers, key=lambda t: (t.block_height, t.tx_index, t.event_index)
+        ):
+            owners[str(transfer.token_id)] = transfer.to_address.lower()
+
+        with self._lock:
+            connection = self._connect(create=True)
+            with connection:
+                connection.executemany(
+                    "INSERT INTO nft_owners (network_id, contract_address, token_id, owner) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (network_id, contract_address, token_id) "
+                    "DO UPDATE SET owner = excluded.owner",
+                    [
+                        (network_id, contract_address, token_id, owner)
+                        for token_id, owner in owners.items()
+                        if owner != ZERO_ADDRESS
+                    ],
+                )
+                # Burned tokens have no owner.
+                connection.executemany(
+                    "DELETE FROM nft_owners "
+                    "WHERE network_id = ? AND contract_address = ? AND token_id = ?",
+                    [
+                        (network_id, contract_address, token_id)
+                        for token_id, owner in owners.items()
+                        if owner == ZERO_ADDRESS
+                    ],
+                )
+                connection.execute(
+                    "INSERT INTO nft_sync_state (network_id, contract_address, last_indexed_block) "
+                    "VALUES (?, ?, ?) ON CONFLICT (network_id, contract_address) DO UPDATE SET "
+                    "last_indexed_block = excluded.last_indexed_block",
+                    (network_id, contract_address, last_indexed_block),
+                )
+                if complete:
+                    connection.execute(
+                        "INSERT OR IGNORE INTO nft_complete_indexes (network_id, contract_address) "
+                        "VALUES (?, ?)",
+                        (network_id, contract_address),
+                    )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return []
+            return connection.execute(sql, params).fetchall()
+
+    def _connect(self, create: bool) -> sqlite3.Connection | None:
+        if self._connection is None:
+            if not create and not self.path.exists():
+                return None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+
+# Process-wide index shared by all actions.
+nft_index = NftIndex()
+
+
+def sync_nft_index(
+    network_id: str,
+    contract_address: str,
+    index: NftIndex | None = None,
+    start_block: int = 0,
+    to_block: int | None = None,
+) -> int:
+    """Index the Transfer events of an NFT contract since its last sync.
+
+    Transfer events are fetched from the CDP contract events API in ranges of
+    `SYNC_BLOCK_RANGE` blocks. Each range is recorded in its own transaction, so an interrupted
+    sync resumes from the last recorded range, and the index is only marked complete with the
+    range ending at `to_block`. A malformed Transfer event stops the sync before its range is
+    recorded.
+
+    Args:
+        network_id: The network ID of the contract.
+        contract_address: The NFT contract address.
+        index: The index to sync, defaults to the process-wide index.
+        start_block: The block to start from when the contract was never indexed, e.g. the
+            block it was deployed at.
+        to_block: The last block to index, defaults to the latest block.
+
+    Returns:
+        int: The number of newly indexed transfers.
+
+    Raises:
+        ValueError: If a Transfer event cannot be parsed.
+
+    """
+    index = index or nft_index
+
+    last_indexed_block = index.last_indexed_block(network_id, contract_address)
+    from_block = start_block if last_indexed_block is None else last_indexed_block + 1
+    if to_block is None:
+        to_block = SmartContract.read(
+            network_id, MULTICALL3_ADDRESS, "getBlockNumber", abi=MULTICALL3_ABI
+        )
+
+    if from_block > to_block:
+        if last_indexed_block is not None:
+            # An index built before completeness was recorded is complete once it is current.
+            index.record_transfers(network_id, contract_address, [], last_indexed_block, True)
+        return 0
+
+    indexed = 0
+    for range_start in range(from_block, to_block + 1, SYNC_BLOCK_RANGE):
+        range_end = min(range_start + SYNC_BLOCK_RANGE - 1, to_block)
+        transfers = [
+            _parse_transfer(event)
+            for event in _list_transfer_events(network_id, contract_address, range_start, range_end)
+        ]
+        index.record_transfers(
+            network_id, contract_address, transfers, range_end, complete=range_end == to_block
+        )
+        indexed += len(transfers)
+    return indexed
+
+
+def _list_transfer_events(
+    network_id: str, contract_address: str, from_block: int, to_block: int
+) -> Iterator:
+    api = ContractEventsApi(api_client=Cdp.api_clients._cdp_client)
+    next_page = None
+    while True:
+        page = api.list_contract_events(
+            network_id=network_id,
+            protocol_name=NFT_EVENTS_PROTOCOL_NAME,
+            contract_address=contract_address.lower(),
+            contract_name=NFT_CONTRACT_NAME,
+            event_name=NFT_TRANSFER_EVENT,
+            from_block_height=from_block,
+            to_block_height=to_block,
+            next_page=next_page,
+        )
+        yield from page.data
+        if not page.has_more or not page.next_page:
+            return
+        next_page = page.next_page
+
+
+def _parse_transfer(event) -> NftTransfer:
+    try:
+        data = json.loads(event.data)
+        return NftTransfer(
+            token_id=int(data["tokenId"]),
+            from_address=checksum_address(data["from"]),
+            to_address=checksum_address(data["to"]),
+            block_height=event.block_height,
+            tx_index=event.tx_index,
+            event_index=event.event_index,
+        )
+    except Exception as error:
+        raise ValueError(
+            f"Malformed {NFT_TRANSFER_EVENT} event in {event.tx_hash}: {error}"
+        ) from error
@@ -0,0 +1,328 @@
+"""Local nonce management for pipelined transactions.
+
+CDP builds every transaction with the next nonce of the sending address as seen by its backend.
+A transaction built while an earlier one from the same address is still in flight can get the
+same nonce, and would replace it, so actions wait for each transaction to land before submitting
+the next one. The process-wide `nonce_manager` records the nonces which are in flight for each
+address, which lets a `TransactionPipeline` submit dependent transactions back-to-back: each one
+is built, checked against the nonces in flight, and only then signed and broadcast. A transaction
+which is dropped before landing leaves a gap which stalls the ones behind it; the pipeline
+rebuilds and resubmits it, which fills the gap with a replacement. In submit-and-track mode the
+nonce of a pending transaction stays reserved until the `transaction_tracker` reports its final
+status, and a transaction reported as dropped is resubmitted from there.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from cdp import Cdp, ContractInvocation, Wallet
+from eth_account.signers.local import LocalAccount
+
+from cdp_agentkit_core.actions.transaction_tracker import (
+    TrackedTransaction,
+    transaction_tracker,
+    wait_or_track,
+)
+
+# How often a transaction is rebuilt when its nonce is still in flight, or resubmitted when it is
+# dropped, before giving up.
+MAX_SUBMIT_ATTEMPTS = 3
+NONCE_RETRY_INTERVAL = 1.0
+
+
+class NonceConflictError(Exception):
+    """Raised when a transaction can only be built with a nonce which is still in flight."""
+
+
+@dataclass
+class _AddressNonces:
+    in_flight: set[int] = field(default_factory=set)
+    gaps: set[int] = field(default_factory=set)
+
+
+class NonceManager:
+    """Tracks the nonces of transactions in flight, per network and address."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._addresses: dict[tuple[str, str], _AddressNonces] = {}
+
+    def reserve(self, network_id: str, address: str, nonce: int) -> bool:
+        """Reserve the nonce of a transaction which is about to be broadcast.
+
+        Args:
+            network_id: The network of the address.
+            address: The sending address.
+            nonce: The nonce the transaction was built with.
+
+        Returns:
+            bool: Whether the nonce was reserved, which is false if a transaction with the same
+                nonce is still in flight and broadcasting would replace it.
+
+        """
+        with self._lock:
+            state = self._addresses.setdefault((network_id, address.lower()), _AddressNonces())
+            if nonce in state.in_flight:
+                return False
+            state.in_flight.add(nonce)
+            state.gaps.discard(nonce)
+            return True
+
+    def release(self, network_id: str, address: str, nonce: int, landed: bool = True) -> None:
+        """Release the nonce of a transaction which landed or was dropped.
+
+        Args:
+            network_id: The network of the address.
+            address: The sending address.
+            nonce: The nonce of the transaction.
+            landed: Whether the transaction landed onchain. A dropped transaction with later
+                transactions in flight leaves a gap which must be filled by a replacement.
+
+        """
+        key = (network_id, address.lower())
+        with self._lock:
+            state = self._addresses.get(key)
+            if state is None:
+                return
+            state.in_flight.discard(nonce)
+            if not landed and any(other > nonce for other in state.in_flight):
+                state.gaps.add(nonce)
+            state.gaps = {gap for gap in state.gaps if any(n > gap for n in state.in_flight)}
+            if not state.in_flight:
+                del self._addresses[key]
+
+    def in_flight(self, network_id: str, address: str) -> list[int]:
+        """Get the nonces of the transactions of an address which are in flight."""
+        with self._lock:
+            state = self._addresses.get((network_id, address.lower()))
+            return sorted(state.in_flight) if state else []
+
+    def gaps(self, network_id: str, address: str) -> list[int]:
+        """Get the nonces of dropped transactions which stall later transactions of an address."""
+        with self._lock:
+            state = self._addresses.get((network_id, address.lower()))
+            return sorted(state.gaps) if state else []
+
+    def clear(self) -> None:
+        """Forget all nonces in flight."""
+        with self._lock:
+            self._addresses.clear()
+
+
+nonce_manager = NonceManager()
+
+
+@dataclass
+class _Step:
+    action: str
+    arguments: dict[str, Any]
+    invocation: ContractInvocation | None = None
+    nonce: int | None = None
+    done: bool = False
+
+
+class TransactionPipeline:
+    """Submits dependent contract invocations back-to-back instead of one per block.
+
+    Each invocation is broadcast as soon as it is built, without waiting for the previous one,
+    when its nonce does not collide with a transaction in flight. Exiting the pipeline as a
+    context manager, or calling `wait`, waits for all of them, resubmitting dropped transactions.
+    Wallets which are signed by a server signer, or without a local key, fall back to waiting
+    for each invocation before submitting the next.
+    """
+
+    def __init__(self, wallet: Wallet, manager: NonceManager | None = None):
+        self.wallet = wallet
+        self.manager = manager or nonce_manager
+        self._steps: list[_Step] = []
+
+    @property
+    def pipelined(self) -> bool:
+        """Whether invocations are broadcast without waiting for the previous one."""
+        return not Cdp.use_server_signer and isinstance(
+            getattr(self.wallet.default_address, "key", None), LocalAccount
+        )
+
+    def invoke_contract(
+        self,
+        action: str,
+        contract_address: str,
+        method: str,
+        abi: list[dict] | None = None,
+        args: dict | None = None,
+        amount: str | None = None,
+        asset_id: str | None = None,
+    ) -> ContractInvocation:
+        """Submit a contract invocation after the previous ones.
+
+        Args:
+            action: The name of the action which submits the invocation.
+            contract_address: The address of the contract to invoke.
+            method: The name of the method to call.
+            abi: The ABI of the contract, if needed.
+            args: The arguments of the method.
+            amount: The amount of the asset to send with the invocation, if any.
+            asset_id: The asset ID of the amount.
+
+        Returns:
+            ContractInvocation: The submitted invocation, which may not have landed yet.
+
+        """
+        arguments = {
+            "contract_address": contract_address,
+            "method": method,
+            "abi": abi,
+            "args": args,
+            "amount": amount,
+            "asset_id": asset_id,
+        }
+
+        if not self.pipelined:
+            self._wait_steps(track=False)
+            invocation = self.wallet.invoke_contract(
+                **{name: value for name, value in arguments.items() if value is not None}
+            )
+            self._steps.append(_Step(action, arguments, invocation))
+            return invocation
+
+        step = _Step(action, arguments)
+        self._submit(step)
+        self._steps.append(step)
+        return step.invocation
+
+    def wait(self) -> list[ContractInvocation]:
+        """Wait for all submitted invocations, or track them in submit-and-track mode.
+
+        Returns:
+            list[ContractInvocation]: The invocations, in the order they were submitted.
+
+        """
+        self._wait_steps(track=True)
+        return [step.invocation for step in self._steps]
+
+    def __enter__(self) -> "TransactionPipeline":
+        """Start submitting invocations."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Wait for the submitted invocations, so that their nonces are released."""
+        if exc_type is None:
+            self.wait()
+            return
+        try:
+            self._wait_steps(track=True)
+        except Exception as e:
+            print(f"Error waiting for pipelined transactions: {e!s}")
+
+    def _submit(self, step: _Step) -> None:
+        address = self.wallet.default_address
+        arguments = step.arguments
+        amount = Decimal(arguments["amount"]) if arguments["amount"] else Decimal("0")
+        if amount > 0 and not arguments["asset_id"]:
+            raise ValueError(
+                "Asset ID is required for contract invocation if an amount is provided"
+            )
+
+        for attempt in range(MAX_SUBMIT_ATTEMPTS):
+            invocation = ContractInvocation.create(
+                address_id=address.address_id,
+                wallet_id=address.wallet_id,
+                network_id=address.network_id,
+                contract_address=arguments["contract_address"],
+                method=arguments["method"],
+                abi=arguments["abi"],
+                args=arguments["args"],
+                amount=amount,
+                asset_id=arguments["asset_id"],
+            )
+            nonce = invocation.transaction.raw.nonce
+            if self.manager.reserve(address.network_id, address.address_id, nonce):
+                break
+            # The backend does not know about a transaction in flight yet. Wait for this
+            # pipeline's transactions, or for another pipeline's, before building again.
+            if any(not other.done for other in self._steps):
+                self._wait_steps(track=False)
+            elif attempt < MAX_SUBMIT_ATTEMPTS - 1:
+                time.sleep(NONCE_RETRY_INTERVAL)
+        else:
+            raise NonceConflictError(f"Nonce {nonce} of {address.address_id} is still in flight")
+
+        try:
+            invocation.sign(address.key)
+            invocation.broadcast()
+        except Exception:
+            self.manager.release(address.network_id, address.address_id, nonce, landed=False)
+            raise
+        step.invocation = invocation
+        step.nonce = nonce
+
+    def _wait_steps(self, track: bool) -> None:
+        for step in self._steps:
+            if step.done:
+                continue
+            if step.nonce is None:
+                step.invocation = (
+                    wait_or_track(step.invocation, step.action) if track else step.invocation.wait()
+                )
+                step.done = True
+            else:
+                self._wait_pipelined(step, track)
+
+    def _wait_pipelined(self, step: _Step, track: bool, first_attempt: int = 0) -> None:
+        for attempt in range(first_attempt, MAX_SUBMIT_ATTEMPTS):
+            if track:
+                step.invocation = wait_or_track(step.invocation, step.action)
+                record = transaction_tracker.get_for_operation(step.invocation)
+                if record is not None and not record.is_final:
+                    # The nonce stays reserved until the tracker reports the final status.
+                    self._settle_when_final(step, record.id, attempt)
+                    step.done = True
+                    return
+            else:
+                step.invocation = step.invocation.wait()
+            if self._settle(step, attempt):
+                return
+            self._submit(step)
+
+    def _settle(self, step: _Step, attempt: int) -> bool:
+        # Returns whether the transaction landed, or releases its nonce for a resubmission.
+        address = self.wallet.default_address
+        transaction = step.invocation.transaction
+        # CDP reports transactions which never landed as failed, without a block.
+        dropped = str(transaction.status) == "failed" and not transaction.block_hash
+        if not dropped:
+            self.manager.release(address.network_id, address.address_id, step.nonce)
+            step.done = True
+            return True
+
+        self.manager.release(address.network_id, address.address_id, step.nonce, landed=False)
+        if attempt == MAX_SUBMIT_ATTEMPTS - 1:
+            step.done = True
+            raise RuntimeError(
+                f"Transaction of {step.action} was dropped {MAX_SUBMIT_ATTEMPTS} times"
+            )
+        return False
+
+    def _settle_when_final(self, step: _Step, transaction_id: str, attempt: int) -> None:
+        settled = threading.Lock()
+
+        def on_final(record: TrackedTransaction) -> None:
+            if record.id != transaction_id or not settled.acquire(blocking=False):
+                return
+            transaction_tracker.remove_listener(on_final)
+            try:
+                if not self._settle(step, attempt):
+                    print(f"Resubmitting dropped transaction of {step.action}")
+                    self._submit(step)
+                    self._wait_pipelined(step, track=True, first_attempt=attempt + 1)
+            except Exception as e:
+                print(f"Error resubmitting dropped transaction of {step.action}: {e!s}")
+
+        transaction_tracker.add_listener(on_final)
+        # The transaction may have reached its final status before the listener was added.
+        record = transaction_tracker.get(transaction_id)
+        if record is not None and record.is_final:
+            on_final(record)
@@ -0,0 +1,381 @@
+"""Materialized portfolio snapshots of wallet addresses, refreshed incrementally.
+
+The first load of an address reads the balances of its assets with the balance engine, at a
+known block. Later refreshes only scan the transaction history of the address for blocks since
+its snapshot: ERC20 token transfers are applied to the holdings as deltas, and native balances,
+which also change with gas fees and internal transfers, are read again only when the address
+had transactions. Snapshots are stored in a local SQLite database, with amounts in atomic units,
+so current holdings are answered without any request.
+
+The CDP transaction history is usually indexed within a few seconds of the latest block, so
+refreshes only advance a snapshot up to `HISTORY_INDEXING_MARGIN` blocks before the latest block.
+Transactions in the most recent blocks are applied by a later refresh, once they are indexed.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+
+from cdp import Address, Cdp, SmartContract, Wallet
+from cdp.client.models.token_transfer_type import TokenTransferType
+
+from cdp_agentkit_core.actions.abi_codec import checksum_address
+from cdp_agentkit_core.actions.balance_engine import MAX_BALANCE_WORKERS, fetch_balances
+from cdp_agentkit_core.actions.constants import (
+    ERC20_BALANCE_ABI,
+    MULTICALL3_ABI,
+    MULTICALL3_ADDRESS,
+)
+from cdp_agentkit_core.actions.multicall import ContractRead, multicall_read
+
+DEFAULT_PORTFOLIO_PATH = Path.home() / ".cdp_agentkit" / "portfolio.sqlite3"
+
+# Number of transactions requested per page of the address transaction history.
+HISTORY_PAGE_SIZE = 100
+
+# Number of most recent blocks which the transaction history may not have indexed yet.
+HISTORY_INDEXING_MARGIN = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+    network_id TEXT NOT NULL,
+    address TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    PRIMARY KEY (network_id, address)
+);
+CREATE TABLE IF NOT EXISTS portfolio_holdings (
+    network_id TEXT NOT NULL,
+    address TEXT NOT NULL,
+    asset_id TEXT NOT NULL,
+    contract_address TEXT,
+    decimals INTEGER NOT NULL,
+    amount TEXT NOT NULL,
+    PRIMARY KEY (network_id, address, asset_id)
+);
+"""
+
+
+@dataclass
+class Holding:
+    """An asset held by an address, in atomic units."""
+
+    asset_id: str
+    # The token contract, or None for the native asset.
+    contract_address: str | None
+    decimals: int
+    amount: int
+
+    @property
+    def balance(self) -> Decimal:
+        """The amount held, in whole units of the asset."""
+        return Decimal(self.amount) / Decimal(10) ** self.decimals
+
+
+@dataclass
+class PortfolioSnapshot:
+    """The holdings of an address as of a block."""
+
+    network_id: str
+    address: str
+    block_number: int
+    # Holdings by asset ID.
+    holdings: dict[str, Holding] = field(default_factory=dict)
+
+    def holding_by_contract(self, contract_address: str) -> Holding | None:
+        """Get the holding of a token contract, if the snapshot tracks it."""
+        contract_address = contract_address.lower()
+        for holding in self.holdings.values():
+            if holding.contract_address and holding.contract_address.lower() == contract_address:
+                return holding
+        return None
+
+
+class PortfolioStore:
+    """SQLite store of portfolio snapshots.
+
+    Like the WOW token registry, the database file is only created by the first write.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_PORTFOLIO_PATH):
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def get(self, network_id: str, address: str) -> PortfolioSnapshot | None:
+        """Get the snapshot of an address.
+
+        Args:
+            network_id: The network ID of the address.
+            address: The address.
+
+        Returns:
+            PortfolioSnapshot | None: The snapshot, or None if the address was never loaded.
+
+        """
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return None
+            snapshot_rows = connection.execute(
+                "SELECT block_number FROM portfolio_snapshots WHERE network_id = ? AND address = ?",
+                (network_id, address.lower()),
+            ).fetchall()
+            if not snapshot_rows:
+                return None
+            holding_rows = connection.execute(
+                "SELECT asset_id, contract_address, decimals, amount FROM portfolio_holdings "
+                "WHERE network_id = ? AND address = ? ORDER BY rowid",
+                (network_id, address.lower()),
+            ).fetchall()
+
+        snapshot = PortfolioSnapshot(network_id, address, snapshot_rows[0][0])
+        for asset_id, contract_address, decimals, amount in holding_rows:
+            snapshot.holdings[asset_id] = Holding(asset_id, contract_address, decimals, int(amount))
+        return snapshot
+
+    def save(self, snapshot: PortfolioSnapshot) -> None:
+        """Replace the snapshot of an address, in a single transaction.
+
+        Args:
+            snapshot: The snapshot to save.
+
+        """
+        address = snapshot.address.lower()
+        with self._lock:
+            connection = self._connect(create=True)
+            with connection:
+                connection.execute(
+                    "INSERT INTO portfolio_snapshots (network_id, address, block_number) "
+                    "VALUES (?, ?, ?) ON CONFLICT (network_id, address) DO UPDATE SET "
+                    "block_number = excluded.block_number",
+                    (snapshot.network_id, address, snapshot.block_number),
+                )
+                connection.execute(
+                    "DELETE FROM portfolio_holdings WHERE network_id = ? AND address = ?",
+                    (snapshot.network_id, address),
+                )
+                connection.executemany(
+                    "INSERT INTO portfolio_holdings "
+                    "(network_id, address, asset_id, contract_address, decimals, amount) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            snapshot.network_id,
+                            address,
+                            holding.asset_id,
+                            holding.contract_address,
+                            holding.decimals,
+                            str(holding.amount),
+                        )
+                        for holding in snapshot.holdings.values()
+                    ],
+                )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self, create: bool) -> sqlite3.Connection | None:
+        if self._connection is None:
+            if not create and not self.path.exists():
+                return None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+
+# Process-wide store shared by all actions.
+portfolio_store = PortfolioStore()
+
+
+def load_portfolio(
+    wallet: Wallet, asset_ids: list[str], store: PortfolioStore | None = None
+) -> list[PortfolioSnapshot]:
+    """Load the full snapshot of every address of a wallet, reading all balances.
+
+    Token balances are read in a single batch at the snapshot block, never from the read cache,
+    since later refreshes apply token transfers after that block to them.
+
+    Args:
+        wallet: The wallet whose addresses are loaded.
+        asset_ids: The asset IDs to hold.
+        store: The store to save the snapshots to, defaults to the process-wide store.
+
+    Returns:
+        list[PortfolioSnapshot]: The snapshot of each address.
+
+    Raises:
+        ValueError: If the balance of an asset could not be read.
+
+    """
+    store = store or portfolio_store
+    balances = fetch_balances(wallet, asset_ids, pin_block=True)
+    if balances.errors:
+        raise ValueError(
+            "; ".join(f"{asset_id}: {error}" for asset_id, error in balances.errors.items())
+        )
+
+    snapshots = []
+    for address_id, address_balances in balances.balances.items():
+        snapshot = PortfolioSnapshot(wallet.network_id, address_id, balances.block_number)
+        for asset_id, balance in address_balances.items():
+            asset = balances.assets[asset_id]
+            snapshot.holdings[asset_id] = Holding(
+                asset_id,
+                asset.contract_address,
+                asset.decimals,
+                int(balance * Decimal(10) ** asset.decimals),
+            )
+        store.save(snapshot)
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def refresh_portfolio(
+    network_id: str,
+    address: str,
+    store: PortfolioStore | None = None,
+    to_block: int | None = None,
+) -> PortfolioSnapshot:
+    """Bring the snapshot of an address up to date from its transactions since the snapshot.
+
+    Args:
+        network_id: The network ID of the address.
+        address: The address, which must have been loaded with `load_portfolio`.
+        store: The store of the snapshot, defaults to the process-wide store.
+        to_block: The latest block, defaults to the head of the chain. The snapshot is
+            refreshed up to `HISTORY_INDEXING_MARGIN` blocks before it.
+
+    Returns:
+        PortfolioSnapshot: The refreshed snapshot.
+
+    Raises:
+        ValueError: If the address was never loaded.
+
+    """
+    store = store or portfolio_store
+    snapshot = store.get(network_id, address)
+    if snapshot is None:
+        raise ValueError(f"No portfolio snapshot of {address} on {network_id}")
+
+    if to_block is None:
+        to_block = SmartContract.read(
+            network_id, MULTICALL3_ADDRESS, "getBlockNumber", abi=MULTICALL3_ABI
+        )
+    to_block -= HISTORY_INDEXING_MARGIN
+    if to_block <= snapshot.block_number:
+        return snapshot
+
+    had_transactions = False
+    new_tokens: dict[str, int] = {}
+    for transaction in _list_transactions(network_id, address, snapshot.block_number, to_block):
+        had_transactions = True
+        for transfer in transaction.token_transfers or []:
+            if transfer.token_transfer_type != TokenTransferType.ERC20 or transfer.value is None:
+                continue
+            delta = _transfer_delta(address, transfer)
+            if delta == 0:
+                continue
+            holding = snapshot.holding_by_contract(transfer.contract_address)
+            if holding is not None:
+                holding.amount += delta
+            else:
+                token_address = checksum_address(transfer.contract_address)
+                new_tokens[token_address] = new_tokens.get(token_address, 0) + delta
+
+    if new_tokens:
+        decimals = multicall_read(
+            network_id,
+            [ContractRead(token, "decimals", ERC20_BALANCE_ABI) for token in new_tokens],
+        )
+        for (token, amount), token_decimals in zip(new_tokens.items(), decimals, strict=True):
+            snapshot.holdings[token] = Holding(token, token, int(token_decimals), amount)
+
+    if had_transactions:
+        native_address = Address(network_id, address)
+        for holding in snapshot.holdings.values():
+            if holding.contract_address is None:
+                balance = native_address.balance(holding.asset_id)
+                holding.amount = int(balance * Decimal(10) ** holding.decimals)
+
+    snapshot.block_number = to_block
+    store.save(snapshot)
+    return snapshot
+
+
+def refresh_wallet_portfolio(
+    wallet: Wallet, asset_ids: list[str] | None = None, store: PortfolioStore | None = None
+) -> list[PortfolioSnapshot]:
+    """Get the up to date snapshots of every address of a wallet.
+
+    Addresses which were loaded before, and already hold every requested asset, are refreshed
+    incrementally and concurrently. Otherwise, all addresses are loaded again.
+
+    Args:
+        wallet: The wallet whose addresses are refreshed.
+        asset_ids: Asset IDs which the snapshots must hold, in addition to the ones they hold.
+        store: The store of the snapshots, defaults to the process-wide store.
+
+    Returns:
+        list[PortfolioSnapshot]: The snapshot of each address.
+
+    """
+    store = store or portfolio_store
+    address_ids = [address.address_id for address in wallet.addresses]
+    snapshots = [store.get(wallet.network_id, address_id) for address_id in address_ids]
+
+    held = {asset_id for snapshot in snapshots if snapshot for asset_id in snapshot.holdings}
+    requested = set(asset_ids or [])
+    if any(snapshot is None for snapshot in snapshots) or not requested <= held:
+        return load_portfolio(wallet, sorted(held | requested), store)
+
+    to_block = SmartContract.read(
+        wallet.network_id, MULTICALL3_ADDRESS, "getBlockNumber", abi=MULTICALL3_ABI
+    )
+    with ThreadPoolExecutor(max_workers=min(MAX_BALANCE_WORKERS, len(address_ids))) as executor:
+        return list(
+            executor.map(
+                lambda address_id: refresh_portfolio(
+                    wallet.network_id, address_id, store, to_block
+                ),
+                address_ids,
+            )
+        )
+
+
+def _transfer_delta(address: str, transfer) -> int:
+    delta = 0
+    if transfer.to_address.lower() == address.lower():
+        delta += int(transfer.value)
+    if transfer.from_address.lower() == address.lower():
+        delta -= int(transfer.value)
+    return delta
+
+
+def _list_transactions(network_id: str, address: str, after_block: int, to_block: int) -> Iterator:
+    # The history lists the most recent transactions first, so paging stops at the first
+    # transaction at or before the snapshot block.
+    page = None
+    while True:
+        response = Cdp.api_clients.transaction_history.list_address_transactions(
+            network_id=network_id, address_id=address, limit=HISTORY_PAGE_SIZE, page=page
+        )
+        for model in response.data:
+            if model.block_height is None or model.content is None:
+                continue
+            block_height = int(model.block_height)
+            if block_height <= after_block:
+                return
+            if block_height <= to_block:
+                yield model.content.actual_instance
+        if not response.has_more or not response.next_page:
+            return
+        page = response.next_page
@@ -0,0 +1,94 @@
+from collections.abc import Callable
+
+from cdp import Wallet
+from pydantic import BaseModel, Field
+
+from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.portfolio import (
+    PortfolioSnapshot,
+    load_portfolio,
+    portfolio_store,
+    refresh_wallet_portfolio,
+)
+
+PORTFOLIO_SNAPSHOT_PROMPT = """
+This tool will get the current holdings of all the addresses in the wallet, from a snapshot which is kept up to date incrementally.
+The first call reads the balances of the given assets, and later calls only look at the transactions since the last snapshot, which also discovers ERC20 tokens received since.
+Token transfers in the last few blocks, which may not be indexed yet, are only counted by a later call.
+It takes an optional list of asset IDs to track in addition to the ones already tracked, e.g. `['eth', 'usdc']`, and whether to reload all balances instead of refreshing incrementally.
+Use this tool to answer what the wallet currently holds.
+"""
+
+# Assets tracked when the wallet has no snapshot and none are requested.
+DEFAULT_PORTFOLIO_ASSETS = ["eth"]
+
+
+class PortfolioSnapshotInput(BaseModel):
+    """Input argument schema for portfolio snapshot action."""
+
+    asset_ids: list[str] | None = Field(
+        None,
+        description="Asset IDs to track in addition to the ones already in the snapshot, e.g. `['eth', 'usdc', '0x036CbD53842c5426634e7929541eC2318f3dCF7e']`",
+    )
+    full_refresh: bool = Field(
+        False,
+        description="Whether to reload the balances of all tracked assets instead of refreshing incrementally",
+    )
+
+
+def portfolio_snapshot(
+    wallet: Wallet, asset_ids: list[str] | None = None, full_refresh: bool = False
+) -> str:
+    """Get the up to date holdings of all addresses in the wallet.
+
+    Args:
+        wallet (Wallet): The wallet to get the holdings of.
+        asset_ids (list[str] | None): Asset IDs to track in addition to the ones already in the snapshot.
+        full_refresh (bool): Whether to reload the balances of all tracked assets.
+
+    Returns:
+        str: A message containing the holdings of all addresses in the wallet.
+
+    """
+    try:
+        snapshots = _snapshot_wallet(wallet, asset_ids, full_refresh)
+    except Exception as e:
+        return f"Error getting portfolio snapshot {e!s}"
+
+    return _format_snapshots(wallet, snapshots)
+
+
+def _snapshot_wallet(
+    wallet: Wallet, asset_ids: list[str] | None, full_refresh: bool
+) -> list[PortfolioSnapshot]:
+    held = {
+        asset_id
+        for address in wallet.addresses
+        if (snapshot := portfolio_store.get(wallet.network_id, address.address_id))
+        for asset_id in snapshot.holdings
+    }
+    requested = set(asset_ids or ([] if held else DEFAULT_PORTFOLIO_ASSETS))
+    if full_refresh:
+        return load_portfolio(wallet, sorted(held | requested))
+    return refresh_wallet_portfolio(wallet, sorted(requested))
+
+
+def _format_snapshots(wallet: Wallet, snapshots: list[PortfolioSnapshot]) -> str:
+    lines = [f"Portfolio of wallet {wallet.id}:"]
+    for snapshot in snapshots:
+        lines.append(f"  {snapshot.address} (block {snapshot.block_number}):")
+        holdings = [holding for holding in snapshot.holdings.values() if holding.amount]
+        lines.extend(f"    {holding.asset_id}: {holding.balance}" for holding in holdings)
+        if not holdings:
+            lines.append("    No holdings")
+    return "\n".join(lines)
+
+
+class PortfolioSnapshotAction(CdpAction):
+    """Portfolio snapshot action."""
+
+    name: str = "portfolio_snapshot"
+    description: str = PORTFOLIO_SNAPSHOT_PROMPT
+    args_schema: type[BaseModel] | None = PortfolioSnapshotInput
+    func: Callable[..., str] = portfolio_snapshot
+    read_only: bool = True
@@ -0,0 +1,288 @@
+"""Local catalog of Pyth crypto price feeds, indexed by symbol and ID.
+
+The full list of crypto feeds is downloaded from Hermes once, persisted to a JSON file, and
+downloaded again when it is older than `PYTH_CATALOG_TTL`. Symbol lookups are then served from
+in-memory indexes, and tolerate the spacing, punctuation and spelling slips of transcribed
+speech through fuzzy matching on base symbols and asset names.
+"""
+
+import difflib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from cdp_agentkit_core.actions.pyth.constants import PYTH_CATALOG_TTL, PYTH_HERMES_URL
+from cdp_agentkit_core.actions.pyth.hermes import HERMES_TIMEOUT, hermes_session
+
+DEFAULT_CATALOG_PATH = Path.home() / ".cdp_agentkit" / "pyth_price_feeds.json"
+
+# Minimum similarity, between 0 and 1, of a fuzzy symbol match.
+FUZZY_MATCH_CUTOFF = 0.75
+
+# Number of seconds to keep using a stale catalog after a failed download, before retrying.
+CATALOG_RETRY_DELAY = 60.0
+
+# Quote currency preferred when a base symbol has feeds in several quotes.
+DEFAULT_QUOTE = "USD"
+
+
+@dataclass(frozen=True)
+class PriceFeed:
+    """A Pyth price feed."""
+
+    id: str
+    base: str
+    quote: str
+    # The name of the base asset, e.g. `BITCOIN`, if Hermes describes it.
+    name: str = ""
+
+
+@dataclass(frozen=True)
+class PriceFeedMatch:
+    """The price feed a symbol resolved to, and how closely it matches."""
+
+    feed: PriceFeed
+    # Whether the symbol is the base symbol or asset name of the feed, rather than a fuzzy match.
+    exact_symbol: bool
+    # Whether the feed is quoted in the requested quote symbol.
+    exact_quote: bool
+
+    @property
+    def exact(self) -> bool:
+        """Whether both the symbol and the quote match exactly."""
+        return self.exact_symbol and self.exact_quote
+
+
+class PriceFeedCatalog:
+    """Catalog of Pyth crypto price feeds, persisted to a JSON file."""
+
+    def __init__(self, path: str | Path = DEFAULT_CATALOG_PATH, ttl: float = PYTH_CATALOG_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._fetched_at: float | None = None
+        self._retry_at = 0.0
+        self._by_id: dict[str, PriceFeed] = {}
+        self._by_base: dict[str, list[PriceFeed]] = {}
+        self._by_quote: dict[str, list[PriceFeed]] = {}
+        self._by_name: dict[str, list[PriceFeed]] = {}
+        self._fuzzy_keys: list[str] = []
+
+    def get(self, feed_id: str) -> PriceFeed | None:
+        """Look up a feed by ID.
+
+        Args:
+            feed_id: The price feed ID, with or without the 0x prefix.
+
+        Returns:
+            PriceFeed | None: The feed, or None if it is not in the catalog.
+
+        """
+        self.load()
+        return self._by_id.get(_normalize_id(feed_id))
+
+    def feeds_by_base(self, symbol: str) -> list[PriceFeed]:
+        """List the feeds of a base symbol, e.g. `BTC`.
+
+        Args:
+            symbol: The base symbol.
+
+        Returns:
+            list[PriceFeed]: The feeds, in catalog order.
+
+        """
+        self.load()
+        return list(self._by_base.get(_normalize_symbol(symbol), []))
+
+    def feeds_by_quote(self, symbol: str) -> list[PriceFeed]:
+        """List the feeds quoted in a symbol, e.g. `USD`.
+
+        Args:
+            symbol: The quote symbol.
+
+        Returns:
+            list[PriceFeed]: The feeds, in catalog order.
+
+        """
+        self.load()
+        return list(self._by_quote.get(_normalize_symbol(symbol), []))
+
+    def resolve(self, symbol: str, quote: str = DEFAULT_QUOTE) -> PriceFeed | None:
+        """Resolve a token symbol or asset name to its price feed.
+
+        Exact base symbols are matched first, then asset names, then the closest base symbol
+        or asset name. Use `match` to tell whether the feed matches exactly.
+
+        Args:
+            symbol: The token symbol or asset name, e.g. `BTC`, `eth` or `bitcoin`.
+            quote: The preferred quote symbol.
+
+        Returns:
+            PriceFeed | None: The feed, or None if nothing matches.
+
+        """
+        match = self.match(symbol, quote)
+        return match.feed if match else None
+
+    def match(self, symbol: str, quote: str = DEFAULT_QUOTE) -> PriceFeedMatch | None:
+        """Resolve a token symbol or asset name to its price feed, with how closely it matches.
+
+        Args:
+            symbol: The token symbol or asset name, e.g. `BTC`, `eth` or `bitcoin`.
+            quote: The preferred quote symbol. Feeds in another quote are only returned when
+                the base has no feed in it.
+
+        Returns:
+            PriceFeedMatch | None: The match, or None if nothing matches.
+
+        """
+        self.load()
+        key = _normalize_symbol(symbol)
+        if not key:
+            return None
+
+        feeds = self._by_base.get(key) or self._by_name.get(key)
+        exact_symbol = bool(feeds)
+        if not feeds:
+            matches = difflib.get_close_matches(
+                key, self._fuzzy_keys, n=1, cutoff=FUZZY_MATCH_CUTOFF
+            )
+            if not matches:
+                return None
+            feeds = self._by_base.get(matches[0]) or self._by_name[matches[0]]
+
+        quote = _normalize_symbol(quote)
+        feed = next((feed for feed in feeds if feed.quote == quote), feeds[0])
+        return PriceFeedMatch(feed, exact_symbol, feed.quote == quote)
+
+    def load(self, force: bool = False) -> None:
+        """Make sure the catalog is loaded and fresh, reading or downloading it as needed.
+
+        If the download fails, a stale catalog is still used.
+
+        Args:
+            force: Whether to download the catalog even if it is fresh.
+
+        Raises:
+            requests.RequestException: If the catalog could not be downloaded and there is
+                no stale catalog to fall back to.
+
+        """
+        with self._lock:
+            if not force and self._is_fresh():
+                return
+            if not force:
+                # Another process may have refreshed the file.
+                self._read()
+                if self._is_fresh():
+                    return
+
+            try:
+                feeds = _download_feeds()
+            except Exception as e:
+                if self._fetched_at is None:
+                    raise
+                print(f"Error refreshing the Pyth price feed catalog, using the stale one: {e!s}")
+                self._retry_at = time.time() + CATALOG_RETRY_DELAY
+                return
+
+            self._index(feeds, time.time())
+            try:
+                self._write(feeds)
+            except OSError as e:
+                print(f"Error saving the Pyth price feed catalog to {self.path}: {e!s}")
+
+    def clear(self) -> None:
+        """Forget the loaded catalog, so that the next lookup reads it again."""
+        with self._lock:
+            self._retry_at = 0.0
+            self._index([], None)
+
+    def _is_fresh(self) -> bool:
+        if self._fetched_at is None:
+            return False
+        now = time.time()
+        return now - self._fetched_at < self.ttl or now < self._retry_at
+
+    def _read(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            feeds = [PriceFeed(**feed) for feed in data["feeds"]]
+            self._index(feeds, data["fetched_at"])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable Pyth price feed catalog {self.path}: {e!s}")
+
+    def _write(self, feeds: list[PriceFeed]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write a temporary file first, so that concurrent processes never read a partial file.
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(
+                {"fetched_at": self._fetched_at, "feeds": [asdict(feed) for feed in feeds]}, f
+            )
+        os.replace(temporary_path, self.path)
+
+    def _index(self, feeds: list[PriceFeed], fetched_at: float | None) -> None:
+        by_id, by_base, by_quote, by_name = {}, {}, {}, {}
+        for feed in feeds:
+            by_id[feed.id] = feed
+            by_base.setdefault(feed.base, []).append(feed)
+            by_quote.setdefault(feed.quote, []).append(feed)
+            if feed.name:
+                by_name.setdefault(feed.name, []).append(feed)
+        self._by_id, self._by_base, self._by_quote, self._by_name = (
+            by_id,
+            by_base,
+            by_quote,
+            by_name,
+        )
+        self._fuzzy_keys = list(by_base) + [name for name in by_name if name not in by_base]
+        self._fetched_at = fetched_at
+
+
+# Process-wide catalog shared by all actions.
+price_feed_catalog = PriceFeedCatalog()
+
+
+def _download_feeds() -> list[PriceFeed]:
+    response = hermes_session().get(
+        f"{PYTH_HERMES_URL}/v2/price_feeds",
+        params={"asset_type": "crypto"},
+        timeout=HERMES_TIMEOUT,
+    )
+    response.raise_for_status()
+
+    feeds = []
+    for item in response.json():
+        attributes = item.get("attributes", {})
+        if "base" not in attributes:
+            continue
+        # Descriptions read like `BITCOIN / US DOLLAR`.
+        name = attributes.get("description", "").partition("/")[0]
+        feeds.append(
+            PriceFeed(
+                id=_normalize_id(item["id"]),
+                base=_normalize_symbol(attributes["base"]),
+                quote=_normalize_symbol(
+                    attributes.get("quote_currency") or attributes.get("quote", "")
+                ),
+                name=_normalize_symbol(name),
+            )
+        )
+    return feeds
+
+
+def _normalize_id(feed_id: str) -> str:
+    return feed_id.lower().removeprefix("0x")
+
+
+def _normalize_symbol(symbol: str) -> str:
+    # Transcribed tickers come with spaces, dots and dashes, e.g. `E.T.H.` or `bit coin`.
+    return re.sub(r"[^A-Z0-9]", "", symbol.upper())
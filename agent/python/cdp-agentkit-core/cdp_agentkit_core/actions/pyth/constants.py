@@ -0,0 +1,16 @@
+PYTH_HERMES_URL = "https://hermes.pyth.network"
+
+# Default timeout, in seconds, for a request to Hermes from async code.
+PYTH_REQUEST_TIMEOUT = 10.0
+
+# Timeout, in seconds, for connecting to Hermes.
+PYTH_CONNECT_TIMEOUT = 3.05
+
+# Maximum number of keep-alive connections to Hermes pooled by the shared session.
+PYTH_POOL_SIZE = 10
+
+# Number of seconds after which the local catalog of price feeds is downloaded again.
+PYTH_CATALOG_TTL = 24 * 60 * 60.0
+
+# Maximum age, in seconds, of a streamed price which is served instead of a REST request.
+PYTH_STREAM_MAX_AGE = 5.0
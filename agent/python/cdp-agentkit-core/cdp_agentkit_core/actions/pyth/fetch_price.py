@@ -1,9 +1,12 @@
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 
-import requests
+import aiohttp
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.pyth.constants import PYTH_HERMES_URL, PYTH_REQUEST_TIMEOUT
+from cdp_agentkit_core.actions.pyth.hermes import HERMES_TIMEOUT, format_price, hermes_session
+from cdp_agentkit_core.actions.pyth.stream import price_stream
 
 PYTH_FETCH_PRICE_PROMPT = """
 Fetch the price of a given price feed from Pyth. First fetch the price feed ID forusing the pyth_fetch_price_feed_id action.
@@ -26,29 +29,61 @@ class PythFetchPriceInput(BaseModel):
 
 
 def pyth_fetch_price(price_feed_id: str) -> str:
-    """Fetch the price of a given price feed from Pyth."""
-    url = f"https://hermes.pyth.network/v2/updates/price/latest?ids[]={price_feed_id}"
-    response = requests.get(url)
+    """Fetch the price of a given price feed from Pyth.
+
+    Once Hermes returned a price for the feed, it is subscribed to the price stream, and served
+    from it while its streamed price is fresh.
+    """
+    streamed_price = _streamed_price(price_feed_id)
+    if streamed_price is not None:
+        return streamed_price
+
+    url = f"{PYTH_HERMES_URL}/v2/updates/price/latest"
+    response = hermes_session().get(url, params={"ids[]": price_feed_id}, timeout=HERMES_TIMEOUT)
     response.raise_for_status()
-    data = response.json()
+    return _format_price(price_feed_id, response.json())
+
+
+async def pyth_fetch_price_async(price_feed_id: str, timeout: float = PYTH_REQUEST_TIMEOUT) -> str:
+    """Fetch the price of a given price feed from Pyth, without blocking the event loop.
+
+    Args:
+        price_feed_id (str): The price feed ID to fetch the price for.
+        timeout (float): The maximum number of seconds to wait for the response.
+
+    Returns:
+        str: The price, with two decimals if the feed has a negative exponent.
+
+    """
+    streamed_price = _streamed_price(price_feed_id)
+    if streamed_price is not None:
+        return streamed_price
+
+    url = f"{PYTH_HERMES_URL}/v2/updates/price/latest"
+    async with (
+        aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session,
+        session.get(url, params={"ids[]": price_feed_id}) as response,
+    ):
+        response.raise_for_status()
+        data = await response.json()
+    return _format_price(price_feed_id, data)
+
+
+def _streamed_price(price_feed_id: str) -> str | None:
+    update = price_stream.fresh(price_feed_id)
+    if update is None:
+        return None
+    return format_price({"price": update.price, "expo": update.expo})
+
+
+def _format_price(price_feed_id: str, data: dict) -> str:
     parsed_data = data["parsed"]
 
     if not parsed_data:
         raise ValueError(f"No price data found for {price_feed_id}")
 
-    price_info = parsed_data[0]["price"]
-    price = int(price_info["price"])
-    exponent = price_info["expo"]
-
-    if exponent < 0:
-        adjusted_price = price * 100
-        divisor = 10**-exponent
-        scaled_price = adjusted_price // divisor
-        price_str = f"{scaled_price // 100}.{scaled_price % 100:02}"
-        return price_str if not price_str.startswith(".") else f"0{price_str}"
-
-    scaled_price = price // (10**exponent)
-    return str(scaled_price)
+    price_stream.track([update["id"] for update in parsed_data if "id" in update])
+    return format_price(parsed_data[0]["price"])
 
 
 class PythFetchPriceAction(CdpAction):
@@ -58,3 +93,5 @@ class PythFetchPriceAction(CdpAction):
     description: str = PYTH_FETCH_PRICE_PROMPT
     args_schema: type[BaseModel] | None = PythFetchPriceInput
     func: Callable[..., str] = pyth_fetch_price
+    coroutine: Callable[..., Awaitable[str]] | None = pyth_fetch_price_async
+    read_only: bool = True
@@ -1,12 +1,14 @@
 from collections.abc import Callable
 
-import requests
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.pyth.catalog import DEFAULT_QUOTE, price_feed_catalog
 
 PYTH_FETCH_PRICE_FEED_ID_PROMPT = """
 Fetch the price feed ID for a given token symbol (e.g. BTC, ETH, etc.) from Pyth.
+Asset names (e.g. bitcoin) and misspelled or transcribed symbols are matched to the closest feed.
+When no USD feed matches the symbol exactly, the closest feed is returned with its base and quote, and must be confirmed before its price is used.
 """
 
 
@@ -17,22 +19,35 @@ class PythFetchPriceFeedIDInput(BaseModel):
 
 
 def pyth_fetch_price_feed_id(token_symbol: str) -> str:
-    """Fetch the price feed ID for a given token symbol from Pyth."""
-    url = f"https://hermes.pyth.network/v2/price_feeds?query={token_symbol}&asset_type=crypto"
-    response = requests.get(url)
-    response.raise_for_status()
-    data = response.json()
+    """Fetch the price feed ID for a given token symbol from Pyth.
 
-    if not data:
-        raise ValueError(f"No price feed found for {token_symbol}")
+    The symbol is resolved in the local catalog of Pyth price feeds, which is downloaded on
+    first use and then refreshed daily. Feeds quoted in USD are preferred.
+
+    Args:
+        token_symbol (str): The token symbol or asset name, e.g. `BTC` or `bitcoin`.
+
+    Returns:
+        str: The price feed ID, or, for a fuzzy match or a feed in another quote, a message
+            naming the base and quote of the feed along with its ID.
 
-    filtered_data = [
-        item for item in data if item["attributes"]["base"].lower() == token_symbol.lower()
-    ]
-    if not filtered_data:
+    """
+    match = price_feed_catalog.match(token_symbol)
+    if match is None:
         raise ValueError(f"No price feed found for {token_symbol}")
+    feed = match.feed
+    if match.exact:
+        return feed.id
 
-    return filtered_data[0]["id"]
+    reasons = []
+    if not match.exact_symbol:
+        reasons.append(f"no price feed matches {token_symbol} exactly")
+    if not match.exact_quote:
+        reasons.append(f"{feed.base} has no {DEFAULT_QUOTE} price feed")
+    return (
+        f"The closest price feed is {feed.base}/{feed.quote}, with ID {feed.id}, as "
+        f"{' and '.join(reasons)}. Confirm it is the intended asset and quote before using it."
+    )
 
 
 class PythFetchPriceFeedIDAction(CdpAction):
@@ -42,3 +57,4 @@ class PythFetchPriceFeedIDAction(CdpAction):
     description: str = PYTH_FETCH_PRICE_FEED_ID_PROMPT
     args_schema: type[BaseModel] | None = PythFetchPriceFeedIDInput
     func: Callable[..., str] = pyth_fetch_price_feed_id
+    read_only: bool = True
@@ -0,0 +1,121 @@
+from collections.abc import Awaitable, Callable
+
+import aiohttp
+from pydantic import BaseModel, Field
+
+from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.pyth.constants import PYTH_HERMES_URL, PYTH_REQUEST_TIMEOUT
+from cdp_agentkit_core.actions.pyth.hermes import HERMES_TIMEOUT, format_price, hermes_session
+from cdp_agentkit_core.actions.pyth.stream import price_stream
+
+PYTH_FETCH_PRICES_PROMPT = """
+Fetch the prices of several Pyth price feeds at once, in a single request. First fetch the price feed IDs using the pyth_fetch_price_feed_id action.
+
+Inputs:
+- A list of Pyth price feed IDs
+
+Important notes:
+- Use this action instead of calling pyth_fetch_price once per feed, e.g. to value a portfolio.
+- Do not assume that a random ID is a Pyth price feed ID. If you are confused, ask a clarifying question.
+- This action only fetches price inputs from Pyth price feeds. No other source.
+"""
+
+
+class PythFetchPricesInput(BaseModel):
+    """Input schema for fetching several Pyth prices."""
+
+    price_feed_ids: list[str] = Field(
+        ..., min_length=1, description="The price feed IDs to fetch the prices for."
+    )
+
+
+def pyth_fetch_prices(price_feed_ids: list[str]) -> str:
+    """Fetch the prices of several price feeds from Pyth in a single request.
+
+    Feeds with a fresh streamed price are served from it, and only the others are requested.
+    Feeds which Hermes returned prices for are then subscribed to the price stream.
+
+    Args:
+        price_feed_ids (list[str]): The price feed IDs to fetch the prices for.
+
+    Returns:
+        str: The price of each feed, one per line.
+
+    """
+    price_feed_ids = list(dict.fromkeys(price_feed_ids))
+    prices = _streamed_prices(price_feed_ids)
+    requested_ids = [feed_id for feed_id in price_feed_ids if _normalize_id(feed_id) not in prices]
+    if requested_ids:
+        url = f"{PYTH_HERMES_URL}/v2/updates/price/latest"
+        response = hermes_session().get(
+            url, params=[("ids[]", feed_id) for feed_id in requested_ids], timeout=HERMES_TIMEOUT
+        )
+        response.raise_for_status()
+        prices.update(_parse_prices(response.json()))
+    return _format_prices(price_feed_ids, prices)
+
+
+async def pyth_fetch_prices_async(
+    price_feed_ids: list[str], timeout: float = PYTH_REQUEST_TIMEOUT
+) -> str:
+    """Fetch the prices of several price feeds from Pyth in a single request, without blocking the event loop.
+
+    Args:
+        price_feed_ids (list[str]): The price feed IDs to fetch the prices for.
+        timeout (float): The maximum number of seconds to wait for the response.
+
+    Returns:
+        str: The price of each feed, one per line.
+
+    """
+    price_feed_ids = list(dict.fromkeys(price_feed_ids))
+    prices = _streamed_prices(price_feed_ids)
+    requested_ids = [feed_id for feed_id in price_feed_ids if _normalize_id(feed_id) not in prices]
+    if requested_ids:
+        url = f"{PYTH_HERMES_URL}/v2/updates/price/latest"
+        async with (
+            aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session,
+            session.get(url, params=[("ids[]", feed_id) for feed_id in requested_ids]) as response,
+        ):
+            response.raise_for_status()
+            prices.update(_parse_prices(await response.json()))
+    return _format_prices(price_feed_ids, prices)
+
+
+def _streamed_prices(price_feed_ids: list[str]) -> dict[str, str]:
+    return {
+        feed_id: format_price({"price": update.price, "expo": update.expo})
+        for feed_id, update in price_stream.fresh_prices(price_feed_ids).items()
+    }
+
+
+def _parse_prices(data: dict) -> dict[str, str]:
+    # Hermes returns feed IDs in lowercase, without the 0x prefix.
+    prices = {
+        _normalize_id(update["id"]): format_price(update["price"])
+        for update in data.get("parsed") or []
+    }
+    price_stream.track(list(prices))
+    return prices
+
+
+def _format_prices(price_feed_ids: list[str], prices: dict[str, str]) -> str:
+    return "\n".join(
+        f"{feed_id}: {prices.get(_normalize_id(feed_id), 'No price data found')}"
+        for feed_id in price_feed_ids
+    )
+
+
+def _normalize_id(feed_id: str) -> str:
+    return feed_id.lower().removeprefix("0x")
+
+
+class PythFetchPricesAction(CdpAction):
+    """Fetch several Pyth prices action."""
+
+    name: str = "pyth_fetch_prices"
+    description: str = PYTH_FETCH_PRICES_PROMPT
+    args_schema: type[BaseModel] | None = PythFetchPricesInput
+    func: Callable[..., str] = pyth_fetch_prices
+    coroutine: Callable[..., Awaitable[str]] | None = pyth_fetch_prices_async
+    read_only: bool = True
@@ -0,0 +1,84 @@
+"""Shared HTTP session and price formatting for the Pyth Hermes API.
+
+Synchronous requests to Hermes go through a single keep-alive `requests.Session`, so that
+repeated price lookups reuse pooled connections instead of opening a new one each time.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cdp_agentkit_core.actions.pyth.constants import (
+    PYTH_CONNECT_TIMEOUT,
+    PYTH_POOL_SIZE,
+    PYTH_REQUEST_TIMEOUT,
+)
+
+# Timeouts, in seconds, for connecting to Hermes and for reading its response.
+HERMES_TIMEOUT = (PYTH_CONNECT_TIMEOUT, PYTH_REQUEST_TIMEOUT)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def hermes_session() -> requests.Session:
+    """Get the process-wide session for requests to Hermes, creating it on first use.
+
+    The session keeps up to `PYTH_POOL_SIZE` connections alive, and retries idempotent
+    requests which fail to connect or are rate limited.
+
+    Returns:
+        requests.Session: The shared session.
+
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retries = Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=("GET",),
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=PYTH_POOL_SIZE, max_retries=retries
+            )
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def close_hermes_session() -> None:
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def format_price(price_info: dict) -> str:
+    """Format the price of a Hermes price update.
+
+    Args:
+        price_info: The `price` object of a parsed price update, with `price` and `expo`.
+
+    Returns:
+        str: The price, with two decimals if the feed has a negative exponent.
+
+    """
+    price = int(price_info["price"])
+    exponent = price_info["expo"]
+
+    if exponent < 0:
+        adjusted_price = price * 100
+        divisor = 10**-exponent
+        scaled_price = adjusted_price // divisor
+        price_str = f"{scaled_price // 100}.{scaled_price % 100:02}"
+        return price_str if not price_str.startswith(".") else f"0{price_str}"
+
+    scaled_price = price // (10**exponent)
+    return str(scaled_price)
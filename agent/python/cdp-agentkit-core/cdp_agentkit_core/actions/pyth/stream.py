@@ -0,0 +1,319 @@
+"""Live cache of Pyth prices, fed by the Hermes server-sent events stream.
+
+A background thread subscribes to `/v2/updates/price/stream` for a set of feeds and keeps the
+latest price update of each in memory. The connection is reopened with exponential backoff
+when it drops or goes quiet, and every update carries its publish time, so readers can tell a
+fresh price from a stale one and fall back to a REST request. The Pyth price actions subscribe
+to each feed Hermes returned a price for, up to `MAX_AUTO_SUBSCRIBED_FEEDS`, so that repeated
+requests for a feed are served from the stream. Unknown feed IDs are ignored by the stream
+rather than failing it for every feed.
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+
+from cdp_agentkit_core.actions.pyth.constants import (
+    PYTH_CONNECT_TIMEOUT,
+    PYTH_HERMES_URL,
+    PYTH_REQUEST_TIMEOUT,
+    PYTH_STREAM_MAX_AGE,
+)
+
+# Delays, in seconds, before reconnecting after the stream drops, doubling up to the maximum.
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+# Maximum number of feeds subscribed to on demand, when prices of unsubscribed feeds are requested.
+MAX_AUTO_SUBSCRIBED_FEEDS = 50
+
+
+@dataclass(frozen=True)
+class PriceUpdate:
+    """The latest price of a Pyth price feed."""
+
+    feed_id: str
+    price: int
+    conf: int
+    expo: int
+    # Unix time, in seconds, at which the price was published.
+    publish_time: int
+
+    def age(self) -> float:
+        """Get the number of seconds since the price was published."""
+        return time.time() - self.publish_time
+
+
+class PriceStream:
+    """Subscriber to the Hermes price stream, holding the latest update of each feed."""
+
+    def __init__(
+        self,
+        max_age: float = PYTH_STREAM_MAX_AGE,
+        reconnect_delay: float = RECONNECT_DELAY,
+        max_reconnect_delay: float = MAX_RECONNECT_DELAY,
+        auto_subscribe: bool = True,
+        max_auto_subscribed_feeds: int = MAX_AUTO_SUBSCRIBED_FEEDS,
+    ):
+        self.max_age = max_age
+        self.auto_subscribe = auto_subscribe
+        self.max_auto_subscribed_feeds = max_auto_subscribed_feeds
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self._feed_ids: set[str] = set()
+        self._prices: dict[str, PriceUpdate] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._changed = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._response: requests.Response | None = None
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        """Whether the stream is currently connected."""
+        return self._connected
+
+    @property
+    def feed_ids(self) -> set[str]:
+        """The IDs of the subscribed feeds."""
+        with self._lock:
+            return set(self._feed_ids)
+
+    def subscribe(self, feed_ids: list[str]) -> None:
+        """Subscribe to feeds, starting the stream if it is not running.
+
+        Args:
+            feed_ids: The price feed IDs to subscribe to.
+
+        """
+        new_ids = {_normalize_id(feed_id) for feed_id in feed_ids}
+        with self._lock:
+            if new_ids <= self._feed_ids:
+                return
+            self._feed_ids |= new_ids
+        self._reconnect()
+        self.start()
+
+    def unsubscribe(self, feed_ids: list[str]) -> None:
+        """Unsubscribe from feeds, and forget their prices.
+
+        Args:
+            feed_ids: The price feed IDs to unsubscribe from.
+
+        """
+        removed_ids = {_normalize_id(feed_id) for feed_id in feed_ids}
+        with self._lock:
+            self._feed_ids -= removed_ids
+            for feed_id in removed_ids:
+                self._prices.pop(feed_id, None)
+        self._reconnect()
+
+    def get(self, feed_id: str) -> PriceUpdate | None:
+        """Get the latest price of a feed, however old it is.
+
+        Args:
+            feed_id: The price feed ID, with or without the 0x prefix.
+
+        Returns:
+            PriceUpdate | None: The latest price, or None if none was received.
+
+        """
+        with self._lock:
+            return self._prices.get(_normalize_id(feed_id))
+
+    def fresh(self, feed_id: str, max_age: float | None = None) -> PriceUpdate | None:
+        """Get the latest price of a feed, if it was published recently.
+
+        Args:
+            feed_id: The price feed ID, with or without the 0x prefix.
+            max_age: The maximum age of the price in seconds, defaults to the stream's maximum.
+
+        Returns:
+            PriceUpdate | None: The latest price, or None if none was received or it is stale.
+
+        """
+        update = self.get(feed_id)
+        if update is None or update.age() > (self.max_age if max_age is None else max_age):
+            return None
+        return update
+
+    def fresh_prices(self, feed_ids: list[str]) -> dict[str, PriceUpdate]:
+        """Get the fresh prices of several feeds.
+
+        Args:
+            feed_ids: The price feed IDs, with or without the 0x prefix.
+
+        Returns:
+            dict[str, PriceUpdate]: The fresh prices, by feed ID without the 0x prefix.
+
+        """
+        updates = {}
+        for feed_id in feed_ids:
+            update = self.fresh(feed_id)
+            if update is not None:
+                updates[update.feed_id] = update
+        return updates
+
+    def track(self, feed_ids: list[str]) -> None:
+        """Subscribe to feeds which Hermes returned prices for, if they are not subscribed yet.
+
+        Feeds are only subscribed to when `auto_subscribe` is set, and while fewer than
+        `max_auto_subscribed_feeds` are subscribed. Only pass IDs of feeds Hermes knows, as
+        taken from its responses, since the IDs given by callers may not exist.
+
+        Args:
+            feed_ids: The price feed IDs, with or without the 0x prefix.
+
+        """
+        if not self.auto_subscribe:
+            return
+        subscribed = self.feed_ids
+        unsubscribed = [
+            feed_id
+            for feed_id in dict.fromkeys(map(_normalize_id, feed_ids))
+            if feed_id not in subscribed
+        ]
+        slots = max(0, self.max_auto_subscribed_feeds - len(subscribed))
+        if unsubscribed[:slots]:
+            self.subscribe(unsubscribed[:slots])
+
+    def start(self) -> None:
+        """Start the background subscriber thread, if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pyth-price-stream", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the background subscriber thread.
+
+        Args:
+            timeout: The maximum number of seconds to wait for the thread to exit.
+
+        """
+        self._stop.set()
+        self._reconnect()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def clear(self) -> None:
+        """Stop the stream, and forget the subscriptions and prices."""
+        self.stop()
+        with self._lock:
+            self._feed_ids.clear()
+            self._prices.clear()
+            self._thread = None
+            self.reconnects = 0
+
+    def _reconnect(self) -> None:
+        # Closing the response makes the subscriber thread read the subscriptions again.
+        self._changed.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+    def _run(self) -> None:
+        session = requests.Session()
+        delay = self.reconnect_delay
+        try:
+            while not self._stop.is_set():
+                self._changed.clear()
+                feed_ids = sorted(self.feed_ids)
+                if not feed_ids:
+                    self._changed.wait(self.max_reconnect_delay)
+                    continue
+
+                try:
+                    if self._listen(session, feed_ids):
+                        delay = self.reconnect_delay
+                except Exception as e:
+                    if not self._stop.is_set() and not self._changed.is_set():
+                        print(f"Pyth price stream disconnected: {e!s}")
+                finally:
+                    self._connected = False
+                    self._response = None
+
+                if self._stop.is_set():
+                    return
+                if not self._changed.is_set():
+                    self.reconnects += 1
+                    self._stop.wait(delay)
+                    delay = min(delay * 2, self.max_reconnect_delay)
+        finally:
+            session.close()
+
+    def _listen(self, session: requests.Session, feed_ids: list[str]) -> bool:
+        # Returns whether any update was received, which resets the reconnect backoff.
+        received = False
+        with session.get(
+            f"{PYTH_HERMES_URL}/v2/updates/price/stream",
+            # Hermes rejects the whole stream when any feed ID is unknown, unless told to ignore it.
+            params=[("ids[]", feed_id) for feed_id in feed_ids]
+            + [("parsed", "true"), ("ignore_invalid_price_ids", "true")],
+            stream=True,
+            # The read timeout also detects a stream which stopped sending updates.
+            timeout=(PYTH_CONNECT_TIMEOUT, PYTH_REQUEST_TIMEOUT),
+        ) as response:
+            self._response = response
+            if self._changed.is_set() or self._stop.is_set():
+                return received
+            response.raise_for_status()
+            self._connected = True
+
+            data_lines: list[str] = []
+            # Read chunks as they arrive rather than in fixed sizes, which would hold events back.
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                # Hermes sends updates continuously, so changes are picked up between them.
+                if self._changed.is_set() or self._stop.is_set():
+                    break
+                if line:
+                    if line.startswith("data:"):
+                        data_lines.append(line[5:].lstrip())
+                    continue
+                if data_lines:
+                    self._handle_event("\n".join(data_lines))
+                    data_lines = []
+                    received = True
+        return received
+
+    def _handle_event(self, data: str) -> None:
+        try:
+            updates = [_parse_update(update) for update in json.loads(data).get("parsed") or []]
+        except Exception as e:
+            print(f"Skipping malformed Pyth price stream event: {e!s}")
+            return
+
+        with self._lock:
+            for update in updates:
+                if update.feed_id not in self._feed_ids:
+                    continue
+                previous = self._prices.get(update.feed_id)
+                if previous is None or update.publish_time >= previous.publish_time:
+                    self._prices[update.feed_id] = update
+
+
+# Process-wide price stream used by the Pyth actions.
+price_stream = PriceStream()
+
+
+def _parse_update(update: dict) -> PriceUpdate:
+    price = update["price"]
+    return PriceUpdate(
+        feed_id=_normalize_id(update["id"]),
+        price=int(price["price"]),
+        conf=int(price["conf"]),
+        expo=int(price["expo"]),
+        publish_time=int(price["publish_time"]),
+    )
+
+
+def _normalize_id(feed_id: str) -> str:
+    return feed_id.lower().removeprefix("0x")
@@ -0,0 +1,302 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from cdp import SmartContract
+
+from cdp_agentkit_core.actions.constants import ERC20_BALANCE_ABI
+from cdp_agentkit_core.actions.snapshot import current_snapshot
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_V3_ABI
+
+
+class Mutability(Enum):
+    """How the result of a contract read may change over time."""
+
+    IMMUTABLE = "immutable"
+    MONOTONIC = "monotonic"
+    VOLATILE = "volatile"
+
+
+@dataclass
+class CachePolicy:
+    """Caching policy for a contract method.
+
+    Immutable results are cached until evicted. Monotonic results are cached like immutable
+    ones once `is_final` returns True for the value, and like volatile ones before that.
+    Volatile results expire after the cache's volatile TTL.
+    """
+
+    mutability: Mutability
+    is_final: Callable[[Any], bool] | None = None
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for a mutability class."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+# Caching policies of the contracts they were designed for, keyed by method. A method name only
+# tells what a read returns for the contract it was designed for, e.g. `fee` is fixed on a
+# Uniswap v3 pool but not on other contracts, so each set applies to reads made with its ABI.
+CACHE_POLICIES: dict[str, dict[str, CachePolicy]] = {
+    "uniswap_v3_pool": {
+        "token0": CachePolicy(Mutability.IMMUTABLE),
+        "token1": CachePolicy(Mutability.IMMUTABLE),
+        "fee": CachePolicy(Mutability.IMMUTABLE),
+        "tickSpacing": CachePolicy(Mutability.IMMUTABLE),
+        "slot0": CachePolicy(Mutability.VOLATILE),
+        "liquidity": CachePolicy(Mutability.VOLATILE),
+    },
+    "wow_token": {
+        "decimals": CachePolicy(Mutability.IMMUTABLE),
+        "poolAddress": CachePolicy(Mutability.IMMUTABLE),
+        "bondingCurve": CachePolicy(Mutability.IMMUTABLE),
+        # A WOW token never returns to the bonding curve once it has graduated.
+        "marketType": CachePolicy(Mutability.MONOTONIC, is_final=lambda value: value == 1),
+        "balanceOf": CachePolicy(Mutability.VOLATILE),
+        "totalSupply": CachePolicy(Mutability.VOLATILE),
+    },
+    "erc20_token": {
+        "decimals": CachePolicy(Mutability.IMMUTABLE),
+        "balanceOf": CachePolicy(Mutability.VOLATILE),
+    },
+}
+
+# The ABIs of the contracts that each set of caching policies was designed for.
+CONTRACT_ABIS: dict[str, list[dict]] = {
+    "uniswap_v3_pool": UNISWAP_V3_ABI,
+    "wow_token": WOW_ABI,
+    "erc20_token": ERC20_BALANCE_ABI,
+}
+
+_VOLATILE_POLICY = CachePolicy(Mutability.VOLATILE)
+
+
+def cache_policy(method: str, abi: list[dict] | None = None) -> CachePolicy | None:
+    """Get the caching policy of a contract read.
+
+    Reads made with the ABI of a contract in `CACHE_POLICIES` follow that contract's policies.
+    Reads of any other contract are volatile if their method is known, and never cached
+    otherwise.
+
+    Args:
+        method: The contract method.
+        abi: The ABI the read is made with.
+
+    Returns:
+        CachePolicy | None: The policy, or None if the read is never cached.
+
+    """
+    for contract, contract_abi in CONTRACT_ABIS.items():
+        if abi is contract_abi:
+            return CACHE_POLICIES[contract].get(method)
+    if any(method in policies for policies in CACHE_POLICIES.values()):
+        return _VOLATILE_POLICY
+    return None
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float | None
+    mutability: Mutability
+
+
+class ReadCache:
+    """A mutability-aware cache for `SmartContract.read` results.
+
+    Entries are keyed by (network, contract address, method, args) and bounded by an LRU limit.
+    """
+
+    def __init__(self, volatile_ttl: float = 2.0, max_entries: int = 4096):
+        self.volatile_ttl = volatile_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._stats = {mutability: CacheStats() for mutability in Mutability}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        network_id: str,
+        contract_address: str,
+        method: str,
+        args: dict | None = None,
+        abi: list[dict] | None = None,
+    ) -> tuple[bool, Any]:
+        """Look up a cached read result.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The address of the contract.
+            method: The contract method.
+            args: The method arguments.
+            abi: The ABI the read is made with, which scopes its caching policy.
+
+        Returns:
+            tuple[bool, Any]: Whether the read was cached, and the cached value if so.
+
+        """
+        policy = cache_policy(method, abi)
+        if policy is None:
+            return False, None
+
+        # Volatile entries may predate the block that an active read snapshot is pinned to.
+        volatile_allowed = current_snapshot(network_id) is None
+
+        key = _cache_key(network_id, contract_address, method, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            expired = entry is not None and (
+                entry.expires_at is not None and entry.expires_at <= time.monotonic()
+            )
+            if entry is not None and not expired and (entry.expires_at is None or volatile_allowed):
+                self._entries.move_to_end(key)
+                self._stats[entry.mutability].hits += 1
+                return True, entry.value
+
+            if expired:
+                del self._entries[key]
+            self._stats[policy.mutability].misses += 1
+            return False, None
+
+    def set(
+        self,
+        network_id: str,
+        contract_address: str,
+        method: str,
+        args: dict | None,
+        value: Any,
+        abi: list[dict] | None = None,
+    ) -> None:
+        """Store a read result according to the caching policy of its method.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The address of the contract.
+            method: The contract method.
+            args: The method arguments.
+            value: The result of the read.
+            abi: The ABI the read was made with, which scopes its caching policy.
+
+        """
+        policy = cache_policy(method, abi)
+        if policy is None:
+            return
+
+        mutability = policy.mutability
+        if mutability == Mutability.MONOTONIC and policy.is_final and policy.is_final(value):
+            mutability = Mutability.IMMUTABLE
+
+        expires_at = (
+            None if mutability == Mutability.IMMUTABLE else time.monotonic() + self.volatile_ttl
+        )
+        key = _cache_key(network_id, contract_address, method, args)
+
+        with self._lock:
+            self._entries[key] = _Entry(value, expires_at, policy.mutability)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def read(
+        self,
+        network_id: str,
+        contract_address: str,
+        method: str,
+        abi: list[dict] | None = None,
+        args: dict | None = None,
+    ) -> Any:
+        """Read from a smart contract, serving the result from the cache when possible.
+
+        Args:
+            network_id: The network ID of the contract.
+            contract_address: The address of the contract.
+            method: The contract method.
+            abi: The ABI of the contract.
+            args: The method arguments.
+
+        Returns:
+            Any: The data read from the smart contract.
+
+        """
+        hit, value = self.get(network_id, contract_address, method, args, abi=abi)
+        if hit:
+            return value
+
+        value = SmartContract.read(network_id, contract_address, method, abi=abi, args=args)
+        self.set(network_id, contract_address, method, args, value, abi=abi)
+        return value
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Get the hit and miss counters for each mutability class.
+
+        Returns:
+            dict[str, CacheStats]: The counters, keyed by mutability class.
+
+        """
+        with self._lock:
+            return {
+                mutability.value: CacheStats(stats.hits, stats.misses)
+                for mutability, stats in self._stats.items()
+            }
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {mutability: CacheStats() for mutability in Mutability}
+
+
+def _cache_key(network_id: str, contract_address: str, method: str, args: dict | None) -> tuple:
+    return (
+        network_id,
+        contract_address.lower(),
+        method,
+        json.dumps(args or {}, sort_keys=True, default=str).lower(),
+    )
+
+
+# Process-wide cache shared by all actions.
+read_cache = ReadCache()
+
+
+def cached_read(
+    network_id: str,
+    contract_address: str,
+    method: str,
+    abi: list[dict] | None = None,
+    args: dict | None = None,
+) -> Any:
+    """Read from a smart contract through the active read snapshot and the process-wide read cache.
+
+    Args:
+        network_id: The network ID of the contract.
+        contract_address: The address of the contract.
+        method: The contract method.
+        abi: The ABI of the contract.
+        args: The method arguments.
+
+    Returns:
+        Any: The data read from the smart contract.
+
+    """
+    snapshot = current_snapshot(network_id)
+    if snapshot is not None:
+        hit, value = snapshot.get(contract_address, method, args)
+        if hit:
+            return value
+
+    value = read_cache.read(network_id, contract_address, method, abi=abi, args=args)
+
+    if snapshot is not None:
+        snapshot.set(contract_address, method, args, value)
+    return value
@@ -2,10 +2,11 @@ from collections.abc import Callable
 
 from cdp import Wallet
 from pydantic import BaseModel, Field
-from web3 import Web3
 from web3.exceptions import ContractLogicError
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.abi_codec import encode_function_call, namehash
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 # Constants
 REGISTER_BASENAME_PROMPT = """
@@ -73,8 +74,8 @@ def register_basename(wallet: Wallet, basename: str, amount: str = "0.002") -> s
             amount=amount,
             asset_id="eth",
         )
-        invocation.wait()
-        return f"Successfully registered basename {basename} for address {address_id}"
+        invocation = wait_or_track(invocation, "register_basename")
+        return f"Successfully registered basename {basename} for address {address_id}{tracking_note(invocation)}"
     except ContractLogicError as e:
         return f"Error registering basename: {e!s}"
     except Exception as e:
@@ -94,15 +95,11 @@ def create_register_contract_method_args(base_name: str, address_id: str, is_mai
         dict: Formatted arguments for the register contract method
 
     """
-    w3 = Web3()
+    name_hash = namehash(base_name)
 
-    resolver_contract = w3.eth.contract(abi=l2_resolver_abi)
+    address_data = encode_function_call(l2_resolver_abi, "setAddr", [name_hash, address_id])
 
-    name_hash = w3.ens.namehash(base_name)
-
-    address_data = resolver_contract.encode_abi("setAddr", args=[name_hash, address_id])
-
-    name_data = resolver_contract.encode_abi("setName", args=[name_hash, base_name])
+    name_data = encode_function_call(l2_resolver_abi, "setName", [name_hash, base_name])
 
     register_args = {
         "request": [
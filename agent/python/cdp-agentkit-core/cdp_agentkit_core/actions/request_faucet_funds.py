@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 REQUEST_FAUCET_FUNDS_PROMPT = """
 This tool will request test tokens from the faucet for the default address in the wallet. It takes the wallet and asset ID as input.
@@ -37,12 +38,12 @@ def request_faucet_funds(wallet: Wallet, asset_id: str | None = None) -> str:
         # Request funds from the faucet.
         faucet_tx = wallet.faucet(asset_id=asset_id if asset_id else None)
 
-        # Wait for the faucet transaction to be confirmed.
-        faucet_tx.wait()
+        # Wait for the faucet transaction to be confirmed, unless it is tracked in the background.
+        faucet_tx = wait_or_track(faucet_tx, "request_faucet_funds")
     except Exception as e:
         return f"Error requesting faucet funds {e!s}"
 
-    return f"Received {asset_id} from the faucet. Transaction: {faucet_tx.transaction_link}"
+    return f"Received {asset_id} from the faucet. Transaction: {faucet_tx.transaction_link}{tracking_note(faucet_tx)}"
 
 
 class RequestFaucetFundsAction(CdpAction):
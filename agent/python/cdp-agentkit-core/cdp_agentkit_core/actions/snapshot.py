@@ -0,0 +1,253 @@
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class BlockMemo:
+    """Process-wide memo of contract read results, keyed by block number.
+
+    Results stored here were observed at a known block, so any snapshot pinned to the same
+    block can reuse them without another round trip.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """Look up a memoized result.
+
+        Args:
+            key: The (network, block, call) key.
+
+        Returns:
+            tuple[bool, Any]: Whether the result was memoized, and the result if so.
+
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def set(self, key: tuple, value: Any) -> None:
+        """Memoize a result.
+
+        Args:
+            key: The (network, block, call) key.
+            value: The result.
+
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all memoized results."""
+        with self._lock:
+            self._entries.clear()
+
+
+block_memo = BlockMemo()
+
+# Number of times a group of reads is restarted in a new snapshot after the block moved.
+SNAPSHOT_RETRIES = 2
+
+
+class SnapshotDriftError(Exception):
+    """Raised when a batch of reads executed at a different block than its snapshot."""
+
+    def __init__(self, pinned_block: int, observed_block: int):
+        super().__init__(
+            f"reads executed at block {observed_block}, but the snapshot is pinned to block "
+            f"{pinned_block}"
+        )
+        self.pinned_block = pinned_block
+        self.observed_block = observed_block
+
+
+class ReadSnapshot:
+    """A consistent view of contract state for a group of reads.
+
+    Every read made while the snapshot is active is memoized, so repeated reads of the same
+    call return the same value. The snapshot is pinned to the block observed by its own first
+    batched read, and results observed at that block are shared with other snapshots pinned
+    to it. A later batch executed at another block raises `SnapshotDriftError`.
+    """
+
+    def __init__(self, network_id: str, block_number: int | None = None):
+        self.network_id = network_id
+        self.block_number = block_number
+        self.hits = 0
+        self.misses = 0
+        self._results: dict[tuple, Any] = {}
+
+    def observe(self, block_number: int) -> None:
+        """Record the block at which a batch of reads was executed.
+
+        The first observed block pins an unpinned snapshot.
+
+        Args:
+            block_number: The block number observed by a batch of reads.
+
+        Raises:
+            SnapshotDriftError: If the batch executed at another block than the pinned one.
+
+        """
+        if self.block_number is None:
+            self.block_number = block_number
+        elif block_number != self.block_number:
+            raise SnapshotDriftError(self.block_number, block_number)
+
+    def get(self, contract_address: str, method: str, args: dict | None) -> tuple[bool, Any]:
+        """Look up a read made in this snapshot or at its pinned block.
+
+        Args:
+            contract_address: The address of the contract.
+            method: The contract method.
+            args: The method arguments.
+
+        Returns:
+            tuple[bool, Any]: Whether the read was memoized, and the result if so.
+
+        """
+        call = _call_key(contract_address, method, args)
+        if call in self._results:
+            self.hits += 1
+            return True, self._results[call]
+
+        if self.block_number is not None:
+            hit, value = block_memo.get((self.network_id, self.block_number, *call))
+            if hit:
+                self._results[call] = value
+                self.hits += 1
+                return True, value
+
+        self.misses += 1
+        return False, None
+
+    def set(
+        self,
+        contract_address: str,
+        method: str,
+        args: dict | None,
+        value: Any,
+        block_number: int | None = None,
+    ) -> None:
+        """Memoize a read made in this snapshot.
+
+        Args:
+            contract_address: The address of the contract.
+            method: The contract method.
+            args: The method arguments.
+            value: The result of the read.
+            block_number: The block at which the read was executed, if known.
+
+        """
+        call = _call_key(contract_address, method, args)
+        self._results[call] = value
+        if block_number is not None and block_number == self.block_number:
+            block_memo.set((self.network_id, block_number, *call), value)
+
+
+_active_snapshot: ContextVar[ReadSnapshot | None] = ContextVar("read_snapshot", default=None)
+
+
+def current_snapshot(network_id: str) -> ReadSnapshot | None:
+    """Get the active read snapshot for a network.
+
+    Args:
+        network_id: The network ID.
+
+    Returns:
+        ReadSnapshot | None: The active snapshot, or None if there is no snapshot for the network.
+
+    """
+    snapshot = _active_snapshot.get()
+    if snapshot is None or snapshot.network_id != network_id:
+        return None
+    return snapshot
+
+
+@contextmanager
+def read_snapshot(network_id: str) -> Iterator[ReadSnapshot]:
+    """Pin all contract reads made within the context to a single block.
+
+    Nested snapshots for the same network reuse the outer snapshot.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+
+    Yields:
+        ReadSnapshot: The active snapshot.
+
+    """
+    active = current_snapshot(network_id)
+    if active is not None:
+        yield active
+        return
+
+    snapshot = ReadSnapshot(network_id)
+    token = _active_snapshot.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _active_snapshot.reset(token)
+
+
+def run_in_snapshot(
+    network_id: str,
+    func: Callable[..., T],
+    *args: Any,
+    retries: int = SNAPSHOT_RETRIES,
+    **kwargs: Any,
+) -> T:
+    """Run a group of reads in a read snapshot, restarting it in a new snapshot on drift.
+
+    Within an active snapshot for the network, the reads join it, and a drift is left to the
+    outer group to handle.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        func: The function making the reads.
+        *args: Positional arguments for the function.
+        retries: The number of times to restart the reads after a drift.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        T: The result of the function.
+
+    Raises:
+        SnapshotDriftError: If the reads still drifted after the retries.
+
+    """
+    if current_snapshot(network_id) is not None:
+        return func(*args, **kwargs)
+
+    attempt = 0
+    while True:
+        try:
+            with read_snapshot(network_id):
+                return func(*args, **kwargs)
+        except SnapshotDriftError as e:
+            if attempt >= retries:
+                raise
+            attempt += 1
+            print(f"Restarting reads in a new snapshot: {e!s}")
+
+
+def _call_key(contract_address: str, method: str, args: dict | None) -> tuple:
+    return (
+        contract_address.lower(),
+        method,
+        json.dumps(args or {}, sort_keys=True, default=str).lower(),
+    )
@@ -7,6 +7,7 @@ from cdp_agentkit_core.actions import CdpAction
 from cdp_agentkit_core.actions.superfluid.constants import (
     CREATE_ABI,
 )
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 SUPERFLUID_CREATE_FLOW_PROMPT = """
 This tool will create a money flow to a specified token recipient using Superfluid. Do not use this tool for any other purpose, or trading other assets.
@@ -62,9 +63,9 @@ def superfluid_create_flow(
             },
         )
 
-        invocation.wait()
+        invocation = wait_or_track(invocation, "superfluid_create_flow")
 
-        return f"Flow created successfully. Result: {invocation}"
+        return f"Flow created successfully. Result: {invocation}{tracking_note(invocation)}"
 
     except Exception as e:
         return f"Error creating flow: {e!s}"
@@ -7,6 +7,7 @@ from cdp_agentkit_core.actions import CdpAction
 from cdp_agentkit_core.actions.superfluid.constants import (
     DELETE_ABI,
 )
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 SUPERFLUID_DELETE_FLOW_PROMPT = """
 This tool will delete an existing money flow to a token recipient using Superfluid. Do not use this tool for any other purpose, or trading other assets.
@@ -50,9 +51,9 @@ def superfluid_delete_flow(wallet: Wallet, recipient: str, token_address: str) -
             },
         )
 
-        invocation.wait()
+        invocation = wait_or_track(invocation, "superfluid_delete_flow")
 
-        return f"Flow deleted successfully. Result: {invocation}"
+        return f"Flow deleted successfully. Result: {invocation}{tracking_note(invocation)}"
     except Exception as e:
         return f"Error deleting flow: {e!s}"
 
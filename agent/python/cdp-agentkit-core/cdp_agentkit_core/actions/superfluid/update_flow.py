@@ -7,6 +7,7 @@ from cdp_agentkit_core.actions import CdpAction
 from cdp_agentkit_core.actions.superfluid.constants import (
     UPDATE_ABI,
 )
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 SUPERFLUID_UPDATE_FLOW_PROMPT = """
 This tool will update an existing money flow to a specified token recipient using Superfluid. Do not use this tool for any other purpose, or trading other assets.
@@ -62,9 +63,9 @@ def superfluid_update_flow(
             },
         )
 
-        invocation.wait()
+        invocation = wait_or_track(invocation, "superfluid_update_flow")
 
-        return f"Flow updated successfully. Result: {invocation}"
+        return f"Flow updated successfully. Result: {invocation}{tracking_note(invocation)}"
 
     except Exception as e:
         return f"Error updating flow: {e!s}"
@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 TRADE_PROMPT = """
 This tool will trade a specified amount of a 'from asset' to a 'to asset' for the wallet.
@@ -50,13 +51,14 @@ def trade(wallet: Wallet, amount: str, from_asset_id: str, to_asset_id: str) ->
 
     """
     try:
-        trade_result = wallet.trade(
-            amount=amount, from_asset_id=from_asset_id, to_asset_id=to_asset_id
-        ).wait()
+        trade_result = wait_or_track(
+            wallet.trade(amount=amount, from_asset_id=from_asset_id, to_asset_id=to_asset_id),
+            "trade",
+        )
     except Exception as e:
         return f"Error trading assets {e!s}"
 
-    return f"Traded {amount} of {from_asset_id} for {trade_result.to_amount} of {to_asset_id}.\nTransaction hash for the trade: {trade_result.transaction.transaction_hash}\nTransaction link for the trade: {trade_result.transaction.transaction_link}"
+    return f"Traded {amount} of {from_asset_id} for {trade_result.to_amount} of {to_asset_id}.\nTransaction hash for the trade: {trade_result.transaction.transaction_hash}\nTransaction link for the trade: {trade_result.transaction.transaction_link}{tracking_note(trade_result)}"
 
 
 class TradeAction(CdpAction):
@@ -0,0 +1,368 @@
+"""Background tracking of submitted transactions.
+
+By default write actions wait for their transaction to land onchain before returning. In
+submit-and-track mode they return as soon as the transaction is submitted, and hand the CDP
+operation (a transfer, contract invocation, trade, contract deployment or faucet transaction) to
+the process-wide `transaction_tracker`. A single background thread reloads all pending
+operations together on every poll, records their status locally and notifies listeners when they
+complete, fail or time out. The `get_transaction_status` action reads from that local state.
+
+Submit-and-track mode is enabled with `transaction_tracker.submit_and_track = True`, or by
+setting the `CDP_AGENTKIT_SUBMIT_AND_TRACK` environment variable to `true`.
+"""
+
+import os
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+from cdp import Transfer
+
+T = TypeVar("T")
+
+SUBMIT_AND_TRACK_ENV = "CDP_AGENTKIT_SUBMIT_AND_TRACK"
+DEFAULT_POLL_INTERVAL = 2.0
+# Transactions which are still pending after this many seconds are no longer polled.
+DEFAULT_TRACKING_TIMEOUT = 600.0
+MAX_POLL_WORKERS = 8
+MAX_FINISHED_TRANSACTIONS = 1000
+
+COMPLETE = "complete"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+FINAL_STATUSES = frozenset({COMPLETE, FAILED, TIMED_OUT})
+
+
+@dataclass(frozen=True)
+class TrackedTransaction:
+    """The locally recorded state of a submitted transaction."""
+
+    id: str
+    action: str
+    network_id: str | None
+    transaction_hash: str | None
+    transaction_link: str | None
+    status: str
+    submitted_at: float
+    updated_at: float
+    error: str | None = None
+
+    @property
+    def is_final(self) -> bool:
+        """Whether the transaction completed, failed or timed out."""
+        return self.status in FINAL_STATUSES
+
+
+class TransactionTracker:
+    """Tracks submitted transactions with a single background poller."""
+
+    def __init__(
+        self,
+        submit_and_track: bool = False,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        tracking_timeout: float = DEFAULT_TRACKING_TIMEOUT,
+    ):
+        self.submit_and_track = submit_and_track
+        self.poll_interval = poll_interval
+        self.tracking_timeout = tracking_timeout
+        self._transactions: OrderedDict[str, TrackedTransaction] = OrderedDict()
+        self._pending: dict[str, Any] = {}
+        self._by_operation: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._listeners: list[Callable[[TrackedTransaction], None]] = []
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def track(self, operation: Any, action: str) -> TrackedTransaction:
+        """Start tracking a submitted operation.
+
+        Args:
+            operation: The CDP operation, such as a `Transfer` or `ContractInvocation`.
+            action: The name of the action which submitted the operation.
+
+        Returns:
+            TrackedTransaction: The recorded state of the transaction.
+
+        """
+        now = time.time()
+        transaction = _transaction_of(operation)
+        record = TrackedTransaction(
+            id=uuid.uuid4().hex[:12],
+            action=action,
+            network_id=getattr(operation, "network_id", None),
+            transaction_hash=_transaction_hash(transaction),
+            transaction_link=_transaction_link(transaction),
+            status=_status(transaction),
+            submitted_at=now,
+            updated_at=now,
+        )
+
+        with self._condition:
+            self._transactions[record.id] = record
+            self._by_operation[operation] = record.id
+            if not record.is_final:
+                self._pending[record.id] = operation
+            self._evict_finished()
+            self._condition.notify_all()
+
+        if record.is_final:
+            self._notify(record)
+        else:
+            self._ensure_polling()
+        return record
+
+    def get(self, transaction: str) -> TrackedTransaction | None:
+        """Get a tracked transaction by tracker ID or transaction hash.
+
+        Args:
+            transaction: The tracker ID or the transaction hash.
+
+        Returns:
+            TrackedTransaction | None: The transaction, or None if it is not tracked.
+
+        """
+        with self._condition:
+            record = self._transactions.get(transaction)
+            if record is not None:
+                return record
+            for record in self._transactions.values():
+                if record.transaction_hash and record.transaction_hash.lower() == (
+                    transaction.lower()
+                ):
+                    return record
+        return None
+
+    def get_for_operation(self, operation: Any) -> TrackedTransaction | None:
+        """Get the tracked transaction of an operation, if it is tracked."""
+        with self._condition:
+            transaction_id = self._by_operation.get(operation)
+            return self._transactions.get(transaction_id) if transaction_id else None
+
+    def list_transactions(self, pending_only: bool = False) -> list[TrackedTransaction]:
+        """List tracked transactions, most recently submitted first.
+
+        Args:
+            pending_only: Whether to only list transactions which are still pending.
+
+        Returns:
+            list[TrackedTransaction]: The transactions.
+
+        """
+        with self._condition:
+            records = list(reversed(self._transactions.values()))
+        return [record for record in records if not (pending_only and record.is_final)]
+
+    def wait(self, transaction: str, timeout: float | None = None) -> TrackedTransaction | None:
+        """Wait until a tracked transaction completes, fails or times out.
+
+        Args:
+            transaction: The tracker ID or the transaction hash.
+            timeout: The maximum number of seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            TrackedTransaction | None: The transaction, which is still pending if the wait timed
+                out, or None if it is not tracked.
+
+        """
+        record = self.get(transaction)
+        if record is None:
+            return None
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._transactions[record.id].is_final, timeout=timeout
+            )
+            return self._transactions[record.id]
+
+    def add_listener(self, listener: Callable[[TrackedTransaction], None]) -> None:
+        """Add a callback which is called when a transaction completes, fails or times out."""
+        with self._condition:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[TrackedTransaction], None]) -> None:
+        """Remove a callback added with `add_listener`."""
+        with self._condition:
+            self._listeners.remove(listener)
+
+    def poll(self) -> list[TrackedTransaction]:
+        """Reload all pending operations once and record their status.
+
+        Returns:
+            list[TrackedTransaction]: The transactions which reached a final status.
+
+        """
+        with self._condition:
+            pending = list(self._pending.items())
+        if not pending:
+            return []
+
+        if len(pending) == 1:
+            errors = [_reload(pending[0][1])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(pending), MAX_POLL_WORKERS)) as executor:
+                errors = list(executor.map(_reload, [operation for _, operation in pending]))
+
+        finished = []
+        now = time.time()
+        with self._condition:
+            for (transaction_id, operation), error in zip(pending, errors, strict=True):
+                record = self._transactions.get(transaction_id)
+                if record is None:
+                    continue
+                transaction = _transaction_of(operation)
+                status = record.status if error else _status(transaction)
+                if (
+                    status not in FINAL_STATUSES
+                    and now - record.submitted_at > self.tracking_timeout
+                ):
+                    status = TIMED_OUT
+                record = replace(
+                    record,
+                    transaction_hash=_transaction_hash(transaction) or record.transaction_hash,
+                    transaction_link=_transaction_link(transaction) or record.transaction_link,
+                    status=status,
+                    updated_at=now,
+                    error=error,
+                )
+                self._transactions[transaction_id] = record
+                if record.is_final:
+                    del self._pending[transaction_id]
+                    finished.append(record)
+            self._condition.notify_all()
+
+        for record in finished:
+            self._notify(record)
+        return finished
+
+    def stop(self) -> None:
+        """Stop the background poller, which restarts when another transaction is tracked."""
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+
+    def clear(self) -> None:
+        """Stop polling and forget all tracked transactions."""
+        self.stop()
+        with self._condition:
+            self._transactions.clear()
+            self._pending.clear()
+            self._by_operation.clear()
+
+    def _ensure_polling(self) -> None:
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._poll_loop, name="cdp-transaction-tracker", daemon=True
+            )
+            self._thread.start()
+
+    def _poll_loop(self) -> None:
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error polling tracked transactions: {e!s}")
+            with self._condition:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+    def _notify(self, record: TrackedTransaction) -> None:
+        with self._condition:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                print(f"Error in transaction listener: {e!s}")
+
+    def _evict_finished(self) -> None:
+        finished = [
+            transaction_id
+            for transaction_id, record in self._transactions.items()
+            if record.is_final
+        ]
+        for transaction_id in finished[: max(0, len(finished) - MAX_FINISHED_TRANSACTIONS)]:
+            del self._transactions[transaction_id]
+
+
+def _transaction_of(operation: Any) -> Any:
+    # Gasless transfers are sent with a sponsored send instead of a transaction.
+    if isinstance(operation, Transfer):
+        return operation.send_tx_delegate
+    return operation.transaction
+
+
+def _status(transaction: Any) -> str:
+    # Contract deployments without a transaction are already deployed.
+    if transaction is None:
+        return COMPLETE
+    return str(transaction.status)
+
+
+def _transaction_hash(transaction: Any) -> str | None:
+    return transaction.transaction_hash if transaction is not None else None
+
+
+def _transaction_link(transaction: Any) -> str | None:
+    return transaction.transaction_link if transaction is not None else None
+
+
+def _reload(operation: Any) -> str | None:
+    try:
+        operation.reload()
+    except Exception as e:
+        return str(e)
+    return None
+
+
+transaction_tracker = TransactionTracker(
+    submit_and_track=os.environ.get(SUBMIT_AND_TRACK_ENV, "").lower() in ("1", "true", "yes")
+)
+
+
+def wait_or_track(operation: T, action: str) -> T:
+    """Wait for a submitted operation to land onchain, or track it in submit-and-track mode.
+
+    Args:
+        operation: The CDP operation, such as a `Transfer` or `ContractInvocation`.
+        action: The name of the action which submitted the operation.
+
+    Returns:
+        The operation, after waiting for it unless it is tracked.
+
+    """
+    if not transaction_tracker.submit_and_track:
+        return operation.wait()
+
+    transaction_tracker.track(operation, action)
+    return operation
+
+
+def tracking_note(operation: Any) -> str:
+    """Describe how to follow up on an operation which is tracked in the background.
+
+    Args:
+        operation: The CDP operation returned by `wait_or_track`.
+
+    Returns:
+        str: A note to append to the action result, or an empty string if the operation was
+            waited for or has already completed.
+
+    """
+    record = transaction_tracker.get_for_operation(operation)
+    if record is None or record.is_final:
+        return ""
+    return (
+        f"\nThe transaction was submitted and is pending confirmation (tracking ID {record.id}). "
+        "Use get_transaction_status to check whether it completed."
+    )
@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 TRANSFER_PROMPT = """
 This tool will transfer an asset from the wallet to another onchain address.
@@ -60,13 +61,16 @@ def transfer(
 
     """
     try:
-        transfer_result = wallet.transfer(
-            amount=amount, asset_id=asset_id, destination=destination, gasless=gasless
-        ).wait()
+        transfer_result = wait_or_track(
+            wallet.transfer(
+                amount=amount, asset_id=asset_id, destination=destination, gasless=gasless
+            ),
+            "transfer",
+        )
     except Exception as e:
         return f"Error transferring the asset {e!s}"
 
-    return f"Transferred {amount} of {asset_id} to {destination}.\nTransaction hash for the transfer: {transfer_result.transaction_hash}\nTransaction link for the transfer: {transfer_result.transaction_link}"
+    return f"Transferred {amount} of {asset_id} to {destination}.\nTransaction hash for the transfer: {transfer_result.transaction_hash}\nTransaction link for the transfer: {transfer_result.transaction_link}{tracking_note(transfer_result)}"
 
 
 class TransferAction(CdpAction):
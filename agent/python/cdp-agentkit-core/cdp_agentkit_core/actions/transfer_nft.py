@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 TRANSFER_NFT_PROMPT = """
 This tool will transfer an NFT (ERC721 token) from the wallet to another onchain address.
@@ -57,15 +58,18 @@ def transfer_nft(
     """
     try:
         from_addr = from_address if from_address is not None else wallet.default_address.address_id
-        transfer_result = wallet.invoke_contract(
-            contract_address=contract_address,
-            method="transferFrom",
-            args={"from": from_addr, "to": destination, "tokenId": token_id},
-        ).wait()
+        transfer_result = wait_or_track(
+            wallet.invoke_contract(
+                contract_address=contract_address,
+                method="transferFrom",
+                args={"from": from_addr, "to": destination, "tokenId": token_id},
+            ),
+            "transfer_nft",
+        )
     except Exception as e:
         return f"Error transferring the NFT (contract: {contract_address}, ID: {token_id}) from {from_addr} to {destination}): {e!s}"
 
-    return f"Transferred NFT (ID: {token_id}) from contract {contract_address} to {destination}.\nTransaction hash: {transfer_result.transaction_hash}\nTransaction link: {transfer_result.transaction_link}"
+    return f"Transferred NFT (ID: {token_id}) from contract {contract_address} to {destination}.\nTransaction hash: {transfer_result.transaction_hash}\nTransaction link: {transfer_result.transaction_link}{tracking_note(transfer_result)}"
 
 
 class TransferNftAction(CdpAction):
@@ -1,23 +1,70 @@
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, TypeVar
+
 from cdp import Wallet
 
+from cdp_agentkit_core.actions.allowance_ledger import allowance_ledger
 from cdp_agentkit_core.actions.constants import ERC20_APPROVE_ABI
 
+if TYPE_CHECKING:
+    from cdp_agentkit_core.actions.nonce_manager import TransactionPipeline
+
+T = TypeVar("T")
+
+# Default timeout, in seconds, for a single blocking CDP call made from async code.
+DEFAULT_READ_TIMEOUT = 10.0
 
-def approve(wallet: Wallet, token_address: str, spender: str, amount: int) -> str:
+
+def approve(
+    wallet: Wallet,
+    token_address: str,
+    spender: str,
+    amount: int,
+    pipeline: "TransactionPipeline | None" = None,
+) -> str:
     """Approve a spender to spend a specified amount of tokens.
 
+    No transaction is sent if the allowance of the spender already covers the amount. With the
+    approve max policy of the `allowance_ledger`, the maximum amount is approved instead.
+
     Args:
         wallet (Wallet): The wallet to execute the approval from
         token_address (str): The address of the token contract
         spender (str): The address of the spender
         amount (int): The amount of tokens to approve
+        pipeline (TransactionPipeline | None): A pipeline to submit the approval to, without
+            waiting for it to land before the following transactions are submitted
 
     Returns:
         str: A success message with transaction hash or error message
 
     """
+    network_id = wallet.network_id
+    owner = wallet.default_address.address_id
     try:
-        amount_str = str(amount)
+        if allowance_ledger.covers(network_id, token_address, owner, spender, int(amount)):
+            allowance_ledger.record_avoided_approval()
+            return f"Allowance of {spender} already covers {amount} tokens, no approval needed"
+    except Exception as e:
+        print(f"Error reading allowance, approving anyway: {e!s}")
+
+    try:
+        approved_amount = allowance_ledger.approval_amount(int(amount))
+        amount_str = str(approved_amount)
+
+        if pipeline is not None:
+            invocation = pipeline.invoke_contract(
+                "approve",
+                contract_address=token_address,
+                method="approve",
+                abi=ERC20_APPROVE_ABI,
+                args={"spender": spender, "value": amount_str},
+            )
+            allowance_ledger.record_approval(
+                network_id, token_address, owner, spender, approved_amount
+            )
+            return f"Submitted approval of {amount} tokens for {spender} with transaction hash: {invocation.transaction_hash} and transaction link: {invocation.transaction_link}"
 
         invocation = wallet.invoke_contract(
             contract_address=token_address,
@@ -28,8 +75,30 @@ def approve(wallet: Wallet, token_address: str, spender: str, amount: int) -> st
                 "value": amount_str,
             },
         ).wait()
+        allowance_ledger.record_approval(network_id, token_address, owner, spender, approved_amount)
 
         return f"Approved {amount} tokens for {spender} with transaction hash: {invocation.transaction_hash} and transaction link: {invocation.transaction_link}"
 
     except Exception as e:
         return f"Error approving tokens: {e!s}"
+
+
+async def run_with_timeout(
+    func: Callable[..., T], *args: Any, timeout: float = DEFAULT_READ_TIMEOUT, **kwargs: Any
+) -> T:
+    """Run a blocking function in a worker thread without blocking the event loop.
+
+    Args:
+        func (Callable): The blocking function to run, such as `SmartContract.read`
+        *args: Positional arguments for the function
+        timeout (float): The maximum number of seconds to wait for the result
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        The return value of the function.
+
+    Raises:
+        TimeoutError: If the function does not complete within the timeout.
+
+    """
+    return await asyncio.wait_for(asyncio.to_thread(func, *args, **kwargs), timeout)
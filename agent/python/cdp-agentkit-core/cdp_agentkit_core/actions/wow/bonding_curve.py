@@ -0,0 +1,210 @@
+"""Local implementation of the WOW bonding curve.
+
+The fixed point helpers are ports of Solady's `FixedPointMathLib`, with the same integer
+rounding, so that quotes match the on-chain `BondingCurve` contract exactly.
+"""
+
+from dataclasses import dataclass
+
+from cdp_agentkit_core.actions.wow.constants import BONDING_CURVE_A, BONDING_CURVE_B
+
+WAD = 10**18
+
+
+def mul_wad(x: int, y: int) -> int:
+    """Calculate floor(x * y / WAD)."""
+    return x * y // WAD
+
+
+def div_wad(x: int, y: int) -> int:
+    """Calculate floor(x * WAD / y)."""
+    if y == 0:
+        raise ZeroDivisionError("DivWadFailed")
+    return x * WAD // y
+
+
+def full_mul_div(x: int, y: int, denominator: int) -> int:
+    """Calculate floor(x * y / denominator) with full precision."""
+    if denominator == 0:
+        raise ZeroDivisionError("FullMulDivFailed")
+    return x * y // denominator
+
+
+def exp_wad(x: int) -> int:
+    """Calculate e^x for a WAD fixed point x, as in `FixedPointMathLib.expWad`.
+
+    Args:
+        x: The exponent, scaled by 1e18.
+
+    Returns:
+        int: e^x, scaled by 1e18.
+
+    Raises:
+        OverflowError: If the result does not fit in an int256.
+
+    """
+    # The result rounds to zero below ln(1e-18).
+    if x <= -41446531673892822313:
+        return 0
+    if x >= 135305999368893231589:
+        raise OverflowError("ExpOverflow")
+
+    # Convert to a 2**96 basis, then reduce the range to (-1/2 ln 2, 1/2 ln 2) * 2**96 by
+    # factoring out powers of two.
+    x = _sdiv(x << 78, 5**18)
+    k = (_sdiv(x << 96, 54916777467707473351141471128) + 2**95) >> 96
+    x = x - k * 54916777467707473351141471128
+
+    # Evaluate using a (6, 7)-term rational approximation.
+    y = x + 1346386616545796478920950773328
+    y = ((y * x) >> 96) + 57155421227552351082224309758442
+    p = y + x - 94201549194550492254356042504812
+    p = ((p * y) >> 96) + 28719021644029726153956944680412240
+    p = p * x + (4385272521454847904659076985693276 << 96)
+
+    q = x - 2855989394907223263936484059900
+    q = ((q * x) >> 96) + 50020603652535783019961831881945
+    q = ((q * x) >> 96) - 533845033583426703283633433725380
+    q = ((q * x) >> 96) + 3604857256930695427073651918091429
+    q = ((q * x) >> 96) - 14423608567350463180887372962807573
+    q = ((q * x) >> 96) + 26449188498355588339934803723976023
+
+    r = _sdiv(p, q)
+
+    # Multiply by the scale factor, 2**k and 1e18 / 2**96 at once.
+    return (r * 3822833074963236453042738258902158003155416615667) >> (195 - k)
+
+
+def ln_wad(x: int) -> int:
+    """Calculate ln(x) for a WAD fixed point x, as in `FixedPointMathLib.lnWad`.
+
+    Args:
+        x: The value, scaled by 1e18.
+
+    Returns:
+        int: ln(x), scaled by 1e18.
+
+    Raises:
+        ValueError: If x is not positive.
+
+    """
+    if x <= 0:
+        raise ValueError("LnWadUndefined")
+
+    # Reduce the range of x to (1, 2) * 2**96, since ln(2^k * x) = k * ln(2) + ln(x).
+    k = x.bit_length() - 1 - 96
+    x = (x << (159 - k)) >> 159
+
+    # Evaluate using a (8, 8)-term rational approximation.
+    p = x + 3273285459638523848632254066296
+    p = ((p * x) >> 96) + 24828157081833163892658089445524
+    p = ((p * x) >> 96) + 43456485725739037958740375743393
+    p = ((p * x) >> 96) - 11111509109440967052023855526967
+    p = ((p * x) >> 96) - 45023709667254063763336534515857
+    p = ((p * x) >> 96) - 14706773417378608786704636184526
+    p = p * x - (795164235651350426258249787498 << 96)
+
+    q = x + 5573035233440673466300451813936
+    q = ((q * x) >> 96) + 71694874799317883764090561454958
+    q = ((q * x) >> 96) + 283447036172924575727196451306956
+    q = ((q * x) >> 96) + 401686690394027663651624208769553
+    q = ((q * x) >> 96) + 204048457590392012362485061816622
+    q = ((q * x) >> 96) + 31853899698501571402653359427138
+    q = ((q * x) >> 96) + 909429971244387300277376558375
+
+    r = _sdiv(p, q)
+
+    # Multiply by the scale factor, add k * ln(2) and ln(2**96 / 1e18), and convert to 1e18.
+    r *= 1677202110996718588342820967067443963516166
+    r += 16597577552685614221487285958193947469193820559219878177908093499208371 * k
+    r += 600920179829731861736702779321621459595472258049074101567377883020018308
+    return r >> 174
+
+
+def _sdiv(a: int, b: int) -> int:
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+@dataclass(frozen=True)
+class BondingCurve:
+    """The WOW bonding curve, which prices tokens at y = A * e^(B * x).
+
+    All amounts are in wei, and `current_supply` is the `totalSupply` of the token.
+    """
+
+    a: int = BONDING_CURVE_A
+    b: int = BONDING_CURVE_B
+
+    def get_eth_buy_quote(self, current_supply: int, eth_order_size: int) -> int:
+        """Get the amount of tokens received for buying with an amount of ETH.
+
+        Args:
+            current_supply: The current token supply (in wei)
+            eth_order_size: Amount of ETH to spend (in wei)
+
+        Returns:
+            int: Amount of tokens to receive (in wei)
+
+        """
+        exp_b_x0 = exp_wad(mul_wad(self.b, current_supply))
+        exp_b_x1 = exp_b_x0 + full_mul_div(eth_order_size, self.b, self.a)
+        return _checked_sub(div_wad(ln_wad(exp_b_x1), self.b), current_supply)
+
+    def get_token_buy_quote(self, current_supply: int, tokens_to_buy: int) -> int:
+        """Get the amount of ETH needed to buy an amount of tokens.
+
+        Args:
+            current_supply: The current token supply (in wei)
+            tokens_to_buy: Amount of tokens to buy (in wei)
+
+        Returns:
+            int: Amount of ETH to spend (in wei)
+
+        """
+        exp_b_x0 = exp_wad(mul_wad(self.b, current_supply))
+        exp_b_x1 = exp_wad(mul_wad(self.b, current_supply + tokens_to_buy))
+        return full_mul_div(_checked_sub(exp_b_x1, exp_b_x0), self.a, self.b)
+
+    def get_token_sell_quote(self, current_supply: int, tokens_to_sell: int) -> int:
+        """Get the amount of ETH received for selling an amount of tokens.
+
+        Args:
+            current_supply: The current token supply (in wei)
+            tokens_to_sell: Amount of tokens to sell (in wei)
+
+        Returns:
+            int: Amount of ETH to receive (in wei)
+
+        """
+        if current_supply < tokens_to_sell:
+            raise ValueError("INSUFFICIENT_SUPPLY")
+
+        exp_b_x0 = exp_wad(mul_wad(self.b, current_supply))
+        exp_b_x1 = exp_wad(mul_wad(self.b, current_supply - tokens_to_sell))
+        return full_mul_div(_checked_sub(exp_b_x0, exp_b_x1), self.a, self.b)
+
+    def get_eth_sell_quote(self, current_supply: int, eth_order_size: int) -> int:
+        """Get the amount of tokens to sell to receive an amount of ETH.
+
+        Args:
+            current_supply: The current token supply (in wei)
+            eth_order_size: Amount of ETH to receive (in wei)
+
+        Returns:
+            int: Amount of tokens to sell (in wei)
+
+        """
+        exp_b_x0 = exp_wad(mul_wad(self.b, current_supply))
+        exp_b_x1 = _checked_sub(exp_b_x0, full_mul_div(eth_order_size, self.b, self.a))
+        return _checked_sub(current_supply, div_wad(ln_wad(exp_b_x1), self.b))
+
+
+def _checked_sub(a: int, b: int) -> int:
+    if b > a:
+        raise ValueError("Arithmetic underflow")
+    return a - b
+
+
+# The curve used by all WOW tokens.
+bonding_curve = BondingCurve()
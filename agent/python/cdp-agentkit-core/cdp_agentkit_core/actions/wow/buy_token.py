@@ -4,11 +4,11 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 from cdp_agentkit_core.actions.wow.constants import (
     WOW_ABI,
 )
-from cdp_agentkit_core.actions.wow.uniswap.index import get_has_graduated
-from cdp_agentkit_core.actions.wow.utils import get_buy_quote
+from cdp_agentkit_core.actions.wow.utils import get_trade_context
 
 WOW_BUY_TOKEN_PROMPT = """
 This tool can only be used to buy a Zora Wow ERC20 memecoin with ETH. Do not use this tool for any other purpose, or trading other assets.
@@ -55,14 +55,13 @@ def wow_buy_token(wallet: Wallet, contract_address: str, amount_eth_in_wei: str)
         str: A message containing the token purchase details.
 
     """
-    token_quote = get_buy_quote(wallet.network_id, contract_address, amount_eth_in_wei)
+    context = get_trade_context(wallet.network_id, contract_address, amount_eth_in_wei, "buy")
 
-    # Multiply by 99/100 and floor to get 99% of quote as minimum
-    min_tokens = str(int((token_quote * 99) // 100))  # Using integer division to floor the result
-
-    has_graduated = get_has_graduated(wallet.network_id, contract_address)
+    # Accept up to 1% slippage from the quote
+    min_tokens = context.min_amount_out(1)
 
     try:
+        context.mark_submitted()
         invocation = wallet.invoke_contract(
             contract_address=contract_address,
             method="buy",
@@ -71,18 +70,19 @@ def wow_buy_token(wallet: Wallet, contract_address: str, amount_eth_in_wei: str)
                 "recipient": wallet.default_address.address_id,
                 "refundRecipient": wallet.default_address.address_id,
                 "orderReferrer": "0x0000000000000000000000000000000000000000",
-                "expectedMarketType": (has_graduated and "1") or "0",
+                "expectedMarketType": context.expected_market_type,
                 "minOrderSize": min_tokens,
                 "sqrtPriceLimitX96": "0",
                 "comment": "",
             },
             amount=amount_eth_in_wei,
             asset_id="wei",
-        ).wait()
+        )
+        invocation = wait_or_track(invocation, "wow_buy_token")
     except Exception as e:
         return f"Error buying Zora Wow ERC20 memecoin {e!s}"
 
-    return f"Purchased WoW ERC20 memecoin with transaction hash: {invocation.transaction.transaction_hash}"
+    return f"Purchased WoW ERC20 memecoin with transaction hash: {invocation.transaction.transaction_hash}{tracking_note(invocation)}"
 
 
 class WowBuyTokenAction(CdpAction):
@@ -819,6 +819,13 @@ WOW_FACTORY_CONTRACT_ADDRESSES = {
     "base-mainnet": "0x997020E5F59cCB79C74D527Be492Cc610CB9fA2B",
 }
 
+# Blocks from which the first sync of the WOW token registry starts on each network. These are
+# lower bounds on the WOW factory deploy blocks, from June 2024, before the factories existed.
+WOW_FACTORY_START_BLOCKS = {
+    "base-sepolia": 10_500_000,
+    "base-mainnet": 15_000_000,
+}
+
 addresses = {
     "base-sepolia": {
         "WowFactory": "0xB09c0b1b18369Ef62e896D5a49Af8d65EFa0A404",
@@ -842,6 +849,10 @@ addresses = {
     },
 }
 
+# Parameters of the WOW bonding curve, which prices tokens at y = A * e^(B * x).
+BONDING_CURVE_A = 1060848709
+BONDING_CURVE_B = 4379701787
+
 
 def get_factory_address(network: str) -> str:
     """Get the Zora Wow ERC20 Factory contract address for the specified network.
@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 from cdp_agentkit_core.actions.wow.constants import (
     GENERIC_TOKEN_METADATA_URI,
     WOW_FACTORY_ABI,
@@ -70,11 +71,12 @@ def wow_create_token(wallet: Wallet, name: str, symbol: str, token_uri: str | No
                 "_name": name,
                 "_symbol": symbol,
             },
-        ).wait()
+        )
+        invocation = wait_or_track(invocation, "wow_create_token")
     except Exception as e:
         return f"Error creating Zora Wow ERC20 memecoin {e!s}"
 
-    return f"Created WoW ERC20 memecoin {name} with symbol {symbol} on network {wallet.network_id}.\nTransaction hash for the token creation: {invocation.transaction.transaction_hash}\nTransaction link for the token creation: {invocation.transaction.transaction_link}"
+    return f"Created WoW ERC20 memecoin {name} with symbol {symbol} on network {wallet.network_id}.\nTransaction hash for the token creation: {invocation.transaction.transaction_hash}\nTransaction link for the token creation: {invocation.transaction.transaction_link}{tracking_note(invocation)}"
 
 
 class WowCreateTokenAction(CdpAction):
@@ -0,0 +1,88 @@
+from collections.abc import Callable
+
+from cdp import Wallet
+from pydantic import BaseModel, Field
+
+from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.wow.registry import registry_sync, wow_registry
+
+WOW_LIST_TOKENS_PROMPT = """
+This tool lists and searches Zora Wow ERC20 memecoins from a local registry of all tokens created by the WOW factory.
+
+Inputs:
+- (Optional) Text to search for in the token name, symbol or address
+- (Optional) Creator address to filter by
+- (Optional) Whether to only list tokens that have, or have not, graduated to Uniswap
+- (Optional) Maximum number of tokens to list
+
+Important notes:
+- Searches are answered from the registry, which indexes new tokens in the background at most once a minute, so tokens created in the last few minutes may be missing
+- Only supported on the following networks:
+  - Base Sepolia (ie, 'base-sepolia')
+  - Base Mainnet (ie, 'base', 'base-mainnet')
+"""
+
+
+class WowListTokensInput(BaseModel):
+    """Input argument schema for list tokens action."""
+
+    query: str | None = Field(
+        None, description="Text to search for in the token name, symbol or address"
+    )
+    creator: str | None = Field(None, description="Only list tokens created by this address")
+    has_graduated: bool | None = Field(
+        None, description="Only list tokens that have, or have not, graduated to Uniswap"
+    )
+    limit: int = Field(20, description="Maximum number of tokens to list", ge=1, le=100)
+
+
+def wow_list_tokens(
+    wallet: Wallet,
+    query: str | None = None,
+    creator: str | None = None,
+    has_graduated: bool | None = None,
+    limit: int = 20,
+) -> str:
+    """List and search Zora Wow ERC20 memecoins.
+
+    Tokens are read from the local registry only, and a background sync of the registry is
+    requested, which starts at most once per `SYNC_INTERVAL`.
+
+    Args:
+        wallet (Wallet): The wallet whose network to list tokens on.
+        query (str | None): Text to search for in the token name, symbol or address.
+        creator (str | None): Only list tokens created by this address.
+        has_graduated (bool | None): Only list tokens with this graduation status.
+        limit (int): Maximum number of tokens to list.
+
+    Returns:
+        str: A message containing the matching tokens.
+
+    """
+    network_id = wallet.network_id
+    registry_sync.request(network_id)
+
+    tokens = wow_registry.list_tokens(network_id, query, creator, has_graduated, limit)
+
+    if not tokens:
+        if wow_registry.last_indexed_block(network_id) is None:
+            return f"The Zora Wow ERC20 memecoins on {network_id} are still being indexed, try again in a few minutes"
+        return f"No Zora Wow ERC20 memecoins found on {network_id}"
+
+    lines = [
+        f"- {token.name} ({token.symbol}): {token.token_address}, pool {token.pool_address}, "
+        f"created by {token.creator} at block {token.creation_block}, "
+        f"{'graduated to Uniswap' if token.has_graduated else 'on the bonding curve'}"
+        for token in tokens
+    ]
+    return f"Found {len(tokens)} Zora Wow ERC20 memecoins on {network_id}:\n" + "\n".join(lines)
+
+
+class WowListTokensAction(CdpAction):
+    """Zora Wow list tokens action."""
+
+    name: str = "wow_list_tokens"
+    description: str = WOW_LIST_TOKENS_PROMPT
+    args_schema: type[BaseModel] | None = WowListTokensInput
+    func: Callable[..., str] = wow_list_tokens
+    read_only: bool = True
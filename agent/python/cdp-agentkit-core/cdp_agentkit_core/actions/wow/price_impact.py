@@ -0,0 +1,305 @@
+"""Vectorized price impact curves for WOW tokens.
+
+Quotes for many order sizes are evaluated in float64 from a single fetch of the pool or curve
+state, which makes them suitable for searching over order sizes but not for slippage bounds.
+Use `get_buy_quote` and `get_sell_quote` for exact quotes.
+
+This module requires numpy, which is installed with the `numpy` extra:
+`pip install "cdp-agentkit-core[numpy]"`.
+"""
+
+from dataclasses import dataclass
+from typing import Literal
+
+from cdp_agentkit_core.actions.snapshot import run_in_snapshot
+from cdp_agentkit_core.actions.wow.bonding_curve import WAD, BondingCurve, bonding_curve
+from cdp_agentkit_core.actions.wow.constants import addresses
+from cdp_agentkit_core.actions.wow.uniswap.index import (
+    PoolInfo,
+    TickData,
+    get_pool_address,
+    get_pool_info,
+    get_tick_data,
+)
+from cdp_agentkit_core.actions.wow.uniswap.swap_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    Q96,
+    PoolState,
+    TickDataUnavailableError,
+    get_amount0_delta,
+    get_amount1_delta,
+    get_sqrt_ratio_at_tick,
+    next_initialized_tick_within_one_word,
+)
+from cdp_agentkit_core.actions.wow.utils import get_market_state
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@dataclass
+class PriceImpactCurve:
+    """Quotes for a batch of order sizes of one token.
+
+    Prices are in ETH per token, and price impact is the relative difference between the
+    effective price and the spot price, including fees. Order sizes that cannot be quoted are NaN.
+    """
+
+    amount_in: "np.ndarray"
+    amount_out: "np.ndarray"
+    effective_price: "np.ndarray"
+    price_impact: "np.ndarray"
+    spot_price: float
+
+    def max_amount_in(self, max_price_impact: float) -> float:
+        """Get the largest order size whose price impact is within a bound.
+
+        Args:
+            max_price_impact: The maximum price impact, such as 0.02 for 2%
+
+        Returns:
+            float: The largest amount in (in wei), or 0 if no order size is within the bound.
+
+        """
+        within = self.amount_in[self.price_impact <= max_price_impact]
+        return float(within.max()) if within.size else 0.0
+
+
+def get_price_impact_curve(
+    network_id: str,
+    token_address: str,
+    amounts: "np.ndarray",
+    quote_type: Literal["buy", "sell"],
+) -> PriceImpactCurve:
+    """Get quotes and price impact for a batch of order sizes.
+
+    The pool or bonding curve state is read once, within a single read snapshot, and every order
+    size is evaluated from it.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amounts: Order sizes (in wei), in ETH for buys and in tokens for sells
+        quote_type: 'buy' or 'sell'
+
+    Returns:
+        PriceImpactCurve: The amount out, effective price and price impact of each order size.
+
+    """
+    _require_numpy()
+
+    current_supply, pool, tick_data = run_in_snapshot(
+        network_id, _read_market, network_id, token_address
+    )
+    if pool is None:
+        return bonding_curve_price_impact(bonding_curve, current_supply, amounts, quote_type)
+
+    state = PoolState(
+        sqrt_price_x96=pool.sqrt_price_x96,
+        tick=pool.tick,
+        liquidity=pool.liquidity,
+        fee=pool.fee,
+        tick_spacing=tick_data.tick_spacing,
+        tick_bitmap=tick_data.tick_bitmap,
+        liquidity_net=tick_data.liquidity_net,
+        min_word=tick_data.min_word,
+        max_word=tick_data.max_word,
+    )
+    is_token0 = pool.token0.lower() == token_address.lower()
+    return uniswap_price_impact(state, is_token0, amounts, quote_type)
+
+
+def bonding_curve_price_impact(
+    curve: BondingCurve,
+    current_supply: int,
+    amounts: "np.ndarray",
+    quote_type: Literal["buy", "sell"],
+) -> PriceImpactCurve:
+    """Evaluate bonding curve quotes for a batch of order sizes.
+
+    Args:
+        curve: The bonding curve
+        current_supply: The current token supply (in wei)
+        amounts: Order sizes (in wei), in ETH for buys and in tokens for sells
+        quote_type: 'buy' or 'sell'
+
+    Returns:
+        PriceImpactCurve: The amount out, effective price and price impact of each order size.
+
+    """
+    _require_numpy()
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    # The curve is y = A * e^(B * x) with both A and B scaled by 1e18.
+    a, k = curve.a / WAD, curve.b / WAD**2
+    exp_k_x0 = np.exp(k * current_supply)
+    spot_price = a * exp_k_x0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if quote_type == "buy":
+            amount_out = np.log1p(amounts * k / (a * exp_k_x0)) / k
+        else:
+            amount_out = a / k * exp_k_x0 * -np.expm1(-k * amounts)
+            amount_out[amounts > current_supply] = np.nan
+
+    return _build_curve(amounts, amount_out, spot_price, quote_type)
+
+
+def uniswap_price_impact(
+    state: PoolState,
+    is_token0: bool,
+    amounts: "np.ndarray",
+    quote_type: Literal["buy", "sell"],
+) -> PriceImpactCurve:
+    """Evaluate Uniswap v3 quotes for a batch of order sizes.
+
+    The initialized ticks in the direction of the swap are walked once to build the constant
+    liquidity segments covering the largest order size, and every order size is then evaluated
+    within its segment.
+
+    Args:
+        state: The pool state
+        is_token0: Whether the token is token0 of the pool, with WETH as token1
+        amounts: Order sizes (in wei), in ETH for buys and in tokens for sells
+        quote_type: 'buy' or 'sell'
+
+    Returns:
+        PriceImpactCurve: The amount out, effective price and price impact of each order size.
+
+    """
+    _require_numpy()
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    # Buying spends WETH, so the swap is zero for one when WETH is token0.
+    zero_for_one = is_token0 if quote_type == "sell" else not is_token0
+    amounts_less_fee = amounts * (1_000_000 - state.fee) / 1_000_000
+
+    max_amount = int(amounts_less_fee.max()) + 1 if amounts_less_fee.size else 0
+    segments, complete = _liquidity_segments(state, zero_for_one, max_amount)
+
+    amount_out = np.zeros_like(amounts)
+    if segments:
+        sqrt_start, segment_in, segment_out, liquidity = (
+            np.array(column, dtype=np.float64) for column in zip(*segments, strict=True)
+        )
+        cumulative_in = np.concatenate(([0.0], np.cumsum(segment_in)))
+        cumulative_out = np.concatenate(([0.0], np.cumsum(segment_out)))
+
+        index = np.clip(
+            np.searchsorted(cumulative_in, amounts_less_fee, side="right") - 1, 0, len(segments) - 1
+        )
+        remaining = np.minimum(amounts_less_fee - cumulative_in[index], segment_in[index])
+        sqrt_price = sqrt_start[index] / Q96
+        segment_liquidity = liquidity[index]
+
+        # The price deltas are rearranged to avoid cancellation for small order sizes.
+        if zero_for_one:
+            out = (
+                segment_liquidity
+                * remaining
+                * sqrt_price**2
+                / (segment_liquidity + remaining * sqrt_price)
+            )
+        else:
+            sqrt_price_next = sqrt_price + remaining / segment_liquidity
+            out = remaining / (sqrt_price * sqrt_price_next)
+
+        amount_out = cumulative_out[index] + out
+        if not complete:
+            amount_out[amounts_less_fee > cumulative_in[-1]] = np.nan
+
+    # The pool price is token1 per token0.
+    price = (state.sqrt_price_x96 / Q96) ** 2
+    spot_price = price if is_token0 else 1 / price
+
+    return _build_curve(amounts, amount_out, spot_price, quote_type)
+
+
+def _read_market(
+    network_id: str, token_address: str
+) -> tuple[int, PoolInfo | None, TickData | None]:
+    has_graduated, current_supply = get_market_state(network_id, token_address)
+    if not has_graduated:
+        return current_supply, None, None
+
+    pool_address = get_pool_address(token_address, network_id)
+    pool = get_pool_info(network_id, pool_address, (token_address, addresses[network_id]["WETH"]))
+    return current_supply, pool, get_tick_data(network_id, pool_address, pool.tick)
+
+
+def _liquidity_segments(
+    state: PoolState, zero_for_one: bool, max_amount_in: int
+) -> tuple[list[tuple[int, int, int, int]], bool]:
+    # Walk the initialized ticks like the swap loop, recording (sqrt price at the start of the
+    # segment, amount in to cross it, amount out when crossed, liquidity) for each segment.
+    sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+    segments = []
+    sqrt_price_x96, tick, liquidity = state.sqrt_price_x96, state.tick, state.liquidity
+    amount_in = 0
+
+    while amount_in < max_amount_in and sqrt_price_x96 != sqrt_price_limit_x96:
+        try:
+            tick_next, initialized = next_initialized_tick_within_one_word(
+                state, tick, zero_for_one
+            )
+        except TickDataUnavailableError:
+            return segments, False
+
+        tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+        sqrt_price_next_x96 = get_sqrt_ratio_at_tick(tick_next)
+        if zero_for_one:
+            sqrt_price_next_x96 = max(sqrt_price_next_x96, sqrt_price_limit_x96)
+            segment_in = get_amount0_delta(sqrt_price_next_x96, sqrt_price_x96, liquidity, True)
+            segment_out = get_amount1_delta(sqrt_price_next_x96, sqrt_price_x96, liquidity, False)
+        else:
+            sqrt_price_next_x96 = min(sqrt_price_next_x96, sqrt_price_limit_x96)
+            segment_in = get_amount1_delta(sqrt_price_x96, sqrt_price_next_x96, liquidity, True)
+            segment_out = get_amount0_delta(sqrt_price_x96, sqrt_price_next_x96, liquidity, False)
+
+        if liquidity > 0:
+            segments.append((sqrt_price_x96, segment_in, segment_out, liquidity))
+            amount_in += segment_in
+
+        if initialized and sqrt_price_next_x96 == get_sqrt_ratio_at_tick(tick_next):
+            liquidity_net = state.liquidity_net.get(tick_next, 0)
+            liquidity += -liquidity_net if zero_for_one else liquidity_net
+        tick = tick_next - 1 if zero_for_one else tick_next
+        sqrt_price_x96 = sqrt_price_next_x96
+
+    return segments, True
+
+
+def _build_curve(
+    amounts: "np.ndarray",
+    amount_out: "np.ndarray",
+    spot_price: float,
+    quote_type: Literal["buy", "sell"],
+) -> PriceImpactCurve:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if quote_type == "buy":
+            effective_price = amounts / amount_out
+            price_impact = effective_price / spot_price - 1
+        else:
+            effective_price = amount_out / amounts
+            price_impact = 1 - effective_price / spot_price
+
+    return PriceImpactCurve(
+        amount_in=amounts,
+        amount_out=amount_out,
+        effective_price=effective_price,
+        price_impact=price_impact,
+        spot_price=float(spot_price),
+    )
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "numpy is required for price impact curves. Install it with "
+            '`pip install "cdp-agentkit-core[numpy]"`.'
+        )
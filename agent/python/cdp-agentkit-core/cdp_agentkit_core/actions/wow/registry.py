@@ -0,0 +1,549 @@
+"""Local registry of WOW tokens, indexed from the token creation events of the WOW factory.
+
+The registry maps each token to its Uniswap pool, creator, creation block and graduation
+status, and is kept up to date by incremental syncs from the last indexed block. Pool lookups
+and token searches are then served from a local SQLite database instead of the chain, while
+`registry_sync` runs syncs in the background, at most once per `SYNC_INTERVAL` per network.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from cdp import Cdp, SmartContract
+from cdp.client.api.contract_events_api import ContractEventsApi
+
+from cdp_agentkit_core.actions.abi_codec import checksum_address
+from cdp_agentkit_core.actions.constants import MULTICALL3_ABI, MULTICALL3_ADDRESS
+from cdp_agentkit_core.actions.multicall import ContractRead, multicall_read
+from cdp_agentkit_core.actions.read_cache import read_cache
+from cdp_agentkit_core.actions.wow.constants import (
+    WOW_ABI,
+    WOW_FACTORY_START_BLOCKS,
+    get_factory_address,
+)
+
+DEFAULT_REGISTRY_PATH = Path.home() / ".cdp_agentkit" / "wow_registry.sqlite3"
+
+# Names the WOW factory and its events are indexed under by the CDP contract events API.
+WOW_EVENTS_PROTOCOL_NAME = "wow"
+WOW_FACTORY_CONTRACT_NAME = "WowFactory"
+WOW_TOKEN_CREATED_EVENT = "WowTokenCreated"
+
+# Number of blocks requested per contract events query during a sync.
+SYNC_BLOCK_RANGE = 500_000
+# Number of tokens whose market type is read per Multicall3 batch when refreshing graduations.
+GRADUATION_BATCH_SIZE = 500
+# Minimum number of seconds between the starts of two background syncs of a network.
+SYNC_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wow_tokens (
+    network_id TEXT NOT NULL,
+    token_address TEXT NOT NULL,
+    pool_address TEXT NOT NULL,
+    creator TEXT NOT NULL,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    token_uri TEXT NOT NULL,
+    creation_block INTEGER NOT NULL,
+    has_graduated INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (network_id, token_address)
+);
+CREATE INDEX IF NOT EXISTS wow_tokens_by_creator ON wow_tokens (network_id, creator);
+CREATE INDEX IF NOT EXISTS wow_tokens_by_block ON wow_tokens (network_id, creation_block);
+CREATE TABLE IF NOT EXISTS wow_sync_state (
+    network_id TEXT PRIMARY KEY,
+    factory_address TEXT NOT NULL,
+    last_indexed_block INTEGER NOT NULL
+);
+"""
+
+_TOKEN_COLUMNS = (
+    "network_id, token_address, pool_address, creator, name, symbol, token_uri, "
+    "creation_block, has_graduated"
+)
+
+
+@dataclass
+class WowToken:
+    """A WOW token recorded in the registry."""
+
+    network_id: str
+    token_address: str
+    pool_address: str
+    creator: str
+    name: str
+    symbol: str
+    token_uri: str
+    creation_block: int
+    has_graduated: bool = False
+
+
+class WowRegistry:
+    """SQLite registry of WOW tokens.
+
+    Addresses are stored in lowercase and returned checksummed. The database file is only
+    created by the first write, so lookups against a registry that was never synced are cheap
+    misses.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_REGISTRY_PATH):
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def get_token(self, network_id: str, token_address: str) -> WowToken | None:
+        """Look up a token.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            token_address: Address of the token contract
+
+        Returns:
+            WowToken | None: The token, or None if it is not in the registry.
+
+        """
+        rows = self._query(
+            f"SELECT {_TOKEN_COLUMNS} FROM wow_tokens WHERE network_id = ? AND token_address = ?",
+            (network_id, token_address.lower()),
+        )
+        return _token_from_row(rows[0]) if rows else None
+
+    def get_pool_address(self, network_id: str, token_address: str) -> str | None:
+        """Look up the Uniswap v3 pool address of a token.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            token_address: Address of the token contract
+
+        Returns:
+            str | None: The pool address, or None if the token is not in the registry.
+
+        """
+        token = self.get_token(network_id, token_address)
+        return token.pool_address if token else None
+
+    def list_tokens(
+        self,
+        network_id: str,
+        query: str | None = None,
+        creator: str | None = None,
+        has_graduated: bool | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[WowToken]:
+        """List tokens, most recently created first.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            query: Only list tokens whose name or symbol contains, or whose address starts
+                with, this case-insensitive text
+            creator: Only list tokens created by this address
+            has_graduated: Only list tokens with this graduation status
+            limit: Maximum number of tokens to return
+            offset: Number of tokens to skip
+
+        Returns:
+            list[WowToken]: The matching tokens.
+
+        """
+        conditions, params = ["network_id = ?"], [network_id]
+        if query:
+            escaped = query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append(
+                "(LOWER(name) LIKE ? ESCAPE '\\' OR LOWER(symbol) LIKE ? ESCAPE '\\' "
+                "OR token_address LIKE ? ESCAPE '\\')"
+            )
+            params += [f"%{escaped}%", f"%{escaped}%", f"{escaped}%"]
+        if creator is not None:
+            conditions.append("creator = ?")
+            params.append(creator.lower())
+        if has_graduated is not None:
+            conditions.append("has_graduated = ?")
+            params.append(int(has_graduated))
+
+        rows = self._query(
+            f"SELECT {_TOKEN_COLUMNS} FROM wow_tokens WHERE {' AND '.join(conditions)} "
+            "ORDER BY creation_block DESC, token_address LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        return [_token_from_row(row) for row in rows]
+
+    def search_tokens(self, network_id: str, query: str, limit: int = 50) -> list[WowToken]:
+        """Search tokens by name, symbol or address prefix, most recently created first.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            query: Case-insensitive text to search for
+            limit: Maximum number of tokens to return
+
+        Returns:
+            list[WowToken]: The matching tokens.
+
+        """
+        return self.list_tokens(network_id, query=query, limit=limit)
+
+    def ungraduated_tokens(self, network_id: str) -> list[str]:
+        """Get the addresses of all tokens which are still on the bonding curve.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+
+        Returns:
+            list[str]: The token addresses.
+
+        """
+        rows = self._query(
+            "SELECT token_address FROM wow_tokens WHERE network_id = ? AND has_graduated = 0",
+            (network_id,),
+        )
+        return [checksum_address(row[0]) for row in rows]
+
+    def last_indexed_block(self, network_id: str) -> int | None:
+        """Get the last block indexed for a network.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+
+        Returns:
+            int | None: The last indexed block, or None if the network was never synced.
+
+        """
+        rows = self._query(
+            "SELECT last_indexed_block FROM wow_sync_state WHERE network_id = ?", (network_id,)
+        )
+        return rows[0][0] if rows else None
+
+    def record_tokens(
+        self,
+        network_id: str,
+        factory_address: str,
+        tokens: list[WowToken],
+        last_indexed_block: int,
+    ) -> None:
+        """Record newly indexed tokens and advance the sync state, in a single transaction.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            factory_address: Address of the indexed WOW factory
+            tokens: The tokens created within the indexed blocks
+            last_indexed_block: The last block indexed
+
+        """
+        with self._lock:
+            connection = self._connect(create=True)
+            with connection:
+                connection.executemany(
+                    f"INSERT INTO wow_tokens ({_TOKEN_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (network_id, token_address) DO NOTHING",
+                    [_token_to_row(token) for token in tokens],
+                )
+                connection.execute(
+                    "INSERT INTO wow_sync_state (network_id, factory_address, last_indexed_block) "
+                    "VALUES (?, ?, ?) ON CONFLICT (network_id) DO UPDATE SET "
+                    "factory_address = excluded.factory_address, "
+                    "last_indexed_block = excluded.last_indexed_block",
+                    (network_id, factory_address.lower(), last_indexed_block),
+                )
+
+    def mark_graduated(self, network_id: str, token_addresses: list[str]) -> None:
+        """Mark tokens as graduated to Uniswap.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            token_addresses: Addresses of the graduated tokens
+
+        """
+        with self._lock:
+            connection = self._connect(create=True)
+            with connection:
+                connection.executemany(
+                    "UPDATE wow_tokens SET has_graduated = 1 "
+                    "WHERE network_id = ? AND token_address = ?",
+                    [(network_id, address.lower()) for address in token_addresses],
+                )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return []
+            return connection.execute(sql, params).fetchall()
+
+    def _connect(self, create: bool) -> sqlite3.Connection | None:
+        if self._connection is None:
+            if not create and not self.path.exists():
+                return None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+
+# Process-wide registry shared by all actions.
+wow_registry = WowRegistry()
+
+
+def sync_registry(
+    network_id: str,
+    registry: WowRegistry | None = None,
+    start_block: int | None = None,
+    to_block: int | None = None,
+) -> int:
+    """Index the WOW tokens created since the last sync, and refresh their graduation status.
+
+    Token creation events of the network's WOW factory are fetched from the CDP contract events
+    API in ranges of `SYNC_BLOCK_RANGE` blocks. Each range is recorded in its own transaction,
+    so an interrupted sync resumes from the last recorded range.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        registry: The registry to sync, defaults to the process-wide registry
+        start_block: The block to start from when the network was never synced, defaults to
+            the network's entry in `WOW_FACTORY_START_BLOCKS`
+        to_block: The last block to index, defaults to the latest block
+
+    Returns:
+        int: The number of newly indexed tokens.
+
+    """
+    registry = registry or wow_registry
+    factory_address = get_factory_address(network_id)
+
+    if start_block is None:
+        start_block = WOW_FACTORY_START_BLOCKS.get(network_id, 0)
+    last_indexed_block = registry.last_indexed_block(network_id)
+    from_block = start_block if last_indexed_block is None else last_indexed_block + 1
+    if to_block is None:
+        to_block = SmartContract.read(
+            network_id, MULTICALL3_ADDRESS, "getBlockNumber", abi=MULTICALL3_ABI
+        )
+
+    indexed = 0
+    for range_start in range(from_block, to_block + 1, SYNC_BLOCK_RANGE):
+        range_end = min(range_start + SYNC_BLOCK_RANGE - 1, to_block)
+        tokens = [
+            token
+            for event in _list_token_created_events(
+                network_id, factory_address, range_start, range_end
+            )
+            if (token := _parse_token_created(network_id, event)) is not None
+        ]
+        registry.record_tokens(network_id, factory_address, tokens, range_end)
+        indexed += len(tokens)
+
+    refresh_graduations(network_id, registry)
+    return indexed
+
+
+def refresh_graduations(network_id: str, registry: WowRegistry | None = None) -> list[str]:
+    """Refresh the graduation status of the tokens still on the bonding curve.
+
+    Graduation is permanent, so only tokens that have not graduated yet are read, in Multicall3
+    batches of `GRADUATION_BATCH_SIZE` tokens.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        registry: The registry to refresh, defaults to the process-wide registry
+
+    Returns:
+        list[str]: The addresses of the tokens which graduated since the last refresh.
+
+    """
+    registry = registry or wow_registry
+    pending_addresses = registry.ungraduated_tokens(network_id)
+
+    graduated = []
+    for start in range(0, len(pending_addresses), GRADUATION_BATCH_SIZE):
+        batch = pending_addresses[start : start + GRADUATION_BATCH_SIZE]
+        market_types = multicall_read(
+            network_id, [ContractRead(address, "marketType", WOW_ABI) for address in batch]
+        )
+        graduated += [
+            address
+            for address, market_type in zip(batch, market_types, strict=True)
+            if market_type == 1
+        ]
+
+    if graduated:
+        registry.mark_graduated(network_id, graduated)
+    return graduated
+
+
+class RegistrySync:
+    """Runs syncs of the WOW token registry in background threads.
+
+    At most one sync per network runs at a time, and a new one is only started `interval`
+    seconds after the previous one started, so that frequent searches do not scan the chain.
+    """
+
+    def __init__(self, interval: float = SYNC_INTERVAL):
+        self.interval = interval
+        self._threads: dict[str, threading.Thread] = {}
+        self._started_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def request(self, network_id: str, registry: WowRegistry | None = None) -> bool:
+        """Start a background sync of a network, unless one ran recently.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            registry: The registry to sync, defaults to the process-wide registry
+
+        Returns:
+            bool: Whether a sync was started.
+
+        """
+        with self._lock:
+            thread = self._threads.get(network_id)
+            if thread is not None and thread.is_alive():
+                return False
+            started_at = self._started_at.get(network_id)
+            if started_at is not None and time.monotonic() - started_at < self.interval:
+                return False
+
+            self._started_at[network_id] = time.monotonic()
+            thread = threading.Thread(
+                target=self._sync,
+                args=(network_id, registry),
+                name=f"wow-registry-sync-{network_id}",
+                daemon=True,
+            )
+            self._threads[network_id] = thread
+            thread.start()
+            return True
+
+    def wait(self, network_id: str, timeout: float | None = None) -> None:
+        """Wait for the background sync of a network to finish, if one is running.
+
+        Args:
+            network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+            timeout: The maximum number of seconds to wait
+
+        """
+        with self._lock:
+            thread = self._threads.get(network_id)
+        if thread is not None:
+            thread.join(timeout)
+
+    def clear(self) -> None:
+        """Forget when each network was last synced, so that the next request starts a sync."""
+        with self._lock:
+            self._started_at.clear()
+
+    def _sync(self, network_id: str, registry: WowRegistry | None) -> None:
+        try:
+            sync_registry(network_id, registry)
+        except Exception as e:
+            print(f"Failed to sync the WOW token registry for {network_id}: {e!s}")
+
+
+# Process-wide background syncs of the process-wide registry.
+registry_sync = RegistrySync()
+
+
+def prime_read_cache(
+    network_id: str, token_address: str, registry: WowRegistry | None = None
+) -> bool:
+    """Seed the read cache with the immutable state of a token known to the registry.
+
+    The pool address never changes, and neither does the market type of a graduated token, so
+    reads of either are served from the cache once it is primed.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Address of the token contract
+        registry: The registry to look the token up in, defaults to the process-wide registry
+
+    Returns:
+        bool: Whether the token was found in the registry.
+
+    """
+    token = (registry or wow_registry).get_token(network_id, token_address)
+    if token is None:
+        return False
+
+    read_cache.set(network_id, token_address, "poolAddress", None, token.pool_address, abi=WOW_ABI)
+    if token.has_graduated:
+        read_cache.set(network_id, token_address, "marketType", None, 1, abi=WOW_ABI)
+    return True
+
+
+def _list_token_created_events(
+    network_id: str, factory_address: str, from_block: int, to_block: int
+) -> Iterator:
+    api = ContractEventsApi(api_client=Cdp.api_clients._cdp_client)
+    next_page = None
+    while True:
+        page = api.list_contract_events(
+            network_id=network_id,
+            protocol_name=WOW_EVENTS_PROTOCOL_NAME,
+            contract_address=factory_address.lower(),
+            contract_name=WOW_FACTORY_CONTRACT_NAME,
+            event_name=WOW_TOKEN_CREATED_EVENT,
+            from_block_height=from_block,
+            to_block_height=to_block,
+            next_page=next_page,
+        )
+        yield from page.data
+        if not page.has_more or not page.next_page:
+            return
+        next_page = page.next_page
+
+
+def _parse_token_created(network_id: str, event) -> WowToken | None:
+    try:
+        data = json.loads(event.data)
+        return WowToken(
+            network_id=network_id,
+            token_address=checksum_address(data["tokenAddress"]),
+            pool_address=checksum_address(data["poolAddress"]),
+            creator=checksum_address(data["tokenCreator"]),
+            name=data.get("name", ""),
+            symbol=data.get("symbol", ""),
+            token_uri=data.get("tokenURI", ""),
+            creation_block=event.block_height,
+        )
+    except Exception as error:
+        print(f"Skipping malformed {WOW_TOKEN_CREATED_EVENT} event in {event.tx_hash}: {error}")
+        return None
+
+
+def _token_to_row(token: WowToken) -> tuple:
+    return (
+        token.network_id,
+        token.token_address.lower(),
+        token.pool_address.lower(),
+        token.creator.lower(),
+        token.name,
+        token.symbol,
+        token.token_uri,
+        token.creation_block,
+        int(token.has_graduated),
+    )
+
+
+def _token_from_row(row: tuple) -> WowToken:
+    return WowToken(
+        network_id=row[0],
+        token_address=checksum_address(row[1]),
+        pool_address=checksum_address(row[2]),
+        creator=checksum_address(row[3]),
+        name=row[4],
+        symbol=row[5],
+        token_uri=row[6],
+        creation_block=row[7],
+        has_graduated=bool(row[8]),
+    )
@@ -4,11 +4,11 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions.cdp_action import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 from cdp_agentkit_core.actions.wow.constants import (
     WOW_ABI,
 )
-from cdp_agentkit_core.actions.wow.uniswap.index import get_has_graduated
-from cdp_agentkit_core.actions.wow.utils import get_sell_quote
+from cdp_agentkit_core.actions.wow.utils import get_trade_context
 
 WOW_SELL_TOKEN_PROMPT = """
 This tool can only be used to sell a Zora Wow ERC20 memecoin for ETH. Do not use this tool for any other purpose, or trading other assets.
@@ -54,13 +54,13 @@ def wow_sell_token(wallet: Wallet, contract_address: str, amount_tokens_in_wei:
         str: A message confirming the sale with the transaction hash
 
     """
-    eth_quote = get_sell_quote(wallet.network_id, contract_address, amount_tokens_in_wei)
-    has_graduated = get_has_graduated(wallet.network_id, contract_address)
+    context = get_trade_context(wallet.network_id, contract_address, amount_tokens_in_wei, "sell")
 
-    # Multiply by 98/100 and floor to get 98% of quote as minimum (slippage protection)
-    min_eth = str(int((eth_quote * 98) // 100))
+    # Accept up to 2% slippage from the quote
+    min_eth = context.min_amount_out(2)
 
     try:
+        context.mark_submitted()
         invocation = wallet.invoke_contract(
             contract_address=contract_address,
             method="sell",
@@ -70,17 +70,16 @@ def wow_sell_token(wallet: Wallet, contract_address: str, amount_tokens_in_wei:
                 "recipient": wallet.default_address.address_id,
                 "orderReferrer": "0x0000000000000000000000000000000000000000",
                 "comment": "",
-                "expectedMarketType": "1" if has_graduated else "0",
+                "expectedMarketType": context.expected_market_type,
                 "minPayoutSize": min_eth,
                 "sqrtPriceLimitX96": "0",
             },
-        ).wait()
+        )
+        invocation = wait_or_track(invocation, "wow_sell_token")
     except Exception as e:
         return f"Error selling Zora Wow ERC20 memecoin {e!s}"
 
-    return (
-        f"Sold WoW ERC20 memecoin with transaction hash: {invocation.transaction.transaction_hash}"
-    )
+    return f"Sold WoW ERC20 memecoin with transaction hash: {invocation.transaction.transaction_hash}{tracking_note(invocation)}"
 
 
 class WowSellTokenAction(CdpAction):
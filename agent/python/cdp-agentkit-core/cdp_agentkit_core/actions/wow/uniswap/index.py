@@ -1,13 +1,33 @@
+import threading
+import time
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Literal
 
-from cdp import SmartContract
 from web3 import Web3
 from web3.types import Wei
 
+from cdp_agentkit_core.actions.abi_codec import checksum_address
+from cdp_agentkit_core.actions.multicall import ContractRead, multicall_read
+from cdp_agentkit_core.actions.read_cache import cached_read
+from cdp_agentkit_core.actions.snapshot import SnapshotDriftError, run_in_snapshot
+from cdp_agentkit_core.actions.utils import DEFAULT_READ_TIMEOUT, run_with_timeout
 from cdp_agentkit_core.actions.wow.constants import WOW_ABI, addresses
+from cdp_agentkit_core.actions.wow.registry import wow_registry
 from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_QUOTER_ABI, UNISWAP_V3_ABI
+from cdp_agentkit_core.actions.wow.uniswap.swap_math import (
+    MAX_TICK,
+    MIN_TICK,
+    PoolState,
+    TickDataUnavailableError,
+    swap_exact_input,
+)
+
+# Initialized ticks only change when liquidity is added or removed, so they are cached for much
+# longer than the pool price.
+TICK_DATA_TTL = 300.0
+# Maximum number of tick bitmap words fetched for a pool, centered on the current tick.
+MAX_TICK_BITMAP_WORDS = 256
 
 
 @dataclass
@@ -56,6 +76,18 @@ class PoolInfo:
     fee: int
     liquidity: int
     sqrt_price_x96: int
+    tick: int | None = None
+
+
+@dataclass
+class TickData:
+    """Initialized ticks of a uniswap v3 pool, for the tick bitmap words between min_word and max_word."""
+
+    tick_spacing: int
+    tick_bitmap: dict[int, int]
+    liquidity_net: dict[int, int]
+    min_word: int
+    max_word: int
 
 
 def create_price_info(wei_amount: Wei, eth_price_in_usd: float) -> PriceInfo:
@@ -85,7 +117,7 @@ def get_has_graduated(network_id: str, token_address: str) -> bool:
         bool: True if the token has graduated, False otherwise
 
     """
-    market_type = SmartContract.read(
+    market_type = cached_read(
         network_id,
         contract_address=token_address,
         method="marketType",
@@ -94,65 +126,35 @@ def get_has_graduated(network_id: str, token_address: str) -> bool:
     return market_type == 1
 
 
-def get_pool_info(network_id: str, pool_address: str) -> PoolInfo:
+def get_pool_info(
+    network_id: str, pool_address: str, token_pair: tuple[str, str] | None = None
+) -> PoolInfo:
     """Get pool info for a given uniswap v3 pool address.
 
+    All reads are batched through Multicall3. When the pair of tokens in the pool is known up
+    front, the token balances are included in the same batch, so the pool info is fetched in a
+    single round trip.
+
     Args:
         network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
         pool_address: Uniswap v3 pool address
+        token_pair: Optional addresses of the two tokens in the pool, in any order
 
     Returns:
         PoolInfo: A PoolInfo object containing the token0, balance0, token1, balance1, fee, liquidity, and sqrt_price_x96.
 
     """
     try:
-        # Parallel execution of contract calls
-        token0 = SmartContract.read(
-            network_id,
-            pool_address,
-            "token0",
-            abi=UNISWAP_V3_ABI,
-        )
-        token1 = SmartContract.read(
-            network_id,
-            pool_address,
-            "token1",
-            abi=UNISWAP_V3_ABI,
-        )
-        fee = SmartContract.read(
-            network_id,
-            pool_address,
-            "fee",
-            abi=UNISWAP_V3_ABI,
-        )
-        liquidity = SmartContract.read(
-            network_id,
-            pool_address,
-            "liquidity",
-            abi=UNISWAP_V3_ABI,
-        )
-        slot0 = SmartContract.read(
-            network_id,
-            pool_address,
-            "slot0",
-            abi=UNISWAP_V3_ABI,
-        )
-
-        balance0 = SmartContract.read(
-            network_id,
-            token0,
-            "balanceOf",
-            abi=WOW_ABI,
-            args={"account": pool_address},
-        )
-
-        balance1 = SmartContract.read(
-            network_id,
-            token1,
-            "balanceOf",
-            abi=WOW_ABI,
-            args={"account": pool_address},
-        )
+        if token_pair:
+            results = multicall_read(network_id, pool_info_reads(pool_address, token_pair))
+            token0, token1, fee, liquidity, slot0, balance0, balance1 = results
+        else:
+            token0, token1, fee, liquidity, slot0 = multicall_read(
+                network_id, pool_info_reads(pool_address)
+            )
+            balance0, balance1 = multicall_read(
+                network_id, _balance_reads(pool_address, token0, token1)
+            )
 
         return PoolInfo(
             token0=token0,
@@ -162,11 +164,208 @@ def get_pool_info(network_id: str, pool_address: str) -> PoolInfo:
             fee=fee,
             liquidity=liquidity,
             sqrt_price_x96=slot0[0],
+            tick=slot0[1],
         )
+    except SnapshotDriftError:
+        # Left to the enclosing snapshot, which restarts the reads at the new block.
+        raise
     except Exception as error:
         raise Exception(f"Failed to fetch pool information: {error!s}") from error
 
 
+def pool_info_reads(
+    pool_address: str, token_pair: tuple[str, str] | None = None
+) -> list[ContractRead]:
+    """Get the contract reads that make up the pool info of a uniswap v3 pool.
+
+    Args:
+        pool_address: Uniswap v3 pool address
+        token_pair: Optional addresses of the two tokens in the pool, in any order, to include
+            the token balances of the pool
+
+    Returns:
+        list[ContractRead]: The token0, token1, fee, liquidity and slot0 reads, followed by the
+            balance0 and balance1 reads when the token pair is given.
+
+    """
+    reads = [
+        ContractRead(pool_address, method, UNISWAP_V3_ABI)
+        for method in ("token0", "token1", "fee", "liquidity", "slot0")
+    ]
+    if token_pair:
+        # Uniswap v3 pools always order their tokens by address.
+        sorted_pair = sorted(token_pair, key=lambda address: int(address, 16))
+        reads += _balance_reads(pool_address, *sorted_pair)
+    return reads
+
+
+def _balance_reads(pool_address: str, token0: str, token1: str) -> list[ContractRead]:
+    return [
+        ContractRead(token, "balanceOf", WOW_ABI, args={"account": pool_address})
+        for token in (token0, token1)
+    ]
+
+
+_tick_data_cache: dict[tuple[str, str], tuple[TickData, float]] = {}
+_tick_data_lock = threading.Lock()
+
+
+def get_tick_data(network_id: str, pool_address: str, tick: int) -> TickData:
+    """Get the initialized ticks of a uniswap v3 pool around the given tick.
+
+    The tick bitmap words and the initialized ticks are fetched through Multicall3 and cached
+    for `TICK_DATA_TTL` seconds, as long as the given tick stays within the fetched words.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        pool_address: Uniswap v3 pool address
+        tick: The current tick of the pool
+
+    Returns:
+        TickData: The tick spacing, tick bitmap words, and net liquidity of each initialized tick.
+
+    """
+    key = (network_id, pool_address.lower())
+    with _tick_data_lock:
+        cached = _tick_data_cache.get(key)
+    if cached is not None:
+        tick_data, fetched_at = cached
+        word = (tick // tick_data.tick_spacing) >> 8
+        if (
+            time.monotonic() - fetched_at < TICK_DATA_TTL
+            and tick_data.min_word <= word <= tick_data.max_word
+        ):
+            return tick_data
+
+    tick_data = _fetch_tick_data(network_id, pool_address, tick)
+    with _tick_data_lock:
+        _tick_data_cache[key] = (tick_data, time.monotonic())
+    return tick_data
+
+
+def clear_tick_data_cache() -> None:
+    """Remove all cached tick data."""
+    with _tick_data_lock:
+        _tick_data_cache.clear()
+
+
+def _fetch_tick_data(network_id: str, pool_address: str, tick: int) -> TickData:
+    tick_spacing = cached_read(network_id, pool_address, "tickSpacing", abi=UNISWAP_V3_ABI)
+
+    min_word = (MIN_TICK // tick_spacing) >> 8
+    max_word = (MAX_TICK // tick_spacing) >> 8
+    if max_word - min_word + 1 > MAX_TICK_BITMAP_WORDS:
+        current_word = (tick // tick_spacing) >> 8
+        min_word = max(min_word, current_word - MAX_TICK_BITMAP_WORDS // 2)
+        max_word = min(max_word, min_word + MAX_TICK_BITMAP_WORDS - 1)
+
+    words = range(min_word, max_word + 1)
+    bitmap_words = multicall_read(
+        network_id,
+        [
+            ContractRead(pool_address, "tickBitmap", UNISWAP_V3_ABI, {"wordPosition": word})
+            for word in words
+        ],
+    )
+    tick_bitmap = {word: bits for word, bits in zip(words, bitmap_words, strict=True) if bits}
+
+    initialized_ticks = [
+        ((word << 8) + bit) * tick_spacing
+        for word, bits in tick_bitmap.items()
+        for bit in range(256)
+        if bits >> bit & 1
+    ]
+    tick_infos = multicall_read(
+        network_id,
+        [
+            ContractRead(pool_address, "ticks", UNISWAP_V3_ABI, {"tick": initialized_tick})
+            for initialized_tick in initialized_ticks
+        ],
+    )
+    liquidity_net = {
+        initialized_tick: _liquidity_net(tick_info)
+        for initialized_tick, tick_info in zip(initialized_ticks, tick_infos, strict=True)
+    }
+
+    return TickData(tick_spacing, tick_bitmap, liquidity_net, min_word, max_word)
+
+
+def _liquidity_net(tick_info) -> int:
+    if isinstance(tick_info, dict):
+        return int(tick_info["liquidityNet"])
+    return int(tick_info[1])
+
+
+def exact_input_single_local(
+    network_id: str, pool_address: str, pool: PoolInfo, token_in: str, amount_in: int
+) -> int:
+    """Compute an exact input quote locally from the pool state and its initialized ticks.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        pool_address: Uniswap v3 pool address
+        pool: The current pool info, including the current tick
+        token_in: Token address to swap from, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amount_in: Amount of tokens to swap (in Wei)
+
+    Returns:
+        int: Amount of tokens to receive (in Wei)
+
+    Raises:
+        TickDataUnavailableError: If the swap needs ticks outside of the fetched tick data.
+
+    """
+    if pool.tick is None:
+        raise TickDataUnavailableError("Current tick of the pool is unknown")
+
+    tick_data = get_tick_data(network_id, pool_address, pool.tick)
+    state = PoolState(
+        sqrt_price_x96=pool.sqrt_price_x96,
+        tick=pool.tick,
+        liquidity=pool.liquidity,
+        fee=pool.fee,
+        tick_spacing=tick_data.tick_spacing,
+        tick_bitmap=tick_data.tick_bitmap,
+        liquidity_net=tick_data.liquidity_net,
+        min_word=tick_data.min_word,
+        max_word=tick_data.max_word,
+    )
+    zero_for_one = token_in.lower() == pool.token0.lower()
+    return swap_exact_input(state, zero_for_one, int(amount_in))
+
+
+def quote_exact_input(
+    network_id: str,
+    pool_address: str,
+    pool: PoolInfo,
+    token_in: str,
+    token_out: str,
+    amount_in: int,
+) -> int:
+    """Get an exact input quote, computed locally with the on-chain quoter as a fallback.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        pool_address: Uniswap v3 pool address
+        pool: The current pool info
+        token_in: Token address to swap from, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        token_out: Token address to swap to, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amount_in: Amount of tokens to swap (in Wei)
+
+    Returns:
+        int: Amount of tokens to receive (in Wei)
+
+    """
+    try:
+        return exact_input_single_local(network_id, pool_address, pool, token_in, amount_in)
+    except SnapshotDriftError:
+        # The quoter fallback would read outside the pinned block; restart the snapshot instead.
+        raise
+    except Exception as error:
+        print(f"Local quote unavailable, falling back to quoter: {error}")
+        return exact_input_single(network_id, token_in, token_out, amount_in, pool.fee)
+
+
 def exact_input_single(
     network_id: str, token_in: str, token_out: str, amount_in: str, fee: str
 ) -> int:
@@ -184,14 +383,14 @@ def exact_input_single(
 
     """
     try:
-        amount = SmartContract.read(
+        amount = cached_read(
             network_id,
             addresses[network_id]["UniswapQuoter"],
             "quoteExactInputSingle",
             abi=UNISWAP_QUOTER_ABI,
             args={
-                "tokenIn": str(Web3.to_checksum_address(token_in)),
-                "tokenOut": str(Web3.to_checksum_address(token_out)),
+                "tokenIn": checksum_address(token_in),
+                "tokenOut": checksum_address(token_out),
                 "fee": fee,
                 "amountIn": amount_in,
                 "sqrtPriceLimitX96": 0,
@@ -209,6 +408,10 @@ def get_uniswap_quote(
 ) -> Quote:
     """Get Uniswap quote for buying or selling tokens.
 
+    The quote is computed locally from the pool state and its initialized ticks, which are read
+    within a single read snapshot. The on-chain quoter is only used when the local quote cannot
+    be computed.
+
     Args:
         network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
         token_address: Token address, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
@@ -220,46 +423,184 @@ def get_uniswap_quote(
 
     """
     pool = None
-    tokens = None
-    balances = None
-    eth_price_in_usd = None
     quote_result = None
     utilization = Wei(0)
     insufficient_liquidity = False
 
-    pool_address = get_pool_address(token_address)
-    invalid_pool_error = "Invalid pool address" if not pool_address else None
+    pool_address = get_pool_address(token_address, network_id)
     print("pool address: " + pool_address)
 
     try:
-        pool_info = get_pool_info(network_id, pool_address)
-        token0, token1 = pool_info.token0, pool_info.token1
-        balance0, balance1 = pool_info.balance0, pool_info.balance1
-        fee = pool_info.fee
-
-        pool = pool_info
-        tokens = (token0, token1)
-        balances = (balance0, balance1)
-
-        is_token0_weth = token0.lower() == addresses[network_id]["WETH"].lower()
-        token_in = (
-            token0
-            if (quote_type == "buy" and is_token0_weth)
-            or (quote_type == "sell" and not is_token0_weth)
-            else token1
+        pool, quote_result, insufficient_liquidity, utilization = run_in_snapshot(
+            network_id, _read_quote, network_id, token_address, pool_address, amount, quote_type
         )
-
-        token_out, balance_out = (token1, balance1) if token_in == token0 else (token0, balance0)
-        print("123", balance_out, amount)
-        print(type(balance_out), type(amount))
-        insufficient_liquidity = quote_type == "buy" and amount > balance_out
-        utilization = Wei(int(amount / balance_out)) if quote_type == "buy" else Wei(0)
-
-        quote_result = exact_input_single(network_id, token_in, token_out, amount, fee)
         print("quote_result", quote_result)
     except Exception as error:
         print(f"Error fetching quote: {error}")
 
+    return _build_quote(
+        network_id,
+        amount,
+        quote_type,
+        pool_address,
+        pool,
+        quote_result,
+        insufficient_liquidity,
+        utilization,
+    )
+
+
+async def get_has_graduated_async(
+    network_id: str, token_address: str, timeout: float = DEFAULT_READ_TIMEOUT
+) -> bool:
+    """Check if a token has graduated from the Zora Wow protocol, without blocking the event loop.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Token address, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        timeout: Maximum number of seconds to wait for the read
+
+    Returns:
+        bool: True if the token has graduated, False otherwise
+
+    """
+    return await run_with_timeout(get_has_graduated, network_id, token_address, timeout=timeout)
+
+
+async def get_pool_info_async(
+    network_id: str,
+    pool_address: str,
+    token_pair: tuple[str, str] | None = None,
+    timeout: float = DEFAULT_READ_TIMEOUT,
+) -> PoolInfo:
+    """Get pool info for a given uniswap v3 pool address, without blocking the event loop.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        pool_address: Uniswap v3 pool address
+        token_pair: Optional addresses of the two tokens in the pool, in any order
+        timeout: Maximum number of seconds to wait for the reads
+
+    Returns:
+        PoolInfo: A PoolInfo object containing the token0, balance0, token1, balance1, fee, liquidity, and sqrt_price_x96.
+
+    """
+    return await run_with_timeout(
+        get_pool_info, network_id, pool_address, token_pair, timeout=timeout
+    )
+
+
+async def get_uniswap_quote_async(
+    network_id: str,
+    token_address: str,
+    amount: int,
+    quote_type: Literal["buy", "sell"],
+    pool_address: str | None = None,
+    timeout: float = DEFAULT_READ_TIMEOUT,
+) -> Quote:
+    """Get Uniswap quote for buying or selling tokens, without blocking the event loop.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Token address, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amount: Amount of tokens (in Wei)
+        quote_type: 'buy' or 'sell'
+        pool_address: Optional uniswap v3 pool address, if already known
+        timeout: Maximum number of seconds to wait for each read
+
+    Returns:
+        Quote: A Quote object containing the amount in, amount out, balance, fee, and any error messages.
+
+    """
+    pool = None
+    quote_result = None
+    utilization = Wei(0)
+    insufficient_liquidity = False
+
+    if pool_address is None:
+        pool_address = await run_with_timeout(
+            get_pool_address, token_address, network_id, timeout=timeout
+        )
+
+    try:
+        pool = await get_pool_info_async(
+            network_id, pool_address, (token_address, addresses[network_id]["WETH"]), timeout
+        )
+        token_in, token_out, insufficient_liquidity, utilization = _select_swap(
+            network_id, pool, amount, quote_type
+        )
+        quote_result = await run_with_timeout(
+            quote_exact_input,
+            network_id,
+            pool_address,
+            pool,
+            token_in,
+            token_out,
+            amount,
+            timeout=timeout,
+        )
+    except Exception as error:
+        print(f"Error fetching quote: {error!r}")
+
+    return _build_quote(
+        network_id,
+        amount,
+        quote_type,
+        pool_address,
+        pool,
+        quote_result,
+        insufficient_liquidity,
+        utilization,
+    )
+
+
+def _read_quote(
+    network_id: str,
+    token_address: str,
+    pool_address: str,
+    amount: int,
+    quote_type: Literal["buy", "sell"],
+) -> tuple[PoolInfo, int | None, bool, Wei]:
+    pool = get_pool_info(network_id, pool_address, (token_address, addresses[network_id]["WETH"]))
+    token_in, token_out, insufficient_liquidity, utilization = _select_swap(
+        network_id, pool, amount, quote_type
+    )
+    quote_result = quote_exact_input(network_id, pool_address, pool, token_in, token_out, amount)
+    return pool, quote_result, insufficient_liquidity, utilization
+
+
+def _select_swap(
+    network_id: str, pool: PoolInfo, amount: int, quote_type: Literal["buy", "sell"]
+) -> tuple[str, str, bool, Wei]:
+    is_token0_weth = pool.token0.lower() == addresses[network_id]["WETH"].lower()
+    token_in = (
+        pool.token0
+        if (quote_type == "buy" and is_token0_weth) or (quote_type == "sell" and not is_token0_weth)
+        else pool.token1
+    )
+    token_out, balance_out = (
+        (pool.token1, pool.balance1) if token_in == pool.token0 else (pool.token0, pool.balance0)
+    )
+
+    insufficient_liquidity = quote_type == "buy" and amount > balance_out
+    utilization = Wei(int(amount / balance_out)) if quote_type == "buy" else Wei(0)
+
+    return token_in, token_out, insufficient_liquidity, utilization
+
+
+def _build_quote(
+    network_id: str,
+    amount: int,
+    quote_type: Literal["buy", "sell"],
+    pool_address: str,
+    pool: PoolInfo | None,
+    quote_result: int | None,
+    insufficient_liquidity: bool,
+    utilization: Wei,
+) -> Quote:
+    eth_price_in_usd = None
+    invalid_pool_error = "Invalid pool address" if not pool_address else None
+
     insufficient_liquidity = (
         quote_type == "sell" and pool and not quote_result
     ) or insufficient_liquidity
@@ -274,13 +615,12 @@ def get_uniswap_quote(
     elif not quote_result:
         error_msg = "Failed fetching quote"
 
-    print(tokens)
     balance_result = None
-    if tokens and balances:
-        is_weth_token0 = tokens[0].lower() == addresses[network_id]["WETH"].lower()
+    if pool:
+        is_weth_token0 = pool.token0.lower() == addresses[network_id]["WETH"].lower()
         balance_result = Balance(
-            erc20z=Wei(balances[1]) if is_weth_token0 else Wei(balances[0]),
-            weth=Wei(balances[0]) if is_weth_token0 else Wei(balances[1]),
+            erc20z=Wei(pool.balance1) if is_weth_token0 else Wei(pool.balance0),
+            weth=Wei(pool.balance0) if is_weth_token0 else Wei(pool.balance1),
         )
 
     return Quote(
@@ -292,15 +632,21 @@ def get_uniswap_quote(
     )
 
 
-def get_pool_address(token_address: str) -> str:
+def get_pool_address(token_address: str, network_id: str = "base-sepolia") -> str:
     """Fetch the uniswap v3 pool address for a given token.
 
+    The pool address is looked up in the local WOW token registry first, and read from the
+    token contract for tokens which were not indexed yet.
+
     Args:
         token_address (str): The address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        network_id (str): Network ID, which is either `base-sepolia` or `base-mainnet`
 
     Returns:
         str: The uniswap v3 pool address associated with the token.
 
     """
-    pool_address = SmartContract.read("base-sepolia", token_address, "poolAddress", abi=WOW_ABI)
+    pool_address = wow_registry.get_pool_address(network_id, token_address)
+    if pool_address is None:
+        pool_address = cached_read(network_id, token_address, "poolAddress", abi=WOW_ABI)
     return str(pool_address)
@@ -0,0 +1,360 @@
+"""Uniswap v3 swap math, ported from the v3-core libraries with identical integer rounding."""
+
+import math
+from dataclasses import dataclass, field
+
+Q96 = 1 << 96
+MAX_UINT256 = (1 << 256) - 1
+
+MIN_TICK = -887272
+MAX_TICK = -MIN_TICK
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+
+class TickDataUnavailableError(Exception):
+    """Raised when a swap needs tick bitmap words that were not fetched."""
+
+
+@dataclass
+class PoolState:
+    """The state of a Uniswap v3 pool needed to simulate a swap.
+
+    `tick_bitmap` maps word positions to bitmap words, and only covers the words between
+    `min_word` and `max_word`. `liquidity_net` maps initialized ticks to their net liquidity.
+    """
+
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    fee: int
+    tick_spacing: int
+    tick_bitmap: dict[int, int] = field(default_factory=dict)
+    liquidity_net: dict[int, int] = field(default_factory=dict)
+    min_word: int = -(1 << 15)
+    max_word: int = (1 << 15) - 1
+
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    """Calculate floor(a * b / denominator) with full precision."""
+    return a * b // denominator
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    """Calculate ceil(a * b / denominator) with full precision."""
+    return -(-a * b // denominator)
+
+
+def div_rounding_up(a: int, b: int) -> int:
+    """Calculate ceil(a / b)."""
+    return -(-a // b)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """Calculate sqrt(1.0001^tick) * 2^96, as in `TickMath.getSqrtRatioAtTick`.
+
+    Args:
+        tick: The tick for which to compute the sqrt ratio.
+
+    Returns:
+        int: The sqrt ratio as a Q64.96.
+
+    """
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError("T")
+
+    ratio = (
+        0xFFFCB933BD6FAD37AA2D162D1A594001
+        if abs_tick & 0x1 != 0
+        else 0x100000000000000000000000000000000
+    )
+    for bit, multiplier in _TICK_MULTIPLIERS:
+        if abs_tick & bit != 0:
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    # Round up so that getTickAtSqrtRatio of the output price is always consistent.
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+_TICK_MULTIPLIERS = (
+    (0x2, 0xFFF97272373D413259A46990580E213A),
+    (0x4, 0xFFF2E50F5F656932EF12357CF3C7FDCC),
+    (0x8, 0xFFE5CACA7E10E4E61C3624EAA0941CD0),
+    (0x10, 0xFFCB9843D60F6159C9DB58835C926644),
+    (0x20, 0xFF973B41FA98C081472E6896DFB254C0),
+    (0x40, 0xFF2EA16466C96A3843EC78B326B52861),
+    (0x80, 0xFE5DEE046A99A2A811C461F1969C3053),
+    (0x100, 0xFCBE86C7900A88AEDCFFC83B479AA3A4),
+    (0x200, 0xF987A7253AC413176F2B074CF7815E54),
+    (0x400, 0xF3392B0822B70005940C7A398E4B70F3),
+    (0x800, 0xE7159475A2C29B7443B29C7FA6E889D9),
+    (0x1000, 0xD097F3BDFD2022B8845AD8F792AA5825),
+    (0x2000, 0xA9F746462D870FDF8A65DC1F90E061E5),
+    (0x4000, 0x70D869A156D2A1B890BB3DF62BAF32F7),
+    (0x8000, 0x31BE135F97D08FD981231505542FCFA6),
+    (0x10000, 0x9AA508B5B7A84E1C677DE54F3E99BC9),
+    (0x20000, 0x5D6AF8DEDB81196699C329225EE604),
+    (0x40000, 0x2216E584F5FA1EA926041BEDFE98),
+    (0x80000, 0x48A170391F7DC42444E8FA2),
+)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """Calculate the greatest tick whose sqrt ratio is at most the given price.
+
+    Equivalent to `TickMath.getTickAtSqrtRatio`.
+
+    Args:
+        sqrt_price_x96: The sqrt price as a Q64.96.
+
+    Returns:
+        int: The greatest tick for which `get_sqrt_ratio_at_tick(tick) <= sqrt_price_x96`.
+
+    """
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError("R")
+
+    # Start from a floating point estimate and correct it with exact integer comparisons.
+    estimate = math.floor(2 * math.log(sqrt_price_x96 / Q96) / math.log(1.0001))
+    tick = max(MIN_TICK, min(MAX_TICK, estimate))
+    while tick > MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def get_next_sqrt_price_from_amount0_rounding_up(
+    sqrt_price_x96: int, liquidity: int, amount: int, add: bool
+) -> int:
+    """Get the next sqrt price given a delta of token0, as in `SqrtPriceMath`."""
+    if amount == 0:
+        return sqrt_price_x96
+    numerator1 = liquidity << 96
+
+    if add:
+        product = amount * sqrt_price_x96
+        denominator = numerator1 + product
+        if product <= MAX_UINT256 and denominator <= MAX_UINT256 and denominator >= numerator1:
+            return mul_div_rounding_up(numerator1, sqrt_price_x96, denominator)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount)
+
+    product = amount * sqrt_price_x96
+    if product > MAX_UINT256 or numerator1 <= product:
+        raise ValueError("Insufficient liquidity for token0 output")
+    return mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 - product)
+
+
+def get_next_sqrt_price_from_amount1_rounding_down(
+    sqrt_price_x96: int, liquidity: int, amount: int, add: bool
+) -> int:
+    """Get the next sqrt price given a delta of token1, as in `SqrtPriceMath`."""
+    if add:
+        quotient = (amount << 96) // liquidity
+        return sqrt_price_x96 + quotient
+
+    quotient = div_rounding_up(amount << 96, liquidity)
+    if sqrt_price_x96 <= quotient:
+        raise ValueError("Insufficient liquidity for token1 output")
+    return sqrt_price_x96 - quotient
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool
+) -> int:
+    """Get the next sqrt price given an input amount of token0 or token1."""
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount0_rounding_up(
+            sqrt_price_x96, liquidity, amount_in, True
+        )
+    return get_next_sqrt_price_from_amount1_rounding_down(
+        sqrt_price_x96, liquidity, amount_in, True
+    )
+
+
+def get_amount0_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Get the amount of token0 between two prices, as in `SqrtPriceMath.getAmount0Delta`."""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+
+    if round_up:
+        return div_rounding_up(
+            mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b_x96), sqrt_ratio_a_x96
+        )
+    return mul_div(numerator1, numerator2, sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """Get the amount of token1 between two prices, as in `SqrtPriceMath.getAmount1Delta`."""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+    return mul_div(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+
+
+def compute_swap_step(
+    sqrt_ratio_current_x96: int,
+    sqrt_ratio_target_x96: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee_pips: int,
+) -> tuple[int, int, int, int]:
+    """Compute the result of swapping an exact input amount within a single tick range.
+
+    Equivalent to `SwapMath.computeSwapStep` with a positive `amountRemaining`.
+
+    Returns:
+        tuple[int, int, int, int]: The next sqrt price, amount in, amount out and fee amount.
+
+    """
+    zero_for_one = sqrt_ratio_current_x96 >= sqrt_ratio_target_x96
+
+    amount_remaining_less_fee = mul_div(amount_remaining, 1_000_000 - fee_pips, 1_000_000)
+    amount_in = (
+        get_amount0_delta(sqrt_ratio_target_x96, sqrt_ratio_current_x96, liquidity, True)
+        if zero_for_one
+        else get_amount1_delta(sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, True)
+    )
+    if amount_remaining_less_fee >= amount_in:
+        sqrt_ratio_next_x96 = sqrt_ratio_target_x96
+    else:
+        sqrt_ratio_next_x96 = get_next_sqrt_price_from_input(
+            sqrt_ratio_current_x96, liquidity, amount_remaining_less_fee, zero_for_one
+        )
+
+    is_max = sqrt_ratio_target_x96 == sqrt_ratio_next_x96
+
+    if zero_for_one:
+        if not is_max:
+            amount_in = get_amount0_delta(
+                sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, True
+            )
+        amount_out = get_amount1_delta(
+            sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, False
+        )
+    else:
+        if not is_max:
+            amount_in = get_amount1_delta(
+                sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, True
+            )
+        amount_out = get_amount0_delta(
+            sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, False
+        )
+
+    if sqrt_ratio_next_x96 != sqrt_ratio_target_x96:
+        # The remainder of the input is taken as fee.
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, 1_000_000 - fee_pips)
+
+    return sqrt_ratio_next_x96, amount_in, amount_out, fee_amount
+
+
+def next_initialized_tick_within_one_word(
+    state: PoolState, tick: int, lte: bool
+) -> tuple[int, bool]:
+    """Find the next initialized tick in the same bitmap word, as in `TickBitmap`.
+
+    Args:
+        state: The pool state holding the tick bitmap.
+        tick: The starting tick.
+        lte: Whether to search to the left (less than or equal) of the starting tick.
+
+    Returns:
+        tuple[int, bool]: The next tick, and whether it is initialized.
+
+    Raises:
+        TickDataUnavailableError: If the bitmap word was not fetched.
+
+    """
+    tick_spacing = state.tick_spacing
+    compressed = tick // tick_spacing
+
+    if lte:
+        word_pos, bit_pos = compressed >> 8, compressed & 0xFF
+        masked = _bitmap_word(state, word_pos) & ((1 << bit_pos) - 1 + (1 << bit_pos))
+        if masked != 0:
+            return (compressed - (bit_pos - (masked.bit_length() - 1))) * tick_spacing, True
+        return (compressed - bit_pos) * tick_spacing, False
+
+    word_pos, bit_pos = (compressed + 1) >> 8, (compressed + 1) & 0xFF
+    masked = _bitmap_word(state, word_pos) & (~((1 << bit_pos) - 1) & MAX_UINT256)
+    if masked != 0:
+        least_significant_bit = (masked & -masked).bit_length() - 1
+        return (compressed + 1 + (least_significant_bit - bit_pos)) * tick_spacing, True
+    return (compressed + 1 + (0xFF - bit_pos)) * tick_spacing, False
+
+
+def _bitmap_word(state: PoolState, word_pos: int) -> int:
+    if not state.min_word <= word_pos <= state.max_word:
+        raise TickDataUnavailableError(f"Tick bitmap word {word_pos} was not fetched")
+    return state.tick_bitmap.get(word_pos, 0)
+
+
+def swap_exact_input(state: PoolState, zero_for_one: bool, amount_in: int) -> int:
+    """Simulate an exact input swap against a pool, crossing initialized ticks as needed.
+
+    Mirrors the swap loop of `UniswapV3Pool.swap` with no price limit, which is what
+    `QuoterV2.quoteExactInputSingle` does with `sqrtPriceLimitX96` set to 0.
+
+    Args:
+        state: The pool state.
+        zero_for_one: True to swap token0 for token1, False to swap token1 for token0.
+        amount_in: The exact amount of the input token.
+
+    Returns:
+        int: The amount of the output token received.
+
+    Raises:
+        TickDataUnavailableError: If the swap moves past the fetched tick bitmap words.
+
+    """
+    sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+
+    amount_remaining = amount_in
+    amount_out = 0
+    sqrt_price_x96 = state.sqrt_price_x96
+    tick = state.tick
+    liquidity = state.liquidity
+
+    while amount_remaining != 0 and sqrt_price_x96 != sqrt_price_limit_x96:
+        sqrt_price_start_x96 = sqrt_price_x96
+
+        tick_next, initialized = next_initialized_tick_within_one_word(state, tick, zero_for_one)
+        tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+        sqrt_price_next_x96 = get_sqrt_ratio_at_tick(tick_next)
+
+        if zero_for_one:
+            use_limit = sqrt_price_next_x96 < sqrt_price_limit_x96
+        else:
+            use_limit = sqrt_price_next_x96 > sqrt_price_limit_x96
+        sqrt_price_target_x96 = sqrt_price_limit_x96 if use_limit else sqrt_price_next_x96
+
+        sqrt_price_x96, step_amount_in, step_amount_out, fee_amount = compute_swap_step(
+            sqrt_price_x96, sqrt_price_target_x96, liquidity, amount_remaining, state.fee
+        )
+        amount_remaining -= step_amount_in + fee_amount
+        amount_out += step_amount_out
+
+        if sqrt_price_x96 == sqrt_price_next_x96:
+            if initialized:
+                liquidity_net = state.liquidity_net.get(tick_next, 0)
+                liquidity += -liquidity_net if zero_for_one else liquidity_net
+            tick = tick_next - 1 if zero_for_one else tick_next
+        elif sqrt_price_x96 != sqrt_price_start_x96:
+            tick = get_tick_at_sqrt_ratio(sqrt_price_x96)
+
+    return amount_out
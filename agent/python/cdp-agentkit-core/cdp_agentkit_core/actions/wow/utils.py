@@ -1,24 +1,210 @@
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
 from cdp import SmartContract
 
-from cdp_agentkit_core.actions.wow.constants import WOW_ABI
-from cdp_agentkit_core.actions.wow.uniswap.index import get_has_graduated, get_uniswap_quote
+from cdp_agentkit_core.actions.multicall import ContractRead, multicall_read
+from cdp_agentkit_core.actions.read_cache import cached_read, read_cache
+from cdp_agentkit_core.actions.snapshot import run_in_snapshot
+from cdp_agentkit_core.actions.utils import DEFAULT_READ_TIMEOUT, run_with_timeout
+from cdp_agentkit_core.actions.wow.bonding_curve import bonding_curve
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI, addresses
+from cdp_agentkit_core.actions.wow.registry import prime_read_cache
+from cdp_agentkit_core.actions.wow.uniswap.index import (
+    PoolInfo,
+    get_has_graduated,
+    get_pool_address,
+    get_pool_info,
+    get_uniswap_quote_async,
+    pool_info_reads,
+    quote_exact_input,
+)
 
 
-def get_current_supply(token_address):
+def get_current_supply(token_address, network_id: str = "base-sepolia"):
     """Get the current supply of a token.
 
     Args:
         token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
 
     """
-    test = SmartContract.read(
-        "base-sepolia",
-        token_address,
-        "totalSupply",
-        WOW_ABI,
+    return cached_read(network_id, token_address, "totalSupply", abi=WOW_ABI)
+
+
+def get_market_state(network_id: str, token_address: str) -> tuple[bool, int]:
+    """Get the graduation status and current supply of a token in a single batched read.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+
+    Returns:
+        tuple[bool, int]: Whether the token has graduated, and its current supply (in wei)
+
+    """
+    market_type, current_supply = multicall_read(
+        network_id,
+        [
+            ContractRead(token_address, "marketType", WOW_ABI),
+            ContractRead(token_address, "totalSupply", WOW_ABI),
+        ],
+    )
+    return market_type == 1, current_supply
+
+
+@dataclass
+class WowTradeContext:
+    """The state needed to quote and submit a trade of a WOW token, fetched in a single pass."""
+
+    network_id: str
+    token_address: str
+    quote_type: Literal["buy", "sell"]
+    amount: int
+    has_graduated: bool
+    current_supply: int
+    pool_address: str
+    pool: PoolInfo | None
+    quote: int
+    fetched_at: float
+    fetch_seconds: float
+    # Seconds between fetching the context and submitting its trade, once submitted.
+    submit_seconds: float | None = None
+
+    @property
+    def expected_market_type(self) -> str:
+        """The market type the trade expects, as passed to the WOW `buy` and `sell` methods."""
+        return "1" if self.has_graduated else "0"
+
+    def min_amount_out(self, max_slippage_percent: int) -> str:
+        """Get the minimum amount out for the quote, floored to a whole number of wei.
+
+        Args:
+            max_slippage_percent: The maximum slippage to accept, in percent
+
+        Returns:
+            str: The minimum amount out (in wei)
+
+        """
+        return str(int((self.quote * (100 - max_slippage_percent)) // 100))
+
+    def age(self) -> float:
+        """Get the number of seconds since the context was fetched.
+
+        Returns:
+            float: The age of the context, in seconds
+
+        """
+        return time.monotonic() - self.fetched_at
+
+    def mark_submitted(self) -> float:
+        """Record that the trade is being submitted, and log the quote-to-submit latency.
+
+        Returns:
+            float: The number of seconds since the context was fetched
+
+        """
+        self.submit_seconds = self.age()
+        print(
+            f"WOW {self.quote_type} of {self.token_address}: context fetched in "
+            f"{self.fetch_seconds:.3f}s, submitted {self.submit_seconds:.3f}s after the fetch"
+        )
+        return self.submit_seconds
+
+
+def get_trade_context(
+    network_id: str, token_address: str, amount: str, quote_type: Literal["buy", "sell"]
+) -> WowTradeContext:
+    """Fetch the graduation status, pool and quote for a trade of a WOW token.
+
+    The market type, current supply and pool address are read in one batch. Once the pool
+    address is known, which it is after the first trade of a token or once the token is in the
+    WOW token registry, the pool state is included in the same batch, so a warm context needs a
+    single round trip. Quotes are computed locally, with the token's quote methods as a
+    fallback. All reads are made within a single read snapshot, which is restarted if the reads
+    drift to a later block.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amount: Amount of ETH to buy with, or of tokens to sell (in wei)
+        quote_type: 'buy' or 'sell'
+
+    Returns:
+        WowTradeContext: The trade context.
+
+    """
+    start = time.monotonic()
+    has_graduated, current_supply, pool_address, pool, quote = run_in_snapshot(
+        network_id, _read_trade_state, network_id, token_address, amount, quote_type
+    )
+    fetched_at = time.monotonic()
+    return WowTradeContext(
+        network_id=network_id,
+        token_address=token_address,
+        quote_type=quote_type,
+        amount=int(amount),
+        has_graduated=has_graduated,
+        current_supply=current_supply,
+        pool_address=str(pool_address),
+        pool=pool,
+        quote=quote,
+        fetched_at=fetched_at,
+        fetch_seconds=fetched_at - start,
+    )
+
+
+def _read_trade_state(
+    network_id: str, token_address: str, amount: str, quote_type: Literal["buy", "sell"]
+) -> tuple[bool, int, str, PoolInfo | None, int]:
+    weth = addresses[network_id]["WETH"]
+
+    reads = [
+        ContractRead(token_address, "marketType", WOW_ABI),
+        ContractRead(token_address, "totalSupply", WOW_ABI),
+        ContractRead(token_address, "poolAddress", WOW_ABI),
+    ]
+    known, cached_pool_address = read_cache.get(
+        network_id, token_address, "poolAddress", abi=WOW_ABI
     )
-    print(test)
-    return test
+    if not known and prime_read_cache(network_id, token_address):
+        known, cached_pool_address = read_cache.get(
+            network_id, token_address, "poolAddress", abi=WOW_ABI
+        )
+    if known:
+        reads += pool_info_reads(cached_pool_address, (token_address, weth))
+
+    market_type, current_supply, pool_address = multicall_read(network_id, reads)[:3]
+    has_graduated = market_type == 1
+
+    pool = None
+    if has_graduated:
+        # Served from the snapshot when the pool state was included in the first batch.
+        pool = get_pool_info(network_id, pool_address, (token_address, weth))
+        token_in, token_out = (
+            (weth, token_address) if quote_type == "buy" else (token_address, weth)
+        )
+        quote = quote_exact_input(network_id, pool_address, pool, token_in, token_out, int(amount))
+    else:
+        quote = _local_bonding_curve_quote(
+            bonding_curve.get_eth_buy_quote
+            if quote_type == "buy"
+            else bonding_curve.get_token_sell_quote,
+            current_supply,
+            amount,
+        )
+
+    if not quote:
+        method, args = (
+            ("getEthBuyQuote", {"ethOrderSize": str(amount)})
+            if quote_type == "buy"
+            else ("getTokenSellQuote", {"tokenOrderSize": str(amount)})
+        )
+        quote = cached_read(network_id, token_address, method, abi=WOW_ABI, args=args)
+    return has_graduated, current_supply, pool_address, pool, quote
 
 
 def get_buy_quote(network_id: str, token_address: str, amount_eth_in_wei: str):
@@ -30,38 +216,131 @@ def get_buy_quote(network_id: str, token_address: str, amount_eth_in_wei: str):
         amount_eth_in_wei: Amount of ETH to buy (in wei), meaning 1 is 1 wei or 0.000000000000000001 of ETH
 
     """
-    has_graduated = get_has_graduated(network_id, token_address)
-    token_quote = (
-        has_graduated
-        and (get_uniswap_quote(network_id, token_address, amount_eth_in_wei, "buy")).amount_out
-    ) or SmartContract.read(
+    return get_trade_context(network_id, token_address, amount_eth_in_wei, "buy").quote
+
+
+def get_sell_quote(network_id: str, token_address: str, amount_tokens_in_wei: str):
+    """Get quote for selling tokens.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amount_tokens_in_wei (str): Amount of tokens to sell (in wei), meaning 1 is 1 wei or 0.000000000000000001 of the token
+
+    """
+    return get_trade_context(network_id, token_address, amount_tokens_in_wei, "sell").quote
+
+
+def _local_bonding_curve_quote(
+    quote: Callable[[int, int], int], current_supply: int, amount: str
+) -> int | None:
+    try:
+        return quote(int(current_supply), int(amount))
+    except Exception as error:
+        print(f"Local bonding curve quote failed, falling back to contract: {error}")
+        return None
+
+
+async def get_buy_quote_async(
+    network_id: str,
+    token_address: str,
+    amount_eth_in_wei: str,
+    timeout: float = DEFAULT_READ_TIMEOUT,
+):
+    """Get quote for buying tokens, without blocking the event loop.
+
+    The graduation status, pool address and current supply are fetched concurrently, and
+    bonding curve quotes are computed locally.
+
+    Args:
+        network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
+        token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
+        amount_eth_in_wei: Amount of ETH to buy (in wei), meaning 1 is 1 wei or 0.000000000000000001 of ETH
+        timeout: Maximum number of seconds to wait for each read
+
+    """
+    return await _get_quote_async(
         network_id,
         token_address,
+        amount_eth_in_wei,
+        "buy",
+        bonding_curve.get_eth_buy_quote,
         "getEthBuyQuote",
-        abi=WOW_ABI,
-        args={"ethOrderSize": str(amount_eth_in_wei)},
+        {"ethOrderSize": str(amount_eth_in_wei)},
+        timeout,
     )
-    return token_quote
 
 
-def get_sell_quote(network_id: str, token_address: str, amount_tokens_in_wei: str):
-    """Get quote for selling tokens.
+async def get_sell_quote_async(
+    network_id: str,
+    token_address: str,
+    amount_tokens_in_wei: str,
+    timeout: float = DEFAULT_READ_TIMEOUT,
+):
+    """Get quote for selling tokens, without blocking the event loop.
+
+    The graduation status, pool address and current supply are fetched concurrently, and
+    bonding curve quotes are computed locally.
 
     Args:
         network_id: Network ID, which is either `base-sepolia` or `base-mainnet`
         token_address: Address of the token contract, such as `0x036CbD53842c5426634e7929541eC2318f3dCF7e`
         amount_tokens_in_wei (str): Amount of tokens to sell (in wei), meaning 1 is 1 wei or 0.000000000000000001 of the token
+        timeout: Maximum number of seconds to wait for each read
 
     """
-    has_graduated = get_has_graduated(network_id, token_address)
-    token_quote = (
-        has_graduated
-        and (get_uniswap_quote(network_id, token_address, amount_tokens_in_wei, "sell")).amount_out
-    ) or SmartContract.read(
+    return await _get_quote_async(
         network_id,
         token_address,
+        amount_tokens_in_wei,
+        "sell",
+        bonding_curve.get_token_sell_quote,
         "getTokenSellQuote",
-        WOW_ABI,
-        args={"tokenOrderSize": str(amount_tokens_in_wei)},
+        {"tokenOrderSize": str(amount_tokens_in_wei)},
+        timeout,
+    )
+
+
+async def _get_quote_async(
+    network_id: str,
+    token_address: str,
+    amount: str,
+    quote_type: Literal["buy", "sell"],
+    local_quote: Callable[[int, int], int],
+    bonding_curve_method: str,
+    bonding_curve_args: dict,
+    timeout: float,
+):
+    # The current supply is only needed before graduation, so it is fetched speculatively
+    # alongside the graduation status.
+    has_graduated, pool_address, current_supply = await asyncio.gather(
+        run_with_timeout(get_has_graduated, network_id, token_address, timeout=timeout),
+        run_with_timeout(get_pool_address, token_address, network_id, timeout=timeout),
+        run_with_timeout(get_current_supply, token_address, network_id, timeout=timeout),
+        return_exceptions=True,
+    )
+    if isinstance(has_graduated, BaseException):
+        raise has_graduated
+
+    if has_graduated:
+        if isinstance(pool_address, BaseException):
+            pool_address = None
+        quote = await get_uniswap_quote_async(
+            network_id, token_address, amount, quote_type, pool_address, timeout
+        )
+        if quote.amount_out:
+            return quote.amount_out
+    elif not isinstance(current_supply, BaseException):
+        token_quote = _local_bonding_curve_quote(local_quote, current_supply, amount)
+        if token_quote:
+            return token_quote
+
+    return await run_with_timeout(
+        SmartContract.read,
+        network_id,
+        token_address,
+        bonding_curve_method,
+        abi=WOW_ABI,
+        args=bonding_curve_args,
+        timeout=timeout,
     )
-    return token_quote
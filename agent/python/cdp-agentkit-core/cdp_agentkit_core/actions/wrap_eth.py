@@ -4,6 +4,7 @@ from cdp import Wallet
 from pydantic import BaseModel, Field
 
 from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.transaction_tracker import tracking_note, wait_or_track
 
 WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
 
@@ -78,8 +79,8 @@ def wrap_eth(wallet: Wallet, amount_to_wrap: str) -> str:
             amount=amount_to_wrap,
             asset_id="wei",
         )
-        result = invocation.wait()
-        return f"Wrapped ETH with transaction hash: {result.transaction.transaction_hash}"
+        result = wait_or_track(invocation, "wrap_eth")
+        return f"Wrapped ETH with transaction hash: {result.transaction.transaction_hash}{tracking_note(result)}"
     except Exception as e:
         return f"Unexpected error wrapping ETH: {e!s}"
 
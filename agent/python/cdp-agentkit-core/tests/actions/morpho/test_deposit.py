@@ -1,5 +1,5 @@
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 
@@ -77,7 +77,7 @@ def test_deposit_success(wallet_factory, contract_invocation_factory, asset_fact
         assert action_response == expected_response
 
         mock_approve.assert_called_once_with(
-            mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_VAULT_ADDRESS, MOCK_ASSETS_WEI
+            mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_VAULT_ADDRESS, MOCK_ASSETS_WEI, pipeline=ANY
         )
 
         mock_get_asset.assert_called_once_with(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS)
@@ -159,7 +159,7 @@ def test_deposit_approval_failure(wallet_factory, asset_factory):
         assert action_response == expected_response
 
         mock_approve.assert_called_once_with(
-            mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_VAULT_ADDRESS, MOCK_ASSETS_WEI
+            mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_VAULT_ADDRESS, MOCK_ASSETS_WEI, pipeline=ANY
         )
 
         mock_get_asset.assert_called_once_with(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS)
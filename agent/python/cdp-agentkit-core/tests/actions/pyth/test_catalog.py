@@ -0,0 +1,141 @@
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from cdp_agentkit_core.actions.pyth.catalog import PriceFeedCatalog
+
+MOCK_BTC_FEED_ID = "e62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43"
+MOCK_BTC_EUR_FEED_ID = "c7a2dd0ef5fe6b1b3d7f2e8c4a1b0d9e8f7a6b5c4d3e2f1a0b9c8d7e6f5a4b3c"
+MOCK_ETH_FEED_ID = "ff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace"
+MOCK_FEEDS = [
+    {
+        "id": MOCK_BTC_EUR_FEED_ID,
+        "attributes": {
+            "base": "BTC",
+            "quote_currency": "EUR",
+            "description": "BITCOIN / EURO",
+        },
+    },
+    {
+        "id": MOCK_BTC_FEED_ID,
+        "attributes": {
+            "base": "BTC",
+            "quote_currency": "USD",
+            "description": "BITCOIN / US DOLLAR",
+        },
+    },
+    {
+        "id": MOCK_ETH_FEED_ID,
+        "attributes": {
+            "base": "ETH",
+            "quote_currency": "USD",
+            "description": "ETHEREUM / US DOLLAR",
+        },
+    },
+]
+
+
+@pytest.fixture
+def mock_get():
+    """Patch Hermes to return the mock feed list."""
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value.json.return_value = MOCK_FEEDS
+        yield mock_get
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Create a catalog persisted to a temporary file."""
+    return PriceFeedCatalog(tmp_path / "pyth_price_feeds.json")
+
+
+def test_catalog_indexes_feeds(catalog, mock_get):
+    """Test that feeds are indexed by base symbol, quote symbol and ID."""
+    assert [feed.id for feed in catalog.feeds_by_base("btc")] == [
+        MOCK_BTC_EUR_FEED_ID,
+        MOCK_BTC_FEED_ID,
+    ]
+    assert [feed.id for feed in catalog.feeds_by_quote("usd")] == [
+        MOCK_BTC_FEED_ID,
+        MOCK_ETH_FEED_ID,
+    ]
+    assert catalog.get(f"0x{MOCK_ETH_FEED_ID.upper()}").base == "ETH"
+    assert catalog.resolve("BTC").id == MOCK_BTC_FEED_ID
+    assert catalog.resolve("BTC", quote="eur").id == MOCK_BTC_EUR_FEED_ID
+    mock_get.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("symbol", "feed_id"),
+    [
+        ("E.T.H.", MOCK_ETH_FEED_ID),
+        ("bit coin", MOCK_BTC_FEED_ID),
+        ("etherium", MOCK_ETH_FEED_ID),
+        ("eath", MOCK_ETH_FEED_ID),
+        ("doge", None),
+    ],
+)
+def test_catalog_fuzzy_resolution(catalog, mock_get, symbol, feed_id):
+    """Test that transcribed symbols and asset names resolve to the closest feed."""
+    feed = catalog.resolve(symbol)
+
+    assert (feed.id if feed else None) == feed_id
+
+
+@pytest.mark.parametrize(
+    ("symbol", "quote", "exact_symbol", "exact_quote"),
+    [
+        ("E.T.H.", "USD", True, True),
+        ("bitcoin", "EUR", True, True),
+        ("etherium", "USD", False, True),
+        ("ETH", "EUR", True, False),
+    ],
+)
+def test_catalog_match_exactness(catalog, mock_get, symbol, quote, exact_symbol, exact_quote):
+    """Test that matches tell fuzzy symbols and feeds in another quote apart from exact ones."""
+    match = catalog.match(symbol, quote)
+
+    assert (match.exact_symbol, match.exact_quote) == (exact_symbol, exact_quote)
+    assert match.exact == (exact_symbol and exact_quote)
+
+
+def test_catalog_survives_restart(catalog, mock_get):
+    """Test that a new catalog reads the persisted feed list instead of downloading it."""
+    catalog.load()
+
+    restarted = PriceFeedCatalog(catalog.path)
+
+    assert restarted.resolve("eth").id == MOCK_ETH_FEED_ID
+    mock_get.assert_called_once()
+
+
+def test_catalog_refreshes_after_ttl(catalog, mock_get):
+    """Test that the feed list is downloaded again once it is older than the TTL."""
+    catalog.load()
+
+    with patch("time.time", return_value=time.time() + catalog.ttl + 1):
+        catalog.load()
+
+    assert mock_get.call_count == 2
+
+
+def test_catalog_uses_stale_feeds_when_download_fails(catalog, mock_get):
+    """Test that a stale feed list is used, and not downloaded again at once, when Hermes fails."""
+    catalog.load()
+    mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+
+    with patch("time.time", return_value=time.time() + catalog.ttl + 1):
+        assert catalog.resolve("btc").id == MOCK_BTC_FEED_ID
+        assert catalog.resolve("eth").id == MOCK_ETH_FEED_ID
+
+    assert mock_get.call_count == 2
+
+
+def test_catalog_download_error_without_stale_feeds(catalog, mock_get):
+    """Test that failing to download the first feed list is raised."""
+    mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        catalog.resolve("btc")
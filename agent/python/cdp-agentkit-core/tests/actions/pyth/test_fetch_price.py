@@ -1,11 +1,16 @@
+import asyncio
 from unittest.mock import patch
 
+import aiohttp
 import pytest
 import requests
+from aiohttp import web
 
 from cdp_agentkit_core.actions.pyth.fetch_price import (
+    PythFetchPriceAction,
     PythFetchPriceInput,
     pyth_fetch_price,
+    pyth_fetch_price_async,
 )
 
 MOCK_PRICE_FEED_ID = "valid-price-feed-id"
@@ -41,7 +46,7 @@ def test_pyth_fetch_price_success():
         ]
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.json.return_value = mock_response
         mock_get.return_value.raise_for_status.return_value = None
 
@@ -52,10 +57,60 @@ def test_pyth_fetch_price_success():
 
 def test_pyth_fetch_price_http_error():
     """Test pyth fetch price error with HTTP error."""
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError(
             "404 Client Error: Not Found"
         )
 
         with pytest.raises(requests.exceptions.HTTPError):
             pyth_fetch_price(MOCK_PRICE_FEED_ID)
+
+
+async def _fetch_from_local_hermes(handler, price_feed_id: str) -> str:
+    app = web.Application()
+    app.router.add_get("/v2/updates/price/latest", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        with patch(
+            "cdp_agentkit_core.actions.pyth.fetch_price.PYTH_HERMES_URL",
+            f"http://127.0.0.1:{port}",
+        ):
+            return await pyth_fetch_price_async(price_feed_id)
+    finally:
+        await runner.cleanup()
+
+
+def test_pyth_fetch_price_async_success():
+    """Test successful async pyth fetch price against a local Hermes server."""
+    requested_ids = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requested_ids.extend(request.query.getall("ids[]"))
+        return web.json_response(
+            {"parsed": [{"price": {"price": "4212345", "expo": -2, "conf": "1234"}}]}
+        )
+
+    result = asyncio.run(_fetch_from_local_hermes(handler, MOCK_PRICE_FEED_ID))
+
+    assert result == "42123.45"
+    assert requested_ids == [MOCK_PRICE_FEED_ID]
+
+
+def test_pyth_fetch_price_async_http_error():
+    """Test async pyth fetch price error with HTTP error."""
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({}, status=404)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(_fetch_from_local_hermes(handler, MOCK_PRICE_FEED_ID))
+
+
+def test_pyth_fetch_price_action_coroutine():
+    """Test that the action exposes its async implementation."""
+    assert PythFetchPriceAction().coroutine is pyth_fetch_price_async
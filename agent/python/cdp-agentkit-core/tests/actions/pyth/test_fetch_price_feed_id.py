@@ -7,8 +7,10 @@ from cdp_agentkit_core.actions.pyth.fetch_price_feed_id import (
     PythFetchPriceFeedIDInput,
     pyth_fetch_price_feed_id,
 )
+from cdp_agentkit_core.actions.pyth.hermes import HERMES_TIMEOUT
 
 MOCK_TOKEN_SYMBOL = "BTC"
+MOCK_FEED_ID = "0ff1e87c65eb6e6f7768e66543859b7f3076ba8a3529636f6b2664f367c3344a"
 
 
 def test_pyth_fetch_price_feed_id_input_model_valid():
@@ -38,7 +40,7 @@ def test_pyth_fetch_price_feed_id_success():
         ]
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.json.return_value = mock_response["data"]
         mock_get.return_value.raise_for_status.return_value = None
 
@@ -46,13 +48,15 @@ def test_pyth_fetch_price_feed_id_success():
 
         assert result == "0ff1e87c65eb6e6f7768e66543859b7f3076ba8a3529636f6b2664f367c3344a"
         mock_get.assert_called_once_with(
-            "https://hermes.pyth.network/v2/price_feeds?query=BTC&asset_type=crypto"
+            "https://hermes.pyth.network/v2/price_feeds",
+            params={"asset_type": "crypto"},
+            timeout=HERMES_TIMEOUT,
         )
 
 
 def test_pyth_fetch_price_feed_id_empty_response():
     """Test pyth fetch price feed id error with empty response for ticker symbol."""
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.json.return_value = []
         mock_get.return_value.raise_for_status.return_value = None
 
@@ -62,10 +66,39 @@ def test_pyth_fetch_price_feed_id_empty_response():
 
 def test_pyth_fetch_price_feed_id_http_error():
     """Test pyth fetch price feed id error with HTTP error."""
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError(
             "404 Client Error: Not Found"
         )
 
         with pytest.raises(requests.exceptions.HTTPError):
             pyth_fetch_price_feed_id(MOCK_TOKEN_SYMBOL)
+
+
+@pytest.mark.parametrize(
+    ("token_symbol", "attributes", "expected_response"),
+    [
+        (
+            "ETHX",
+            {"base": "ETH", "quote_currency": "USD"},
+            f"The closest price feed is ETH/USD, with ID {MOCK_FEED_ID}, as no price feed matches ETHX "
+            "exactly. Confirm it is the intended asset and quote before using it.",
+        ),
+        (
+            "BTC",
+            {"base": "BTC", "quote_currency": "EUR"},
+            f"The closest price feed is BTC/EUR, with ID {MOCK_FEED_ID}, as BTC has no USD price feed. "
+            "Confirm it is the intended asset and quote before using it.",
+        ),
+    ],
+)
+def test_pyth_fetch_price_feed_id_reports_inexact_match(
+    token_symbol, attributes, expected_response
+):
+    """Test that fuzzy matches and feeds in another quote are reported with their base and quote."""
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value.json.return_value = [
+            {"id": f"0x{MOCK_FEED_ID}", "attributes": attributes}
+        ]
+
+        assert pyth_fetch_price_feed_id(token_symbol) == expected_response
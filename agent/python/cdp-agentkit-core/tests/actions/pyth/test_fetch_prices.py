@@ -0,0 +1,115 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+import requests
+from aiohttp import web
+
+from cdp_agentkit_core.actions.pyth.fetch_prices import (
+    PythFetchPricesAction,
+    PythFetchPricesInput,
+    pyth_fetch_prices,
+    pyth_fetch_prices_async,
+)
+from cdp_agentkit_core.actions.pyth.hermes import close_hermes_session, hermes_session
+
+MOCK_BTC_FEED_ID = "0xe62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43"
+MOCK_ETH_FEED_ID = "ff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace"
+MOCK_UNKNOWN_FEED_ID = "0x" + "00" * 32
+MOCK_RESPONSE = {
+    "parsed": [
+        {"id": MOCK_BTC_FEED_ID[2:], "price": {"price": "9712345678", "expo": -5}},
+        {"id": MOCK_ETH_FEED_ID, "price": {"price": "312345", "expo": -2}},
+    ]
+}
+
+
+def test_pyth_fetch_prices_input_model_empty():
+    """Test that PythFetchPricesInput requires at least one price feed ID."""
+    with pytest.raises(ValueError):
+        PythFetchPricesInput(price_feed_ids=[])
+
+
+def test_pyth_fetch_prices_success():
+    """Test that the prices of several feeds are fetched in one request."""
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value.json.return_value = MOCK_RESPONSE
+
+        result = pyth_fetch_prices(
+            [MOCK_BTC_FEED_ID, MOCK_ETH_FEED_ID, MOCK_UNKNOWN_FEED_ID, MOCK_BTC_FEED_ID]
+        )
+
+    assert result == (
+        f"{MOCK_BTC_FEED_ID}: 97123.45\n"
+        f"{MOCK_ETH_FEED_ID}: 3123.45\n"
+        f"{MOCK_UNKNOWN_FEED_ID}: No price data found"
+    )
+    mock_get.assert_called_once()
+    assert mock_get.call_args.kwargs["params"] == [
+        ("ids[]", MOCK_BTC_FEED_ID),
+        ("ids[]", MOCK_ETH_FEED_ID),
+        ("ids[]", MOCK_UNKNOWN_FEED_ID),
+    ]
+
+
+def test_pyth_fetch_prices_http_error():
+    """Test pyth fetch prices error with HTTP error."""
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            "404 Client Error: Not Found"
+        )
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            pyth_fetch_prices([MOCK_BTC_FEED_ID])
+
+
+def test_hermes_session_is_shared():
+    """Test that requests to Hermes share one pooled session until it is closed."""
+    session = hermes_session()
+
+    assert hermes_session() is session
+    assert session.get_adapter("https://hermes.pyth.network").max_retries.total == 2
+
+    close_hermes_session()
+    assert hermes_session() is not session
+
+
+def test_pyth_fetch_prices_async_success():
+    """Test that several feeds are requested at once from a local Hermes server."""
+    requested_ids = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requested_ids.extend(request.query.getall("ids[]"))
+        return web.json_response(MOCK_RESPONSE)
+
+    async def fetch() -> str:
+        app = web.Application()
+        app.router.add_get("/v2/updates/price/latest", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        try:
+            with patch(
+                "cdp_agentkit_core.actions.pyth.fetch_prices.PYTH_HERMES_URL",
+                f"http://127.0.0.1:{port}",
+            ):
+                return await pyth_fetch_prices_async([MOCK_BTC_FEED_ID, MOCK_ETH_FEED_ID])
+        finally:
+            await runner.cleanup()
+
+    result = asyncio.run(fetch())
+
+    assert result == f"{MOCK_BTC_FEED_ID}: 97123.45\n{MOCK_ETH_FEED_ID}: 3123.45"
+    assert requested_ids == [MOCK_BTC_FEED_ID, MOCK_ETH_FEED_ID]
+
+
+def test_pyth_fetch_prices_action():
+    """Test the pyth fetch prices action is read-only and async."""
+    action = PythFetchPricesAction()
+
+    assert action.name == "pyth_fetch_prices"
+    assert action.read_only
+    assert action.coroutine is pyth_fetch_prices_async
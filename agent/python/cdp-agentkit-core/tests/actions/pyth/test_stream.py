@@ -0,0 +1,297 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from cdp_agentkit_core.actions.pyth.fetch_price import pyth_fetch_price
+from cdp_agentkit_core.actions.pyth.fetch_prices import pyth_fetch_prices
+from cdp_agentkit_core.actions.pyth.stream import PriceStream
+
+MOCK_BTC_FEED_ID = "e62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43"
+MOCK_ETH_FEED_ID = "ff61491a931112ddf1bd8147cd1b641375f79f5825126d665480874634fd0ace"
+MOCK_UNKNOWN_FEED_ID = "00" * 32
+
+
+def price_event(feed_id: str, price: str, publish_time: int | None = None) -> str:
+    """Build a Hermes price stream event for a feed."""
+    update = {
+        "id": feed_id,
+        "price": {
+            "price": price,
+            "conf": "1234",
+            "expo": -2,
+            "publish_time": int(time.time()) if publish_time is None else publish_time,
+        },
+    }
+    return f"data:{json.dumps({'parsed': [update]})}\n\n"
+
+
+class LocalHermes:
+    """A local stand-in for the Hermes price stream, serving one script of events per connection."""
+
+    def __init__(
+        self, connections: list[tuple[list[str], bool]], known_ids: set[str] | None = None
+    ):
+        self.connections = connections
+        self.known_ids = known_ids
+        self.requests: list[dict] = []
+        self.closed = threading.Event()
+        hermes = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802
+                query = parse_qs(urlparse(self.path).query)
+                hermes.requests.append(query)
+                # Like Hermes, reject unknown feed IDs unless they are to be ignored.
+                if (
+                    hermes.known_ids is not None
+                    and not set(query["ids[]"]) <= hermes.known_ids
+                    and query.get("ignore_invalid_price_ids") != ["true"]
+                ):
+                    self.send_error(404)
+                    return
+                events, keep_open = hermes.connections[
+                    min(len(hermes.requests), len(hermes.connections)) - 1
+                ]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event in events:
+                    data = event.encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                # Like Hermes, keep sending the latest updates while the connection is open.
+                while keep_open and events and not hermes.closed.wait(0.05):
+                    data = events[-1].encode()
+                    try:
+                        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                        self.wfile.flush()
+                    except OSError:
+                        return
+                self.wfile.write(b"0\r\n\r\n")
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        """Release held connections and stop the server."""
+        self.closed.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def local_hermes():
+    """Start local Hermes stand-ins, serving the stream from them."""
+    servers = []
+
+    def start(connections, known_ids=None):
+        hermes = LocalHermes(connections, known_ids)
+        servers.append(hermes)
+        patcher = patch("cdp_agentkit_core.actions.pyth.stream.PYTH_HERMES_URL", hermes.url)
+        patcher.start()
+        return hermes
+
+    yield start
+    patch.stopall()
+    for hermes in servers:
+        hermes.close()
+
+
+@pytest.fixture
+def stream():
+    """Create a price stream which reconnects quickly."""
+    stream = PriceStream(reconnect_delay=0.01)
+    yield stream
+    stream.clear()
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Wait until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_price_stream_caches_subscribed_feeds(local_hermes, stream):
+    """Test that streamed updates of subscribed feeds are kept, and other feeds are ignored."""
+    hermes = local_hermes(
+        [([price_event(MOCK_BTC_FEED_ID, "9712345"), price_event(MOCK_ETH_FEED_ID, "1")], True)]
+    )
+
+    stream.subscribe([f"0x{MOCK_BTC_FEED_ID}"])
+    wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) is not None)
+
+    update = stream.fresh(f"0x{MOCK_BTC_FEED_ID}")
+    assert (update.price, update.conf, update.expo) == (9712345, 1234, -2)
+    assert stream.connected
+    assert stream.get(MOCK_ETH_FEED_ID) is None
+    assert hermes.requests[0]["ids[]"] == [MOCK_BTC_FEED_ID]
+    assert hermes.requests[0]["parsed"] == ["true"]
+
+
+def test_pyth_fetch_price_serves_fresh_streamed_price(local_hermes, stream):
+    """Test that a fresh streamed price is served without a REST request."""
+    local_hermes([([price_event(MOCK_BTC_FEED_ID, "9712345")], True)])
+    stream.subscribe([MOCK_BTC_FEED_ID])
+    wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) is not None)
+
+    with (
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.price_stream", stream),
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.hermes_session") as mock_session,
+    ):
+        assert pyth_fetch_price(MOCK_BTC_FEED_ID) == "97123.45"
+
+    mock_session.assert_not_called()
+
+
+def test_pyth_fetch_price_falls_back_to_rest_for_stale_price(local_hermes, stream):
+    """Test that a stale streamed price is not served."""
+    local_hermes([([price_event(MOCK_BTC_FEED_ID, "9712345", publish_time=1)], True)])
+    stream.subscribe([MOCK_BTC_FEED_ID])
+    wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) is not None)
+
+    with (
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.price_stream", stream),
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.hermes_session") as mock_session,
+    ):
+        mock_session.return_value.get.return_value.json.return_value = {
+            "parsed": [{"price": {"price": "9800000", "expo": -2}}]
+        }
+        assert pyth_fetch_price(MOCK_BTC_FEED_ID) == "98000.00"
+
+    assert stream.fresh(MOCK_BTC_FEED_ID) is None
+
+
+def test_pyth_fetch_price_subscribes_on_first_fetch(local_hermes, stream):
+    """Test that a feed returned by the first fetch is subscribed to, and later fetches are streamed."""
+    hermes = local_hermes([([price_event(MOCK_BTC_FEED_ID, "9712345")], True)])
+
+    with (
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.price_stream", stream),
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.hermes_session") as mock_session,
+    ):
+        mock_session.return_value.get.return_value.json.return_value = {
+            "parsed": [{"id": MOCK_BTC_FEED_ID, "price": {"price": "9800000", "expo": -2}}]
+        }
+        assert pyth_fetch_price(f"0x{MOCK_BTC_FEED_ID}") == "98000.00"
+        wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) is not None)
+        assert pyth_fetch_price(f"0x{MOCK_BTC_FEED_ID}") == "97123.45"
+
+    mock_session.return_value.get.assert_called_once()
+    assert hermes.requests[0]["ids[]"] == [MOCK_BTC_FEED_ID]
+
+
+def test_pyth_fetch_prices_requests_only_unstreamed_feeds(local_hermes, stream):
+    """Test that fresh streamed prices are served, and only the other feeds are requested."""
+    local_hermes([([price_event(MOCK_BTC_FEED_ID, "9712345")], True)])
+    stream.subscribe([MOCK_BTC_FEED_ID])
+    wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) is not None)
+
+    with (
+        patch("cdp_agentkit_core.actions.pyth.fetch_prices.price_stream", stream),
+        patch("cdp_agentkit_core.actions.pyth.fetch_prices.hermes_session") as mock_session,
+    ):
+        mock_session.return_value.get.return_value.json.return_value = {
+            "parsed": [{"id": MOCK_ETH_FEED_ID, "price": {"price": "300000", "expo": -2}}]
+        }
+        result = pyth_fetch_prices([MOCK_ETH_FEED_ID, f"0x{MOCK_BTC_FEED_ID}"])
+
+    assert result == f"{MOCK_ETH_FEED_ID}: 3000.00\n0x{MOCK_BTC_FEED_ID}: 97123.45"
+    assert mock_session.return_value.get.call_args.kwargs["params"] == [("ids[]", MOCK_ETH_FEED_ID)]
+    assert stream.feed_ids == {MOCK_BTC_FEED_ID, MOCK_ETH_FEED_ID}
+
+
+def test_price_stream_tracks_feeds_up_to_limit():
+    """Test that feeds are only subscribed to on demand while under the limit, and when enabled."""
+    stream = PriceStream(max_auto_subscribed_feeds=1)
+
+    with patch.object(stream, "subscribe") as mock_subscribe:
+        stream.track([f"0x{MOCK_BTC_FEED_ID}", MOCK_ETH_FEED_ID])
+        mock_subscribe.assert_called_once_with([MOCK_BTC_FEED_ID])
+
+        mock_subscribe.reset_mock()
+        stream.auto_subscribe = False
+        stream.track([MOCK_BTC_FEED_ID])
+        mock_subscribe.assert_not_called()
+
+
+def test_pyth_fetch_prices_does_not_subscribe_unknown_feeds(stream):
+    """Test that feed IDs which Hermes does not know are not subscribed to."""
+    with (
+        patch("cdp_agentkit_core.actions.pyth.fetch_prices.price_stream", stream),
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.price_stream", stream),
+        patch("cdp_agentkit_core.actions.pyth.fetch_prices.hermes_session") as mock_session,
+        patch("cdp_agentkit_core.actions.pyth.fetch_price.hermes_session") as mock_single_session,
+    ):
+        mock_session.return_value.get.return_value.raise_for_status.side_effect = (
+            requests.exceptions.HTTPError("404 Client Error: Not Found")
+        )
+        mock_single_session.return_value.get.return_value.json.return_value = {"parsed": []}
+        with pytest.raises(requests.exceptions.HTTPError):
+            pyth_fetch_prices([MOCK_UNKNOWN_FEED_ID])
+        with pytest.raises(ValueError, match="No price data found"):
+            pyth_fetch_price(MOCK_UNKNOWN_FEED_ID)
+
+    assert stream.feed_ids == set()
+
+
+def test_price_stream_ignores_unknown_feeds(local_hermes, stream):
+    """Test that an unknown feed ID does not stop the stream for the other feeds."""
+    hermes = local_hermes(
+        [([price_event(MOCK_BTC_FEED_ID, "9712345")], True)], known_ids={MOCK_BTC_FEED_ID}
+    )
+
+    stream.subscribe([MOCK_BTC_FEED_ID, MOCK_UNKNOWN_FEED_ID])
+    wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) is not None)
+
+    assert stream.reconnects == 0
+    assert hermes.requests[0]["ignore_invalid_price_ids"] == ["true"]
+
+
+def test_price_stream_reconnects(local_hermes, stream):
+    """Test that the stream reconnects when the connection drops, and skips malformed events."""
+    local_hermes(
+        [
+            (["data:not json\n\n", price_event(MOCK_BTC_FEED_ID, "100")], False),
+            ([price_event(MOCK_BTC_FEED_ID, "200")], True),
+        ]
+    )
+
+    stream.subscribe([MOCK_BTC_FEED_ID])
+    wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) and stream.get(MOCK_BTC_FEED_ID).price == 200)
+
+    assert stream.reconnects >= 1
+
+
+def test_price_stream_resubscribes(local_hermes, stream):
+    """Test that subscribing to more feeds reopens the stream with every subscribed feed."""
+    hermes = local_hermes(
+        [
+            ([price_event(MOCK_BTC_FEED_ID, "100")], True),
+            ([price_event(MOCK_ETH_FEED_ID, "300")], True),
+        ]
+    )
+    stream.subscribe([MOCK_BTC_FEED_ID])
+    wait_for(lambda: stream.get(MOCK_BTC_FEED_ID) is not None)
+
+    stream.subscribe([MOCK_ETH_FEED_ID])
+    wait_for(lambda: stream.get(MOCK_ETH_FEED_ID) is not None)
+
+    assert sorted(hermes.requests[-1]["ids[]"]) == [MOCK_BTC_FEED_ID, MOCK_ETH_FEED_ID]
+    assert stream.reconnects == 0
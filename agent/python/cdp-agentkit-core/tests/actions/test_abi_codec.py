@@ -0,0 +1,102 @@
+import pytest
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.abi_codec import (
+    checksum_address,
+    encode_function_call,
+    get_function_codec,
+    namehash,
+)
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_QUOTER_ABI, UNISWAP_V3_ABI
+
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+
+
+def test_function_codec_is_cached():
+    """Test that codecs are built once per ABI and method."""
+    assert get_function_codec(WOW_ABI, "balanceOf") is get_function_codec(WOW_ABI, "balanceOf")
+    assert get_function_codec(WOW_ABI, "balanceOf") is not get_function_codec(
+        WOW_ABI, "totalSupply"
+    )
+
+
+def test_function_codec_distinguishes_abis():
+    """Test that equal method names in different ABIs get their own codec."""
+    abi = [
+        {
+            "type": "function",
+            "name": "balanceOf",
+            "inputs": [{"name": "owner", "type": "uint256"}],
+            "outputs": [],
+        }
+    ]
+
+    assert get_function_codec(abi, "balanceOf").selector != (
+        get_function_codec(WOW_ABI, "balanceOf").selector
+    )
+
+
+def test_encode_call_named_and_positional_args():
+    """Test that named and positional arguments produce the same calldata."""
+    codec = get_function_codec(WOW_ABI, "balanceOf")
+
+    named = codec.encode_call({"account": MOCK_TOKEN_ADDRESS.lower()})
+    positional = codec.encode_call([MOCK_TOKEN_ADDRESS])
+
+    assert named == positional
+    assert named == bytes.fromhex("70a08231") + encode(["address"], [MOCK_TOKEN_ADDRESS])
+
+
+def test_encode_call_struct_args():
+    """Test that struct parameters may be passed flattened, with numbers as strings."""
+    calldata = encode_function_call(
+        UNISWAP_QUOTER_ABI,
+        "quoteExactInputSingle",
+        {
+            "tokenIn": MOCK_WETH_ADDRESS,
+            "tokenOut": MOCK_TOKEN_ADDRESS,
+            "amountIn": "1000",
+            "fee": "10000",
+            "sqrtPriceLimitX96": 0,
+        },
+    )
+
+    assert (
+        calldata[10:]
+        == encode(
+            ["(address,address,uint256,uint24,uint160)"],
+            [(MOCK_WETH_ADDRESS, MOCK_TOKEN_ADDRESS, 1000, 10000, 0)],
+        ).hex()
+    )
+
+
+def test_decode_output():
+    """Test that single outputs are unwrapped and multiple outputs are returned as a tuple."""
+    assert get_function_codec(WOW_ABI, "totalSupply").decode_output(encode(["uint256"], [7])) == 7
+
+    slot0 = (2**96, -10, 1, 2, 3, 0, True)
+    return_data = encode(["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"], slot0)
+    assert get_function_codec(UNISWAP_V3_ABI, "slot0").decode_output(return_data) == slot0
+
+
+def test_unknown_method():
+    """Test that methods missing from the ABI raise an error."""
+    with pytest.raises(ValueError, match="Method missing not found in ABI"):
+        get_function_codec(WOW_ABI, "missing")
+
+
+def test_checksum_address_is_interned():
+    """Test that checksummed addresses are computed once per input."""
+    first = checksum_address(MOCK_TOKEN_ADDRESS.lower())
+
+    assert first == MOCK_TOKEN_ADDRESS
+    assert checksum_address(MOCK_TOKEN_ADDRESS.lower()) is first
+
+
+def test_namehash():
+    """Test the ENS namehash against the reference value of `eth`."""
+    assert namehash("eth").hex() == (
+        "93cdeb708b7545dc668eb9280176169d1c33cfd8ed6f04690a0bcc88a93fc4ae"
+    )
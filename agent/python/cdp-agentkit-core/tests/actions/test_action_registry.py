@@ -0,0 +1,207 @@
+import json
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+
+import pytest
+
+from cdp_agentkit_core.actions import CdpAction
+from cdp_agentkit_core.actions.action_registry import (
+    BUILTIN_ACTIONS,
+    BUILTIN_MANIFEST_PATH,
+    ActionRegistry,
+    ActionSpec,
+    _with_manifest_metadata,
+    action_registry,
+    build_manifest,
+)
+
+
+def _noop() -> str:
+    return ""
+
+
+class MockAction(CdpAction):
+    """Mock action."""
+
+    name: str = "mock_action"
+    description: str = "A mock action"
+    func: object = _noop
+
+
+def _run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_import_is_lazy():
+    """Test that importing the actions package does not import any action or web3."""
+    output = _run_python(
+        "import sys, cdp_agentkit_core.actions; "
+        "print(sorted(m for m in sys.modules if m.startswith(('web3', 'cdp_agentkit_core.actions.'))))"
+    )
+
+    assert "web3" not in output
+    assert output == str(
+        [
+            "cdp_agentkit_core.actions.action_registry",
+            "cdp_agentkit_core.actions.cdp_action",
+        ]
+    )
+
+
+def test_get_action_imports_only_its_module():
+    """Test that using an action only imports the module implementing it."""
+    output = _run_python(
+        "import sys; from cdp_agentkit_core.actions import get_action; "
+        "print(get_action('pyth_fetch_price').name, 'wow' in str(list(sys.modules)))"
+    )
+
+    assert output == "pyth_fetch_price False"
+
+
+def test_builtin_actions():
+    """Test that every built-in action loads under its registered name."""
+    actions = action_registry.load_all()
+
+    assert [action.name for action in actions] == [spec.name for spec in BUILTIN_ACTIONS]
+    assert action_registry.get("get_balance") is action_registry.get("get_balance")
+
+
+def test_lazy_package_attributes():
+    """Test that CDP_ACTIONS and the action classes are still exported by the package."""
+    from cdp_agentkit_core.actions import CDP_ACTIONS, WowBuyTokenAction
+
+    assert WowBuyTokenAction.__name__ == "WowBuyTokenAction"
+    assert "wow_buy_token" in [action.name for action in CDP_ACTIONS]
+
+
+def test_register_action():
+    """Test registering actions by class and by import path."""
+    registry = ActionRegistry(entry_point_group=None)
+
+    registry.register("mock_action", MockAction)
+
+    assert registry.names() == ["mock_action"]
+    assert isinstance(registry.get("mock_action"), MockAction)
+    assert "mock_action" in registry
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register("mock_action", "cdp_agentkit_core.actions.trade:TradeAction")
+
+    registry.register("mock_action", f"{__name__}:MockAction")
+    registry.unregister("mock_action")
+    assert registry.names() == []
+
+
+def test_unknown_action():
+    """Test that unknown actions raise a KeyError."""
+    with pytest.raises(KeyError, match="Unknown action: missing"):
+        ActionRegistry(entry_point_group=None).get("missing")
+
+
+def test_action_name_mismatch():
+    """Test that actions registered under another name than their own are rejected."""
+    registry = ActionRegistry(entry_point_group=None)
+    registry.register("other_name", MockAction)
+
+    with pytest.raises(ValueError, match="is named mock_action"):
+        registry.get("other_name")
+
+
+def test_register_non_action():
+    """Test that targets which are not actions are rejected on load."""
+    registry = ActionRegistry(entry_point_group=None)
+    registry.register("mock_action", f"{__name__}:_noop")
+
+    with pytest.raises(TypeError, match="is not a CdpAction subclass"):
+        registry.get("mock_action")
+
+
+def test_entry_point_actions():
+    """Test that actions declared as entry points are discovered on first listing."""
+    entry_point = EntryPoint(
+        name="mock_action", value=f"{__name__}:MockAction", group="cdp_agentkit.actions"
+    )
+
+    with patch(
+        "cdp_agentkit_core.actions.action_registry.entry_points", return_value=[entry_point]
+    ) as mock_entry_points:
+        registry = ActionRegistry()
+        registry.register("get_balance", "cdp_agentkit_core.actions.get_balance:GetBalanceAction")
+
+        assert registry.names() == ["get_balance", "mock_action"]
+        assert isinstance(registry.get("mock_action"), MockAction)
+        registry.names()
+
+    mock_entry_points.assert_called_once_with(group="cdp_agentkit.actions")
+
+
+def test_register_action_metadata():
+    """Test that action metadata is read from classes, or given with import paths."""
+    registry = ActionRegistry(entry_point_group=None)
+
+    spec = registry.register("mock_action", MockAction)
+    assert (spec.description, spec.read_only) == ("A mock action", False)
+    assert registry.register("mock_action", f"{__name__}:MockAction") == spec
+
+    registry.register(
+        "other_action",
+        "missing_package.module:OtherAction",
+        description="Another action",
+        args_schema={"type": "object", "properties": {}},
+        read_only=True,
+    )
+
+    other_spec = registry.spec("other_action")
+    assert other_spec.has_metadata
+    assert (other_spec.description, other_spec.read_only) == ("Another action", True)
+    with pytest.raises(KeyError, match="Unknown action: missing"):
+        registry.spec("missing")
+
+
+def test_builtin_actions_are_described_without_import():
+    """Test that every built-in action has metadata from the manifest without being imported."""
+    output = _run_python(
+        "import sys; from cdp_agentkit_core.actions import action_registry; "
+        "specs = action_registry.specs(); "
+        "print(all(spec.has_metadata for spec in specs), "
+        "[m for m in sys.modules if m.startswith('cdp_agentkit_core.actions.')])"
+    )
+
+    assert output == (
+        "True ['cdp_agentkit_core.actions.cdp_action', 'cdp_agentkit_core.actions.action_registry']"
+    )
+
+
+def test_builtin_manifest_is_up_to_date():
+    """Test that the built-in action manifest matches the actions, see `make action-manifest`."""
+    with open(BUILTIN_MANIFEST_PATH) as f:
+        manifest = json.load(f)
+
+    assert manifest == build_manifest(action_registry.load_all())
+
+
+def test_stale_manifest_metadata_is_ignored(tmp_path):
+    """Test that manifest metadata of another target, or an unreadable manifest, is not used."""
+    manifest_path = tmp_path / "actions.json"
+    manifest_path.write_text(
+        json.dumps(
+            {
+                "mock_action": {
+                    "target": "old_package:MockAction",
+                    "description": "Stale",
+                    "args_schema": None,
+                    "read_only": True,
+                }
+            }
+        )
+    )
+    specs = [ActionSpec("mock_action", f"{__name__}:MockAction")]
+
+    assert _with_manifest_metadata(specs, manifest_path) == specs
+
+    manifest_path.write_text("not json")
+    assert _with_manifest_metadata(specs, manifest_path) == specs
@@ -0,0 +1,165 @@
+from unittest.mock import patch
+
+import pytest
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.allowance_ledger import AllowanceLedger, allowance_ledger
+from cdp_agentkit_core.actions.constants import ERC20_APPROVE_ABI, MAX_UINT256
+from cdp_agentkit_core.actions.utils import approve
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_TOKEN_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_OTHER_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_OWNER = "0x1234567890123456789012345678901234567890"
+MOCK_SPENDER = "0xBBBBBbbBBb9cC5e90e3b3Af64bdAF62C37EEFFCb"
+MOCK_AMOUNT = 1000
+
+
+def aggregate_result(*allowances: int) -> list[dict]:
+    """Build the aggregate3 result of allowance reads."""
+    return [
+        {"success": True, "returnData": "0x" + encode(["uint256"], [allowance]).hex()}
+        for allowance in allowances
+    ]
+
+
+@pytest.fixture
+def mock_wallet(wallet_factory):
+    """Create a wallet owning the tokens."""
+    return wallet_factory(network_id=MOCK_NETWORK_ID, default_address=MOCK_OWNER)
+
+
+def test_allowances_are_read_in_one_batch_and_cached():
+    """Test that allowances which are not cached are read in a single multicall."""
+    ledger = AllowanceLedger()
+    allowances = [
+        (MOCK_TOKEN_ADDRESS, MOCK_OWNER, MOCK_SPENDER),
+        (MOCK_OTHER_TOKEN_ADDRESS, MOCK_OWNER, MOCK_SPENDER),
+    ]
+
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=aggregate_result(MOCK_AMOUNT, 0),
+    ) as mock_read:
+        assert ledger.allowances(MOCK_NETWORK_ID, allowances) == [MOCK_AMOUNT, 0]
+        cached = ledger.allowance(
+            MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS.lower(), MOCK_OWNER, MOCK_SPENDER.lower()
+        )
+
+    assert cached == MOCK_AMOUNT
+    mock_read.assert_called_once()
+    assert len(mock_read.call_args.kwargs["args"]["calls"]) == 2
+
+
+def test_cached_allowances_expire():
+    """Test that cached allowances are read again after the TTL."""
+    ledger = AllowanceLedger(ttl=0)
+
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=aggregate_result(MOCK_AMOUNT),
+    ) as mock_read:
+        ledger.allowance(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_OWNER, MOCK_SPENDER)
+        ledger.allowance(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_OWNER, MOCK_SPENDER)
+
+    assert mock_read.call_count == 2
+
+
+def test_approvals_and_spending_update_the_ledger():
+    """Test that recorded approvals set allowances and spending decreases them."""
+    ledger = AllowanceLedger()
+    allowance = (MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_OWNER, MOCK_SPENDER)
+
+    ledger.record_approval(*allowance, MOCK_AMOUNT)
+    ledger.spend(*allowance, 400)
+
+    assert ledger.covers(*allowance, 600)
+    assert not ledger.covers(*allowance, 601)
+
+    ledger.record_approval(*allowance, MAX_UINT256)
+    ledger.spend(*allowance, MOCK_AMOUNT)
+
+    assert ledger.allowance(*allowance) == MAX_UINT256
+    assert ledger.stats().approvals_sent == 2
+
+
+def test_approve_skips_covered_allowance(mock_wallet):
+    """Test that no approval is sent when the allowance covers the amount."""
+    allowance_ledger.record_approval(
+        MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_OWNER, MOCK_SPENDER, MOCK_AMOUNT
+    )
+
+    with patch.object(mock_wallet, "invoke_contract") as mock_invoke:
+        result = approve(mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_SPENDER, MOCK_AMOUNT)
+
+    assert result == (
+        f"Allowance of {MOCK_SPENDER} already covers {MOCK_AMOUNT} tokens, no approval needed"
+    )
+    mock_invoke.assert_not_called()
+    assert allowance_ledger.stats().approvals_avoided == 1
+
+
+def test_approve_sends_approval_and_records_it(mock_wallet, contract_invocation_factory):
+    """Test that an approval is sent when the allowance does not cover the amount."""
+    mock_invocation = contract_invocation_factory()
+
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            return_value=aggregate_result(MOCK_AMOUNT - 1),
+        ),
+        patch.object(mock_wallet, "invoke_contract", return_value=mock_invocation) as mock_invoke,
+        patch.object(mock_invocation, "wait", return_value=mock_invocation),
+    ):
+        result = approve(mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_SPENDER, MOCK_AMOUNT)
+        second_result = approve(mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_SPENDER, MOCK_AMOUNT)
+
+    assert result.startswith(f"Approved {MOCK_AMOUNT} tokens for {MOCK_SPENDER}")
+    assert second_result.endswith("no approval needed")
+    mock_invoke.assert_called_once_with(
+        contract_address=MOCK_TOKEN_ADDRESS,
+        method="approve",
+        abi=ERC20_APPROVE_ABI,
+        args={"spender": MOCK_SPENDER, "value": str(MOCK_AMOUNT)},
+    )
+    assert allowance_ledger.stats().approvals_sent == 1
+    assert allowance_ledger.stats().approvals_avoided == 1
+
+
+def test_approve_max_once(monkeypatch, mock_wallet, contract_invocation_factory):
+    """Test that the approve max policy approves the maximum amount once."""
+    monkeypatch.setattr(allowance_ledger, "approve_max", True)
+    mock_invocation = contract_invocation_factory()
+
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            return_value=aggregate_result(0),
+        ),
+        patch.object(mock_wallet, "invoke_contract", return_value=mock_invocation) as mock_invoke,
+        patch.object(mock_invocation, "wait", return_value=mock_invocation),
+    ):
+        for _ in range(3):
+            approve(mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_SPENDER, MOCK_AMOUNT)
+            allowance_ledger.spend(
+                MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_OWNER, MOCK_SPENDER, MOCK_AMOUNT
+            )
+
+    mock_invoke.assert_called_once()
+    assert mock_invoke.call_args.kwargs["args"]["value"] == str(MAX_UINT256)
+    assert allowance_ledger.stats().approvals_avoided == 2
+
+
+def test_approve_when_allowance_read_fails(mock_wallet, contract_invocation_factory):
+    """Test that an approval is sent when the allowance can not be read."""
+    mock_invocation = contract_invocation_factory()
+
+    with (
+        patch.object(allowance_ledger, "allowance", side_effect=Exception("API error")),
+        patch.object(mock_wallet, "invoke_contract", return_value=mock_invocation) as mock_invoke,
+        patch.object(mock_invocation, "wait", return_value=mock_invocation),
+    ):
+        result = approve(mock_wallet, MOCK_TOKEN_ADDRESS, MOCK_SPENDER, MOCK_AMOUNT)
+
+    assert result.startswith("Approved")
+    mock_invoke.assert_called_once()
@@ -0,0 +1,50 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from cdp_agentkit_core.actions.get_balance import (
+    GetBalanceAction,
+    GetBalanceInput,
+    get_balance,
+)
+
+MOCK_ASSET_ID = "usdc"
+MOCK_ADDRESSES = ["0xaddress1", "0xaddress2", "0xaddress3"]
+
+
+def _mock_addresses(balance):
+    addresses = []
+    for address_id in MOCK_ADDRESSES:
+        address = Mock()
+        address.address_id = address_id
+        address.balance.side_effect = balance
+        addresses.append(address)
+    return addresses
+
+
+def test_get_balance_input_model_missing_params():
+    """Test that GetBalanceInput raises error when params are missing."""
+    with pytest.raises(ValueError):
+        GetBalanceInput()
+
+
+def test_get_balance_success(wallet_factory):
+    """Test successful balance check for all addresses of the wallet."""
+    mock_wallet = wallet_factory()
+    mock_wallet.addresses = _mock_addresses(lambda asset_id: Decimal("1.5"))
+
+    action_response = get_balance(mock_wallet, MOCK_ASSET_ID)
+
+    assert action_response == (
+        "Balances for wallet test-wallet-id:\n"
+        "  0xaddress1: 1.5\n  0xaddress2: 1.5\n  0xaddress3: 1.5"
+    )
+
+
+def test_get_balance_action_runs_in_worker_thread():
+    """Test that the action has no coroutine, so async callers run it in a worker thread."""
+    action = GetBalanceAction()
+
+    assert action.func is get_balance
+    assert action.coroutine is None
@@ -3,13 +3,17 @@ from unittest.mock import patch
 import pytest
 
 from cdp_agentkit_core.actions.get_balance_nft import (
+    NFT_BALANCE_PAGE_SIZE,
     GetBalanceNftInput,
     get_balance_nft,
 )
+from cdp_agentkit_core.actions.nft_index import ZERO_ADDRESS, NftTransfer
 
 MOCK_CONTRACT_ADDRESS = "0xvalidContractAddress"
 MOCK_ADDRESS = "0xvalidAddress"
 MOCK_TOKEN_IDS = [1, 2, 3]
+MOCK_INDEXED_CONTRACT = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_INDEXED_OWNER = "0x1234567890123456789012345678901234567890"
 
 
 def test_get_balance_nft_input_model_valid():
@@ -104,3 +108,147 @@ def test_get_balance_nft_api_error(wallet_factory):
 
         expected_response = f"Error getting NFT balance for address {MOCK_ADDRESS} in contract {MOCK_CONTRACT_ADDRESS}: API error"
         assert action_response == expected_response
+
+
+def test_get_balance_nft_pages_large_holdings(wallet_factory):
+    """Test that large holdings are listed one page at a time."""
+    mock_wallet = wallet_factory()
+    mock_wallet.default_address.address_id = MOCK_ADDRESS
+    token_ids = list(range(NFT_BALANCE_PAGE_SIZE + 5))
+
+    with patch("cdp.smart_contract.SmartContract.read", return_value=token_ids):
+        action_response = get_balance_nft(mock_wallet, MOCK_CONTRACT_ADDRESS, page=2)
+
+    assert action_response == (
+        f"Address {MOCK_ADDRESS} owns {len(token_ids)} NFTs in contract {MOCK_CONTRACT_ADDRESS}.\n"
+        f"Token IDs: {', '.join(str(token_id) for token_id in token_ids[NFT_BALANCE_PAGE_SIZE:])}\n"
+        "Showing page 2 of 2."
+    )
+
+
+def test_get_balance_nft_from_index(wallet_factory, isolate_nft_index):
+    """Test that indexed contracts are synced and answered without tokensOfOwner."""
+    mock_wallet = wallet_factory()
+    mock_wallet.default_address.address_id = MOCK_INDEXED_OWNER
+    isolate_nft_index.record_transfers(
+        "base-sepolia",
+        MOCK_INDEXED_CONTRACT,
+        [NftTransfer(7, ZERO_ADDRESS, MOCK_INDEXED_OWNER, 10)],
+        100,
+        complete=True,
+    )
+
+    with (
+        patch("cdp_agentkit_core.actions.get_balance_nft.sync_nft_index") as mock_sync,
+        patch("cdp.smart_contract.SmartContract.read") as mock_read,
+    ):
+        action_response = get_balance_nft(mock_wallet, MOCK_INDEXED_CONTRACT)
+
+    assert action_response == (
+        f"Address {MOCK_INDEXED_OWNER} owns 1 NFTs in contract {MOCK_INDEXED_CONTRACT}.\n"
+        "Token IDs: 7"
+    )
+    mock_sync.assert_called_once_with("base-sepolia", MOCK_INDEXED_CONTRACT, start_block=0)
+    mock_read.assert_not_called()
+
+
+def test_get_balance_nft_index_sync_error(wallet_factory, isolate_nft_index):
+    """Test that indexed contracts are answered from the last sync when syncing fails."""
+    mock_wallet = wallet_factory()
+    mock_wallet.default_address.address_id = MOCK_INDEXED_OWNER
+    isolate_nft_index.record_transfers(
+        "base-sepolia",
+        MOCK_INDEXED_CONTRACT,
+        [NftTransfer(7, ZERO_ADDRESS, MOCK_INDEXED_OWNER, 10)],
+        100,
+        complete=True,
+    )
+
+    with patch(
+        "cdp_agentkit_core.actions.get_balance_nft.sync_nft_index",
+        side_effect=Exception("API error"),
+    ):
+        action_response = get_balance_nft(mock_wallet, MOCK_INDEXED_CONTRACT)
+
+    assert action_response.endswith("Token IDs: 7")
+
+
+def test_get_balance_nft_build_index_error(wallet_factory):
+    """Test that failing to build the index of a contract is reported."""
+    mock_wallet = wallet_factory()
+    mock_wallet.default_address.address_id = MOCK_ADDRESS
+
+    with patch(
+        "cdp_agentkit_core.actions.get_balance_nft.sync_nft_index",
+        side_effect=Exception("API error"),
+    ):
+        action_response = get_balance_nft(mock_wallet, MOCK_CONTRACT_ADDRESS, build_index=True)
+
+    assert action_response == (
+        f"Error getting NFT balance for address {MOCK_ADDRESS} in contract {MOCK_CONTRACT_ADDRESS}: API error"
+    )
+
+
+def test_get_balance_nft_partial_index_reads_tokens_of_owner(wallet_factory, isolate_nft_index):
+    """Test that a contract whose first index build was interrupted is read with tokensOfOwner."""
+    mock_wallet = wallet_factory()
+    mock_wallet.default_address.address_id = MOCK_INDEXED_OWNER
+    isolate_nft_index.record_transfers(
+        "base-sepolia",
+        MOCK_INDEXED_CONTRACT,
+        [NftTransfer(7, ZERO_ADDRESS, MOCK_INDEXED_OWNER, 10)],
+        100,
+    )
+
+    with (
+        patch(
+            "cdp_agentkit_core.actions.get_balance_nft.sync_nft_index",
+            side_effect=Exception("API error"),
+        ),
+        patch("cdp.smart_contract.SmartContract.read", return_value=MOCK_TOKEN_IDS),
+    ):
+        action_response = get_balance_nft(mock_wallet, MOCK_INDEXED_CONTRACT)
+
+    assert action_response.endswith("Token IDs: 1, 2, 3")
+
+    with (
+        patch(
+            "cdp_agentkit_core.actions.get_balance_nft.sync_nft_index",
+            side_effect=Exception("API error"),
+        ),
+        patch("cdp.smart_contract.SmartContract.read", side_effect=Exception("no tokensOfOwner")),
+    ):
+        action_response = get_balance_nft(mock_wallet, MOCK_INDEXED_CONTRACT, page=2)
+
+    assert action_response == (
+        f"Error getting NFT balance for address {MOCK_INDEXED_OWNER} in contract "
+        f"{MOCK_INDEXED_CONTRACT}: the NFT index is only built up to block 100, and "
+        "tokensOfOwner failed: no tokensOfOwner"
+    )
+
+
+def test_get_balance_nft_build_index_from_start_block(wallet_factory, isolate_nft_index):
+    """Test that building an index starts from the given deploy block, and answers from it."""
+    mock_wallet = wallet_factory()
+    mock_wallet.default_address.address_id = MOCK_INDEXED_OWNER
+
+    def sync(network_id, contract_address, start_block):
+        isolate_nft_index.record_transfers(
+            network_id,
+            contract_address,
+            [NftTransfer(7, ZERO_ADDRESS, MOCK_INDEXED_OWNER, start_block)],
+            start_block + 10,
+            complete=True,
+        )
+
+    with (
+        patch("cdp_agentkit_core.actions.get_balance_nft.sync_nft_index", side_effect=sync),
+        patch("cdp.smart_contract.SmartContract.read") as mock_read,
+    ):
+        action_response = get_balance_nft(
+            mock_wallet, MOCK_INDEXED_CONTRACT, build_index=True, start_block=1_000
+        )
+
+    assert action_response.endswith("Token IDs: 7")
+    assert isolate_nft_index.last_indexed_block("base-sepolia", MOCK_INDEXED_CONTRACT) == 1_010
+    mock_read.assert_not_called()
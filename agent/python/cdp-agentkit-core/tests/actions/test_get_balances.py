@@ -0,0 +1,208 @@
+import threading
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.balance_engine import fetch_balances
+from cdp_agentkit_core.actions.get_balances import (
+    GetBalancesAction,
+    GetBalancesInput,
+    get_balances,
+)
+
+MOCK_ADDRESSES = [
+    "0x1234567890123456789012345678901234567890",
+    "0xBBBBBbbBBb9cC5e90e3b3Af64bdAF62C37EEFFCb",
+]
+MOCK_USDC_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_TOKEN_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_ASSETS = {
+    "eth": SimpleNamespace(contract_address=None, decimals=18),
+    "usdc": SimpleNamespace(contract_address=MOCK_USDC_ADDRESS, decimals=6),
+}
+
+
+def aggregate_result(*values: int) -> list[dict]:
+    """Build the aggregate3 result of uint reads."""
+    return [
+        {"success": True, "returnData": "0x" + encode(["uint256"], [value]).hex()}
+        for value in values
+    ]
+
+
+def fetch_asset(network_id: str, asset_id: str) -> SimpleNamespace:
+    """Fetch a mock asset."""
+    if asset_id not in MOCK_ASSETS:
+        raise Exception(f"Asset {asset_id} not found")
+    return MOCK_ASSETS[asset_id]
+
+
+@pytest.fixture
+def mock_wallet(wallet_factory):
+    """Create a wallet with two addresses holding 1.5 ETH each."""
+    wallet = wallet_factory()
+    wallet.addresses = []
+    for address_id in MOCK_ADDRESSES:
+        address = Mock()
+        address.address_id = address_id
+        address.balance.return_value = Decimal("1.5")
+        wallet.addresses.append(address)
+    return wallet
+
+
+def test_get_balances_input_model_valid():
+    """Test that GetBalancesInput accepts a list of asset IDs."""
+    input_model = GetBalancesInput(asset_ids=["eth", "usdc"])
+
+    assert input_model.asset_ids == ["eth", "usdc"]
+
+
+def test_get_balances_input_model_empty():
+    """Test that GetBalancesInput requires at least one asset ID."""
+    with pytest.raises(ValueError):
+        GetBalancesInput(asset_ids=[])
+
+
+def test_get_balances_success(mock_wallet):
+    """Test that native balances and batched token balances are reported for every address."""
+    with (
+        patch("cdp_agentkit_core.actions.balance_engine.Asset.fetch", side_effect=fetch_asset),
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            return_value=aggregate_result(2_500_000, 0, 10**18, 3 * 10**17, 18),
+        ) as mock_read,
+    ):
+        action_response = get_balances(mock_wallet, ["eth", "usdc", MOCK_TOKEN_ADDRESS])
+
+    assert action_response == (
+        "Balances for wallet test-wallet-id:\n"
+        f"  {MOCK_ADDRESSES[0]}:\n"
+        "    eth: 1.5\n"
+        "    usdc: 2.5\n"
+        f"    {MOCK_TOKEN_ADDRESS}: 1\n"
+        f"  {MOCK_ADDRESSES[1]}:\n"
+        "    eth: 1.5\n"
+        "    usdc: 0\n"
+        f"    {MOCK_TOKEN_ADDRESS}: 0.3"
+    )
+    mock_read.assert_called_once()
+    assert len(mock_read.call_args.kwargs["args"]["calls"]) == 5
+    for address in mock_wallet.addresses:
+        address.balance.assert_called_once_with("eth")
+
+
+def test_get_balances_fetches_native_and_token_balances_concurrently(mock_wallet):
+    """Test that native balances and the token batch are fetched at the same time."""
+    barrier = threading.Barrier(len(MOCK_ADDRESSES) + 1, timeout=5)
+
+    def balance(asset_id: str) -> Decimal:
+        barrier.wait()
+        return Decimal("2")
+
+    def read(*args, **kwargs) -> list[dict]:
+        barrier.wait()
+        return aggregate_result(1_000_000, 2_000_000)
+
+    for address in mock_wallet.addresses:
+        address.balance.side_effect = balance
+
+    with (
+        patch("cdp_agentkit_core.actions.balance_engine.Asset.fetch", side_effect=fetch_asset),
+        patch("cdp_agentkit_core.actions.multicall.SmartContract.read", side_effect=read),
+    ):
+        action_response = get_balances(mock_wallet, ["eth", "usdc"])
+
+    assert "    eth: 2\n    usdc: 1\n" in action_response
+    assert action_response.endswith("    eth: 2\n    usdc: 2")
+
+
+def test_fetch_balances_pins_block_of_fresh_balances(mock_wallet):
+    """Test that pinned balances are read with the block, rather than from the read cache."""
+    with (
+        patch("cdp_agentkit_core.actions.balance_engine.Asset.fetch", side_effect=fetch_asset),
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            side_effect=[aggregate_result(1_000_000, 0, 6), aggregate_result(2_000_000, 0, 100)],
+        ) as mock_read,
+    ):
+        fetch_balances(mock_wallet, [MOCK_USDC_ADDRESS])
+        balances = fetch_balances(mock_wallet, [MOCK_USDC_ADDRESS], pin_block=True)
+
+    assert balances.block_number == 100
+    assert balances.balances[MOCK_ADDRESSES[0]][MOCK_USDC_ADDRESS] == Decimal(2)
+    # The decimals are immutable, so only the balances and the block are read again.
+    assert len(mock_read.call_args.kwargs["args"]["calls"]) == 3
+
+
+def test_fetch_balances_fails_without_pinned_block(mock_wallet):
+    """Test that pinned balances fail when the batch falls back to individual reads."""
+
+    def read(network_id, contract_address, method, **kwargs):
+        if method == "aggregate3":
+            raise Exception("Multicall error")
+        return 0
+
+    with (
+        patch("cdp_agentkit_core.actions.balance_engine.Asset.fetch", side_effect=fetch_asset),
+        patch("cdp_agentkit_core.actions.multicall.SmartContract.read", side_effect=read),
+    ):
+        balances = fetch_balances(mock_wallet, ["usdc"], pin_block=True)
+
+    assert balances.block_number is None
+    assert balances.errors == {"usdc": "could not read the token balances in a single batch"}
+
+
+def test_get_balances_resolves_assets_once(mock_wallet):
+    """Test that assets are fetched from the API once."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.balance_engine.Asset.fetch", side_effect=fetch_asset
+        ) as mock_fetch,
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            return_value=aggregate_result(0, 0),
+        ),
+    ):
+        get_balances(mock_wallet, ["eth", "usdc", "eth"])
+        get_balances(mock_wallet, ["eth", "usdc"])
+
+    assert mock_fetch.call_count == 2
+
+
+def test_get_balances_reports_asset_errors(mock_wallet):
+    """Test that assets which fail are reported without hiding the others."""
+    mock_wallet.addresses[1].balance.side_effect = Exception("API error")
+
+    with patch("cdp_agentkit_core.actions.balance_engine.Asset.fetch", side_effect=fetch_asset):
+        action_response = get_balances(mock_wallet, ["eth", "unknown"])
+
+    assert action_response == (
+        "Balances for wallet test-wallet-id:\n"
+        f"  {MOCK_ADDRESSES[0]}:\n"
+        f"  {MOCK_ADDRESSES[1]}:\n"
+        "Errors:\n"
+        "  unknown: Asset unknown not found\n"
+        "  eth: API error"
+    )
+
+
+def test_get_balances_error(wallet_factory):
+    """Test that failing to list the addresses of the wallet is reported."""
+    mock_wallet = wallet_factory()
+    type(mock_wallet).addresses = property(Mock(side_effect=Exception("API error")))
+
+    action_response = get_balances(mock_wallet, ["eth"])
+
+    assert action_response == "Error getting balances for all addresses in the wallet API error"
+
+
+def test_get_balances_action():
+    """Test the get balances action is read-only and runs in a worker thread when awaited."""
+    action = GetBalancesAction()
+
+    assert action.name == "get_balances"
+    assert action.read_only
+    assert action.coroutine is None
@@ -0,0 +1,69 @@
+from unittest.mock import Mock
+
+import pytest
+from cdp import Transaction
+
+from cdp_agentkit_core.actions.get_transaction_status import (
+    GetTransactionStatusInput,
+    get_transaction_status,
+)
+from cdp_agentkit_core.actions.transaction_tracker import transaction_tracker
+
+MOCK_TRANSACTION_HASH = "0xvalidTransactionHash"
+MOCK_TRANSACTION_LINK = "https://basescan.org/tx/0xvalidTransactionHash"
+
+
+@pytest.fixture
+def tracked_operation(monkeypatch):
+    """Track a submitted operation without background polling."""
+    monkeypatch.setattr(transaction_tracker, "poll_interval", 60)
+    operation = Mock(spec=["network_id", "transaction", "reload"])
+    operation.transaction = Mock(spec=Transaction)
+    operation.transaction.status = "broadcast"
+    operation.transaction.transaction_hash = MOCK_TRANSACTION_HASH
+    operation.transaction.transaction_link = MOCK_TRANSACTION_LINK
+    return operation
+
+
+def test_get_transaction_status_input_model_valid():
+    """Test that GetTransactionStatusInput accepts valid parameters."""
+    assert GetTransactionStatusInput(transaction="abc").transaction == "abc"
+    assert GetTransactionStatusInput().transaction is None
+
+
+def test_get_transaction_status_by_id(tracked_operation):
+    """Test getting the status of a transaction by tracking ID."""
+    record = transaction_tracker.track(tracked_operation, "transfer")
+
+    action_response = get_transaction_status(record.id)
+
+    assert action_response == (
+        f"- {record.id} (transfer): broadcast, transaction hash {MOCK_TRANSACTION_HASH}, "
+        f"transaction link {MOCK_TRANSACTION_LINK}"
+    )
+
+
+def test_get_transaction_status_by_hash_after_completion(tracked_operation):
+    """Test getting the status of a completed transaction by transaction hash."""
+    record = transaction_tracker.track(tracked_operation, "trade")
+    tracked_operation.transaction.status = "complete"
+    transaction_tracker.poll()
+
+    action_response = get_transaction_status(MOCK_TRANSACTION_HASH)
+
+    assert action_response.startswith(f"- {record.id} (trade): complete")
+
+
+def test_get_transaction_status_lists_transactions(tracked_operation):
+    """Test listing the tracked transactions."""
+    record = transaction_tracker.track(tracked_operation, "transfer")
+
+    action_response = get_transaction_status()
+
+    assert action_response.startswith(f"Tracked transactions:\n- {record.id} (transfer)")
+
+
+def test_get_transaction_status_unknown():
+    """Test getting the status of transactions which are not tracked."""
+    assert get_transaction_status("0xunknown") == "No tracked transaction found for 0xunknown"
+    assert get_transaction_status() == "No transactions have been tracked"
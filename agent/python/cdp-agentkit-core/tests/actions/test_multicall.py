@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.constants import MULTICALL3_ABI, MULTICALL3_ADDRESS
+from cdp_agentkit_core.actions.multicall import (
+    ContractRead,
+    decode_result,
+    encode_call,
+    multicall_read,
+)
+from cdp_agentkit_core.actions.read_cache import read_cache
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_V3_ABI
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_BALANCE = 123456789
+MOCK_FEE = 3000
+
+
+def test_encode_call_balance_of():
+    """Test that calldata is the function selector followed by the encoded arguments."""
+    read = ContractRead(MOCK_TOKEN_ADDRESS, "balanceOf", WOW_ABI, {"account": MOCK_POOL_ADDRESS})
+
+    calldata = encode_call(read)
+
+    assert calldata[:4].hex() == "70a08231"
+    assert calldata[4:] == encode(["address"], [MOCK_POOL_ADDRESS])
+
+
+def test_decode_result_multiple_outputs():
+    """Test that methods with multiple outputs are decoded as a tuple."""
+    read = ContractRead(MOCK_POOL_ADDRESS, "slot0", UNISWAP_V3_ABI)
+    return_data = encode(
+        ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"],
+        [2**96, -10, 1, 2, 3, 0, True],
+    )
+
+    assert decode_result(read, return_data) == (2**96, -10, 1, 2, 3, 0, True)
+
+
+def test_multicall_read_success():
+    """Test that all reads are sent in a single aggregate3 call and decoded in order."""
+    reads = [
+        ContractRead(MOCK_TOKEN_ADDRESS, "balanceOf", WOW_ABI, {"account": MOCK_POOL_ADDRESS}),
+        ContractRead(MOCK_POOL_ADDRESS, "fee", UNISWAP_V3_ABI),
+    ]
+    aggregate_result = [
+        {"success": True, "returnData": "0x" + encode(["uint256"], [MOCK_BALANCE]).hex()},
+        {"success": True, "returnData": "0x" + encode(["uint24"], [MOCK_FEE]).hex()},
+    ]
+
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read", return_value=aggregate_result
+    ) as mock_read:
+        result = multicall_read(MOCK_NETWORK_ID, reads)
+
+    assert result == [MOCK_BALANCE, MOCK_FEE]
+    mock_read.assert_called_once()
+    assert mock_read.call_args[0][:3] == (MOCK_NETWORK_ID, MULTICALL3_ADDRESS, "aggregate3")
+    assert mock_read.call_args[1]["abi"] == MULTICALL3_ABI
+    assert len(mock_read.call_args[1]["args"]["calls"]) == 2
+
+
+def test_multicall_read_failed_call_falls_back():
+    """Test that a call which fails inside the batch is retried as an individual read."""
+    reads = [
+        ContractRead(MOCK_TOKEN_ADDRESS, "balanceOf", WOW_ABI, {"account": MOCK_POOL_ADDRESS}),
+        ContractRead(MOCK_POOL_ADDRESS, "fee", UNISWAP_V3_ABI),
+    ]
+    aggregate_result = [
+        {"success": True, "returnData": "0x" + encode(["uint256"], [MOCK_BALANCE]).hex()},
+        {"success": False, "returnData": "0x"},
+    ]
+
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        side_effect=[aggregate_result, MOCK_FEE],
+    ) as mock_read:
+        result = multicall_read(MOCK_NETWORK_ID, reads)
+
+    assert result == [MOCK_BALANCE, MOCK_FEE]
+    assert mock_read.call_count == 2
+    mock_read.assert_called_with(
+        MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "fee", abi=UNISWAP_V3_ABI, args=None
+    )
+
+
+def test_multicall_read_batch_error_falls_back():
+    """Test that every read is executed individually when the aggregate call fails."""
+    reads = [
+        ContractRead(MOCK_TOKEN_ADDRESS, "balanceOf", WOW_ABI, {"account": MOCK_POOL_ADDRESS}),
+        ContractRead(MOCK_POOL_ADDRESS, "fee", UNISWAP_V3_ABI),
+    ]
+
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        side_effect=[Exception("API error"), MOCK_BALANCE, MOCK_FEE],
+    ) as mock_read:
+        result = multicall_read(MOCK_NETWORK_ID, reads)
+
+    assert result == [MOCK_BALANCE, MOCK_FEE]
+    assert mock_read.call_count == 3
+
+
+def test_multicall_read_empty():
+    """Test that an empty batch does not make any calls."""
+    with patch("cdp_agentkit_core.actions.multicall.SmartContract.read") as mock_read:
+        assert multicall_read(MOCK_NETWORK_ID, []) == []
+
+    mock_read.assert_not_called()
+
+
+def test_multicall_read_skips_cached_reads():
+    """Test that cached immutable reads are not sent again while volatile reads are."""
+    reads = [
+        ContractRead(MOCK_POOL_ADDRESS, "fee", UNISWAP_V3_ABI),
+        ContractRead(MOCK_TOKEN_ADDRESS, "balanceOf", WOW_ABI, {"account": MOCK_POOL_ADDRESS}),
+    ]
+    aggregate_result = [
+        {"success": True, "returnData": "0x" + encode(["uint24"], [MOCK_FEE]).hex()},
+        {"success": True, "returnData": "0x" + encode(["uint256"], [MOCK_BALANCE]).hex()},
+    ]
+
+    with (
+        patch.object(read_cache, "volatile_ttl", 0),
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            side_effect=[aggregate_result, aggregate_result[1:]],
+        ) as mock_read,
+    ):
+        multicall_read(MOCK_NETWORK_ID, reads)
+        result = multicall_read(MOCK_NETWORK_ID, reads)
+
+    assert result == [MOCK_FEE, MOCK_BALANCE]
+    assert len(mock_read.call_args[1]["args"]["calls"]) == 1
@@ -0,0 +1,172 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cdp_agentkit_core.actions.nft_index import (
+    SYNC_BLOCK_RANGE,
+    ZERO_ADDRESS,
+    NftIndex,
+    NftTransfer,
+    sync_nft_index,
+)
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_CONTRACT_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_OWNER = "0x1234567890123456789012345678901234567890"
+MOCK_OTHER_OWNER = "0xBBBBBbbBBb9cC5e90e3b3Af64bdAF62C37EEFFCb"
+
+
+def _event(token_id, from_address, to_address, block_height, event_index=0):
+    data = {"from": from_address.lower(), "to": to_address.lower(), "tokenId": str(token_id)}
+    return SimpleNamespace(
+        data=json.dumps(data),
+        block_height=block_height,
+        tx_index=0,
+        event_index=event_index,
+        tx_hash="0xabc",
+    )
+
+
+def _page(events, next_page=""):
+    return SimpleNamespace(data=events, has_more=bool(next_page), next_page=next_page)
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Create an empty NFT index."""
+    index = NftIndex(tmp_path / "nft_index.sqlite3")
+    yield index
+    index.close()
+
+
+def test_nft_index_lookup_without_database(tmp_path):
+    """Test that lookups against an index that was never synced miss without creating it."""
+    index = NftIndex(tmp_path / "missing.sqlite3")
+
+    assert index.last_indexed_block(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS) is None
+    assert index.tokens_of_owner(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OWNER) == []
+    assert not index.path.exists()
+
+
+def test_nft_index_applies_transfers_in_chain_order(index):
+    """Test that the last transfer of a token sets its owner, and burns remove it."""
+    index.record_transfers(
+        MOCK_NETWORK_ID,
+        MOCK_CONTRACT_ADDRESS,
+        [
+            NftTransfer(2, MOCK_OWNER, MOCK_OTHER_OWNER, 20),
+            NftTransfer(2, ZERO_ADDRESS, MOCK_OWNER, 10),
+            NftTransfer(10, ZERO_ADDRESS, MOCK_OWNER, 10, event_index=1),
+            NftTransfer(3, ZERO_ADDRESS, MOCK_OWNER, 10, event_index=2),
+            NftTransfer(3, MOCK_OWNER, ZERO_ADDRESS, 30),
+            NftTransfer(2**200, ZERO_ADDRESS, MOCK_OWNER, 30),
+        ],
+        100,
+    )
+
+    assert index.tokens_of_owner(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OWNER.upper()) == [
+        10,
+        2**200,
+    ]
+    assert index.tokens_of_owner(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OTHER_OWNER) == [2]
+    assert index.count_tokens_of_owner(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OWNER) == 2
+    assert index.tokens_of_owner(
+        MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OWNER, limit=1, offset=1
+    ) == [2**200]
+    assert index.last_indexed_block(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS.lower()) == 100
+
+
+def test_sync_nft_index_incremental(index):
+    """Test that syncs page through Transfer events and resume from the last indexed block."""
+    pages = [
+        _page([_event(1, ZERO_ADDRESS, MOCK_OWNER, 10)], next_page="next"),
+        _page(
+            [
+                _event(1, MOCK_OWNER, MOCK_OTHER_OWNER, 20),
+                _event(2, ZERO_ADDRESS, MOCK_OWNER, 20, 1),
+            ]
+        ),
+    ]
+    with (
+        patch("cdp_agentkit_core.actions.nft_index.Cdp"),
+        patch("cdp_agentkit_core.actions.nft_index.ContractEventsApi") as mock_api,
+    ):
+        mock_api.return_value.list_contract_events.side_effect = pages
+        indexed = sync_nft_index(
+            MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, index, start_block=5, to_block=50
+        )
+
+    assert indexed == 3
+    assert index.tokens_of_owner(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OWNER) == [2]
+    calls = mock_api.return_value.list_contract_events.call_args_list
+    assert calls[0].kwargs["from_block_height"] == 5
+    assert calls[0].kwargs["contract_address"] == MOCK_CONTRACT_ADDRESS.lower()
+    assert calls[0].kwargs["event_name"] == "Transfer"
+    assert calls[1].kwargs["next_page"] == "next"
+
+    with (
+        patch("cdp_agentkit_core.actions.nft_index.Cdp"),
+        patch("cdp_agentkit_core.actions.nft_index.ContractEventsApi") as mock_api,
+        patch(
+            "cdp_agentkit_core.actions.nft_index.SmartContract.read",
+            return_value=50 + SYNC_BLOCK_RANGE + 10,
+        ),
+    ):
+        mock_api.return_value.list_contract_events.return_value = _page([])
+        indexed = sync_nft_index(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, index)
+
+    assert indexed == 0
+    calls = mock_api.return_value.list_contract_events.call_args_list
+    assert [call.kwargs["from_block_height"] for call in calls] == [51, 51 + SYNC_BLOCK_RANGE]
+    assert index.last_indexed_block(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS) == (
+        50 + SYNC_BLOCK_RANGE + 10
+    )
+    assert index.is_complete(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS)
+
+
+def test_interrupted_first_sync_is_not_complete(index):
+    """Test that a first build interrupted after some ranges is only complete once resumed."""
+    with (
+        patch("cdp_agentkit_core.actions.nft_index.Cdp"),
+        patch("cdp_agentkit_core.actions.nft_index.ContractEventsApi") as mock_api,
+    ):
+        mock_api.return_value.list_contract_events.side_effect = [
+            _page([_event(1, ZERO_ADDRESS, MOCK_OWNER, 10)]),
+            Exception("API error"),
+        ]
+        with pytest.raises(Exception, match="API error"):
+            sync_nft_index(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, index, to_block=SYNC_BLOCK_RANGE)
+
+    assert index.last_indexed_block(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS) == SYNC_BLOCK_RANGE - 1
+    assert not index.is_complete(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS)
+
+    with (
+        patch("cdp_agentkit_core.actions.nft_index.Cdp"),
+        patch("cdp_agentkit_core.actions.nft_index.ContractEventsApi") as mock_api,
+    ):
+        mock_api.return_value.list_contract_events.return_value = _page([])
+        sync_nft_index(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, index, to_block=SYNC_BLOCK_RANGE)
+
+    assert index.is_complete(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS)
+    assert index.tokens_of_owner(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OWNER) == [1]
+
+
+def test_sync_nft_index_stops_at_malformed_events(index):
+    """Test that a range with an event that cannot be parsed is not recorded."""
+    malformed = SimpleNamespace(data="not json", block_height=SYNC_BLOCK_RANGE, tx_hash="0xabc")
+    with (
+        patch("cdp_agentkit_core.actions.nft_index.Cdp"),
+        patch("cdp_agentkit_core.actions.nft_index.ContractEventsApi") as mock_api,
+    ):
+        mock_api.return_value.list_contract_events.side_effect = [
+            _page([_event(1, ZERO_ADDRESS, MOCK_OWNER, 10)]),
+            _page([_event(2, ZERO_ADDRESS, MOCK_OWNER, SYNC_BLOCK_RANGE), malformed]),
+        ]
+        with pytest.raises(ValueError, match="Malformed Transfer event in 0xabc"):
+            sync_nft_index(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, index, to_block=SYNC_BLOCK_RANGE)
+
+    assert index.last_indexed_block(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS) == SYNC_BLOCK_RANGE - 1
+    assert not index.is_complete(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS)
+    assert index.tokens_of_owner(MOCK_NETWORK_ID, MOCK_CONTRACT_ADDRESS, MOCK_OWNER) == [1]
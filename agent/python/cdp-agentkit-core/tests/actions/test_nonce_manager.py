@@ -0,0 +1,313 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from cdp import ContractInvocation
+from eth_account import Account
+
+from cdp_agentkit_core.actions.allowance_ledger import allowance_ledger
+from cdp_agentkit_core.actions.morpho.deposit import deposit_to_morpho
+from cdp_agentkit_core.actions.nonce_manager import (
+    NonceManager,
+    TransactionPipeline,
+    nonce_manager,
+)
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_TOKEN_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_VAULT_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+
+
+class DevTransaction:
+    """The transaction of a contract invocation on the dev chain."""
+
+    def __init__(self, nonce: int):
+        self.raw = SimpleNamespace(nonce=nonce)
+        self.status = "pending"
+        self.block_hash = None
+        self.transaction_hash = f"0x{nonce:064x}"
+        self.transaction_link = f"https://sepolia.basescan.org/tx/0x{nonce:064x}"
+
+    @property
+    def terminal_state(self) -> bool:
+        """Whether the transaction landed or failed."""
+        return self.status in ("complete", "failed")
+
+
+class DevInvocation:
+    """A contract invocation built, broadcast and mined by the dev chain."""
+
+    def __init__(self, chain: "DevChain", method: str, nonce: int):
+        self.chain = chain
+        self.method = method
+        self.transaction = DevTransaction(nonce)
+        self.transaction_hash = self.transaction.transaction_hash
+        self.transaction_link = self.transaction.transaction_link
+        self.signed = False
+
+    def sign(self, key):
+        """Sign the invocation."""
+        self.signed = True
+        return self
+
+    def broadcast(self):
+        """Broadcast the invocation to the dev chain."""
+        assert self.signed
+        self.chain.broadcast(self)
+        return self
+
+    def reload(self):
+        """Reload the invocation, whose status the dev chain updates in place."""
+        return self
+
+    def wait(self):
+        """Mine blocks until the invocation landed or failed."""
+        for _ in range(5):
+            if self.transaction.terminal_state:
+                return self
+            self.chain.mine()
+        raise TimeoutError("Contract Invocation timed out")
+
+
+class DevChain:
+    """A local dev chain stand-in for a single address, which mines in nonce order."""
+
+    def __init__(self, pending_aware: bool = True):
+        # Whether the backend builds transactions after the ones in the mempool, or only after
+        # the ones which landed.
+        self.pending_aware = pending_aware
+        self.account_nonce = 0
+        self.mempool: dict[int, DevInvocation] = {}
+        self.blocks: list[list[str]] = []
+        self.built: list[DevInvocation] = []
+
+    def create(self, method: str, **kwargs) -> DevInvocation:
+        """Build a contract invocation with the next nonce of the address."""
+        nonce = self.account_nonce
+        while self.pending_aware and nonce in self.mempool:
+            nonce += 1
+        invocation = DevInvocation(self, method, nonce)
+        self.built.append(invocation)
+        return invocation
+
+    def broadcast(self, invocation: DevInvocation) -> None:
+        """Add a transaction to the mempool, replacing any with the same nonce."""
+        replaced = self.mempool.get(invocation.transaction.raw.nonce)
+        if replaced is not None:
+            replaced.transaction.status = "failed"
+        self.mempool[invocation.transaction.raw.nonce] = invocation
+
+    def drop(self, invocation: DevInvocation) -> None:
+        """Drop a transaction from the mempool."""
+        del self.mempool[invocation.transaction.raw.nonce]
+        invocation.transaction.status = "failed"
+
+    def mine(self) -> None:
+        """Mine a block with every transaction whose nonce follows the last one mined."""
+        included = []
+        while self.account_nonce in self.mempool:
+            invocation = self.mempool.pop(self.account_nonce)
+            invocation.transaction.status = "complete"
+            invocation.transaction.block_hash = f"0xblock{len(self.blocks)}"
+            included.append(invocation.method)
+            self.account_nonce += 1
+        self.blocks.append(included)
+
+
+@pytest.fixture
+def local_wallet(wallet_factory):
+    """Create a wallet whose default address signs locally."""
+    wallet = wallet_factory(default_address=MOCK_ADDRESS)
+    wallet.default_address.wallet_id = "test-wallet-id"
+    wallet.default_address.network_id = MOCK_NETWORK_ID
+    wallet.default_address.key = Account.create()
+    return wallet
+
+
+def submit_approve_and_deposit(wallet, chain: DevChain) -> list:
+    """Submit an approval and a deposit through a pipeline on the dev chain."""
+    with (
+        patch.object(ContractInvocation, "create", side_effect=chain.create),
+        TransactionPipeline(wallet) as pipeline,
+    ):
+        pipeline.invoke_contract("approve", MOCK_TOKEN_ADDRESS, "approve")
+        pipeline.invoke_contract("morpho_deposit", MOCK_VAULT_ADDRESS, "deposit")
+        assert nonce_manager.in_flight(MOCK_NETWORK_ID, MOCK_ADDRESS)
+    return pipeline.wait()
+
+
+def test_nonce_manager_reserve_and_release():
+    """Test that nonces in flight can not be reserved again until released."""
+    manager = NonceManager()
+
+    assert manager.reserve(MOCK_NETWORK_ID, MOCK_ADDRESS, 0)
+    assert manager.reserve(MOCK_NETWORK_ID, MOCK_ADDRESS.lower(), 1)
+    assert not manager.reserve(MOCK_NETWORK_ID, MOCK_ADDRESS, 0)
+    assert manager.reserve("base-mainnet", MOCK_ADDRESS, 0)
+    assert manager.in_flight(MOCK_NETWORK_ID, MOCK_ADDRESS) == [0, 1]
+
+    manager.release(MOCK_NETWORK_ID, MOCK_ADDRESS, 0)
+
+    assert manager.reserve(MOCK_NETWORK_ID, MOCK_ADDRESS, 0)
+
+
+def test_nonce_manager_records_gaps_of_dropped_transactions():
+    """Test that a dropped transaction with later ones in flight leaves a gap until replaced."""
+    manager = NonceManager()
+    for nonce in (0, 1, 2):
+        manager.reserve(MOCK_NETWORK_ID, MOCK_ADDRESS, nonce)
+
+    manager.release(MOCK_NETWORK_ID, MOCK_ADDRESS, 2, landed=False)
+    manager.release(MOCK_NETWORK_ID, MOCK_ADDRESS, 0, landed=False)
+
+    assert manager.gaps(MOCK_NETWORK_ID, MOCK_ADDRESS) == [0]
+
+    manager.reserve(MOCK_NETWORK_ID, MOCK_ADDRESS, 0)
+
+    assert manager.gaps(MOCK_NETWORK_ID, MOCK_ADDRESS) == []
+    manager.release(MOCK_NETWORK_ID, MOCK_ADDRESS, 0)
+    manager.release(MOCK_NETWORK_ID, MOCK_ADDRESS, 1)
+    assert manager.in_flight(MOCK_NETWORK_ID, MOCK_ADDRESS) == []
+
+
+def test_pipeline_lands_dependent_transactions_in_one_block(local_wallet):
+    """Test that an approval and a deposit are submitted back-to-back and land in one block."""
+    chain = DevChain()
+
+    approval, deposit = submit_approve_and_deposit(local_wallet, chain)
+
+    assert chain.blocks == [["approve", "deposit"]]
+    assert (approval.transaction.raw.nonce, deposit.transaction.raw.nonce) == (0, 1)
+    assert nonce_manager.in_flight(MOCK_NETWORK_ID, MOCK_ADDRESS) == []
+
+
+def test_pipeline_does_not_replace_transactions_in_flight(local_wallet):
+    """Test that a transaction built with a nonce in flight is rebuilt after the previous lands."""
+    chain = DevChain(pending_aware=False)
+
+    approval, deposit = submit_approve_and_deposit(local_wallet, chain)
+
+    assert chain.blocks == [["approve"], ["deposit"]]
+    assert approval.transaction.status == deposit.transaction.status == "complete"
+    assert len(chain.built) == 3
+
+
+def test_pipeline_replaces_dropped_transactions(local_wallet):
+    """Test that a dropped transaction is resubmitted with its nonce, unblocking later ones."""
+    chain = DevChain()
+
+    with patch.object(ContractInvocation, "create", side_effect=chain.create):
+        pipeline = TransactionPipeline(local_wallet)
+        dropped = pipeline.invoke_contract("approve", MOCK_TOKEN_ADDRESS, "approve")
+        pipeline.invoke_contract("morpho_deposit", MOCK_VAULT_ADDRESS, "deposit")
+        chain.drop(dropped)
+
+        approval, deposit = pipeline.wait()
+
+    assert approval is not dropped
+    assert approval.transaction.raw.nonce == 0
+    assert chain.blocks == [["approve", "deposit"]]
+    assert nonce_manager.gaps(MOCK_NETWORK_ID, MOCK_ADDRESS) == []
+
+
+def test_pipeline_keeps_tracked_nonces_reserved_until_final(
+    local_wallet, reset_transaction_tracker, monkeypatch
+):
+    """Test that tracked transactions keep their nonce until final, and dropped ones are resubmitted."""
+    chain = DevChain()
+    monkeypatch.setattr(reset_transaction_tracker, "submit_and_track", True)
+    monkeypatch.setattr(reset_transaction_tracker, "poll_interval", 3600)
+
+    with patch.object(ContractInvocation, "create", side_effect=chain.create):
+        pipeline = TransactionPipeline(local_wallet)
+        dropped = pipeline.invoke_contract("approve", MOCK_TOKEN_ADDRESS, "approve")
+        pipeline.invoke_contract("morpho_deposit", MOCK_VAULT_ADDRESS, "deposit")
+        pipeline.wait()
+
+        assert nonce_manager.in_flight(MOCK_NETWORK_ID, MOCK_ADDRESS) == [0, 1]
+
+        chain.drop(dropped)
+        reset_transaction_tracker.poll()
+
+    replacement = chain.built[-1]
+    assert replacement is not dropped
+    assert replacement.transaction.raw.nonce == 0
+    assert nonce_manager.in_flight(MOCK_NETWORK_ID, MOCK_ADDRESS) == [0, 1]
+
+    chain.mine()
+    reset_transaction_tracker.poll()
+
+    assert chain.blocks == [["approve", "deposit"]]
+    assert nonce_manager.in_flight(MOCK_NETWORK_ID, MOCK_ADDRESS) == []
+    assert [record.status for record in reset_transaction_tracker.list_transactions()] == [
+        "complete",
+        "complete",
+        "failed",
+    ]
+
+
+def test_pipeline_waits_for_each_transaction_without_local_key(
+    wallet_factory, contract_invocation_factory
+):
+    """Test that wallets which can not sign locally wait for each invocation in turn."""
+    wallet = wallet_factory()
+    approval, deposit = contract_invocation_factory(), contract_invocation_factory()
+    approval.wait.return_value = approval
+    deposit.wait.return_value = deposit
+
+    with (
+        patch.object(wallet, "invoke_contract", side_effect=[approval, deposit]) as mock_invoke,
+        TransactionPipeline(wallet) as pipeline,
+    ):
+        assert not pipeline.pipelined
+        pipeline.invoke_contract("approve", MOCK_TOKEN_ADDRESS, "approve")
+        approval.wait.assert_not_called()
+        pipeline.invoke_contract("morpho_deposit", MOCK_VAULT_ADDRESS, "deposit")
+        approval.wait.assert_called_once_with()
+
+    deposit.wait.assert_called_once_with()
+    mock_invoke.assert_called_with(contract_address=MOCK_VAULT_ADDRESS, method="deposit")
+
+
+def test_morpho_deposit_lands_in_one_block(local_wallet, asset_factory):
+    """Test that a Morpho deposit and its approval land in the same block."""
+    chain = DevChain()
+    mock_asset = asset_factory(decimals=18)
+
+    with (
+        patch.object(ContractInvocation, "create", side_effect=chain.create),
+        patch("cdp_agentkit_core.actions.morpho.deposit.Asset.fetch", return_value=mock_asset),
+        patch.object(mock_asset, "to_atomic_amount", return_value="1000000000000000000"),
+        patch.object(allowance_ledger, "allowance", return_value=0),
+    ):
+        action_response = deposit_to_morpho(
+            local_wallet, MOCK_VAULT_ADDRESS, "1", MOCK_ADDRESS, MOCK_TOKEN_ADDRESS
+        )
+
+    assert action_response.startswith(f"Deposited 1 to Morpho Vault {MOCK_VAULT_ADDRESS}")
+    assert chain.blocks == [["approve", "deposit"]]
+
+
+def test_repeated_morpho_deposit_skips_approval(local_wallet, asset_factory):
+    """Test that a second Morpho deposit within the approved allowance sends no approval."""
+    chain = DevChain()
+    mock_asset = asset_factory(decimals=18)
+
+    with (
+        patch.object(ContractInvocation, "create", side_effect=chain.create),
+        patch("cdp_agentkit_core.actions.morpho.deposit.Asset.fetch", return_value=mock_asset),
+        patch.object(mock_asset, "to_atomic_amount", return_value="1000000000000000000"),
+        patch.object(allowance_ledger, "approve_max", True),
+        patch(
+            "cdp_agentkit_core.actions.allowance_ledger.multicall_read", return_value=[0]
+        ) as mock_read,
+    ):
+        for _ in range(2):
+            deposit_to_morpho(
+                local_wallet, MOCK_VAULT_ADDRESS, "1", MOCK_ADDRESS, MOCK_TOKEN_ADDRESS
+            )
+
+    mock_read.assert_called_once()
+    assert chain.blocks == [["approve", "deposit"], ["deposit"]]
+    assert allowance_ledger.stats().approvals_avoided == 1
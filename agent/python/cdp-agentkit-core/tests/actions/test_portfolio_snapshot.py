@@ -0,0 +1,299 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from cdp.client.models.token_transfer_type import TokenTransferType
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.balance_engine import fetch_balances
+from cdp_agentkit_core.actions.portfolio import HISTORY_INDEXING_MARGIN, portfolio_store
+from cdp_agentkit_core.actions.portfolio_snapshot import (
+    PortfolioSnapshotAction,
+    PortfolioSnapshotInput,
+    portfolio_snapshot,
+)
+
+MOCK_ADDRESSES = [
+    "0x1234567890123456789012345678901234567890",
+    "0xBBBBBbbBBb9cC5e90e3b3Af64bdAF62C37EEFFCb",
+]
+MOCK_SENDER = "0x9999999999999999999999999999999999999999"
+MOCK_USDC_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_TOKEN_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_ASSETS = {
+    "eth": SimpleNamespace(contract_address=None, decimals=18),
+    "usdc": SimpleNamespace(contract_address=MOCK_USDC_ADDRESS, decimals=6),
+}
+MOCK_SNAPSHOT_BLOCK = 100
+MOCK_HEAD_BLOCK = 115
+
+
+def aggregate_result(*values: int) -> list[dict]:
+    """Build the aggregate3 result of uint reads."""
+    return [
+        {"success": True, "returnData": "0x" + encode(["uint256"], [value]).hex()}
+        for value in values
+    ]
+
+
+def erc20_transfer(contract_address: str, from_address: str, to_address: str, value: int):
+    """Build an ERC20 token transfer of a transaction."""
+    return SimpleNamespace(
+        token_transfer_type=TokenTransferType.ERC20,
+        contract_address=contract_address.lower(),
+        from_address=from_address.lower(),
+        to_address=to_address.lower(),
+        value=str(value),
+    )
+
+
+def history_transaction(block_height: int, *token_transfers) -> SimpleNamespace:
+    """Build a transaction of the address transaction history."""
+    return SimpleNamespace(
+        block_height=str(block_height),
+        content=SimpleNamespace(
+            actual_instance=SimpleNamespace(token_transfers=list(token_transfers))
+        ),
+    )
+
+
+def history_page(*transactions, next_page: str | None = None) -> SimpleNamespace:
+    """Build a page of the address transaction history."""
+    return SimpleNamespace(
+        data=list(transactions), has_more=next_page is not None, next_page=next_page
+    )
+
+
+def read(network_id: str, contract_address: str, method: str, **kwargs):
+    """Read the head block, or the full load batch of USDC balances at the snapshot block."""
+    if method == "getBlockNumber":
+        return MOCK_HEAD_BLOCK
+    balances = [2_500_000, 0][: len(kwargs["args"]["calls"]) - 1]
+    return aggregate_result(*balances, MOCK_SNAPSHOT_BLOCK)
+
+
+@pytest.fixture
+def mock_wallet(wallet_factory):
+    """Create a wallet with two addresses holding 1.5 ETH each."""
+    wallet = wallet_factory()
+    wallet.addresses = []
+    for address_id in MOCK_ADDRESSES:
+        address = Mock()
+        address.address_id = address_id
+        address.balance.return_value = Decimal("1.5")
+        wallet.addresses.append(address)
+    return wallet
+
+
+@pytest.fixture
+def mock_chain():
+    """Patch the asset API, contract reads, transaction history and address balances."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.balance_engine.Asset.fetch",
+            side_effect=lambda network_id, asset_id: MOCK_ASSETS[asset_id],
+        ),
+        patch("cdp_agentkit_core.actions.multicall.SmartContract.read", side_effect=read) as read_,
+        patch("cdp_agentkit_core.actions.portfolio.Cdp") as mock_cdp,
+        patch("cdp_agentkit_core.actions.portfolio.Address") as mock_address,
+    ):
+        mock_address.return_value.balance.return_value = Decimal("1.25")
+        yield SimpleNamespace(
+            read=read_,
+            history=mock_cdp.api_clients.transaction_history.list_address_transactions,
+            address=mock_address,
+        )
+
+
+def test_portfolio_snapshot_input_model_defaults():
+    """Test that PortfolioSnapshotInput refreshes the tracked assets by default."""
+    input_model = PortfolioSnapshotInput()
+
+    assert input_model.asset_ids is None
+    assert not input_model.full_refresh
+
+
+def test_portfolio_snapshot_full_load(mock_wallet, mock_chain):
+    """Test that the first snapshot reads every balance at a pinned block and stores it."""
+    action_response = portfolio_snapshot(mock_wallet, ["eth", "usdc"])
+
+    assert action_response == (
+        "Portfolio of wallet test-wallet-id:\n"
+        f"  {MOCK_ADDRESSES[0]} (block 100):\n"
+        "    eth: 1.5\n"
+        "    usdc: 2.5\n"
+        f"  {MOCK_ADDRESSES[1]} (block 100):\n"
+        "    eth: 1.5"
+    )
+    snapshot = portfolio_store.get("base-sepolia", MOCK_ADDRESSES[0])
+    assert snapshot.block_number == MOCK_SNAPSHOT_BLOCK
+    assert snapshot.holdings["usdc"].amount == 2_500_000
+    assert snapshot.holdings["eth"].amount == 15 * 10**17
+    mock_chain.history.assert_not_called()
+
+
+def test_portfolio_snapshot_full_load_skips_cached_balances(mock_wallet, mock_chain):
+    """Test that the balances stored with the snapshot block are read at that block."""
+    mock_chain.read.side_effect = [
+        aggregate_result(1_000_000, 0),
+        aggregate_result(2_500_000, 0, MOCK_SNAPSHOT_BLOCK),
+    ]
+    fetch_balances(mock_wallet, ["usdc"])
+
+    portfolio_snapshot(mock_wallet, ["usdc"])
+
+    snapshot = portfolio_store.get("base-sepolia", MOCK_ADDRESSES[0])
+    assert snapshot.block_number == MOCK_SNAPSHOT_BLOCK
+    assert snapshot.holdings["usdc"].amount == 2_500_000
+
+
+def test_portfolio_snapshot_incremental_refresh(mock_wallet, mock_chain):
+    """Test that a refresh applies the token transfers since the snapshot and discovers new tokens."""
+    portfolio_snapshot(mock_wallet, ["eth", "usdc"])
+
+    def list_address_transactions(network_id, address_id, limit, page):
+        if address_id != MOCK_ADDRESSES[0]:
+            return history_page()
+        return history_page(
+            history_transaction(
+                107, erc20_transfer(MOCK_USDC_ADDRESS, MOCK_ADDRESSES[0], MOCK_SENDER, 500_000)
+            ),
+            history_transaction(
+                104, erc20_transfer(MOCK_TOKEN_ADDRESS, MOCK_SENDER, MOCK_ADDRESSES[0], 3 * 10**17)
+            ),
+            history_transaction(
+                99, erc20_transfer(MOCK_USDC_ADDRESS, MOCK_SENDER, MOCK_ADDRESSES[0], 2_500_000)
+            ),
+        )
+
+    mock_chain.history.side_effect = list_address_transactions
+    mock_chain.read.side_effect = lambda network_id, contract_address, method, **kwargs: (
+        MOCK_HEAD_BLOCK if method == "getBlockNumber" else aggregate_result(18)
+    )
+
+    action_response = portfolio_snapshot(mock_wallet)
+
+    assert action_response == (
+        "Portfolio of wallet test-wallet-id:\n"
+        f"  {MOCK_ADDRESSES[0]} (block 110):\n"
+        "    eth: 1.25\n"
+        "    usdc: 2\n"
+        f"    {MOCK_TOKEN_ADDRESS}: 0.3\n"
+        f"  {MOCK_ADDRESSES[1]} (block 110):\n"
+        "    eth: 1.5"
+    )
+    # Only the address with transactions re-reads its native balance.
+    mock_chain.address.assert_called_once_with("base-sepolia", MOCK_ADDRESSES[0])
+    assert portfolio_store.get("base-sepolia", MOCK_ADDRESSES[1]).block_number == (
+        MOCK_HEAD_BLOCK - HISTORY_INDEXING_MARGIN
+    )
+
+
+def test_portfolio_snapshot_leaves_recent_blocks_to_later_refresh(mock_wallet, mock_chain):
+    """Test that transactions in blocks the history may not have indexed yet are applied later, once."""
+    portfolio_snapshot(mock_wallet, ["usdc"])
+    transactions = [
+        history_transaction(
+            113, erc20_transfer(MOCK_USDC_ADDRESS, MOCK_SENDER, MOCK_ADDRESSES[0], 1_000_000)
+        )
+    ]
+    mock_chain.history.side_effect = lambda network_id, address_id, limit, page: (
+        history_page(*transactions) if address_id == MOCK_ADDRESSES[0] else history_page()
+    )
+
+    portfolio_snapshot(mock_wallet)
+
+    snapshot = portfolio_store.get("base-sepolia", MOCK_ADDRESSES[0])
+    assert snapshot.block_number == MOCK_HEAD_BLOCK - HISTORY_INDEXING_MARGIN
+    assert snapshot.holdings["usdc"].amount == 2_500_000
+
+    mock_chain.read.side_effect = lambda network_id, contract_address, method, **kwargs: (
+        MOCK_HEAD_BLOCK + HISTORY_INDEXING_MARGIN
+    )
+    portfolio_snapshot(mock_wallet)
+    portfolio_snapshot(mock_wallet)
+
+    snapshot = portfolio_store.get("base-sepolia", MOCK_ADDRESSES[0])
+    assert snapshot.block_number == MOCK_HEAD_BLOCK
+    assert snapshot.holdings["usdc"].amount == 3_500_000
+
+
+def test_portfolio_snapshot_pages_through_history(mock_wallet, mock_chain):
+    """Test that the refresh follows history pages until it reaches the snapshot block."""
+    portfolio_snapshot(mock_wallet, ["usdc"])
+    pages = {
+        None: history_page(
+            history_transaction(
+                108, erc20_transfer(MOCK_USDC_ADDRESS, MOCK_SENDER, MOCK_ADDRESSES[1], 1_000_000)
+            ),
+            next_page="page-2",
+        ),
+        "page-2": history_page(
+            history_transaction(
+                102, erc20_transfer(MOCK_USDC_ADDRESS, MOCK_SENDER, MOCK_ADDRESSES[1], 1_000_000)
+            ),
+            history_transaction(100),
+            next_page="page-3",
+        ),
+    }
+    mock_chain.history.side_effect = lambda network_id, address_id, limit, page: (
+        pages[page] if address_id == MOCK_ADDRESSES[1] else history_page()
+    )
+
+    action_response = portfolio_snapshot(mock_wallet)
+
+    assert action_response.endswith(f"  {MOCK_ADDRESSES[1]} (block 110):\n    usdc: 2")
+    pages_read = [
+        call.kwargs["page"]
+        for call in mock_chain.history.call_args_list
+        if call.kwargs["address_id"] == MOCK_ADDRESSES[1]
+    ]
+    assert pages_read == [None, "page-2"]
+    assert mock_chain.history.call_count == 3
+
+
+def test_portfolio_snapshot_is_current(mock_wallet, mock_chain):
+    """Test that a snapshot at the head block is answered without reading the history."""
+    mock_chain.read.side_effect = lambda network_id, contract_address, method, **kwargs: (
+        MOCK_SNAPSHOT_BLOCK
+        if method == "getBlockNumber"
+        else read(network_id, contract_address, method, **kwargs)
+    )
+    portfolio_snapshot(mock_wallet, ["eth", "usdc"])
+
+    action_response = portfolio_snapshot(mock_wallet)
+
+    assert f"  {MOCK_ADDRESSES[0]} (block 100):\n    eth: 1.5\n    usdc: 2.5\n" in action_response
+    mock_chain.history.assert_not_called()
+
+
+def test_portfolio_snapshot_loads_new_assets(mock_wallet, mock_chain):
+    """Test that requesting an untracked asset, or a full refresh, reloads every balance."""
+    portfolio_snapshot(mock_wallet, ["eth"])
+    portfolio_snapshot(mock_wallet, ["usdc"])
+    portfolio_snapshot(mock_wallet, full_refresh=True)
+
+    snapshot = portfolio_store.get("base-sepolia", MOCK_ADDRESSES[0])
+    assert set(snapshot.holdings) == {"eth", "usdc"}
+    assert mock_chain.read.call_count == 3
+    mock_chain.history.assert_not_called()
+
+
+def test_portfolio_snapshot_error(mock_wallet, mock_chain):
+    """Test that failing to read a balance is reported without storing a snapshot."""
+    mock_wallet.addresses[0].balance.side_effect = Exception("API error")
+
+    action_response = portfolio_snapshot(mock_wallet, ["eth"])
+
+    assert action_response == "Error getting portfolio snapshot eth: API error"
+    assert portfolio_store.get("base-sepolia", MOCK_ADDRESSES[0]) is None
+
+
+def test_portfolio_snapshot_action():
+    """Test the portfolio snapshot action is read-only and runs in a worker thread when awaited."""
+    action = PortfolioSnapshotAction()
+
+    assert action.name == "portfolio_snapshot"
+    assert action.read_only
+    assert action.coroutine is None
@@ -0,0 +1,153 @@
+from unittest.mock import patch
+
+from cdp_agentkit_core.actions.constants import ERC20_BALANCE_ABI
+from cdp_agentkit_core.actions.read_cache import ReadCache
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_V3_ABI
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+def test_immutable_read_is_cached():
+    """Test that immutable reads are only fetched once, regardless of address casing."""
+    cache = ReadCache()
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", return_value=MOCK_POOL_ADDRESS
+    ) as mock_read:
+        first = cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "poolAddress", abi=WOW_ABI)
+        second = cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS.lower(), "poolAddress", abi=WOW_ABI)
+
+    assert first == second == MOCK_POOL_ADDRESS
+    mock_read.assert_called_once()
+    assert cache.stats()["immutable"].hits == 1
+    assert cache.stats()["immutable"].misses == 1
+
+
+def test_volatile_read_expires():
+    """Test that volatile reads are refetched once their TTL has expired."""
+    cache = ReadCache(volatile_ttl=0)
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", side_effect=[100, 200]
+    ) as mock_read:
+        first = cache.read(
+            MOCK_NETWORK_ID,
+            MOCK_TOKEN_ADDRESS,
+            "balanceOf",
+            abi=WOW_ABI,
+            args={"account": MOCK_POOL_ADDRESS},
+        )
+        second = cache.read(
+            MOCK_NETWORK_ID,
+            MOCK_TOKEN_ADDRESS,
+            "balanceOf",
+            abi=WOW_ABI,
+            args={"account": MOCK_POOL_ADDRESS},
+        )
+
+    assert (first, second) == (100, 200)
+    assert mock_read.call_count == 2
+    assert cache.stats()["volatile"].misses == 2
+
+
+def test_volatile_read_cached_within_ttl():
+    """Test that volatile reads are served from the cache within their TTL."""
+    cache = ReadCache(volatile_ttl=60)
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", return_value=100
+    ) as mock_read:
+        cache.read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "liquidity")
+        cache.read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "liquidity")
+
+    mock_read.assert_called_once()
+
+
+def test_monotonic_read_cached_once_final():
+    """Test that marketType is only cached permanently once the token has graduated."""
+    cache = ReadCache(volatile_ttl=0)
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", side_effect=[0, 1]
+    ) as mock_read:
+        for expected in (0, 1, 1):
+            assert (
+                cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "marketType", abi=WOW_ABI)
+                == expected
+            )
+
+    assert mock_read.call_count == 2
+    assert cache.stats()["monotonic"].hits == 1
+
+
+def test_immutable_method_of_other_contract_is_volatile():
+    """Test that pool configuration methods are only cached permanently on Uniswap v3 pools."""
+    cache = ReadCache(volatile_ttl=0)
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", side_effect=[3000, 500, 500]
+    ) as mock_read:
+        assert cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "fee", abi=WOW_ABI) == 3000
+        assert cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "fee") == 500
+        assert cache.read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "fee", abi=UNISWAP_V3_ABI) == 500
+        assert cache.read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "fee", abi=UNISWAP_V3_ABI) == 500
+
+    assert mock_read.call_count == 3
+    assert cache.stats()["immutable"].hits == 1
+
+
+def test_erc20_decimals_are_immutable():
+    """Test that ERC20 decimals are cached permanently, but not ERC20 balances."""
+    cache = ReadCache(volatile_ttl=0)
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", side_effect=[6, 100, 200]
+    ) as mock_read:
+        assert (
+            cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "decimals", abi=ERC20_BALANCE_ABI) == 6
+        )
+        assert (
+            cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "decimals", abi=ERC20_BALANCE_ABI) == 6
+        )
+        args = {"account": MOCK_POOL_ADDRESS}
+        assert (
+            cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "balanceOf", ERC20_BALANCE_ABI, args)
+            == 100
+        )
+        assert (
+            cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "balanceOf", ERC20_BALANCE_ABI, args)
+            == 200
+        )
+
+    assert mock_read.call_count == 3
+    assert cache.stats()["immutable"].hits == 1
+
+
+def test_unknown_method_is_not_cached():
+    """Test that methods without a caching policy always hit the network."""
+    cache = ReadCache()
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", return_value=5
+    ) as mock_read:
+        cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "getEthBuyQuote")
+        cache.read(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "getEthBuyQuote")
+
+    assert mock_read.call_count == 2
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted when the cache is full."""
+    cache = ReadCache(max_entries=1)
+
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", side_effect=["a", "b", "a"]
+    ) as mock_read:
+        cache.read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "token0")
+        cache.read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "token1")
+        cache.read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "token0")
+
+    assert mock_read.call_count == 3
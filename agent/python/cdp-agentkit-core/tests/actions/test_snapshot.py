@@ -0,0 +1,164 @@
+from unittest.mock import patch
+
+import pytest
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.multicall import ContractRead, multicall_read
+from cdp_agentkit_core.actions.read_cache import cached_read
+from cdp_agentkit_core.actions.snapshot import (
+    SnapshotDriftError,
+    current_snapshot,
+    read_snapshot,
+    run_in_snapshot,
+)
+from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_V3_ABI
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_OTHER_POOL_ADDRESS = "0x0987654321098765432109876543210987654321"
+MOCK_LIQUIDITY = 5000
+MOCK_BLOCK_NUMBER = 1000
+
+
+def _batch_result(liquidity, block_number):
+    return [
+        {"success": True, "returnData": "0x" + encode(["uint128"], [liquidity]).hex()},
+        {"success": True, "returnData": "0x" + encode(["uint256"], [block_number]).hex()},
+    ]
+
+
+def _liquidity_read(pool_address):
+    return ContractRead(pool_address, "liquidity", UNISWAP_V3_ABI)
+
+
+def test_snapshot_is_pinned_by_first_batch():
+    """Test that the first batched read records the block number and pins the snapshot."""
+    reads = [ContractRead(MOCK_POOL_ADDRESS, "liquidity", UNISWAP_V3_ABI)]
+
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            return_value=_batch_result(MOCK_LIQUIDITY, MOCK_BLOCK_NUMBER),
+        ) as mock_read,
+        read_snapshot(MOCK_NETWORK_ID) as snapshot,
+    ):
+        assert multicall_read(MOCK_NETWORK_ID, reads) == [MOCK_LIQUIDITY]
+
+    assert snapshot.block_number == MOCK_BLOCK_NUMBER
+    calls = mock_read.call_args[1]["args"]["calls"]
+    assert len(calls) == 2
+
+
+def test_snapshot_memoizes_volatile_reads():
+    """Test that repeated reads within a snapshot are served from memory."""
+    reads = [ContractRead(MOCK_POOL_ADDRESS, "liquidity", UNISWAP_V3_ABI)]
+
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            return_value=_batch_result(MOCK_LIQUIDITY, MOCK_BLOCK_NUMBER),
+        ) as mock_read,
+        read_snapshot(MOCK_NETWORK_ID) as snapshot,
+    ):
+        multicall_read(MOCK_NETWORK_ID, reads)
+        assert multicall_read(MOCK_NETWORK_ID, reads) == [MOCK_LIQUIDITY]
+        assert cached_read(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, "liquidity") == MOCK_LIQUIDITY
+
+    mock_read.assert_called_once()
+    assert snapshot.hits == 2
+
+
+def test_snapshots_at_same_block_share_results():
+    """Test that a later snapshot pinned to the same block reuses memoized results."""
+    reads = [ContractRead(MOCK_POOL_ADDRESS, "liquidity", UNISWAP_V3_ABI)]
+    other_reads = [ContractRead(MOCK_OTHER_POOL_ADDRESS, "liquidity", UNISWAP_V3_ABI)]
+
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=_batch_result(MOCK_LIQUIDITY, MOCK_BLOCK_NUMBER),
+    ) as mock_read:
+        with read_snapshot(MOCK_NETWORK_ID):
+            multicall_read(MOCK_NETWORK_ID, reads)
+
+        with read_snapshot(MOCK_NETWORK_ID) as snapshot:
+            # A new snapshot is pinned by its own first batch, not by an earlier snapshot.
+            assert snapshot.block_number is None
+            multicall_read(MOCK_NETWORK_ID, other_reads)
+            assert snapshot.block_number == MOCK_BLOCK_NUMBER
+            assert multicall_read(MOCK_NETWORK_ID, reads) == [MOCK_LIQUIDITY]
+
+    assert mock_read.call_count == 2
+
+
+def test_snapshot_detects_drift():
+    """Test that a batch executed at a different block raises a drift error."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            side_effect=[
+                _batch_result(MOCK_LIQUIDITY, MOCK_BLOCK_NUMBER),
+                _batch_result(MOCK_LIQUIDITY, MOCK_BLOCK_NUMBER + 1),
+            ],
+        ),
+        read_snapshot(MOCK_NETWORK_ID) as snapshot,
+    ):
+        multicall_read(MOCK_NETWORK_ID, [_liquidity_read(MOCK_POOL_ADDRESS)])
+        with pytest.raises(SnapshotDriftError):
+            multicall_read(MOCK_NETWORK_ID, [_liquidity_read(MOCK_OTHER_POOL_ADDRESS)])
+
+    assert snapshot.block_number == MOCK_BLOCK_NUMBER
+
+
+def test_run_in_snapshot_restarts_drifted_reads():
+    """Test that reads which drift to another block are restarted in a new snapshot."""
+
+    def read_pools():
+        return [
+            multicall_read(MOCK_NETWORK_ID, [_liquidity_read(pool_address)])[0]
+            for pool_address in (MOCK_POOL_ADDRESS, MOCK_OTHER_POOL_ADDRESS)
+        ]
+
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        side_effect=[
+            _batch_result(MOCK_LIQUIDITY, MOCK_BLOCK_NUMBER),
+            _batch_result(MOCK_LIQUIDITY + 1, MOCK_BLOCK_NUMBER + 1),
+            _batch_result(MOCK_LIQUIDITY + 2, MOCK_BLOCK_NUMBER + 1),
+            _batch_result(MOCK_LIQUIDITY + 3, MOCK_BLOCK_NUMBER + 1),
+        ],
+    ) as mock_read:
+        assert run_in_snapshot(MOCK_NETWORK_ID, read_pools) == [
+            MOCK_LIQUIDITY + 2,
+            MOCK_LIQUIDITY + 3,
+        ]
+
+    assert mock_read.call_count == 4
+
+
+def test_run_in_snapshot_gives_up_after_retries():
+    """Test that reads which keep drifting raise a drift error."""
+
+    def read_pools():
+        for pool_address in (MOCK_POOL_ADDRESS, MOCK_OTHER_POOL_ADDRESS):
+            multicall_read(MOCK_NETWORK_ID, [_liquidity_read(pool_address)])
+
+    blocks = iter(range(MOCK_BLOCK_NUMBER, MOCK_BLOCK_NUMBER + 100))
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            side_effect=lambda *args, **kwargs: _batch_result(MOCK_LIQUIDITY, next(blocks)),
+        ),
+        pytest.raises(SnapshotDriftError),
+    ):
+        run_in_snapshot(MOCK_NETWORK_ID, read_pools, retries=1)
+
+
+def test_nested_snapshots_reuse_outer_snapshot():
+    """Test that nested snapshots for the same network share the outer snapshot."""
+    with read_snapshot(MOCK_NETWORK_ID) as outer:
+        with read_snapshot(MOCK_NETWORK_ID) as inner:
+            assert inner is outer
+        assert current_snapshot(MOCK_NETWORK_ID) is outer
+        assert current_snapshot("base-mainnet") is None
+
+    assert current_snapshot(MOCK_NETWORK_ID) is None
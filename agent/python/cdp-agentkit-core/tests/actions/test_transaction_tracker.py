@@ -0,0 +1,196 @@
+import threading
+from unittest.mock import Mock, patch
+
+from cdp import Transaction
+
+from cdp_agentkit_core.actions.transaction_tracker import (
+    COMPLETE,
+    FAILED,
+    TIMED_OUT,
+    TransactionTracker,
+    tracking_note,
+    transaction_tracker,
+    wait_or_track,
+)
+from cdp_agentkit_core.actions.transfer import transfer
+
+MOCK_TRANSACTION_HASH = "0xvalidTransactionHash"
+MOCK_TRANSACTION_LINK = "https://basescan.org/tx/0xvalidTransactionHash"
+
+
+class FakeOperation:
+    """A submitted operation which reaches the given statuses on successive reloads."""
+
+    def __init__(self, *statuses: str, transaction_hash: str = MOCK_TRANSACTION_HASH):
+        self.network_id = "base-sepolia"
+        self.transaction = Mock(spec=Transaction)
+        self.transaction.status = "broadcast"
+        self.transaction.transaction_hash = transaction_hash
+        self.transaction.transaction_link = MOCK_TRANSACTION_LINK
+        self.statuses = list(statuses)
+        self.reloads = 0
+
+    def reload(self):
+        """Move to the next status."""
+        self.reloads += 1
+        if self.statuses:
+            self.transaction.status = self.statuses.pop(0)
+
+    def wait(self):
+        """Wait until the final status is reached."""
+        while self.statuses:
+            self.reload()
+        return self
+
+
+def test_track_records_pending_transaction():
+    """Test that tracking records the submitted transaction as pending."""
+    tracker = TransactionTracker(poll_interval=60)
+    operation = FakeOperation(COMPLETE)
+
+    record = tracker.track(operation, "transfer")
+
+    assert record.status == "broadcast"
+    assert not record.is_final
+    assert record.action == "transfer"
+    assert record.network_id == "base-sepolia"
+    assert record.transaction_hash == MOCK_TRANSACTION_HASH
+    assert tracker.get(record.id) == record
+    assert tracker.get(MOCK_TRANSACTION_HASH.upper()) == record
+    assert tracker.get_for_operation(operation) == record
+    assert tracker.list_transactions(pending_only=True) == [record]
+    tracker.clear()
+
+
+def test_poll_reloads_all_pending_operations():
+    """Test that one poll reloads every pending operation and records final statuses."""
+    tracker = TransactionTracker(poll_interval=60)
+    completed = FakeOperation(COMPLETE, transaction_hash="0x1")
+    failed = FakeOperation(FAILED, transaction_hash="0x2")
+    pending = FakeOperation("broadcast", COMPLETE, transaction_hash="0x3")
+    for operation in (completed, failed, pending):
+        tracker.track(operation, "transfer")
+
+    finished = tracker.poll()
+
+    assert sorted(record.status for record in finished) == [COMPLETE, FAILED]
+    assert [operation.reloads for operation in (completed, failed, pending)] == [1, 1, 1]
+    assert [record.transaction_hash for record in tracker.list_transactions(pending_only=True)] == [
+        "0x3"
+    ]
+
+    tracker.poll()
+
+    assert completed.reloads == 1
+    assert tracker.get("0x3").status == COMPLETE
+    tracker.clear()
+
+
+def test_poll_records_reload_errors():
+    """Test that a failed reload keeps the transaction pending with the error."""
+    tracker = TransactionTracker(poll_interval=60)
+    operation = FakeOperation()
+    record = tracker.track(operation, "transfer")
+
+    with patch.object(operation, "reload", side_effect=Exception("API error")):
+        assert tracker.poll() == []
+
+    assert tracker.get(record.id).status == "broadcast"
+    assert tracker.get(record.id).error == "API error"
+    tracker.clear()
+
+
+def test_poll_times_out_transactions():
+    """Test that transactions pending for longer than the tracking timeout time out."""
+    tracker = TransactionTracker(poll_interval=60, tracking_timeout=0)
+    record = tracker.track(FakeOperation(), "transfer")
+
+    finished = tracker.poll()
+
+    assert [finished_record.id for finished_record in finished] == [record.id]
+    assert tracker.get(record.id).status == TIMED_OUT
+    assert tracker.list_transactions(pending_only=True) == []
+    tracker.clear()
+
+
+def test_listeners_are_notified_of_final_statuses():
+    """Test that listeners are called once a transaction reaches a final status."""
+    tracker = TransactionTracker(poll_interval=60)
+    listener = Mock()
+    tracker.add_listener(listener)
+    record = tracker.track(FakeOperation(COMPLETE), "transfer")
+
+    listener.assert_not_called()
+    tracker.poll()
+
+    listener.assert_called_once_with(tracker.get(record.id))
+
+    tracker.remove_listener(listener)
+    tracker.track(FakeOperation(COMPLETE, transaction_hash="0x1"), "transfer")
+    tracker.poll()
+
+    listener.assert_called_once()
+    tracker.clear()
+
+
+def test_background_poller_completes_transactions():
+    """Test that the background poller completes transactions and stops when none are pending."""
+    tracker = TransactionTracker(poll_interval=0.01)
+    completed = threading.Event()
+    tracker.add_listener(lambda record: completed.set())
+
+    record = tracker.track(FakeOperation("broadcast", COMPLETE), "transfer")
+
+    assert tracker.wait(record.id, timeout=5).status == COMPLETE
+    assert completed.wait(timeout=5)
+    tracker.clear()
+
+
+def test_wait_for_untracked_transaction():
+    """Test that waiting for an unknown transaction returns None."""
+    assert TransactionTracker().wait("0xunknown", timeout=0) is None
+
+
+def test_wait_or_track_waits_by_default():
+    """Test that operations are waited for unless submit-and-track mode is enabled."""
+    operation = FakeOperation("broadcast", COMPLETE)
+
+    assert wait_or_track(operation, "transfer") is operation
+
+    assert operation.transaction.status == COMPLETE
+    assert transaction_tracker.get_for_operation(operation) is None
+    assert tracking_note(operation) == ""
+
+
+def test_wait_or_track_tracks_in_submit_and_track_mode(monkeypatch):
+    """Test that operations are tracked instead of waited for in submit-and-track mode."""
+    monkeypatch.setattr(transaction_tracker, "submit_and_track", True)
+    monkeypatch.setattr(transaction_tracker, "poll_interval", 60)
+    operation = FakeOperation(COMPLETE)
+
+    assert wait_or_track(operation, "transfer") is operation
+
+    assert operation.reloads == 0
+    record = transaction_tracker.get_for_operation(operation)
+    assert f"tracking ID {record.id}" in tracking_note(operation)
+
+    transaction_tracker.poll()
+
+    assert tracking_note(operation) == ""
+
+
+def test_transfer_in_submit_and_track_mode(monkeypatch, wallet_factory, transfer_factory):
+    """Test that a transfer returns once submitted in submit-and-track mode."""
+    monkeypatch.setattr(transaction_tracker, "submit_and_track", True)
+    monkeypatch.setattr(transaction_tracker, "poll_interval", 60)
+    mock_wallet = wallet_factory()
+    mock_transfer_instance = transfer_factory()
+    mock_transfer_instance.send_tx_delegate = FakeOperation().transaction
+
+    with patch.object(mock_wallet, "transfer", return_value=mock_transfer_instance):
+        action_response = transfer(mock_wallet, "0.01", "usdc", "example.eth", True)
+
+    record = transaction_tracker.get(MOCK_TRANSACTION_HASH)
+    assert record.action == "transfer"
+    assert f"pending confirmation (tracking ID {record.id})" in action_response
+    mock_transfer_instance.wait.assert_not_called()
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+import pytest
+from eth_abi import decode, encode
+
+from cdp_agentkit_core.actions.abi_codec import abi_type, get_function_codec
+from cdp_agentkit_core.actions.constants import MULTICALL3_ABI
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.uniswap.constants import UNISWAP_QUOTER_ABI, UNISWAP_V3_ABI
+
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_SQRT_PRICE_X96 = 79228162514264337593543950336
+MOCK_TICK_SPACING = 200
+MOCK_LIQUIDITY = 10**20
+# A single position between ticks -200 and 200.
+MOCK_TICK_BITMAP = {-1: 1 << 255, 0: 1 << 1}
+MOCK_LIQUIDITY_NET = {-200: MOCK_LIQUIDITY, 200: -MOCK_LIQUIDITY}
+MOCK_BALANCES = {MOCK_TOKEN_ADDRESS.lower(): 10**24, MOCK_WETH_ADDRESS.lower(): 10**20}
+MOCK_SUPPLY = 250_000_000 * 10**18
+
+
+class MockChain:
+    """A graduated WOW token and its pool, executing each Multicall3 batch at a scripted block."""
+
+    def __init__(self, blocks: list[int]):
+        self.blocks = blocks
+        self.batches = 0
+        self.methods: list[str] = []
+        self._codecs = {
+            codec.selector: codec
+            for abi in (WOW_ABI, UNISWAP_V3_ABI, UNISWAP_QUOTER_ABI, MULTICALL3_ABI)
+            for item in abi
+            if item.get("type") == "function" and (codec := get_function_codec(abi, item["name"]))
+        }
+
+    def read(self, network_id, contract_address, method, abi=None, args=None):
+        """Serve a `SmartContract.read` call."""
+        if method != "aggregate3":
+            self.methods.append(method)
+            return self._value(contract_address, method, args or {}, block=None)
+
+        block = self.blocks[min(self.batches, len(self.blocks) - 1)]
+        self.batches += 1
+        results = []
+        for target, _, calldata in args["calls"]:
+            data = bytes.fromhex(calldata.removeprefix("0x"))
+            codec = self._codecs[data[:4]]
+            self.methods.append(codec.name)
+            values = decode([abi_type(c) for c in codec.inputs], data[4:])
+            call_args = {c["name"]: v for c, v in zip(codec.inputs, values, strict=True)}
+            value = self._value(target, codec.name, call_args, block)
+            output_types = [abi_type(c) for c in codec.outputs]
+            return_data = encode(output_types, list(value) if len(output_types) > 1 else [value])
+            results.append({"success": True, "returnData": "0x" + return_data.hex()})
+        return results
+
+    def _value(self, contract_address, method, args, block):
+        return {
+            "marketType": lambda: 1,
+            "totalSupply": lambda: MOCK_SUPPLY,
+            "poolAddress": lambda: MOCK_POOL_ADDRESS,
+            "token0": lambda: MOCK_TOKEN_ADDRESS,
+            "token1": lambda: MOCK_WETH_ADDRESS,
+            "fee": lambda: 10000,
+            "liquidity": lambda: MOCK_LIQUIDITY,
+            "slot0": lambda: (MOCK_SQRT_PRICE_X96, 0, 0, 1, 1, 0, True),
+            "balanceOf": lambda: MOCK_BALANCES[contract_address.lower()],
+            "tickSpacing": lambda: MOCK_TICK_SPACING,
+            "tickBitmap": lambda: MOCK_TICK_BITMAP.get(args.get("wordPosition"), 0),
+            "ticks": lambda: (
+                MOCK_LIQUIDITY,
+                MOCK_LIQUIDITY_NET[args["tick"]],
+                0,
+                0,
+                0,
+                0,
+                0,
+                True,
+            ),
+            "quoteExactInputSingle": lambda: 12345,
+            "getBlockNumber": lambda: block,
+        }[method]()
+
+
+@pytest.fixture
+def mock_chain():
+    """Serve contract reads from a mock chain whose batches execute at the given blocks."""
+
+    def start(blocks: list[int]) -> MockChain:
+        chain = MockChain(blocks)
+        patcher = patch("cdp_agentkit_core.actions.multicall.SmartContract.read", chain.read)
+        patcher.start()
+        return chain
+
+    yield start
+    patch.stopall()
@@ -0,0 +1,165 @@
+from decimal import Decimal, getcontext
+from unittest.mock import patch
+
+import pytest
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.wow.bonding_curve import (
+    WAD,
+    BondingCurve,
+    bonding_curve,
+    exp_wad,
+    ln_wad,
+)
+from cdp_agentkit_core.actions.wow.constants import BONDING_CURVE_A, BONDING_CURVE_B
+from cdp_agentkit_core.actions.wow.utils import get_buy_quote, get_sell_quote
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_SUPPLY = 250_000_000 * 10**18
+MOCK_AMOUNT = 10**17
+
+getcontext().prec = 80
+
+
+def _ok(types, values):
+    return {"success": True, "returnData": "0x" + encode(types, values).hex()}
+
+
+# The market type, supply and pool address, followed by the block number of the read snapshot.
+MARKET_STATE_RESULTS = [
+    _ok(["uint8"], [0]),
+    _ok(["uint256"], [MOCK_SUPPLY]),
+    _ok(["address"], ["0x1234567890123456789012345678901234567890"]),
+    _ok(["uint256"], [1]),
+]
+
+
+def _exact_eth_buy_quote(current_supply: int, eth_order_size: int) -> Decimal:
+    # The same curve evaluated with high precision decimals instead of fixed point math.
+    a, b = Decimal(BONDING_CURVE_A), Decimal(BONDING_CURVE_B)
+    exp_b_x0 = (b * current_supply / Decimal(10) ** 36).exp()
+    exp_b_x1 = exp_b_x0 + eth_order_size * b / (a * WAD)
+    return exp_b_x1.ln() * Decimal(10) ** 36 / b - current_supply
+
+
+def _exact_token_sell_quote(current_supply: int, tokens_to_sell: int) -> Decimal:
+    a, b = Decimal(BONDING_CURVE_A), Decimal(BONDING_CURVE_B)
+    exp_b_x0 = (b * current_supply / Decimal(10) ** 36).exp()
+    exp_b_x1 = (b * (current_supply - tokens_to_sell) / Decimal(10) ** 36).exp()
+    return (exp_b_x0 - exp_b_x1) * a * WAD / b
+
+
+@pytest.mark.parametrize(
+    ("x", "expected"),
+    [
+        (0, WAD),
+        (WAD, 2718281828459045235),
+        (-WAD, 367879441171442321),
+        (-42 * WAD, 0),
+    ],
+)
+def test_exp_wad(x, expected):
+    """Test expWad against the reference values of the Solidity implementation."""
+    assert exp_wad(x) == expected
+
+
+@pytest.mark.parametrize(
+    ("x", "expected"),
+    [
+        (1, -41446531673892822313),
+        (WAD, 0),
+        (2 * WAD, 693147180559945309),
+        (10**30, 27631021115928548208),
+    ],
+)
+def test_ln_wad(x, expected):
+    """Test lnWad against the reference values of the Solidity implementation."""
+    assert ln_wad(x) == expected
+
+
+def test_exp_wad_overflow():
+    """Test that expWad raises when the result does not fit in an int256."""
+    with pytest.raises(OverflowError):
+        exp_wad(136 * WAD)
+
+
+@pytest.mark.parametrize("current_supply", [0, MOCK_SUPPLY, 790_000_000 * 10**18])
+@pytest.mark.parametrize("amount", [10**14, MOCK_AMOUNT, 2 * 10**18])
+def test_eth_buy_quote_matches_curve(current_supply, amount):
+    """Test that the fixed point buy quote matches the curve evaluated exactly."""
+    quote = bonding_curve.get_eth_buy_quote(current_supply, amount)
+
+    assert abs(quote - _exact_eth_buy_quote(current_supply, amount)) <= quote / 10**12 + 10**6
+
+
+@pytest.mark.parametrize("tokens", [10**18, 10**6 * 10**18, MOCK_SUPPLY])
+def test_token_sell_quote_matches_curve(tokens):
+    """Test that the fixed point sell quote matches the curve evaluated exactly."""
+    quote = bonding_curve.get_token_sell_quote(MOCK_SUPPLY, tokens)
+
+    assert abs(quote - _exact_token_sell_quote(MOCK_SUPPLY, tokens)) <= quote / 10**12 + 10**6
+
+
+def test_buy_and_sell_quotes_are_inverse():
+    """Test that the ETH and token denominated quotes are consistent with each other."""
+    tokens = bonding_curve.get_eth_buy_quote(MOCK_SUPPLY, MOCK_AMOUNT)
+
+    assert abs(bonding_curve.get_token_buy_quote(MOCK_SUPPLY, tokens) - MOCK_AMOUNT) <= 10
+    assert abs(bonding_curve.get_token_sell_quote(MOCK_SUPPLY + tokens, tokens) - MOCK_AMOUNT) <= 10
+    assert abs(bonding_curve.get_eth_sell_quote(MOCK_SUPPLY + tokens, MOCK_AMOUNT) - tokens) <= (
+        tokens // 10**12
+    )
+
+
+def test_token_sell_quote_insufficient_supply():
+    """Test that selling more than the current supply raises an error."""
+    with pytest.raises(ValueError, match="INSUFFICIENT_SUPPLY"):
+        bonding_curve.get_token_sell_quote(10**18, 2 * 10**18)
+
+
+def test_bonding_curve_parameters():
+    """Test that curve parameters can be overridden."""
+    steeper = BondingCurve(b=2 * BONDING_CURVE_B)
+
+    assert steeper.get_eth_buy_quote(MOCK_SUPPLY, MOCK_AMOUNT) < bonding_curve.get_eth_buy_quote(
+        MOCK_SUPPLY, MOCK_AMOUNT
+    )
+
+
+def test_get_buy_quote_computed_locally():
+    """Test that buy quotes for tokens on the bonding curve need a single batched read."""
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=MARKET_STATE_RESULTS,
+    ) as mock_read:
+        result = get_buy_quote(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(MOCK_AMOUNT))
+
+    assert result == bonding_curve.get_eth_buy_quote(MOCK_SUPPLY, MOCK_AMOUNT)
+    mock_read.assert_called_once()
+    assert mock_read.call_args[0][2] == "aggregate3"
+
+
+def test_get_sell_quote_computed_locally():
+    """Test that sell quotes for tokens on the bonding curve are computed locally."""
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=MARKET_STATE_RESULTS,
+    ) as mock_read:
+        result = get_sell_quote(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(10**24))
+
+    assert result == bonding_curve.get_token_sell_quote(MOCK_SUPPLY, 10**24)
+    mock_read.assert_called_once()
+
+
+def test_get_sell_quote_falls_back_to_contract():
+    """Test that the contract quote is used when the local quote cannot be computed."""
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        side_effect=[MARKET_STATE_RESULTS, 12345],
+    ) as mock_read:
+        # Selling more than the current supply cannot be quoted locally.
+        result = get_sell_quote(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(MOCK_SUPPLY + 1))
+
+    assert result == 12345
+    assert mock_read.call_args[0][2] == "getTokenSellQuote"
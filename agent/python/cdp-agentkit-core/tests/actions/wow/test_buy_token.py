@@ -1,3 +1,4 @@
+import time
 from unittest.mock import patch
 
 import pytest
@@ -7,6 +8,7 @@ from cdp_agentkit_core.actions.wow.buy_token import (
     wow_buy_token,
 )
 from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.utils import WowTradeContext
 
 MOCK_CONTRACT_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
 MOCK_AMOUNT_ETH = "100000000000000"
@@ -15,6 +17,22 @@ MOCK_WALLET_ADDRESS = "0x1234567890123456789012345678901234567890"
 MOCK_TOKEN_QUOTE = 1000000
 
 
+def _trade_context(has_graduated: bool, quote: int) -> WowTradeContext:
+    return WowTradeContext(
+        network_id=MOCK_NETWORK_ID,
+        token_address=MOCK_CONTRACT_ADDRESS,
+        quote_type="buy",
+        amount=int(MOCK_AMOUNT_ETH),
+        has_graduated=has_graduated,
+        current_supply=10**26,
+        pool_address="0x0000000000000000000000000000000000000000",
+        pool=None,
+        quote=quote,
+        fetched_at=time.monotonic(),
+        fetch_seconds=0.0,
+    )
+
+
 def test_buy_token_input_model_valid():
     """Test that WowBuyTokenInput accepts valid parameters."""
     input_model = WowBuyTokenInput(
@@ -41,9 +59,9 @@ def test_buy_token_success(wallet_factory, contract_invocation_factory):
 
     with (
         patch(
-            "cdp_agentkit_core.actions.wow.buy_token.get_buy_quote", return_value=MOCK_TOKEN_QUOTE
+            "cdp_agentkit_core.actions.wow.buy_token.get_trade_context",
+            return_value=_trade_context(False, MOCK_TOKEN_QUOTE),
         ),
-        patch("cdp_agentkit_core.actions.wow.buy_token.get_has_graduated", return_value=False),
         patch.object(
             mock_wallet, "invoke_contract", return_value=mock_contract_instance
         ) as mock_invoke,
@@ -91,9 +109,9 @@ def test_buy_token_graduated_pool(wallet_factory, contract_invocation_factory):
 
     with (
         patch(
-            "cdp_agentkit_core.actions.wow.buy_token.get_buy_quote", return_value=MOCK_TOKEN_QUOTE
+            "cdp_agentkit_core.actions.wow.buy_token.get_trade_context",
+            return_value=_trade_context(True, MOCK_TOKEN_QUOTE),
         ),
-        patch("cdp_agentkit_core.actions.wow.buy_token.get_has_graduated", return_value=True),
         patch.object(
             mock_wallet, "invoke_contract", return_value=mock_contract_instance
         ) as mock_invoke,
@@ -117,9 +135,9 @@ def test_buy_token_api_error(wallet_factory):
 
     with (
         patch(
-            "cdp_agentkit_core.actions.wow.buy_token.get_buy_quote", return_value=MOCK_TOKEN_QUOTE
+            "cdp_agentkit_core.actions.wow.buy_token.get_trade_context",
+            return_value=_trade_context(False, MOCK_TOKEN_QUOTE),
         ),
-        patch("cdp_agentkit_core.actions.wow.buy_token.get_has_graduated", return_value=False),
         patch.object(
             mock_wallet, "invoke_contract", side_effect=Exception("API error")
         ) as mock_invoke,
@@ -134,3 +152,21 @@ def test_buy_token_api_error(wallet_factory):
 
         assert action_response == expected_response
         mock_invoke.assert_called_once()
+
+
+def test_buy_token_records_submit_latency(wallet_factory, contract_invocation_factory):
+    """Test that the time from fetching the trade context to submitting the trade is recorded."""
+    mock_wallet = wallet_factory()
+    mock_contract_instance = contract_invocation_factory()
+    mock_wallet.default_address.address_id = MOCK_WALLET_ADDRESS
+    mock_wallet.network_id = MOCK_NETWORK_ID
+    context = _trade_context(False, MOCK_TOKEN_QUOTE)
+
+    with (
+        patch("cdp_agentkit_core.actions.wow.buy_token.get_trade_context", return_value=context),
+        patch.object(mock_wallet, "invoke_contract", return_value=mock_contract_instance),
+        patch.object(mock_contract_instance, "wait", return_value=mock_contract_instance),
+    ):
+        wow_buy_token(mock_wallet, MOCK_CONTRACT_ADDRESS, MOCK_AMOUNT_ETH)
+
+    assert 0 <= context.submit_seconds < 1
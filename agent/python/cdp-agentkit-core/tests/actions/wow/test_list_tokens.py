@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+
+from cdp_agentkit_core.actions.wow.constants import WOW_FACTORY_CONTRACT_ADDRESSES
+from cdp_agentkit_core.actions.wow.list_tokens import WowListTokensInput, wow_list_tokens
+from cdp_agentkit_core.actions.wow.registry import WowToken
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_CREATOR = "0x1234567890123456789012345678901234567890"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_POOL_ADDRESS = "0x4200000000000000000000000000000000000006"
+
+
+def test_list_tokens_input_model_defaults():
+    """Test that WowListTokensInput accepts no parameters."""
+    input_model = WowListTokensInput()
+
+    assert input_model.query is None
+    assert input_model.limit == 20
+
+
+def test_list_tokens_input_model_invalid_limit():
+    """Test that WowListTokensInput rejects limits out of range."""
+    with pytest.raises(ValueError):
+        WowListTokensInput(limit=0)
+
+
+def test_list_tokens_success(wallet_factory, isolate_wow_registry):
+    """Test searching indexed tokens after a sync."""
+    mock_wallet = wallet_factory()
+    mock_wallet.network_id = MOCK_NETWORK_ID
+    isolate_wow_registry.record_tokens(
+        MOCK_NETWORK_ID,
+        WOW_FACTORY_CONTRACT_ADDRESSES[MOCK_NETWORK_ID],
+        [
+            WowToken(
+                network_id=MOCK_NETWORK_ID,
+                token_address=MOCK_TOKEN_ADDRESS,
+                pool_address=MOCK_POOL_ADDRESS,
+                creator=MOCK_CREATOR,
+                name="Based Frog",
+                symbol="FROG",
+                token_uri="ipfs://token",
+                creation_block=10,
+            )
+        ],
+        100,
+    )
+
+    with patch("cdp_agentkit_core.actions.wow.list_tokens.registry_sync") as mock_sync:
+        response = wow_list_tokens(mock_wallet, query="frog")
+
+    mock_sync.request.assert_called_once_with(MOCK_NETWORK_ID)
+    assert "Found 1 Zora Wow ERC20 memecoins" in response
+    assert f"Based Frog (FROG): {MOCK_TOKEN_ADDRESS}" in response
+    assert "on the bonding curve" in response
+
+
+def test_list_tokens_not_indexed_yet(wallet_factory):
+    """Test that searches of a network which was never indexed do not wait for the sync."""
+    mock_wallet = wallet_factory()
+    mock_wallet.network_id = MOCK_NETWORK_ID
+
+    with patch("cdp_agentkit_core.actions.wow.list_tokens.registry_sync") as mock_sync:
+        response = wow_list_tokens(mock_wallet)
+
+    mock_sync.request.assert_called_once_with(MOCK_NETWORK_ID)
+    assert "still being indexed" in response
+
+
+def test_list_tokens_no_match(wallet_factory, isolate_wow_registry):
+    """Test searching an indexed network without matching tokens."""
+    mock_wallet = wallet_factory()
+    mock_wallet.network_id = MOCK_NETWORK_ID
+    isolate_wow_registry.record_tokens(
+        MOCK_NETWORK_ID, WOW_FACTORY_CONTRACT_ADDRESSES[MOCK_NETWORK_ID], [], 100
+    )
+
+    with patch("cdp_agentkit_core.actions.wow.list_tokens.registry_sync"):
+        response = wow_list_tokens(mock_wallet, query="frog")
+
+    assert response == f"No Zora Wow ERC20 memecoins found on {MOCK_NETWORK_ID}"
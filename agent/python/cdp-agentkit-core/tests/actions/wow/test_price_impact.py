@@ -0,0 +1,168 @@
+from unittest.mock import patch
+
+import pytest
+
+from cdp_agentkit_core.actions.wow.bonding_curve import bonding_curve
+from cdp_agentkit_core.actions.wow.uniswap.index import PoolInfo, TickData
+from cdp_agentkit_core.actions.wow.uniswap.swap_math import (
+    PoolState,
+    get_sqrt_ratio_at_tick,
+    swap_exact_input,
+)
+
+np = pytest.importorskip("numpy")
+
+from cdp_agentkit_core.actions.wow.price_impact import (  # noqa: E402
+    bonding_curve_price_impact,
+    get_price_impact_curve,
+    uniswap_price_impact,
+)
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_SUPPLY = 250_000_000 * 10**18
+MOCK_AMOUNTS = np.array([1e14, 1e16, 1e18, 1e20, 3e20])
+
+# A full range position and a concentrated position around the current price.
+MOCK_TICK_DATA = TickData(
+    tick_spacing=200,
+    tick_bitmap={-18: 1 << 172, -1: 1 << 246, 0: 1 << 10, 17: 1 << 84},
+    liquidity_net={-887200: 10**20, -2000: 10**21, 2000: -(10**21), 887200: -(10**20)},
+    min_word=-18,
+    max_word=17,
+)
+MOCK_POOL_STATE = PoolState(
+    sqrt_price_x96=get_sqrt_ratio_at_tick(0),
+    tick=0,
+    liquidity=11 * 10**20,
+    fee=10000,
+    tick_spacing=MOCK_TICK_DATA.tick_spacing,
+    tick_bitmap=MOCK_TICK_DATA.tick_bitmap,
+    liquidity_net=MOCK_TICK_DATA.liquidity_net,
+    min_word=MOCK_TICK_DATA.min_word,
+    max_word=MOCK_TICK_DATA.max_word,
+)
+
+
+@pytest.mark.parametrize(
+    ("is_token0", "quote_type", "zero_for_one"),
+    [(True, "buy", False), (True, "sell", True), (False, "buy", True), (False, "sell", False)],
+)
+def test_uniswap_price_impact_matches_swap(is_token0, quote_type, zero_for_one):
+    """Test that batched Uniswap quotes match the exact swap engine, across tick crossings."""
+    curve = uniswap_price_impact(MOCK_POOL_STATE, is_token0, MOCK_AMOUNTS, quote_type)
+
+    expected = [
+        swap_exact_input(MOCK_POOL_STATE, zero_for_one, int(amount)) for amount in MOCK_AMOUNTS
+    ]
+    np.testing.assert_allclose(curve.amount_out, np.array(expected, dtype=float), rtol=1e-9)
+    assert curve.spot_price == pytest.approx(1.0)
+    # Price impact starts at the 1% pool fee and grows with the order size.
+    fee_impact = 1 / 0.99 - 1 if quote_type == "buy" else 0.01
+    assert curve.price_impact[0] == pytest.approx(fee_impact, rel=1e-3)
+    assert np.all(np.diff(curve.price_impact) > 0)
+
+
+def test_uniswap_price_impact_missing_tick_data():
+    """Test that order sizes beyond the fetched tick data are NaN."""
+    state = PoolState(
+        sqrt_price_x96=get_sqrt_ratio_at_tick(0),
+        tick=0,
+        liquidity=10**18,
+        fee=3000,
+        tick_spacing=1,
+        tick_bitmap={-1: 1 << 246, 0: 1 << 10},
+        liquidity_net={-10: 10**18, 10: -(10**18)},
+        min_word=-1,
+        max_word=0,
+    )
+
+    curve = uniswap_price_impact(state, True, np.array([1e14, 1e20]), "sell")
+
+    assert curve.amount_out[0] == pytest.approx(swap_exact_input(state, True, 10**14), rel=1e-9)
+    assert np.isnan(curve.amount_out[1])
+
+
+@pytest.mark.parametrize("quote_type", ["buy", "sell"])
+def test_bonding_curve_price_impact_matches_curve(quote_type):
+    """Test that batched bonding curve quotes match the fixed point implementation."""
+    amounts = MOCK_AMOUNTS if quote_type == "buy" else MOCK_AMOUNTS * 10**5
+    quote = (
+        bonding_curve.get_eth_buy_quote
+        if quote_type == "buy"
+        else bonding_curve.get_token_sell_quote
+    )
+
+    curve = bonding_curve_price_impact(bonding_curve, MOCK_SUPPLY, amounts, quote_type)
+
+    expected = [quote(MOCK_SUPPLY, int(amount)) for amount in amounts]
+    np.testing.assert_allclose(curve.amount_out, np.array(expected, dtype=float), rtol=1e-9)
+    assert np.all(curve.price_impact >= 0)
+
+
+def test_max_amount_in():
+    """Test picking the largest order size within a price impact bound."""
+    amounts = np.geomspace(1e14, 1e20, 1000)
+    curve = bonding_curve_price_impact(bonding_curve, MOCK_SUPPLY, amounts, "buy")
+
+    max_amount = curve.max_amount_in(0.02)
+
+    assert 0 < max_amount < amounts[-1]
+    assert curve.price_impact[amounts == max_amount][0] <= 0.02
+    assert curve.price_impact[amounts > max_amount][0] > 0.02
+
+
+def test_get_price_impact_curve_bonding_curve():
+    """Test that the bonding curve state is fetched once for all order sizes."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.wow.price_impact.get_market_state",
+            return_value=(False, MOCK_SUPPLY),
+        ) as mock_market_state,
+        patch("cdp_agentkit_core.actions.wow.price_impact.get_pool_info") as mock_pool_info,
+    ):
+        curve = get_price_impact_curve(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_AMOUNTS, "buy")
+
+    assert len(curve.amount_out) == len(MOCK_AMOUNTS)
+    mock_market_state.assert_called_once()
+    mock_pool_info.assert_not_called()
+
+
+def test_get_price_impact_curve_uniswap():
+    """Test that the pool state and ticks are fetched once for all order sizes."""
+    pool_info = PoolInfo(
+        token0=MOCK_TOKEN_ADDRESS,
+        balance0=10**24,
+        token1=MOCK_WETH_ADDRESS,
+        balance1=10**22,
+        fee=10000,
+        liquidity=MOCK_POOL_STATE.liquidity,
+        sqrt_price_x96=MOCK_POOL_STATE.sqrt_price_x96,
+        tick=0,
+    )
+
+    with (
+        patch(
+            "cdp_agentkit_core.actions.wow.price_impact.get_market_state",
+            return_value=(True, MOCK_SUPPLY),
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.price_impact.get_pool_address",
+            return_value=MOCK_POOL_ADDRESS,
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.price_impact.get_pool_info", return_value=pool_info
+        ) as mock_pool_info,
+        patch(
+            "cdp_agentkit_core.actions.wow.price_impact.get_tick_data",
+            return_value=MOCK_TICK_DATA,
+        ) as mock_tick_data,
+    ):
+        curve = get_price_impact_curve(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_AMOUNTS, "buy")
+
+    expected = [swap_exact_input(MOCK_POOL_STATE, False, int(amount)) for amount in MOCK_AMOUNTS]
+    np.testing.assert_allclose(curve.amount_out, np.array(expected, dtype=float), rtol=1e-9)
+    mock_pool_info.assert_called_once()
+    mock_tick_data.assert_called_once_with(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, 0)
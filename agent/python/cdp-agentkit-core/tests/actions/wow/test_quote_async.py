@@ -0,0 +1,177 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from cdp_agentkit_core.actions.wow.bonding_curve import bonding_curve
+from cdp_agentkit_core.actions.wow.uniswap.index import (
+    PoolInfo,
+    Quote,
+    get_uniswap_quote_async,
+)
+from cdp_agentkit_core.actions.wow.utils import get_buy_quote_async, get_sell_quote_async
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_AMOUNT = "100000000000000"
+MOCK_BONDING_CURVE_QUOTE = 1000000
+MOCK_SUPPLY = 10**26
+MOCK_LOCAL_BUY_QUOTE = bonding_curve.get_eth_buy_quote(MOCK_SUPPLY, int(MOCK_AMOUNT))
+MOCK_UNISWAP_QUOTE = 2000000
+
+MOCK_POOL_INFO = PoolInfo(
+    token0=MOCK_TOKEN_ADDRESS,
+    balance0=10**24,
+    token1=MOCK_WETH_ADDRESS,
+    balance1=10**20,
+    fee=10000,
+    liquidity=10**22,
+    sqrt_price_x96=2**96,
+)
+
+
+def test_get_buy_quote_async_not_graduated():
+    """Test that the bonding curve quote is computed locally for tokens that have not graduated."""
+    with (
+        patch("cdp_agentkit_core.actions.wow.utils.get_has_graduated", return_value=False),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_pool_address", return_value=MOCK_POOL_ADDRESS
+        ),
+        patch("cdp_agentkit_core.actions.wow.utils.get_current_supply", return_value=MOCK_SUPPLY),
+        patch("cdp_agentkit_core.actions.wow.utils.SmartContract.read") as mock_read,
+        patch("cdp_agentkit_core.actions.wow.utils.get_uniswap_quote_async") as mock_uniswap_quote,
+    ):
+        result = asyncio.run(get_buy_quote_async(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_AMOUNT))
+
+    assert result == MOCK_LOCAL_BUY_QUOTE
+    mock_read.assert_not_called()
+    mock_uniswap_quote.assert_not_called()
+
+
+def test_get_buy_quote_async_supply_error_falls_back():
+    """Test that the contract quote is used when the current supply cannot be read."""
+    with (
+        patch("cdp_agentkit_core.actions.wow.utils.get_has_graduated", return_value=False),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_pool_address", return_value=MOCK_POOL_ADDRESS
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_current_supply",
+            side_effect=Exception("API error"),
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.SmartContract.read",
+            return_value=MOCK_BONDING_CURVE_QUOTE,
+        ) as mock_read,
+    ):
+        result = asyncio.run(get_buy_quote_async(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_AMOUNT))
+
+    assert result == MOCK_BONDING_CURVE_QUOTE
+    assert mock_read.call_args[0][2] == "getEthBuyQuote"
+
+
+def test_get_sell_quote_async_graduated():
+    """Test that the Uniswap quote is used for graduated tokens, reusing the pool address."""
+    uniswap_quote = Quote(
+        amount_in=int(MOCK_AMOUNT),
+        amount_out=MOCK_UNISWAP_QUOTE,
+        balance=None,
+        fee=0.01,
+        error=None,
+    )
+
+    with (
+        patch("cdp_agentkit_core.actions.wow.utils.get_has_graduated", return_value=True),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_pool_address", return_value=MOCK_POOL_ADDRESS
+        ),
+        patch("cdp_agentkit_core.actions.wow.utils.get_current_supply", return_value=MOCK_SUPPLY),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_uniswap_quote_async",
+            return_value=uniswap_quote,
+        ) as mock_uniswap_quote,
+    ):
+        result = asyncio.run(get_sell_quote_async(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_AMOUNT))
+
+    assert result == MOCK_UNISWAP_QUOTE
+    assert mock_uniswap_quote.call_args[0][4] == MOCK_POOL_ADDRESS
+
+
+def test_get_buy_quote_async_reads_run_concurrently():
+    """Test that independent reads are fanned out instead of serialized."""
+
+    def slow(value):
+        def _read(*args, **kwargs):
+            time.sleep(0.2)
+            return value
+
+        return _read
+
+    with (
+        patch("cdp_agentkit_core.actions.wow.utils.get_has_graduated", side_effect=slow(False)),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_pool_address",
+            side_effect=slow(MOCK_POOL_ADDRESS),
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_current_supply",
+            side_effect=slow(MOCK_SUPPLY),
+        ),
+    ):
+        start = time.perf_counter()
+        result = asyncio.run(get_buy_quote_async(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_AMOUNT))
+        elapsed = time.perf_counter() - start
+
+    assert result == MOCK_LOCAL_BUY_QUOTE
+    assert elapsed < 0.5
+
+
+def test_get_buy_quote_async_timeout():
+    """Test that a read exceeding the timeout raises a TimeoutError."""
+
+    def hang(*args, **kwargs):
+        time.sleep(0.5)
+        return False
+
+    with (
+        patch("cdp_agentkit_core.actions.wow.utils.get_has_graduated", side_effect=hang),
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.get_pool_address", return_value=MOCK_POOL_ADDRESS
+        ),
+        patch("cdp_agentkit_core.actions.wow.utils.get_current_supply", return_value=MOCK_SUPPLY),
+        pytest.raises(TimeoutError),
+    ):
+        asyncio.run(
+            get_buy_quote_async(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, MOCK_AMOUNT, timeout=0.1)
+        )
+
+
+def test_get_uniswap_quote_async():
+    """Test that the async Uniswap quote returns the same Quote dataclass as the sync path."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.wow.uniswap.index.get_pool_info",
+            return_value=MOCK_POOL_INFO,
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.uniswap.index.exact_input_single",
+            return_value=MOCK_UNISWAP_QUOTE,
+        ) as mock_exact_input_single,
+    ):
+        quote = asyncio.run(
+            get_uniswap_quote_async(
+                MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, 10**15, "buy", MOCK_POOL_ADDRESS
+            )
+        )
+
+    assert isinstance(quote, Quote)
+    assert quote.amount_out == MOCK_UNISWAP_QUOTE
+    assert quote.fee == 0.01
+    assert quote.balance.weth == MOCK_POOL_INFO.balance1
+    assert quote.balance.erc20z == MOCK_POOL_INFO.balance0
+    mock_exact_input_single.assert_called_once_with(
+        MOCK_NETWORK_ID, MOCK_WETH_ADDRESS, MOCK_TOKEN_ADDRESS, 10**15, 10000
+    )
@@ -0,0 +1,264 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cdp_agentkit_core.actions.read_cache import read_cache
+from cdp_agentkit_core.actions.wow.constants import (
+    WOW_ABI,
+    WOW_FACTORY_CONTRACT_ADDRESSES,
+    WOW_FACTORY_START_BLOCKS,
+)
+from cdp_agentkit_core.actions.wow.registry import (
+    SYNC_BLOCK_RANGE,
+    RegistrySync,
+    WowRegistry,
+    WowToken,
+    prime_read_cache,
+    sync_registry,
+)
+from cdp_agentkit_core.actions.wow.uniswap.index import get_pool_address
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_CREATOR = "0x1234567890123456789012345678901234567890"
+MOCK_TOKEN_A = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_POOL_A = "0x4200000000000000000000000000000000000006"
+MOCK_TOKEN_B = "0x15ba66e376856F3F6FE53dE9eeAb10dEF10E8C92"
+MOCK_POOL_B = "0xCE00c75B9807A2aA87B2297cA7Dc1C0190137D6F"
+
+
+def _event(token_address, pool_address, name, symbol, block_height):
+    data = {
+        "factoryAddress": WOW_FACTORY_CONTRACT_ADDRESSES[MOCK_NETWORK_ID],
+        "tokenCreator": MOCK_CREATOR.lower(),
+        "tokenURI": "ipfs://token",
+        "name": name,
+        "symbol": symbol,
+        "tokenAddress": token_address.lower(),
+        "poolAddress": pool_address.lower(),
+    }
+    return SimpleNamespace(data=json.dumps(data), block_height=block_height, tx_hash="0xabc")
+
+
+def _page(events, next_page=""):
+    return SimpleNamespace(data=events, has_more=bool(next_page), next_page=next_page)
+
+
+def _token(token_address, pool_address, name, symbol, creation_block, has_graduated=False):
+    return WowToken(
+        network_id=MOCK_NETWORK_ID,
+        token_address=token_address,
+        pool_address=pool_address,
+        creator=MOCK_CREATOR,
+        name=name,
+        symbol=symbol,
+        token_uri="ipfs://token",
+        creation_block=creation_block,
+        has_graduated=has_graduated,
+    )
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Create an empty registry."""
+    registry = WowRegistry(tmp_path / "registry.sqlite3")
+    yield registry
+    registry.close()
+
+
+def test_registry_lookup_without_database(tmp_path):
+    """Test that lookups against a registry that was never synced miss without creating it."""
+    registry = WowRegistry(tmp_path / "missing.sqlite3")
+
+    assert registry.get_pool_address(MOCK_NETWORK_ID, MOCK_TOKEN_A) is None
+    assert registry.last_indexed_block(MOCK_NETWORK_ID) is None
+    assert not registry.path.exists()
+
+
+def test_registry_list_and_search(registry):
+    """Test listing and searching recorded tokens."""
+    registry.record_tokens(
+        MOCK_NETWORK_ID,
+        WOW_FACTORY_CONTRACT_ADDRESSES[MOCK_NETWORK_ID],
+        [
+            _token(MOCK_TOKEN_A, MOCK_POOL_A, "Based Frog", "FROG", 10),
+            _token(MOCK_TOKEN_B, MOCK_POOL_B, "Moon_Dog", "MDOG", 20, has_graduated=True),
+        ],
+        100,
+    )
+
+    assert registry.get_pool_address(MOCK_NETWORK_ID, MOCK_TOKEN_A.lower()) == MOCK_POOL_A
+    assert registry.get_token("base-mainnet", MOCK_TOKEN_A) is None
+    assert registry.last_indexed_block(MOCK_NETWORK_ID) == 100
+
+    assert [token.symbol for token in registry.list_tokens(MOCK_NETWORK_ID)] == ["MDOG", "FROG"]
+    assert [
+        token.symbol for token in registry.list_tokens(MOCK_NETWORK_ID, has_graduated=False)
+    ] == ["FROG"]
+    assert registry.list_tokens(MOCK_NETWORK_ID, creator=MOCK_POOL_A) == []
+    assert [token.symbol for token in registry.search_tokens(MOCK_NETWORK_ID, "frog")] == ["FROG"]
+    assert [token.symbol for token in registry.search_tokens(MOCK_NETWORK_ID, "0x15ba")] == ["MDOG"]
+    # LIKE wildcards in the query are matched literally.
+    assert [token.symbol for token in registry.search_tokens(MOCK_NETWORK_ID, "n_d")] == ["MDOG"]
+    assert registry.search_tokens(MOCK_NETWORK_ID, "o%d") == []
+
+
+def test_sync_registry_incremental(registry):
+    """Test that syncs page through events and resume from the last indexed block."""
+    pages = [
+        _page([_event(MOCK_TOKEN_A, MOCK_POOL_A, "Based Frog", "FROG", 10)], next_page="next"),
+        _page([_event(MOCK_TOKEN_B, MOCK_POOL_B, "Moon Dog", "MDOG", 20)]),
+    ]
+    with (
+        patch("cdp_agentkit_core.actions.wow.registry.Cdp"),
+        patch("cdp_agentkit_core.actions.wow.registry.ContractEventsApi") as mock_api,
+        patch(
+            "cdp_agentkit_core.actions.wow.registry.multicall_read", return_value=[0, 1]
+        ) as mock_multicall,
+    ):
+        mock_api.return_value.list_contract_events.side_effect = pages
+        indexed = sync_registry(MOCK_NETWORK_ID, registry, start_block=5, to_block=50)
+
+    assert indexed == 2
+    assert registry.last_indexed_block(MOCK_NETWORK_ID) == 50
+    calls = mock_api.return_value.list_contract_events.call_args_list
+    assert len(calls) == 2
+    assert calls[0].kwargs["from_block_height"] == 5
+    assert calls[0].kwargs["to_block_height"] == 50
+    assert calls[0].kwargs["event_name"] == "WowTokenCreated"
+    assert calls[1].kwargs["next_page"] == "next"
+    mock_multicall.assert_called_once()
+    assert registry.get_token(MOCK_NETWORK_ID, MOCK_TOKEN_B).has_graduated
+    assert not registry.get_token(MOCK_NETWORK_ID, MOCK_TOKEN_A).has_graduated
+
+    with (
+        patch("cdp_agentkit_core.actions.wow.registry.Cdp"),
+        patch("cdp_agentkit_core.actions.wow.registry.ContractEventsApi") as mock_api,
+        patch(
+            "cdp_agentkit_core.actions.wow.registry.multicall_read", return_value=[0]
+        ) as mock_multicall,
+        patch(
+            "cdp_agentkit_core.actions.wow.registry.SmartContract.read",
+            return_value=50 + SYNC_BLOCK_RANGE + 10,
+        ),
+    ):
+        mock_api.return_value.list_contract_events.return_value = _page([])
+        indexed = sync_registry(MOCK_NETWORK_ID, registry)
+
+    assert indexed == 0
+    calls = mock_api.return_value.list_contract_events.call_args_list
+    assert [call.kwargs["from_block_height"] for call in calls] == [51, 51 + SYNC_BLOCK_RANGE]
+    assert calls[-1].kwargs["to_block_height"] == 50 + SYNC_BLOCK_RANGE + 10
+    # Graduated tokens are never read again.
+    assert len(mock_multicall.call_args[0][1]) == 1
+
+
+def test_sync_registry_skips_malformed_events(registry):
+    """Test that events that cannot be parsed are skipped."""
+    malformed = SimpleNamespace(data="not json", block_height=10, tx_hash="0xabc")
+    with (
+        patch("cdp_agentkit_core.actions.wow.registry.Cdp"),
+        patch("cdp_agentkit_core.actions.wow.registry.ContractEventsApi") as mock_api,
+        patch("cdp_agentkit_core.actions.wow.registry.multicall_read", return_value=[0]),
+    ):
+        mock_api.return_value.list_contract_events.return_value = _page(
+            [malformed, _event(MOCK_TOKEN_A, MOCK_POOL_A, "Based Frog", "FROG", 11)]
+        )
+        indexed = sync_registry(MOCK_NETWORK_ID, registry, start_block=0, to_block=20)
+
+    assert indexed == 1
+
+
+def test_sync_registry_starts_at_factory_start_block(registry):
+    """Test that the first sync of a network starts at the factory's start block, not at 0."""
+    start_block = WOW_FACTORY_START_BLOCKS[MOCK_NETWORK_ID]
+    with (
+        patch("cdp_agentkit_core.actions.wow.registry.Cdp"),
+        patch("cdp_agentkit_core.actions.wow.registry.ContractEventsApi") as mock_api,
+        patch("cdp_agentkit_core.actions.wow.registry.multicall_read"),
+    ):
+        mock_api.return_value.list_contract_events.return_value = _page([])
+        sync_registry(MOCK_NETWORK_ID, registry, to_block=start_block + 10)
+
+    calls = mock_api.return_value.list_contract_events.call_args_list
+    assert [call.kwargs["from_block_height"] for call in calls] == [start_block]
+
+
+def test_registry_sync_is_rate_limited(registry):
+    """Test that background syncs of a network start at most once per interval."""
+    syncs = RegistrySync(interval=60)
+    with patch("cdp_agentkit_core.actions.wow.registry.sync_registry") as mock_sync:
+        assert syncs.request(MOCK_NETWORK_ID, registry)
+        syncs.wait(MOCK_NETWORK_ID)
+        assert not syncs.request(MOCK_NETWORK_ID, registry)
+        assert syncs.request("base-mainnet", registry)
+        syncs.wait("base-mainnet")
+
+        syncs.clear()
+        assert syncs.request(MOCK_NETWORK_ID, registry)
+        syncs.wait(MOCK_NETWORK_ID)
+
+    assert [call.args[0] for call in mock_sync.call_args_list] == [
+        MOCK_NETWORK_ID,
+        "base-mainnet",
+        MOCK_NETWORK_ID,
+    ]
+
+
+def test_registry_sync_survives_errors(registry):
+    """Test that a failed background sync is logged rather than raised."""
+    syncs = RegistrySync(interval=0)
+    with patch(
+        "cdp_agentkit_core.actions.wow.registry.sync_registry",
+        side_effect=[Exception("API error"), 0],
+    ) as mock_sync:
+        assert syncs.request(MOCK_NETWORK_ID, registry)
+        syncs.wait(MOCK_NETWORK_ID)
+        assert syncs.request(MOCK_NETWORK_ID, registry)
+        syncs.wait(MOCK_NETWORK_ID)
+
+    assert mock_sync.call_count == 2
+
+
+def test_get_pool_address_from_registry(isolate_wow_registry):
+    """Test that pool lookups of indexed tokens do not read the chain."""
+    isolate_wow_registry.record_tokens(
+        MOCK_NETWORK_ID,
+        WOW_FACTORY_CONTRACT_ADDRESSES[MOCK_NETWORK_ID],
+        [_token(MOCK_TOKEN_A, MOCK_POOL_A, "Based Frog", "FROG", 10)],
+        100,
+    )
+
+    with patch("cdp_agentkit_core.actions.read_cache.SmartContract.read") as mock_read:
+        assert get_pool_address(MOCK_TOKEN_A, MOCK_NETWORK_ID) == MOCK_POOL_A
+
+    mock_read.assert_not_called()
+
+
+def test_get_pool_address_reads_network():
+    """Test that pool lookups of tokens missing from the registry read the given network."""
+    with patch(
+        "cdp_agentkit_core.actions.read_cache.SmartContract.read", return_value=MOCK_POOL_A
+    ) as mock_read:
+        assert get_pool_address(MOCK_TOKEN_A, "base-mainnet") == MOCK_POOL_A
+
+    assert mock_read.call_args[0][:3] == ("base-mainnet", MOCK_TOKEN_A, "poolAddress")
+
+
+def test_prime_read_cache(registry):
+    """Test that the immutable state of indexed tokens is seeded into the read cache."""
+    registry.record_tokens(
+        MOCK_NETWORK_ID,
+        WOW_FACTORY_CONTRACT_ADDRESSES[MOCK_NETWORK_ID],
+        [_token(MOCK_TOKEN_B, MOCK_POOL_B, "Moon Dog", "MDOG", 20, has_graduated=True)],
+        100,
+    )
+
+    assert not prime_read_cache(MOCK_NETWORK_ID, MOCK_TOKEN_A, registry)
+    assert prime_read_cache(MOCK_NETWORK_ID, MOCK_TOKEN_B, registry)
+    assert read_cache.get(MOCK_NETWORK_ID, MOCK_TOKEN_B, "poolAddress", abi=WOW_ABI) == (
+        True,
+        MOCK_POOL_B,
+    )
+    assert read_cache.get(MOCK_NETWORK_ID, MOCK_TOKEN_B, "marketType", abi=WOW_ABI) == (True, 1)
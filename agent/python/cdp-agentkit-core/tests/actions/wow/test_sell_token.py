@@ -1,3 +1,4 @@
+import time
 from unittest.mock import patch
 
 import pytest
@@ -7,6 +8,7 @@ from cdp_agentkit_core.actions.wow.sell_token import (
     WowSellTokenInput,
     wow_sell_token,
 )
+from cdp_agentkit_core.actions.wow.utils import WowTradeContext
 
 MOCK_CONTRACT_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
 MOCK_AMOUNT_TOKENS = "100000000000000"
@@ -15,6 +17,22 @@ MOCK_WALLET_ADDRESS = "0x1234567890123456789012345678901234567890"
 MOCK_ETH_QUOTE = 1000000
 
 
+def _trade_context(has_graduated: bool, quote: int) -> WowTradeContext:
+    return WowTradeContext(
+        network_id=MOCK_NETWORK_ID,
+        token_address=MOCK_CONTRACT_ADDRESS,
+        quote_type="sell",
+        amount=int(MOCK_AMOUNT_TOKENS),
+        has_graduated=has_graduated,
+        current_supply=10**26,
+        pool_address="0x0000000000000000000000000000000000000000",
+        pool=None,
+        quote=quote,
+        fetched_at=time.monotonic(),
+        fetch_seconds=0.0,
+    )
+
+
 def test_sell_token_input_model_valid():
     """Test that WowSellTokenInput accepts valid parameters."""
     input_model = WowSellTokenInput(
@@ -41,12 +59,8 @@ def test_sell_token_success(wallet_factory, contract_invocation_factory):
 
     with (
         patch(
-            "cdp_agentkit_core.actions.wow.sell_token.get_sell_quote",
-            return_value=MOCK_ETH_QUOTE,
-        ),
-        patch(
-            "cdp_agentkit_core.actions.wow.sell_token.get_has_graduated",
-            return_value=False,
+            "cdp_agentkit_core.actions.wow.sell_token.get_trade_context",
+            return_value=_trade_context(False, MOCK_ETH_QUOTE),
         ),
         patch.object(
             mock_wallet, "invoke_contract", return_value=mock_contract_instance
@@ -93,12 +107,8 @@ def test_sell_token_graduated_pool(wallet_factory, contract_invocation_factory):
 
     with (
         patch(
-            "cdp_agentkit_core.actions.wow.sell_token.get_sell_quote",
-            return_value=MOCK_ETH_QUOTE,
-        ),
-        patch(
-            "cdp_agentkit_core.actions.wow.sell_token.get_has_graduated",
-            return_value=True,
+            "cdp_agentkit_core.actions.wow.sell_token.get_trade_context",
+            return_value=_trade_context(True, MOCK_ETH_QUOTE),
         ),
         patch.object(
             mock_wallet, "invoke_contract", return_value=mock_contract_instance
@@ -123,12 +133,8 @@ def test_sell_token_api_error(wallet_factory):
 
     with (
         patch(
-            "cdp_agentkit_core.actions.wow.sell_token.get_sell_quote",
-            return_value=MOCK_ETH_QUOTE,
-        ),
-        patch(
-            "cdp_agentkit_core.actions.wow.sell_token.get_has_graduated",
-            return_value=False,
+            "cdp_agentkit_core.actions.wow.sell_token.get_trade_context",
+            return_value=_trade_context(False, MOCK_ETH_QUOTE),
         ),
         patch.object(
             mock_wallet, "invoke_contract", side_effect=Exception("API error")
@@ -0,0 +1,210 @@
+from decimal import Decimal, getcontext
+
+import pytest
+
+from cdp_agentkit_core.actions.wow.uniswap.swap_math import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    Q96,
+    PoolState,
+    TickDataUnavailableError,
+    compute_swap_step,
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+    next_initialized_tick_within_one_word,
+    swap_exact_input,
+)
+
+# Initialized ticks used by the v3-core TickBitmap tests.
+TICK_BITMAP_TICKS = [-200, -55, -4, 70, 78, 84, 139, 240, 535]
+
+
+# Pool states recorded from the canonical Uniswap v3 bytecode, whose pool init code hash is
+# 0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54, run in a local EVM.
+# Positions were minted through NonfungiblePositionManager, and each test case pairs the state
+# with the amount out returned by QuoterV2.quoteExactInputSingle with no price limit.
+RECORDED_WOW_POOL = {
+    "sqrt_price_x96": 51345717726626491483456871,
+    "tick": -146838,
+    "liquidity": 278516105421553224714991,
+    "fee": 10000,
+    "tick_spacing": 200,
+    "tick_bitmap": {
+        -18: 5986310706507378352962293074805895248510699696029696,
+        -3: 354603499520,
+        17: 19342813113834066795298816,
+    },
+    "liquidity_net": {
+        -887200: 648074069840786023096,
+        -150000: 111685997597433208963634,
+        -148000: 158043430146749108626112,
+        -147400: 119824601204963330065783,
+        -147000: -111685997597433208963634,
+        -146400: -119824601204963330065783,
+        -146000: -158043430146749108626112,
+        887200: -648074069840786023096,
+    },
+}
+RECORDED_MEDIUM_FEE_POOL = {
+    "sqrt_price_x96": 79374599285965604694807055186,
+    "tick": 36,
+    "liquidity": 73904454728687315163151,
+    "fee": 3000,
+    "tick_spacing": 60,
+    "tick_bitmap": {
+        -1: 86844066927987146567678238756515930889952488499230423029593188005934847229952,
+        0: 15,
+    },
+    "liquidity_net": {
+        -120: 12771343689239718675935,
+        -60: 7028104994910422652470,
+        0: 54104007889419201820731,
+        60: -54104007889419201820731,
+        120: -12771343689239718675935,
+        180: -7028104994910422652470,
+    },
+}
+
+
+def _encode_price_sqrt(reserve1: int, reserve0: int) -> int:
+    getcontext().prec = 80
+    return int((Decimal(reserve1) / Decimal(reserve0)).sqrt() * Q96)
+
+
+def _pool_state(tick_spacing, positions, tick=0, fee=3000, **kwargs):
+    # Build the bitmap and net liquidity for (tick_lower, tick_upper, liquidity) positions.
+    tick_bitmap, liquidity_net, liquidity = {}, {}, 0
+    for tick_lower, tick_upper, amount in positions:
+        for initialized_tick, delta in ((tick_lower, amount), (tick_upper, -amount)):
+            compressed = initialized_tick // tick_spacing
+            tick_bitmap[compressed >> 8] = tick_bitmap.get(compressed >> 8, 0) | (
+                1 << (compressed & 0xFF)
+            )
+            liquidity_net[initialized_tick] = liquidity_net.get(initialized_tick, 0) + delta
+        if tick_lower <= tick < tick_upper:
+            liquidity += amount
+
+    return PoolState(
+        sqrt_price_x96=get_sqrt_ratio_at_tick(tick),
+        tick=tick,
+        liquidity=liquidity,
+        fee=fee,
+        tick_spacing=tick_spacing,
+        tick_bitmap=tick_bitmap,
+        liquidity_net=liquidity_net,
+        **kwargs,
+    )
+
+
+def test_get_sqrt_ratio_at_tick_bounds():
+    """Test the sqrt ratio at the minimum, maximum and zero ticks."""
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(0) == Q96
+    assert get_sqrt_ratio_at_tick(50) == 79426470787362580746886972461
+
+    with pytest.raises(ValueError):
+        get_sqrt_ratio_at_tick(MAX_TICK + 1)
+
+
+@pytest.mark.parametrize("tick", [MIN_TICK, -50000, -1, 0, 1, 50000, MAX_TICK - 1])
+def test_get_tick_at_sqrt_ratio(tick):
+    """Test that the tick is the greatest tick whose sqrt ratio does not exceed the price."""
+    assert get_tick_at_sqrt_ratio(get_sqrt_ratio_at_tick(tick)) == tick
+    assert get_tick_at_sqrt_ratio(get_sqrt_ratio_at_tick(tick + 1) - 1) == tick
+
+
+def test_compute_swap_step_capped_at_price_target():
+    """Test an exact input step that is capped at the price target, as in the v3-core tests."""
+    price_target = _encode_price_sqrt(101, 100)
+
+    sqrt_q, amount_in, amount_out, fee_amount = compute_swap_step(
+        _encode_price_sqrt(1, 1), price_target, 2 * 10**18, 10**18, 600
+    )
+
+    assert amount_in == 9975124224178055
+    assert fee_amount == 5988667735148
+    assert amount_out == 9925619580021728
+    assert sqrt_q == price_target
+
+
+def test_compute_swap_step_fully_spent():
+    """Test an exact input step that is fully spent before the price target."""
+    price_target = _encode_price_sqrt(1000, 100)
+
+    sqrt_q, amount_in, amount_out, fee_amount = compute_swap_step(
+        _encode_price_sqrt(1, 1), price_target, 2 * 10**18, 10**18, 600
+    )
+
+    assert amount_in == 999400000000000000
+    assert fee_amount == 600000000000000
+    assert amount_out == 666399946655997866
+    assert sqrt_q < price_target
+
+
+@pytest.mark.parametrize(
+    ("tick", "lte", "expected"),
+    [
+        (78, False, (84, True)),
+        (77, False, (78, True)),
+        (-56, False, (-55, True)),
+        (255, False, (511, False)),
+        (-257, False, (-200, True)),
+        (78, True, (78, True)),
+        (79, True, (78, True)),
+        (258, True, (256, False)),
+        (-55, True, (-55, True)),
+        (-56, True, (-200, True)),
+    ],
+)
+def test_next_initialized_tick_within_one_word(tick, lte, expected):
+    """Test the next initialized tick search against the v3-core TickBitmap cases."""
+    state = _pool_state(1, [])
+    for initialized_tick in TICK_BITMAP_TICKS:
+        state.tick_bitmap[initialized_tick >> 8] = state.tick_bitmap.get(
+            initialized_tick >> 8, 0
+        ) | (1 << (initialized_tick & 0xFF))
+
+    assert next_initialized_tick_within_one_word(state, tick, lte) == expected
+
+
+def test_swap_exact_input_within_range():
+    """Test that a small swap within a single range matches a single swap step."""
+    state = _pool_state(60, [(-600, 600, 10**21)])
+
+    amount_out = swap_exact_input(state, True, 10**18)
+
+    _, _, expected, _ = compute_swap_step(
+        state.sqrt_price_x96, get_sqrt_ratio_at_tick(-600), 10**21, 10**18, 3000
+    )
+    assert amount_out == expected
+
+
+@pytest.mark.parametrize(
+    ("pool", "zero_for_one", "amount_in", "amount_out"),
+    [
+        (RECORDED_WOW_POOL, True, 10**17, 41579999990),
+        (RECORDED_WOW_POOL, True, 10**23, 41570423783016627),
+        (RECORDED_WOW_POOL, True, 5 * 10**25, 18190346239307408413),
+        (RECORDED_WOW_POOL, False, 10**15, 2357129928773299570185),
+        (RECORDED_WOW_POOL, False, 10**19, 14900550788991660161285206),
+        (RECORDED_WOW_POOL, False, 10**20, 14995499514329675741849251),
+        (RECORDED_MEDIUM_FEE_POOL, True, 10**16, 10006887647536581),
+        (RECORDED_MEDIUM_FEE_POOL, True, 10**21, 235040354105835908446),
+        (RECORDED_MEDIUM_FEE_POOL, False, 10**16, 9933245648589755),
+        (RECORDED_MEDIUM_FEE_POOL, False, 2 * 10**21, 166074171528104149816),
+    ],
+)
+def test_swap_exact_input_matches_recorded_quotes(pool, zero_for_one, amount_in, amount_out):
+    """Test that swaps, within a range and across several initialized ticks, match QuoterV2."""
+    assert swap_exact_input(PoolState(**pool), zero_for_one, amount_in) == amount_out
+
+
+def test_swap_exact_input_missing_tick_data():
+    """Test that a swap past the fetched bitmap words raises an error."""
+    state = _pool_state(1, [(-10, 10, 10**18)], min_word=-1, max_word=0)
+
+    with pytest.raises(TickDataUnavailableError):
+        swap_exact_input(state, True, 10**24)
@@ -0,0 +1,150 @@
+from unittest.mock import patch
+
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.read_cache import read_cache
+from cdp_agentkit_core.actions.wow.bonding_curve import bonding_curve
+from cdp_agentkit_core.actions.wow.constants import WOW_ABI
+from cdp_agentkit_core.actions.wow.uniswap.swap_math import PoolState, swap_exact_input
+from cdp_agentkit_core.actions.wow.utils import get_trade_context
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_SUPPLY = 250_000_000 * 10**18
+MOCK_AMOUNT = 10**17
+MOCK_SQRT_PRICE_X96 = 79228162514264337593543950336
+
+
+def _ok(types, values):
+    return {"success": True, "returnData": "0x" + encode(types, values).hex()}
+
+
+BLOCK_NUMBER_RESULT = _ok(["uint256"], [1])
+POOL_RESULTS = [
+    _ok(["address"], [MOCK_TOKEN_ADDRESS]),
+    _ok(["address"], [MOCK_WETH_ADDRESS]),
+    _ok(["uint24"], [10000]),
+    _ok(["uint128"], [5000]),
+    _ok(
+        ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"],
+        [MOCK_SQRT_PRICE_X96, 0, 0, 1, 1, 0, True],
+    ),
+    _ok(["uint256"], [111]),
+    _ok(["uint256"], [222]),
+]
+
+
+def _market_results(market_type):
+    return [
+        _ok(["uint8"], [market_type]),
+        _ok(["uint256"], [MOCK_SUPPLY]),
+        _ok(["address"], [MOCK_POOL_ADDRESS]),
+    ]
+
+
+def test_trade_context_bonding_curve_single_round_trip():
+    """Test that a trade on the bonding curve is quoted from a single batched read."""
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=[*_market_results(0), BLOCK_NUMBER_RESULT],
+    ) as mock_read:
+        context = get_trade_context(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(MOCK_AMOUNT), "buy")
+
+    mock_read.assert_called_once()
+    assert not context.has_graduated
+    assert context.current_supply == MOCK_SUPPLY
+    assert context.pool_address == MOCK_POOL_ADDRESS
+    assert context.pool is None
+    assert context.quote == bonding_curve.get_eth_buy_quote(MOCK_SUPPLY, MOCK_AMOUNT)
+    assert context.expected_market_type == "0"
+
+
+def test_trade_context_graduated_cold():
+    """Test that the pool state is fetched in a second batch when the pool address is unknown."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            side_effect=[
+                [*_market_results(1), BLOCK_NUMBER_RESULT],
+                [*POOL_RESULTS, BLOCK_NUMBER_RESULT],
+            ],
+        ) as mock_read,
+        patch(
+            "cdp_agentkit_core.actions.wow.utils.quote_exact_input", return_value=12345
+        ) as mock_quote,
+    ):
+        context = get_trade_context(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(MOCK_AMOUNT), "sell")
+
+    assert mock_read.call_count == 2
+    assert context.has_graduated
+    assert context.pool.balance0 == 111
+    assert context.quote == 12345
+    assert context.expected_market_type == "1"
+    mock_quote.assert_called_once_with(
+        MOCK_NETWORK_ID,
+        MOCK_POOL_ADDRESS,
+        context.pool,
+        MOCK_TOKEN_ADDRESS,
+        MOCK_WETH_ADDRESS,
+        MOCK_AMOUNT,
+    )
+
+
+def test_trade_context_graduated_warm_single_round_trip():
+    """Test that the pool state is read in the first batch once the pool address is cached."""
+    read_cache.set(
+        MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, "poolAddress", None, MOCK_POOL_ADDRESS, abi=WOW_ABI
+    )
+
+    # The cached pool address is served without a call, so only the market state is read.
+    market_results = _market_results(1)[:2]
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            return_value=[*market_results, *POOL_RESULTS, BLOCK_NUMBER_RESULT],
+        ) as mock_read,
+        patch("cdp_agentkit_core.actions.wow.utils.quote_exact_input", return_value=12345),
+    ):
+        context = get_trade_context(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(MOCK_AMOUNT), "buy")
+
+    mock_read.assert_called_once()
+    assert context.pool.liquidity == 5000
+    assert context.pool.balance1 == 222
+    assert context.quote == 12345
+
+
+def test_trade_context_min_amount_out():
+    """Test that the minimum amount out is floored to a whole number of wei."""
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=[*_market_results(0), BLOCK_NUMBER_RESULT],
+    ):
+        context = get_trade_context(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(MOCK_AMOUNT), "buy")
+
+    context.quote = 1001
+    assert context.min_amount_out(1) == "990"
+    assert context.min_amount_out(2) == "980"
+
+
+def test_trade_context_restarts_drifted_reads(mock_chain):
+    """Test that tick reads drifting to a new block restart the context instead of using the quoter."""
+    chain = mock_chain([1000, 1000, 1001])
+
+    context = get_trade_context(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, str(MOCK_AMOUNT), "buy")
+
+    expected_state = PoolState(
+        sqrt_price_x96=MOCK_SQRT_PRICE_X96,
+        tick=0,
+        liquidity=10**20,
+        fee=10000,
+        tick_spacing=200,
+        tick_bitmap={-1: 1 << 255, 0: 1 << 1},
+        liquidity_net={-200: 10**20, 200: -(10**20)},
+    )
+    assert context.has_graduated
+    assert context.quote == swap_exact_input(expected_state, False, MOCK_AMOUNT)
+    assert "quoteExactInputSingle" not in chain.methods
+    assert "getEthBuyQuote" not in chain.methods
+    assert chain.methods.count("slot0") == 2
@@ -0,0 +1,234 @@
+from unittest.mock import patch
+
+import pytest
+from eth_abi import encode
+
+from cdp_agentkit_core.actions.wow.uniswap.index import (
+    PoolInfo,
+    get_pool_info,
+    get_uniswap_quote,
+    quote_exact_input,
+)
+from cdp_agentkit_core.actions.wow.uniswap.swap_math import (
+    PoolState,
+    get_sqrt_ratio_at_tick,
+    swap_exact_input,
+)
+
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_POOL_ADDRESS = "0x1234567890123456789012345678901234567890"
+MOCK_TOKEN_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+MOCK_WETH_ADDRESS = "0x4200000000000000000000000000000000000006"
+MOCK_SQRT_PRICE_X96 = 79228162514264337593543950336
+
+
+def _ok(types, values):
+    return {"success": True, "returnData": "0x" + encode(types, values).hex()}
+
+
+POOL_RESULTS = [
+    _ok(["address"], [MOCK_TOKEN_ADDRESS]),
+    _ok(["address"], [MOCK_WETH_ADDRESS]),
+    _ok(["uint24"], [10000]),
+    _ok(["uint128"], [5000]),
+    _ok(
+        ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"],
+        [MOCK_SQRT_PRICE_X96, 0, 0, 1, 1, 0, True],
+    ),
+]
+BALANCE_RESULTS = [_ok(["uint256"], [111]), _ok(["uint256"], [222])]
+
+MOCK_TICK_SPACING = 200
+MOCK_LIQUIDITY = 10**20
+# A single position between ticks -200 and 200.
+MOCK_TICK_BITMAP = {-1: 1 << 255, 0: 1 << 1}
+MOCK_LIQUIDITY_NET = {-200: MOCK_LIQUIDITY, 200: -MOCK_LIQUIDITY}
+MOCK_POOL_INFO = PoolInfo(
+    token0=MOCK_TOKEN_ADDRESS,
+    balance0=10**24,
+    token1=MOCK_WETH_ADDRESS,
+    balance1=10**20,
+    fee=10000,
+    liquidity=MOCK_LIQUIDITY,
+    sqrt_price_x96=MOCK_SQRT_PRICE_X96,
+    tick=0,
+)
+
+
+def _tick_reads(network_id, reads):
+    return [
+        MOCK_TICK_BITMAP.get(read.args["wordPosition"], 0)
+        if read.method == "tickBitmap"
+        else (MOCK_LIQUIDITY, MOCK_LIQUIDITY_NET[read.args["tick"]], 0, 0, 0, 0, 0, True)
+        for read in reads
+    ]
+
+
+def test_get_pool_info_single_batch_with_token_pair():
+    """Test that pool info is fetched in a single multicall when the token pair is known."""
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=POOL_RESULTS + BALANCE_RESULTS,
+    ) as mock_read:
+        pool_info = get_pool_info(
+            MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, (MOCK_WETH_ADDRESS, MOCK_TOKEN_ADDRESS)
+        )
+
+    mock_read.assert_called_once()
+    calls = mock_read.call_args[1]["args"]["calls"]
+    assert len(calls) == 7
+    # Balances are requested in pool token order, regardless of the order of the pair.
+    assert calls[5][0] == MOCK_TOKEN_ADDRESS
+    assert calls[6][0] == MOCK_WETH_ADDRESS
+
+    assert pool_info.token0.lower() == MOCK_TOKEN_ADDRESS.lower()
+    assert pool_info.token1.lower() == MOCK_WETH_ADDRESS.lower()
+    assert pool_info.balance0 == 111
+    assert pool_info.balance1 == 222
+    assert pool_info.fee == 10000
+    assert pool_info.liquidity == 5000
+    assert pool_info.sqrt_price_x96 == MOCK_SQRT_PRICE_X96
+
+
+def test_get_pool_info_without_token_pair():
+    """Test that balances are fetched in a second batch when the token pair is unknown."""
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        side_effect=[POOL_RESULTS, BALANCE_RESULTS],
+    ) as mock_read:
+        pool_info = get_pool_info(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS)
+
+    assert mock_read.call_count == 2
+    assert pool_info.balance0 == 111
+    assert pool_info.balance1 == 222
+
+
+def test_get_pool_info_error():
+    """Test that errors are wrapped when pool info cannot be fetched."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.multicall.SmartContract.read",
+            side_effect=Exception("API error"),
+        ),
+        pytest.raises(Exception, match="Failed to fetch pool information: API error"),
+    ):
+        get_pool_info(MOCK_NETWORK_ID, MOCK_POOL_ADDRESS)
+
+
+def test_get_pool_info_includes_tick():
+    """Test that the current tick is taken from slot0."""
+    results = list(POOL_RESULTS)
+    results[4] = _ok(
+        ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"],
+        [get_sqrt_ratio_at_tick(-120), -120, 0, 1, 1, 0, True],
+    )
+    with patch(
+        "cdp_agentkit_core.actions.multicall.SmartContract.read",
+        return_value=results + BALANCE_RESULTS,
+    ):
+        pool_info = get_pool_info(
+            MOCK_NETWORK_ID, MOCK_POOL_ADDRESS, (MOCK_WETH_ADDRESS, MOCK_TOKEN_ADDRESS)
+        )
+
+    assert pool_info.tick == -120
+
+
+def test_quote_exact_input_computed_locally():
+    """Test that quotes are computed from cached tick data without calling the quoter."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.wow.uniswap.index.cached_read",
+            return_value=MOCK_TICK_SPACING,
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.uniswap.index.multicall_read",
+            side_effect=_tick_reads,
+        ) as mock_multicall_read,
+        patch(
+            "cdp_agentkit_core.actions.wow.uniswap.index.exact_input_single"
+        ) as mock_exact_input_single,
+    ):
+        buy = quote_exact_input(
+            MOCK_NETWORK_ID,
+            MOCK_POOL_ADDRESS,
+            MOCK_POOL_INFO,
+            MOCK_WETH_ADDRESS,
+            MOCK_TOKEN_ADDRESS,
+            10**18,
+        )
+        sell = quote_exact_input(
+            MOCK_NETWORK_ID,
+            MOCK_POOL_ADDRESS,
+            MOCK_POOL_INFO,
+            MOCK_TOKEN_ADDRESS,
+            MOCK_WETH_ADDRESS,
+            10**18,
+        )
+
+    expected_state = PoolState(
+        sqrt_price_x96=MOCK_SQRT_PRICE_X96,
+        tick=0,
+        liquidity=MOCK_LIQUIDITY,
+        fee=10000,
+        tick_spacing=MOCK_TICK_SPACING,
+        tick_bitmap=MOCK_TICK_BITMAP,
+        liquidity_net=MOCK_LIQUIDITY_NET,
+    )
+    assert buy == swap_exact_input(expected_state, False, 10**18)
+    assert sell == swap_exact_input(expected_state, True, 10**18)
+    assert 0 < buy < 10**18
+    # The bitmap and the initialized ticks are fetched once, then served from the cache.
+    assert mock_multicall_read.call_count == 2
+    mock_exact_input_single.assert_not_called()
+
+
+def test_quote_exact_input_falls_back_to_quoter():
+    """Test that the on-chain quoter is used when tick data cannot be fetched."""
+    with (
+        patch(
+            "cdp_agentkit_core.actions.wow.uniswap.index.cached_read",
+            side_effect=Exception("API error"),
+        ),
+        patch(
+            "cdp_agentkit_core.actions.wow.uniswap.index.exact_input_single",
+            return_value=12345,
+        ) as mock_exact_input_single,
+    ):
+        result = quote_exact_input(
+            MOCK_NETWORK_ID,
+            MOCK_POOL_ADDRESS,
+            MOCK_POOL_INFO,
+            MOCK_WETH_ADDRESS,
+            MOCK_TOKEN_ADDRESS,
+            10**18,
+        )
+
+    assert result == 12345
+    mock_exact_input_single.assert_called_once_with(
+        MOCK_NETWORK_ID, MOCK_WETH_ADDRESS, MOCK_TOKEN_ADDRESS, 10**18, 10000
+    )
+
+
+def test_get_uniswap_quote_restarts_drifted_reads(mock_chain):
+    """Test that tick reads drifting to a new block restart the quote instead of using the quoter."""
+    chain = mock_chain([1000, 1001])
+
+    with patch(
+        "cdp_agentkit_core.actions.wow.uniswap.index.get_pool_address",
+        return_value=MOCK_POOL_ADDRESS,
+    ):
+        quote = get_uniswap_quote(MOCK_NETWORK_ID, MOCK_TOKEN_ADDRESS, 10**18, "buy")
+
+    expected_state = PoolState(
+        sqrt_price_x96=MOCK_SQRT_PRICE_X96,
+        tick=0,
+        liquidity=MOCK_LIQUIDITY,
+        fee=10000,
+        tick_spacing=MOCK_TICK_SPACING,
+        tick_bitmap=MOCK_TICK_BITMAP,
+        liquidity_net=MOCK_LIQUIDITY_NET,
+    )
+    assert quote.amount_out == swap_exact_input(expected_state, False, 10**18)
+    assert "quoteExactInputSingle" not in chain.methods
+    # The pool state is read again in the restarted snapshot.
+    assert chain.methods.count("slot0") == 2
@@ -1,7 +1,93 @@
 import os
 
+import pytest
+
+from cdp_agentkit_core.actions.allowance_ledger import allowance_ledger
+from cdp_agentkit_core.actions.balance_engine import clear_resolved_assets
+from cdp_agentkit_core.actions.nft_index import nft_index
+from cdp_agentkit_core.actions.nonce_manager import nonce_manager
+from cdp_agentkit_core.actions.portfolio import portfolio_store
+from cdp_agentkit_core.actions.pyth.catalog import price_feed_catalog
+from cdp_agentkit_core.actions.pyth.stream import price_stream
+from cdp_agentkit_core.actions.read_cache import read_cache
+from cdp_agentkit_core.actions.snapshot import block_memo
+from cdp_agentkit_core.actions.transaction_tracker import transaction_tracker
+from cdp_agentkit_core.actions.wow.registry import registry_sync, wow_registry
+from cdp_agentkit_core.actions.wow.uniswap.index import clear_tick_data_cache
+
 factory_modules = [
     f[:-3] for f in os.listdir("./tests/factories") if f.endswith(".py") and f != "__init__.py"
 ]
 
 pytest_plugins = [f"tests.factories.{module_name}" for module_name in factory_modules]
+
+
+@pytest.fixture(autouse=True)
+def clear_read_cache():
+    """Clear the process-wide read caches so that tests do not share cached reads."""
+    read_cache.clear()
+    block_memo.clear()
+    clear_tick_data_cache()
+    allowance_ledger.clear()
+    clear_resolved_assets()
+    yield
+    read_cache.clear()
+    block_memo.clear()
+    clear_tick_data_cache()
+    allowance_ledger.clear()
+    clear_resolved_assets()
+
+
+@pytest.fixture(autouse=True)
+def isolate_wow_registry(tmp_path, monkeypatch):
+    """Point the process-wide WOW token registry at an empty database for each test, and forget its syncs."""
+    wow_registry.close()
+    registry_sync.clear()
+    monkeypatch.setattr(wow_registry, "path", tmp_path / "wow_registry.sqlite3")
+    yield wow_registry
+    wow_registry.close()
+    registry_sync.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolate_nft_index(tmp_path, monkeypatch):
+    """Point the process-wide NFT ownership index at an empty database for each test."""
+    nft_index.close()
+    monkeypatch.setattr(nft_index, "path", tmp_path / "nft_index.sqlite3")
+    yield nft_index
+    nft_index.close()
+
+
+@pytest.fixture(autouse=True)
+def isolate_portfolio_store(tmp_path, monkeypatch):
+    """Point the process-wide portfolio store at an empty database for each test."""
+    portfolio_store.close()
+    monkeypatch.setattr(portfolio_store, "path", tmp_path / "portfolio.sqlite3")
+    yield portfolio_store
+    portfolio_store.close()
+
+
+@pytest.fixture(autouse=True)
+def isolate_price_feed_catalog(tmp_path, monkeypatch):
+    """Point the process-wide Pyth price feed catalog at an empty file for each test."""
+    price_feed_catalog.clear()
+    monkeypatch.setattr(price_feed_catalog, "path", tmp_path / "pyth_price_feeds.json")
+    yield price_feed_catalog
+    price_feed_catalog.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolate_price_stream(monkeypatch):
+    """Keep the Pyth price actions from subscribing to the price stream unless a test enables it."""
+    monkeypatch.setattr(price_stream, "auto_subscribe", False)
+    yield price_stream
+    price_stream.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_transaction_tracker(monkeypatch):
+    """Wait for transactions in each test unless it enables submit-and-track mode, and forget nonces in flight."""
+    monkeypatch.setattr(transaction_tracker, "submit_and_track", False)
+    yield transaction_tracker
+    transaction_tracker.clear()
+    nonce_manager.clear()
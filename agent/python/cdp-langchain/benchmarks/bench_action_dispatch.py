@@ -0,0 +1,110 @@
+"""Benchmark the per-call dispatch overhead of CDP tools against the previous dispatch.
+
+Run with `poetry run python benchmarks/bench_action_dispatch.py`. Every registered action is
+called through `CdpTool._run` with valid arguments, with the action function replaced by a stub
+of the same signature, so only the dispatch is timed: validating the arguments, binding them and
+deciding whether to pass the wallet. The previous side instantiates the argument schema, dumps it
+and inspects the function signature on every call, as before the precompiled dispatcher.
+"""
+
+import functools
+import inspect
+import time
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import Mock
+
+from pydantic import BaseModel
+
+from cdp import Wallet
+from cdp_agentkit_core.actions import action_registry
+from cdp_langchain.tools import CdpTool
+from cdp_langchain.utils import CdpAgentkitWrapper
+
+CALLS = 20_000
+REPEATS = 5
+MOCK_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+SAMPLE_VALUES = {str: MOCK_ADDRESS, bool: False, int: 1, dict: {}}
+
+
+def stub(func: Callable[..., str]) -> Callable[..., str]:
+    """Replace an action function with a no-op of the same signature."""
+
+    @functools.wraps(func)
+    def call(*args, **kwargs) -> str:
+        return ""
+
+    return call
+
+
+def sample_arguments(args_schema: type[BaseModel] | None) -> dict[str, Any]:
+    """Build valid arguments for a schema from the defaults and types of its fields."""
+    if args_schema is None:
+        return {}
+
+    arguments = {}
+    for name, field in args_schema.model_fields.items():
+        if not field.is_required():
+            continue
+        annotation = getattr(field.annotation, "__origin__", field.annotation)
+        arguments[name] = SAMPLE_VALUES[annotation]
+    return arguments
+
+
+def previous_run(
+    wallet: Wallet, func: Callable[..., str], args_schema: type[BaseModel] | None, **kwargs
+) -> str:
+    """Dispatch a call as `CdpTool._run` and `CdpAgentkitWrapper.run_action` did before."""
+    if args_schema is not None:
+        parsed_input_args = args_schema(**kwargs).model_dump()
+    else:
+        parsed_input_args = {"instructions": ""}
+
+    first_kwarg = next(iter(inspect.signature(func).parameters.values()), None)
+    if first_kwarg and first_kwarg.annotation is Wallet:
+        return func(wallet, **parsed_input_args)
+    return func(**parsed_input_args)
+
+
+def per_call_us(func: Callable[[], object]) -> float:
+    """Return the best per-call time of several runs of a function, in microseconds."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            func()
+        times.append(time.perf_counter() - start)
+    return min(times) / CALLS * 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    wallet = Mock(spec=Wallet)
+    wrapper = CdpAgentkitWrapper.model_construct(wallet=wallet)
+
+    print(f"{CALLS} calls, best of {REPEATS} runs")
+    for action in action_registry.load_all():
+        func = stub(action.func)
+        arguments = sample_arguments(action.args_schema)
+        tool = CdpTool(
+            name=action.name,
+            description=action.description,
+            cdp_agentkit_wrapper=wrapper,
+            args_schema=action.args_schema,
+            func=func,
+        )
+
+        before = per_call_us(
+            lambda func=func, action=action, arguments=arguments: previous_run(
+                wallet, func, action.args_schema, **arguments
+            )
+        )
+        after = per_call_us(lambda tool=tool, arguments=arguments: tool._run(**arguments))
+        print(
+            f"{action.name:<26} before {before:7.2f} us   after {after:7.2f} us   "
+            f"speedup {before / after:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
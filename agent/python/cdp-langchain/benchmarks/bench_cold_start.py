@@ -0,0 +1,229 @@
+"""Benchmark the cold start of CDP Agentkit processes and check it against stored baselines.
+
+Run with `poetry run python benchmarks/bench_cold_start.py`. Every measurement runs in a fresh
+interpreter, as the chatbot API route spawns a new Python process per request:
+
+- `import:<module>` is the cumulative import time of the module, parsed from `-X importtime`.
+- `create_wallet:<step>` and `import_wallet:<step>` time the steps of `cold_start_scenario.py`
+  against a local stub of the CDP Platform API, with a new wallet and with exported wallet data.
+  `process` is the wall time of the whole interpreter, including start up and shut down.
+
+The median of several runs is compared against `cold_start_baselines.json`, and the script exits
+with status 1 if any metric is slower than its baseline by more than the regression threshold.
+Baselines depend on the machine, so record them with `--update-baselines` on the machine which
+runs the check.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PACKAGE_DIR = BENCHMARKS_DIR.parent
+BASELINES_PATH = BENCHMARKS_DIR / "cold_start_baselines.json"
+SCENARIO_PATH = BENCHMARKS_DIR / "cold_start_scenario.py"
+STUB_BACKEND_PATH = BENCHMARKS_DIR / "stub_cdp_backend.py"
+
+IMPORTED_MODULES = [
+    "cdp_agentkit_core",
+    "cdp_agentkit_core.actions",
+    "cdp_langchain",
+    "cdp_langchain.agent_toolkits",
+    "cdp_langchain.utils",
+]
+REPEATS = 5
+# A metric regresses when it is slower than its baseline by both the relative threshold and the
+# absolute minimum, so that noise on millisecond-scale metrics does not fail the check.
+REGRESSION_THRESHOLD = 0.25
+MIN_REGRESSION_SECONDS = 0.02
+
+
+def parse_importtime(stderr: str, ignored: set[str] = frozenset()) -> dict[str, tuple[int, int]]:
+    """Parse the output of `python -X importtime`.
+
+    Args:
+        stderr: The standard error of the interpreter.
+        ignored: Modules to leave out, such as the modules imported on interpreter start up.
+
+    Returns:
+        dict[str, tuple[int, int]]: The self and cumulative import time in microseconds of each
+            top-level import, keyed by module name, in import order.
+
+    """
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, package = line[len("import time:") :].split("|", 2)
+        # Nested imports are indented by two spaces per level after the leading space.
+        if package.startswith("   "):
+            continue
+        module = package.strip()
+        if module not in ignored:
+            imports[module] = (int(self_us), int(cumulative_us))
+    return imports
+
+
+def startup_modules() -> set[str]:
+    """Get the modules imported by the interpreter before running any code."""
+    result = run_python(["-X", "importtime", "-c", "pass"])
+    return set(parse_importtime(result.stderr))
+
+
+def import_time(module: str, ignored: set[str]) -> float:
+    """Measure the cumulative import time of a module in a fresh interpreter, in seconds."""
+    result = run_python(["-X", "importtime", "-c", f"import {module}"])
+    return (
+        sum(cumulative for _, cumulative in parse_importtime(result.stderr, ignored).values()) / 1e6
+    )
+
+
+def run_scenario(env: dict[str, str]) -> tuple[dict[str, float], str]:
+    """Run the cold start scenario in a fresh interpreter.
+
+    Returns:
+        tuple[dict[str, float], str]: The step durations in seconds, and the exported wallet data.
+
+    """
+    start = time.perf_counter()
+    result = run_python([str(SCENARIO_PATH)], env)
+    process = time.perf_counter() - start
+
+    timings_line, wallet_data = result.stdout.strip().splitlines()[-2:]
+    timings = json.loads(timings_line)
+    timings["process"] = process
+    return timings, wallet_data
+
+
+def run_python(args: list[str], env: dict[str, str] | None = None) -> subprocess.CompletedProcess:
+    """Run the current interpreter, raising with its output if it fails."""
+    result = subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, cwd=PACKAGE_DIR
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr}")
+    return result
+
+
+def start_stub_backend() -> tuple[subprocess.Popen, str]:
+    """Start the stub CDP backend and return the process and its base URL."""
+    process = subprocess.Popen(
+        [sys.executable, str(STUB_BACKEND_PATH)], stdout=subprocess.PIPE, text=True
+    )
+    return process, process.stdout.readline().strip()
+
+
+def scenario_env(base_path: str) -> dict[str, str]:
+    """Build the environment of the scenario, with a throwaway API key for the stub."""
+    private_key = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    env = {key: value for key, value in os.environ.items() if key != "MNEMONIC_PHRASE"}
+    env.update(
+        CDP_API_KEY_NAME="organizations/stub/apiKeys/stub",
+        CDP_API_KEY_PRIVATE_KEY=private_key.decode(),
+        CDP_STUB_BASE_PATH=base_path,
+        NETWORK_ID="base-sepolia",
+    )
+    return env
+
+
+def measure(repeats: int) -> dict[str, float]:
+    """Measure every metric, returning the median of each in seconds."""
+    samples: dict[str, list[float]] = {}
+
+    ignored = startup_modules()
+    for module in IMPORTED_MODULES:
+        # The first run compiles bytecode and warms the file system cache, and is not counted.
+        import_time(module, ignored)
+        samples[f"import:{module}"] = [import_time(module, ignored) for _ in range(repeats)]
+
+    stub_backend, base_path = start_stub_backend()
+    try:
+        env = scenario_env(base_path)
+        _, wallet_data = run_scenario(env)
+        import_env = {**env, "CDP_WALLET_DATA": wallet_data}
+
+        for _ in range(repeats):
+            for scenario, run_env in (("create_wallet", env), ("import_wallet", import_env)):
+                timings, _ = run_scenario(run_env)
+                for step, duration in timings.items():
+                    samples.setdefault(f"{scenario}:{step}", []).append(duration)
+    finally:
+        stub_backend.terminate()
+        stub_backend.wait()
+
+    return {metric: statistics.median(values) for metric, values in samples.items()}
+
+
+def find_regressions(
+    results: dict[str, float],
+    baselines: dict[str, float],
+    threshold: float = REGRESSION_THRESHOLD,
+    min_regression: float = MIN_REGRESSION_SECONDS,
+) -> list[str]:
+    """Find the metrics which are slower than their baseline.
+
+    Args:
+        results: The measured metrics in seconds.
+        baselines: The baseline metrics in seconds.
+        threshold: The allowed slowdown relative to the baseline.
+        min_regression: The allowed slowdown in seconds.
+
+    Returns:
+        list[str]: The names of the regressed metrics.
+
+    """
+    return [
+        metric
+        for metric, value in results.items()
+        if metric in baselines
+        and value > baselines[metric] * (1 + threshold)
+        and value - baselines[metric] > min_regression
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and check it against the baselines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    parser.add_argument(
+        "--update-baselines", action="store_true", help="Store the results as the new baselines."
+    )
+    args = parser.parse_args()
+
+    results = measure(args.repeats)
+    baselines = json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    regressions = find_regressions(results, baselines, args.threshold)
+
+    print(f"Median of {args.repeats} runs, threshold {args.threshold:.0%}")
+    for metric, value in results.items():
+        baseline = baselines.get(metric)
+        comparison = f"baseline {baseline * 1e3:9.1f} ms" if baseline is not None else "new"
+        flag = "  REGRESSION" if metric in regressions else ""
+        print(f"{metric:<40} {value * 1e3:9.1f} ms   {comparison}{flag}")
+
+    if args.update_baselines:
+        args.baselines.write_text(
+            json.dumps({metric: round(value, 4) for metric, value in results.items()}, indent=2)
+            + "\n"
+        )
+        print(f"Stored baselines in {args.baselines}")
+    elif regressions:
+        sys.exit(f"Cold start regressed for {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
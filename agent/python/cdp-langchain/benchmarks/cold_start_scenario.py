@@ -0,0 +1,64 @@
+"""Time the start up of a chatbot process against the stub CDP backend.
+
+This script is run in a fresh interpreter by `bench_cold_start.py` and mirrors
+`initialize_agent` of the chatbot example: it imports the packages, creates the CDP Agentkit
+wrapper, builds the toolkit and creates the LangGraph agent. It prints the duration of each step
+in seconds as JSON, followed by the exported wallet data, on stdout.
+
+The Platform API base URL is read from `CDP_STUB_BASE_PATH`, and an existing wallet is imported
+when `CDP_WALLET_DATA` is set, as the chatbot does with `wallet_data.txt`.
+"""
+
+import time
+
+_start = time.perf_counter()
+
+import json  # noqa: E402
+import os  # noqa: E402
+
+from langchain_openai import ChatOpenAI  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.prebuilt import create_react_agent  # noqa: E402
+
+from cdp import Cdp  # noqa: E402
+from cdp_langchain.agent_toolkits import CdpToolkit  # noqa: E402
+from cdp_langchain.utils import CdpAgentkitWrapper  # noqa: E402
+
+STATE_MODIFIER = "You are a blockchain agent with access to CDP tools."
+
+
+def main() -> None:
+    """Run the start up steps and print their durations."""
+    timings = {"imports": time.perf_counter() - _start}
+
+    # The wrapper always configures the SDK for the production API, so point it at the stub.
+    configure = Cdp.configure
+    Cdp.configure = lambda **kwargs: configure(
+        **kwargs, base_path=os.environ["CDP_STUB_BASE_PATH"], max_network_retries=0
+    )
+
+    values = {}
+    if os.environ.get("CDP_WALLET_DATA"):
+        values["cdp_wallet_data"] = os.environ["CDP_WALLET_DATA"]
+
+    step = time.perf_counter()
+    agentkit = CdpAgentkitWrapper(**values)
+    wallet_data = agentkit.export_wallet()
+    timings["wrapper"] = time.perf_counter() - step
+
+    step = time.perf_counter()
+    tools = CdpToolkit.from_cdp_agentkit_wrapper(agentkit).get_tools()
+    timings["toolkit"] = time.perf_counter() - step
+
+    step = time.perf_counter()
+    llm = ChatOpenAI(api_key="stub", base_url=os.environ["CDP_STUB_BASE_PATH"])
+    create_react_agent(llm, tools=tools, checkpointer=MemorySaver(), state_modifier=STATE_MODIFIER)
+    timings["agent"] = time.perf_counter() - step
+
+    timings["total"] = time.perf_counter() - _start
+    print(json.dumps(timings))
+    print(wallet_data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Local stub of the CDP Platform API endpoints used to create and import a wallet.
+
+Run with `python benchmarks/stub_cdp_backend.py [port]`. The server prints its base URL on the
+first line of stdout once it accepts connections, and keeps wallets and addresses in memory, so a
+wallet created by one benchmark run can be imported by the next. Addresses are derived from the
+public key sent by the SDK, so they match the wallet's own key derivation.
+"""
+
+import json
+import re
+import sys
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_keys import keys
+
+NETWORK_ID = "base-sepolia"
+FEATURE_SET = {
+    "faucet": True,
+    "server_signer": False,
+    "transfer": True,
+    "trade": False,
+    "stake": False,
+    "gasless_send": True,
+}
+
+WALLETS_PATH = re.compile(r"^/v1/wallets$")
+WALLET_PATH = re.compile(r"^/v1/wallets/(?P<wallet_id>[^/]+)$")
+ADDRESSES_PATH = re.compile(r"^/v1/wallets/(?P<wallet_id>[^/]+)/addresses$")
+
+
+class StubCdpBackend:
+    """In-memory wallets and addresses served by the stub."""
+
+    def __init__(self):
+        self.wallets: dict[str, dict] = {}
+        self.addresses: dict[str, list[dict]] = {}
+
+    def create_wallet(self, request: dict) -> dict:
+        """Create a wallet without addresses."""
+        wallet_id = str(uuid.uuid4())
+        self.wallets[wallet_id] = {
+            "id": wallet_id,
+            "network_id": request.get("wallet", {}).get("network_id", NETWORK_ID),
+            "feature_set": FEATURE_SET,
+        }
+        self.addresses[wallet_id] = []
+        return self.wallets[wallet_id]
+
+    def create_address(self, wallet_id: str, request: dict) -> dict:
+        """Create an address for the public key of the request."""
+        public_key = keys.PublicKey.from_compressed_bytes(bytes.fromhex(request["public_key"]))
+        address = {
+            "wallet_id": wallet_id,
+            "network_id": self.wallets[wallet_id]["network_id"],
+            "public_key": request["public_key"],
+            "address_id": public_key.to_checksum_address(),
+            "index": request.get("address_index", len(self.addresses[wallet_id])),
+        }
+        self.addresses[wallet_id].append(address)
+        self.wallets[wallet_id].setdefault("default_address", address)
+        return address
+
+    def list_addresses(self, wallet_id: str) -> dict:
+        """List the addresses of a wallet."""
+        data = self.addresses[wallet_id]
+        return {"data": data, "has_more": False, "next_page": "", "total_count": len(data)}
+
+
+class StubCdpRequestHandler(BaseHTTPRequestHandler):
+    """Routes Platform API requests to the backend of the server."""
+
+    backend = StubCdpBackend()
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Fetch a wallet or list its addresses."""
+        path = self._path()
+        if (match := WALLET_PATH.match(path)) and match["wallet_id"] in self.backend.wallets:
+            self._respond(200, self.backend.wallets[match["wallet_id"]])
+        elif (match := ADDRESSES_PATH.match(path)) and match["wallet_id"] in self.backend.wallets:
+            self._respond(200, self.backend.list_addresses(match["wallet_id"]))
+        else:
+            self._respond(404, {"code": "not_found", "message": f"Unknown path {path}"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Create a wallet or an address."""
+        path = self._path()
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if WALLETS_PATH.match(path):
+            self._respond(200, self.backend.create_wallet(request))
+        elif (match := ADDRESSES_PATH.match(path)) and match["wallet_id"] in self.backend.wallets:
+            self._respond(200, self.backend.create_address(match["wallet_id"], request))
+        else:
+            self._respond(404, {"code": "not_found", "message": f"Unknown path {path}"})
+
+    def log_message(self, format: str, *args) -> None:
+        """Silence request logging."""
+
+    def _path(self) -> str:
+        return self.path.split("?", 1)[0]
+
+    def _respond(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def main() -> None:
+    """Serve the stub until the process is terminated."""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubCdpRequestHandler)
+    print(f"http://127.0.0.1:{server.server_port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
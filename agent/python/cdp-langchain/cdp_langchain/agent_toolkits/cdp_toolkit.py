@@ -1,9 +1,11 @@
 """CDP Toolkit."""
 
+from functools import partial
+
 from langchain_core.tools import BaseTool
 from langchain_core.tools.base import BaseToolkit
 
-from cdp_agentkit_core.actions import CDP_ACTIONS
+from cdp_agentkit_core.actions import ActionSpec, action_registry
 from cdp_langchain.tools import CdpTool
 from cdp_langchain.utils import CdpAgentkitWrapper
 
@@ -42,6 +44,9 @@ class CdpToolkit(BaseToolkit):
             cdp = CdpAgentkitWrapper()
             cdp_toolkit = CdpToolkit.from_cdp_agentkit_wrapper(cdp)
 
+            # Or only import the actions that are needed
+            cdp_toolkit = CdpToolkit.from_cdp_agentkit_wrapper(cdp, ["get_balance", "transfer"])
+
     Tools:
         .. code-block:: python
 
@@ -117,31 +122,53 @@ class CdpToolkit(BaseToolkit):
     tools: list[BaseTool] = []  # noqa: RUF012
 
     @classmethod
-    def from_cdp_agentkit_wrapper(cls, cdp_agentkit_wrapper: CdpAgentkitWrapper) -> "CdpToolkit":
+    def from_cdp_agentkit_wrapper(
+        cls, cdp_agentkit_wrapper: CdpAgentkitWrapper, actions: list[str] | None = None
+    ) -> "CdpToolkit":
         """Create a CdpToolkit from a CdpAgentkitWrapper.
 
         Args:
             cdp_agentkit_wrapper: CdpAgentkitWrapper. The CDP Agentkit wrapper.
+            actions: Optional[List[str]]. The names of the actions to include. Defaults to all
+                registered actions. Actions described by their spec are only imported when
+                their tool is first run.
 
         Returns:
             CdpToolkit. The CDP toolkit.
 
         """
-        actions = CDP_ACTIONS
-
-        tools = [
-            CdpTool(
-                name=action.name,
-                description=action.description,
-                cdp_agentkit_wrapper=cdp_agentkit_wrapper,
-                args_schema=action.args_schema,
-                func=action.func,
-            )
-            for action in actions
-        ]
+        if actions is None:
+            specs = action_registry.specs()
+        else:
+            specs = [action_registry.spec(name) for name in actions]
+
+        tools = [_action_tool(cdp_agentkit_wrapper, spec) for spec in specs]
 
         return cls(tools=tools)  # type: ignore[arg-type]
 
     def get_tools(self) -> list[BaseTool]:
         """Get the tools in the toolkit."""
         return self.tools
+
+
+def _action_tool(cdp_agentkit_wrapper: CdpAgentkitWrapper, spec: ActionSpec) -> CdpTool:
+    if spec.has_metadata:
+        return CdpTool(
+            name=spec.name,
+            description=spec.description,
+            cdp_agentkit_wrapper=cdp_agentkit_wrapper,
+            args_schema=spec.args_schema,
+            read_only=spec.read_only,
+            action_loader=partial(action_registry.get, spec.name),
+        )
+
+    action = action_registry.get(spec.name)
+    return CdpTool(
+        name=action.name,
+        description=action.description,
+        cdp_agentkit_wrapper=cdp_agentkit_wrapper,
+        args_schema=action.args_schema,
+        func=action.func,
+        coroutine=action.coroutine,
+        read_only=action.read_only,
+    )
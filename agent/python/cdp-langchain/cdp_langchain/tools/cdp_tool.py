@@ -7,24 +7,34 @@ To use this tool, you must first set as environment variables:
 
 """
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel
 
+from cdp_agentkit_core.actions import CdpAction
+from cdp_langchain.utils.action_dispatcher import compile_action
 from cdp_langchain.utils.cdp_agentkit_wrapper import CdpAgentkitWrapper
 
 
 class CdpTool(BaseTool):  # type: ignore[override]
-    """Tool for interacting with the CDP SDK."""
+    """Tool for interacting with the CDP SDK.
+
+    A tool built from the metadata of an action, with its arguments as a JSON schema and an
+    `action_loader` instead of a `func`, imports the action when it is first run.
+    """
 
     cdp_agentkit_wrapper: CdpAgentkitWrapper
     name: str = ""
     description: str = ""
-    args_schema: type[BaseModel] | None = None
-    func: Callable[..., str]
+    args_schema: type[BaseModel] | dict[str, Any] | None = None
+    func: Callable[..., str] | None = None
+    coroutine: Callable[..., Awaitable[str]] | None = None
+    # Read-only tools run on any signer of a wallet pool, without waiting for writes.
+    read_only: bool = False
+    action_loader: Callable[[], CdpAction] | None = None
 
     def _run(
         self,
@@ -33,12 +43,48 @@ class CdpTool(BaseTool):  # type: ignore[override]
         **kwargs: Any,
     ) -> str:
         """Use the CDP SDK to run an operation."""
+        self._load_action()
+        parsed_input_args = self._parse_input_args(self.func, instructions, kwargs)
+        if self.read_only:
+            return self.cdp_agentkit_wrapper.run_read_action(self.func, **parsed_input_args)
+        return self.cdp_agentkit_wrapper.run_action(self.func, **parsed_input_args)
+
+    async def _arun(
+        self,
+        instructions: str | None = "",
+        run_manager: AsyncCallbackManagerForToolRun | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """Use the CDP SDK to run an operation, natively if the action has a coroutine."""
+        self._load_action()
+        if self.coroutine is None:
+            # Run the blocking action in a worker thread.
+            return await super()._arun(instructions, run_manager=run_manager, **kwargs)
+
+        parsed_input_args = self._parse_input_args(self.coroutine, instructions, kwargs)
+        if self.read_only:
+            return await self.cdp_agentkit_wrapper.arun_read_action(
+                self.coroutine, **parsed_input_args
+            )
+        return await self.cdp_agentkit_wrapper.arun_action(self.coroutine, **parsed_input_args)
+
+    def _load_action(self) -> None:
+        if self.func is not None:
+            return
+        if self.action_loader is None:
+            raise ValueError(f"Tool {self.name} has neither a func nor an action loader")
+        action = self.action_loader()
+        # The validating model replaces the JSON schema the tool was described with.
+        self.args_schema = action.args_schema
+        self.coroutine = action.coroutine
+        self.func = action.func
+
+    def _parse_input_args(
+        self, func: Callable[..., Any], instructions: str | None, kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
         if not instructions or instructions == "{}":
             # Catch other forms of empty input that GPT-4 likes to send.
             instructions = ""
         if self.args_schema is not None:
-            validated_input_data = self.args_schema(**kwargs)
-            parsed_input_args = validated_input_data.model_dump()
-        else:
-            parsed_input_args = {"instructions": instructions}
-        return self.cdp_agentkit_wrapper.run_action(self.func, **parsed_input_args)
+            return compile_action(func, self.args_schema).validate(kwargs)
+        return {"instructions": instructions}
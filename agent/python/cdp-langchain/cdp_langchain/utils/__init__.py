@@ -1,5 +1,17 @@
 """**Utilities** are the integration wrappers that LangChain uses to interact with third-party systems and packages."""
 
+from cdp_langchain.utils.action_dispatcher import CompiledAction, compile_action
 from cdp_langchain.utils.cdp_agentkit_wrapper import CdpAgentkitWrapper
+from cdp_langchain.utils.lazy_wallet import LazyWallet, WalletCache, WalletMetadata
+from cdp_langchain.utils.wallet_pool import AddressWallet, WalletPool
 
-__all__ = ["CdpAgentkitWrapper"]
+__all__ = [
+    "AddressWallet",
+    "CdpAgentkitWrapper",
+    "CompiledAction",
+    "LazyWallet",
+    "WalletCache",
+    "WalletMetadata",
+    "WalletPool",
+    "compile_action",
+]
@@ -0,0 +1,105 @@
+"""Precompiled dispatch of CDP actions.
+
+Everything about calling an action which does not depend on its arguments is computed once per
+action function and argument schema: whether the wallet is injected as the first argument, the
+pydantic validator of the schema and how validated arguments are bound to keyword arguments.
+"""
+
+import dataclasses
+import inspect
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, get_args
+
+from pydantic import BaseModel, TypeAdapter
+
+from cdp import Wallet
+
+MAX_COMPILED_ACTIONS = 1024
+
+
+@dataclass(frozen=True)
+class CompiledAction:
+    """An action function with its precomputed dispatch."""
+
+    func: Callable[..., str | Awaitable[str]]
+    injects_wallet: bool
+    validator: TypeAdapter | None = None
+    flat_arguments: bool = True
+
+    def validate(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Validate arguments against the schema of the action.
+
+        Args:
+            arguments: The raw arguments of the action.
+
+        Returns:
+            dict[str, Any]: The validated keyword arguments of the action function.
+
+        Raises:
+            ValidationError: If the arguments do not match the schema.
+
+        """
+        if self.validator is None:
+            return arguments
+
+        validated = self.validator.validate_python(arguments)
+        if self.flat_arguments:
+            # Without nested models, the fields are the same as `model_dump()` would return.
+            return dict(validated.__dict__)
+        return validated.model_dump()
+
+    def call(self, wallet: Wallet | None, arguments: dict[str, Any]) -> str | Awaitable[str]:
+        """Call the action function with validated arguments.
+
+        Args:
+            wallet: The wallet, which is passed if the function takes it as its first argument.
+            arguments: The keyword arguments of the action function.
+
+        Returns:
+            str | Awaitable[str]: The result of the action, which is awaitable for coroutines.
+
+        """
+        if self.injects_wallet:
+            return self.func(wallet, **arguments)
+        return self.func(**arguments)
+
+    def __call__(self, wallet: Wallet | None, arguments: dict[str, Any]) -> str | Awaitable[str]:
+        """Validate arguments and call the action function."""
+        return self.call(wallet, self.validate(arguments))
+
+
+@lru_cache(maxsize=MAX_COMPILED_ACTIONS)
+def compile_action(
+    func: Callable[..., str | Awaitable[str]], args_schema: type[BaseModel] | None = None
+) -> CompiledAction:
+    """Compile the dispatch of an action, once per function and argument schema.
+
+    Args:
+        func: The action function or coroutine function.
+        args_schema: The pydantic model of the action arguments, if any.
+
+    Returns:
+        CompiledAction: The compiled action.
+
+    """
+    first_parameter = next(iter(inspect.signature(func).parameters.values()), None)
+    injects_wallet = first_parameter is not None and first_parameter.annotation is Wallet
+
+    if args_schema is None:
+        return CompiledAction(func, injects_wallet)
+
+    # Extra fields are not stored in the model's `__dict__`, and nested models must be dumped.
+    flat_arguments = args_schema.model_config.get("extra") != "allow" and not any(
+        _contains_model(field.annotation) for field in args_schema.model_fields.values()
+    )
+    return CompiledAction(func, injects_wallet, TypeAdapter(args_schema), flat_arguments)
+
+
+def _contains_model(annotation: Any) -> bool:
+    if isinstance(annotation, type) and (
+        issubclass(annotation, BaseModel) or dataclasses.is_dataclass(annotation)
+    ):
+        return True
+    return any(_contains_model(argument) for argument in get_args(annotation))
@@ -1,25 +1,32 @@
 """Util that calls CDP."""
 
-import inspect
 import json
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from langchain_core.utils import get_from_dict_or_env
 from pydantic import BaseModel, model_validator
 
-from cdp import MnemonicSeedPhrase, Wallet
+from cdp import MnemonicSeedPhrase
 from cdp_langchain import __version__
 from cdp_langchain.constants import CDP_LANGCHAIN_DEFAULT_SOURCE
+from cdp_langchain.utils.action_dispatcher import compile_action
+from cdp_langchain.utils.lazy_wallet import LazyWallet, WalletCache, WalletMetadata
+from cdp_langchain.utils.wallet_pool import WalletPool
+
+WALLET_HYDRATION_MODES = ("eager", "lazy", "background")
 
 
 class CdpAgentkitWrapper(BaseModel):
     """Wrapper for CDP Agentkit Core."""
 
     wallet: Any = None  #: :meta private:
+    wallet_pool: Any = None  #: :meta private:
     cdp_api_key_name: str | None = None
     cdp_api_key_private_key: str | None = None
     network_id: str | None = None
+    wallet_hydration: str = "eager"
+    wallet_cache_file: str | None = None
 
     @model_validator(mode="before")
     @classmethod
@@ -32,6 +39,21 @@ class CdpAgentkitWrapper(BaseModel):
         mnemonic_phrase = get_from_dict_or_env(values, "mnemonic_phrase", "MNEMONIC_PHRASE", "")
         network_id = get_from_dict_or_env(values, "network_id", "NETWORK_ID", "base-sepolia")
         wallet_data_json = values.get("cdp_wallet_data")
+        wallet_pool_data_json = values.get("cdp_wallet_pool_data")
+        wallet_pool_size = int(
+            get_from_dict_or_env(values, "wallet_pool_size", "CDP_WALLET_POOL_SIZE", "1")
+        )
+        wallet_hydration = get_from_dict_or_env(
+            values, "wallet_hydration", "CDP_WALLET_HYDRATION", "eager"
+        ).lower()
+        if wallet_hydration not in WALLET_HYDRATION_MODES:
+            raise ValueError(
+                f"Invalid wallet hydration {wallet_hydration}, must be one of "
+                f"{', '.join(WALLET_HYDRATION_MODES)}"
+            )
+        wallet_cache_file = (
+            get_from_dict_or_env(values, "wallet_cache_file", "CDP_WALLET_CACHE_FILE", "") or None
+        )
 
         try:
             from cdp import Cdp, Wallet, WalletData
@@ -47,20 +69,45 @@ class CdpAgentkitWrapper(BaseModel):
             source_version=__version__,
         )
 
-        if wallet_data_json:
-            wallet_data = WalletData.from_dict(json.loads(wallet_data_json))
-            wallet = Wallet.import_data(wallet_data)
-        elif mnemonic_phrase:
-            phrase = MnemonicSeedPhrase(mnemonic_phrase)
-            wallet = Wallet.import_wallet(phrase, network_id)
+        wallet_pool = None
+        if wallet_pool_data_json:
+            # A pool of separate wallets, the first of which is the main wallet.
+            wallet_pool = WalletPool(
+                [
+                    Wallet.import_data(WalletData.from_dict(wallet_data))
+                    for wallet_data in json.loads(wallet_pool_data_json)
+                ]
+            )
+            wallet = wallet_pool.signers[0]
         else:
-            wallet = Wallet.create(network_id=network_id)
+            wallet_data_dict = json.loads(wallet_data_json) if wallet_data_json else None
+
+            def load_wallet() -> Wallet:
+                if wallet_data_dict is not None:
+                    return Wallet.import_data(WalletData.from_dict(wallet_data_dict))
+                if mnemonic_phrase:
+                    return Wallet.import_wallet(MnemonicSeedPhrase(mnemonic_phrase), network_id)
+                return Wallet.create(network_id=network_id)
+
+            if wallet_hydration == "eager" or wallet_pool_size > 1:
+                # A pool of addresses is built from the addresses of the hydrated wallet.
+                wallet = load_wallet()
+            else:
+                wallet = _lazy_wallet(load_wallet, wallet_data_dict, wallet_cache_file)
+                if wallet_hydration == "background":
+                    wallet.hydrate_in_background()
+
+        if wallet_pool is None and wallet_pool_size > 1:
+            wallet_pool = WalletPool.from_addresses(wallet, wallet_pool_size)
 
         values["wallet"] = wallet
+        values["wallet_pool"] = wallet_pool
         values["cdp_api_key_name"] = cdp_api_key_name
         values["cdp_api_key_private_key"] = cdp_api_key_private_key
         values["mnemonic_phrase"] = mnemonic_phrase
         values["network_id"] = network_id
+        values["wallet_hydration"] = wallet_hydration
+        values["wallet_cache_file"] = wallet_cache_file
 
         return values
 
@@ -77,13 +124,89 @@ class CdpAgentkitWrapper(BaseModel):
 
         return json.dumps(wallet_data_dict)
 
-    def run_action(self, func: Callable[..., str], **kwargs) -> str:
-        """Run a CDP Action."""
-        func_signature = inspect.signature(func)
+    def save_wallet(self, path: str) -> bool:
+        """Save the exported wallet data to a file, unless the file already holds it.
 
-        first_kwarg = next(iter(func_signature.parameters.values()), None)
+        A lazily hydrated wallet imported from wallet data is exported without hydrating it, so
+        saving an unchanged wallet makes no request and writes nothing.
 
-        if first_kwarg and first_kwarg.annotation is Wallet:
-            return func(self.wallet, **kwargs)
-        else:
-            return func(**kwargs)
+        Args:
+            path: The path of the wallet data file.
+
+        Returns:
+            bool: Whether the file was written.
+
+        """
+        wallet_data = self.export_wallet()
+        try:
+            with open(path) as f:
+                if json.loads(f.read()) == json.loads(wallet_data):
+                    return False
+        except (OSError, ValueError):
+            pass
+
+        with open(path, "w") as f:
+            f.write(wallet_data)
+        return True
+
+    def run_action(self, func: Callable[..., str], **kwargs) -> str:
+        """Run a CDP Action, on the least busy signer of the wallet pool if there is one."""
+        compiled = compile_action(func)
+        if self.wallet_pool is None or not compiled.injects_wallet:
+            return compiled.call(self.wallet, kwargs)
+
+        with self.wallet_pool.write_signer() as wallet:
+            return compiled.call(wallet, kwargs)
+
+    def run_read_action(self, func: Callable[..., str], **kwargs) -> str:
+        """Run a read-only CDP Action, on any signer of the wallet pool if there is one."""
+        wallet = self.wallet if self.wallet_pool is None else self.wallet_pool.read_signer()
+        return compile_action(func).call(wallet, kwargs)
+
+    async def arun_action(self, coroutine: Callable[..., Awaitable[str]], **kwargs) -> str:
+        """Run the async implementation of a CDP Action."""
+        compiled = compile_action(coroutine)
+        if self.wallet_pool is None or not compiled.injects_wallet:
+            return await compiled.call(self.wallet, kwargs)
+
+        async with self.wallet_pool.awrite_signer() as wallet:
+            return await compiled.call(wallet, kwargs)
+
+    async def arun_read_action(self, coroutine: Callable[..., Awaitable[str]], **kwargs) -> str:
+        """Run the async implementation of a read-only CDP Action."""
+        wallet = self.wallet if self.wallet_pool is None else self.wallet_pool.read_signer()
+        return await compile_action(coroutine).call(wallet, kwargs)
+
+
+def _lazy_wallet(
+    load_wallet: Callable[[], Any],
+    wallet_data: dict[str, str] | None,
+    wallet_cache_file: str | None,
+) -> LazyWallet:
+    cache = WalletCache(wallet_cache_file) if wallet_cache_file else None
+
+    metadata = None
+    if wallet_data is not None:
+        wallet_id = wallet_data.get("wallet_id") or wallet_data.get("walletId")
+        metadata = (cache.load(wallet_id) if cache is not None else None) or WalletMetadata(
+            wallet_id
+        )
+        metadata.network_id = (
+            wallet_data.get("network_id") or wallet_data.get("networkId") or metadata.network_id
+        )
+        metadata.default_address_id = (
+            wallet_data.get("default_address_id") or metadata.default_address_id
+        )
+
+    def store_metadata(wallet: Any) -> None:
+        try:
+            cache.store(WalletMetadata.from_wallet(wallet))
+        except Exception as e:
+            print(f"Error updating wallet cache {cache.path}: {e!s}")
+
+    return LazyWallet(
+        load_wallet,
+        metadata=metadata,
+        wallet_data=wallet_data,
+        on_hydrate=store_metadata if cache is not None else None,
+    )
@@ -0,0 +1,229 @@
+"""A wallet which is hydrated from the CDP API on first use.
+
+Importing or creating a wallet takes several round trips to the CDP API, which dominate the start
+up of short lived agent processes. A `LazyWallet` defers them until the wallet is first used, or
+runs them in a background thread. Until then, its ID, network, default address ID and address IDs
+come from the wallet data it is imported from and from a local `WalletCache` file, which is
+updated after each hydration.
+"""
+
+import json
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from cdp import Wallet, WalletData
+
+
+@dataclass
+class WalletMetadata:
+    """Metadata of a wallet which is known without importing it."""
+
+    wallet_id: str
+    network_id: str | None = None
+    default_address_id: str | None = None
+    address_ids: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_wallet(cls, wallet: Wallet) -> "WalletMetadata":
+        """Get the metadata of a hydrated wallet."""
+        return cls(
+            wallet_id=wallet.id,
+            network_id=wallet.network_id,
+            default_address_id=wallet.default_address.address_id,
+            address_ids=[address.address_id for address in wallet.addresses],
+        )
+
+
+class WalletCache:
+    """A JSON file of wallet metadata, keyed by wallet ID."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self, wallet_id: str) -> WalletMetadata | None:
+        """Load the cached metadata of a wallet.
+
+        Args:
+            wallet_id: The ID of the wallet.
+
+        Returns:
+            WalletMetadata | None: The metadata, or None if the wallet is not cached.
+
+        """
+        entry = self._read().get(wallet_id)
+        return WalletMetadata(wallet_id=wallet_id, **entry) if entry is not None else None
+
+    def store(self, metadata: WalletMetadata) -> bool:
+        """Store the metadata of a wallet, unless the file already holds it.
+
+        Args:
+            metadata: The metadata of the wallet.
+
+        Returns:
+            bool: Whether the file was written.
+
+        """
+        entry = asdict(metadata)
+        wallet_id = entry.pop("wallet_id")
+        with self._lock:
+            wallets = self._read()
+            if wallets.get(wallet_id) == entry:
+                return False
+
+            wallets[wallet_id] = entry
+            # Write a temporary file first, so that concurrent processes never read a partial file.
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w") as f:
+                json.dump(wallets, f, indent=2, sort_keys=True)
+            os.replace(temporary_path, self.path)
+            return True
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Error reading wallet cache {self.path}: {e!s}")
+            return {}
+
+
+class LazyWallet:
+    """A wallet which is imported or created on first use, and stands in for it until then.
+
+    Attributes which the metadata answers are served without hydrating the wallet. Every other
+    attribute hydrates the wallet and is read from it.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Wallet],
+        metadata: WalletMetadata | None = None,
+        wallet_data: dict[str, str] | None = None,
+        on_hydrate: Callable[[Wallet], None] | None = None,
+    ):
+        self._load = load
+        self._metadata = metadata
+        self._wallet_data = wallet_data
+        self._on_hydrate = on_hydrate
+        self._wallet: Wallet | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def hydrated(self) -> bool:
+        """Whether the wallet was imported or created."""
+        return self._wallet is not None
+
+    def hydrate(self) -> Wallet:
+        """Import or create the wallet, once.
+
+        Returns:
+            Wallet: The hydrated wallet.
+
+        """
+        if self._wallet is None:
+            with self._lock:
+                if self._wallet is None:
+                    wallet = self._load()
+                    if self._on_hydrate is not None:
+                        self._on_hydrate(wallet)
+                    self._wallet = wallet
+        return self._wallet
+
+    def hydrate_in_background(self) -> threading.Thread:
+        """Start hydrating the wallet in a daemon thread.
+
+        If it fails, the error is printed and the wallet is hydrated again on first use.
+
+        Returns:
+            threading.Thread: The hydrating thread.
+
+        """
+
+        def hydrate() -> None:
+            try:
+                self.hydrate()
+            except Exception as e:
+                print(f"Error hydrating wallet in the background: {e!s}")
+
+        thread = threading.Thread(target=hydrate, name="cdp-wallet-hydration", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def id(self) -> str:
+        """Get the ID of the wallet."""
+        if self._wallet is None and self._metadata is not None:
+            return self._metadata.wallet_id
+        return self.hydrate().id
+
+    @property
+    def network_id(self) -> str:
+        """Get the network ID of the wallet."""
+        if self._wallet is None and self._metadata is not None and self._metadata.network_id:
+            return self._metadata.network_id
+        return self.hydrate().network_id
+
+    @property
+    def default_address(self) -> Any:
+        """Get the default address of the wallet, which is hydrated when more than its ID is used."""
+        if (
+            self._wallet is None
+            and self._metadata is not None
+            and self._metadata.default_address_id
+        ):
+            return _LazyAddress(self, self._metadata.default_address_id)
+        return self.hydrate().default_address
+
+    @property
+    def address_ids(self) -> list[str]:
+        """Get the IDs of the addresses of the wallet."""
+        if self._wallet is None and self._metadata is not None and self._metadata.address_ids:
+            return list(self._metadata.address_ids)
+        return [address.address_id for address in self.hydrate().addresses]
+
+    def export_data(self) -> WalletData:
+        """Export the data required to re-instantiate the wallet, without hydrating it if possible."""
+        if self._wallet is None and self._wallet_data is not None:
+            return WalletData.from_dict(self._wallet_data)
+        return self.hydrate().export_data()
+
+    def __getattr__(self, name: str) -> Any:
+        """Get an attribute of the hydrated wallet."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.hydrate(), name)
+
+    def __repr__(self) -> str:
+        """Get the representation of the wallet, without hydrating it."""
+        if self._wallet is not None:
+            return repr(self._wallet)
+        wallet_id = self._metadata.wallet_id if self._metadata is not None else None
+        return f"LazyWallet(wallet_id={wallet_id!r}, hydrated=False)"
+
+
+class _LazyAddress:
+    def __init__(self, wallet: LazyWallet, address_id: str):
+        self._wallet = wallet
+        self.address_id = address_id
+
+    @property
+    def wallet_id(self) -> str:
+        return self._wallet.id
+
+    @property
+    def network_id(self) -> str:
+        return self._wallet.network_id
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._wallet.hydrate().default_address, name)
+
+    def __repr__(self) -> str:
+        return f"WalletAddress(address_id={self.address_id!r}, hydrated=False)"
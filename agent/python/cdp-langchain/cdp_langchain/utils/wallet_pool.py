@@ -0,0 +1,150 @@
+"""A pool of signers to submit transactions from in parallel.
+
+Every address has its own nonce sequence, so transactions from one address are submitted one
+after the other. A pool spreads write actions over several signers, which are either separate
+wallets or the addresses of one wallet: each write runs on the least busy signer, and writes on
+the same signer are serialized. Read actions run on any signer without waiting for writes.
+"""
+
+import asyncio
+import itertools
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from cdp import Wallet, WalletAddress
+
+# Number of seconds a worker thread waits for a signer lock before checking for cancellation.
+LOCK_POLL_INTERVAL = 0.1
+
+
+class AddressWallet(Wallet):
+    """A view of a wallet which acts from one of its addresses instead of the default address."""
+
+    def __init__(self, wallet: Wallet, address: WalletAddress):
+        # Share the state of the wallet, so that its seed and addresses are not loaded again.
+        self.__dict__.update(wallet.__dict__)
+        self._signer_address = address
+
+    @property
+    def default_address(self) -> WalletAddress:
+        """Get the address this view acts from."""
+        return self._signer_address
+
+
+class WalletPool:
+    """Routes actions to a pool of signers, serializing the writes of each signer."""
+
+    def __init__(self, signers: list[Wallet]):
+        if not signers:
+            raise ValueError("A wallet pool needs at least one signer")
+
+        self.signers = list(signers)
+        self._signer_locks = [threading.Lock() for _ in self.signers]
+        self._busy = [0] * len(self.signers)
+        self._lock = threading.Lock()
+        self._next_write = itertools.count()
+        self._next_read = itertools.count()
+
+    @classmethod
+    def from_addresses(cls, wallet: Wallet, size: int) -> "WalletPool":
+        """Create a pool from the first addresses of a wallet, creating addresses as needed.
+
+        Args:
+            wallet: The wallet, which must be able to sign with all of its addresses.
+            size: The number of addresses in the pool.
+
+        Returns:
+            WalletPool: The pool, with the default address of the wallet first.
+
+        """
+        default_address_id = wallet.default_address.address_id
+        addresses = [
+            address for address in wallet.addresses if address.address_id != default_address_id
+        ]
+        while len(addresses) < size - 1:
+            addresses.append(wallet.create_address())
+        return cls([wallet, *(AddressWallet(wallet, address) for address in addresses[: size - 1])])
+
+    @property
+    def size(self) -> int:
+        """Get the number of signers in the pool."""
+        return len(self.signers)
+
+    def busy(self) -> list[int]:
+        """Get the number of writes running or waiting on each signer."""
+        with self._lock:
+            return list(self._busy)
+
+    def read_signer(self) -> Wallet:
+        """Get a signer to run a read action with, in turn."""
+        return self.signers[next(self._next_read) % len(self.signers)]
+
+    @contextmanager
+    def write_signer(self) -> Iterator[Wallet]:
+        """Reserve the least busy signer to run a write action with.
+
+        Yields:
+            Wallet: The signer, which runs no other write until the context exits.
+
+        """
+        index = self._reserve()
+        self._signer_locks[index].acquire()
+        try:
+            yield self.signers[index]
+        finally:
+            self._signer_locks[index].release()
+            self._release(index)
+
+    @asynccontextmanager
+    async def awrite_signer(self) -> AsyncIterator[Wallet]:
+        """Reserve the least busy signer to run an async write action with.
+
+        Yields:
+            Wallet: The signer, which runs no other write until the context exits.
+
+        """
+        index = self._reserve()
+        lock = self._signer_locks[index]
+        try:
+            while not await _acquire_off_loop(lock):
+                pass
+        except BaseException:
+            self._release(index)
+            raise
+        try:
+            yield self.signers[index]
+        finally:
+            self._signer_locks[index].release()
+            self._release(index)
+
+    def _reserve(self) -> int:
+        with self._lock:
+            # Ties are broken in turn, so that idle signers are used evenly.
+            start = next(self._next_write) % len(self.signers)
+            order = [(start + offset) % len(self.signers) for offset in range(len(self.signers))]
+            index = min(order, key=lambda candidate: self._busy[candidate])
+            self._busy[index] += 1
+            return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._busy[index] -= 1
+
+
+async def _acquire_off_loop(lock: threading.Lock) -> bool:
+    if lock.acquire(blocking=False):
+        return True
+    # The lock is shared with blocking writes, so it is waited for off the event loop, for a
+    # short time only, so that a cancelled waiter does not hold a worker thread for long.
+    acquire = asyncio.ensure_future(asyncio.to_thread(lock.acquire, timeout=LOCK_POLL_INTERVAL))
+    try:
+        return await asyncio.shield(acquire)
+    except asyncio.CancelledError:
+        # The worker thread may still acquire the lock after the waiter is cancelled.
+        def release_if_acquired(future: asyncio.Future) -> None:
+            if not future.cancelled() and future.exception() is None and future.result():
+                lock.release()
+
+        acquire.add_done_callback(release_if_acquired)
+        raise
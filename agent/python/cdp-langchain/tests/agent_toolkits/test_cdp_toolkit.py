@@ -0,0 +1,76 @@
+"""Tests for the CDP Toolkit."""
+
+import subprocess
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+from cdp_agentkit_core.actions import action_registry
+from cdp_agentkit_core.actions.pyth.fetch_price import PythFetchPriceInput
+from cdp_langchain.agent_toolkits import CdpToolkit
+from cdp_langchain.utils import CdpAgentkitWrapper
+
+
+@pytest.fixture
+def mock_cdp_agentkit_wrapper():
+    """Fixture for mocked CDP Agentkit wrapper."""
+    return Mock(spec=CdpAgentkitWrapper)
+
+
+def test_toolkit_does_not_import_actions():
+    """Test that building the toolkit describes every action without importing any of them."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from unittest.mock import Mock; "
+            "from cdp_langchain.agent_toolkits import CdpToolkit; "
+            "from cdp_langchain.utils import CdpAgentkitWrapper; "
+            "tools = CdpToolkit.from_cdp_agentkit_wrapper(Mock(spec=CdpAgentkitWrapper)).get_tools(); "
+            "print(len(tools), [m for m in sys.modules if m.startswith('cdp_agentkit_core.actions.') "
+            "and m not in ('cdp_agentkit_core.actions.action_registry', "
+            "'cdp_agentkit_core.actions.cdp_action')])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+    assert output == f"{len(action_registry.names())} []"
+
+
+def test_toolkit_describes_actions_from_specs(mock_cdp_agentkit_wrapper):
+    """Test that the tools are described by the action specs, as the loaded actions would be."""
+    tool = CdpToolkit.from_cdp_agentkit_wrapper(
+        mock_cdp_agentkit_wrapper, actions=["pyth_fetch_price"]
+    ).get_tools()[0]
+    action = action_registry.get("pyth_fetch_price")
+
+    assert tool.func is None
+    assert (tool.name, tool.description, tool.read_only) == (
+        action.name,
+        action.description,
+        action.read_only,
+    )
+    assert (
+        tool.tool_call_schema["properties"]
+        == (PythFetchPriceInput.model_json_schema()["properties"])
+    )
+
+
+def test_toolkit_loads_action_on_first_run(mock_cdp_agentkit_wrapper):
+    """Test that a tool imports its action when first run, and validates its arguments."""
+    mock_cdp_agentkit_wrapper.run_read_action.return_value = "97123.45"
+    tool = CdpToolkit.from_cdp_agentkit_wrapper(
+        mock_cdp_agentkit_wrapper, actions=["pyth_fetch_price"]
+    ).get_tools()[0]
+    action = action_registry.get("pyth_fetch_price")
+
+    assert tool.invoke({"price_feed_id": "0x123"}) == "97123.45"
+
+    assert tool.func is action.func
+    assert tool.args_schema is PythFetchPriceInput
+    mock_cdp_agentkit_wrapper.run_read_action.assert_called_once_with(
+        action.func, price_feed_id="0x123"
+    )
@@ -1,7 +1,8 @@
 """Tests for the CDP Tool."""
 
+import asyncio
 from typing import Any
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from langchain_core.callbacks import CallbackManager
@@ -131,3 +132,65 @@ def test_run_with_different_valid_inputs(cdp_tool_with_schema, input_data: dict[
         cdp_tool_with_schema.func, **input_data
     )
     assert result == "success"
+
+
+async def _async_action(test_param: str) -> str:
+    return test_param
+
+
+def test_arun_with_coroutine(mock_cdp_agentkit_wrapper):
+    """Test that CDP Tool runs the coroutine of the action natively."""
+    mock_cdp_agentkit_wrapper.arun_action = AsyncMock(return_value="success")
+    tool = CdpTool(
+        cdp_agentkit_wrapper=mock_cdp_agentkit_wrapper,
+        name="test_action_with_coroutine",
+        description="Test CDP Tool",
+        args_schema=TestArgsSchema,
+        func=lambda test_param: test_param,
+        coroutine=_async_action,
+    )
+
+    result = asyncio.run(tool._arun(test_param="test"))
+
+    mock_cdp_agentkit_wrapper.arun_action.assert_awaited_once_with(_async_action, test_param="test")
+    mock_cdp_agentkit_wrapper.run_action.assert_not_called()
+    assert result == "success"
+
+
+def test_arun_without_coroutine(cdp_tool_with_schema):
+    """Test that CDP Tool runs actions without a coroutine in a worker thread."""
+    cdp_tool_with_schema.cdp_agentkit_wrapper.run_action.return_value = "success"
+
+    result = asyncio.run(cdp_tool_with_schema._arun(test_param="test"))
+
+    cdp_tool_with_schema.cdp_agentkit_wrapper.run_action.assert_called_once_with(
+        cdp_tool_with_schema.func, test_param="test"
+    )
+    assert result == "success"
+
+
+def test_arun_with_invalid_schema_data(mock_cdp_agentkit_wrapper):
+    """Test that CDP Tool validates arguments before running the coroutine."""
+    tool = CdpTool(
+        cdp_agentkit_wrapper=mock_cdp_agentkit_wrapper,
+        name="test_action_with_coroutine",
+        description="Test CDP Tool",
+        args_schema=TestArgsSchema,
+        func=lambda test_param: test_param,
+        coroutine=_async_action,
+    )
+
+    with pytest.raises(ValueError):
+        asyncio.run(tool._arun(invalid_param="test"))
+
+
+def test_run_without_func_or_action_loader(mock_cdp_agentkit_wrapper):
+    """Test that a tool with neither a func nor an action loader cannot run."""
+    tool = CdpTool(
+        cdp_agentkit_wrapper=mock_cdp_agentkit_wrapper,
+        name="test_action",
+        description="Test CDP Tool",
+    )
+
+    with pytest.raises(ValueError, match="neither a func nor an action loader"):
+        tool._run(instructions="test instructions")
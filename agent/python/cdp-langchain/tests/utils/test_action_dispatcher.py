@@ -0,0 +1,94 @@
+"""Tests for the precompiled action dispatcher."""
+
+from unittest.mock import Mock
+
+import pytest
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from cdp import Wallet
+from cdp_agentkit_core.actions.address_reputation import AddressReputationInput
+from cdp_langchain.utils import compile_action
+
+MOCK_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+
+
+class NestedInput(BaseModel):
+    """Test schema with a nested model."""
+
+    inner: AddressReputationInput
+
+
+class ExtraInput(BaseModel):
+    """Test schema which allows extra fields."""
+
+    model_config = ConfigDict(extra="allow")
+
+    asset_id: str
+
+
+def wallet_action(wallet: Wallet, asset_id: str) -> str:
+    """Test action which takes the wallet."""
+    return f"{wallet.id} {asset_id}"
+
+
+def walletless_action(asset_id: str) -> str:
+    """Test action without the wallet."""
+    return asset_id
+
+
+def test_compile_action_is_cached():
+    """Test that actions are compiled once per function and schema."""
+    assert compile_action(wallet_action) is compile_action(wallet_action)
+    assert compile_action(wallet_action) is not compile_action(wallet_action, ExtraInput)
+
+
+def test_wallet_injection():
+    """Test that the wallet is only passed to functions taking it first."""
+    wallet = Mock(spec=Wallet, id="wallet-id")
+
+    assert compile_action(wallet_action).injects_wallet
+    assert compile_action(wallet_action).call(wallet, {"asset_id": "eth"}) == "wallet-id eth"
+    assert not compile_action(walletless_action).injects_wallet
+    assert compile_action(walletless_action).call(wallet, {"asset_id": "eth"}) == "eth"
+
+
+def test_validate_matches_model_dump():
+    """Test that validated arguments equal those of instantiating and dumping the schema."""
+    arguments = {"address": MOCK_ADDRESS, "network": "base-mainnet"}
+
+    compiled = compile_action(walletless_action, AddressReputationInput)
+
+    assert compiled.flat_arguments
+    assert compiled.validate(arguments) == AddressReputationInput(**arguments).model_dump()
+
+
+def test_validate_runs_field_validators():
+    """Test that the field validators of the schema are applied."""
+    compiled = compile_action(walletless_action, AddressReputationInput)
+
+    with pytest.raises(ValidationError, match="Invalid Ethereum address format"):
+        compiled.validate({"address": "not-an-address", "network": "base-mainnet"})
+
+
+@pytest.mark.parametrize(
+    ("schema", "arguments"),
+    [
+        (NestedInput, {"inner": {"address": MOCK_ADDRESS, "network": "base-mainnet"}}),
+        (ExtraInput, {"asset_id": "eth", "extra": "value"}),
+    ],
+)
+def test_validate_dumps_nested_and_extra_fields(schema: type[BaseModel], arguments: dict):
+    """Test that schemas with nested models or extra fields are dumped."""
+    compiled = compile_action(walletless_action, schema)
+
+    assert not compiled.flat_arguments
+    assert compiled.validate(arguments) == arguments
+
+
+def test_validate_and_call():
+    """Test validating and calling in one step."""
+    wallet = Mock(spec=Wallet, id="wallet-id")
+
+    compiled = compile_action(wallet_action, ExtraInput)
+
+    assert compiled(wallet, {"asset_id": "usdc"}) == "wallet-id usdc"
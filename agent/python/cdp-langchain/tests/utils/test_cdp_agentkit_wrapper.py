@@ -1,5 +1,6 @@
 """Tests for the CDP Agentkit Wrapper."""
 
+import asyncio
 import json
 from unittest.mock import Mock, patch
 
@@ -205,6 +206,25 @@ def test_run_action_valid_modes(
     assert result is True
 
 
+def test_arun_action(
+    env_vars: dict[str, str],
+    mock_cdp_configure: Mock,
+    mock_wallet_create: Mock,
+):
+    """Test running an async action, with and without the wallet."""
+
+    async def get_wallet(wallet: Wallet):
+        return wallet
+
+    async def echo(value: str):
+        return value
+
+    wrapper = CdpAgentkitWrapper()
+
+    assert asyncio.run(wrapper.arun_action(get_wallet)) is wrapper.wallet
+    assert asyncio.run(wrapper.arun_action(echo, value="test")) == "test"
+
+
 def test_cdp_configuration_error(
     env_vars: dict[str, str], mock_cdp_configure: Mock, mock_wallet_create: Mock
 ):
@@ -0,0 +1,173 @@
+"""Tests for the lazily hydrated wallet."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from cdp import Wallet, WalletData
+from cdp_langchain.utils import CdpAgentkitWrapper, LazyWallet, WalletCache, WalletMetadata
+
+MOCK_WALLET_ID = "test-wallet-id"
+MOCK_NETWORK_ID = "base-sepolia"
+MOCK_ADDRESS_ID = "0x1234567890123456789012345678901234567890"
+MOCK_OTHER_ADDRESS_ID = "0xBBBBBbbBBb9cC5e90e3b3Af64bdAF62C37EEFFCb"
+MOCK_WALLET_DATA = {
+    "wallet_id": MOCK_WALLET_ID,
+    "seed": "test-seed",
+    "network_id": MOCK_NETWORK_ID,
+    "default_address_id": MOCK_ADDRESS_ID,
+}
+
+
+@pytest.fixture
+def env_vars(monkeypatch: pytest.MonkeyPatch):
+    """Fixture to set environment variables for lazy hydration."""
+    monkeypatch.setenv("CDP_API_KEY_NAME", "test-cdp-api-key-name")
+    monkeypatch.setenv("CDP_API_KEY_PRIVATE_KEY", "test-cdp-api-key-private-key")
+    monkeypatch.setenv("CDP_WALLET_HYDRATION", "lazy")
+
+
+@pytest.fixture
+def mock_cdp_configure():
+    """Fixture for mocked CDP SDK configuration."""
+    with patch("cdp.Cdp.configure") as mock_configure:
+        yield mock_configure
+
+
+@pytest.fixture
+def mock_wallet():
+    """Fixture for a hydrated wallet with two addresses."""
+    wallet = Mock(spec=Wallet)
+    wallet.id = MOCK_WALLET_ID
+    wallet.network_id = MOCK_NETWORK_ID
+    wallet.default_address.address_id = MOCK_ADDRESS_ID
+    wallet.addresses = [Mock(address_id=MOCK_ADDRESS_ID), Mock(address_id=MOCK_OTHER_ADDRESS_ID)]
+    wallet.export_data.return_value = WalletData.from_dict(MOCK_WALLET_DATA)
+    return wallet
+
+
+@pytest.fixture
+def mock_wallet_import_data(mock_wallet):
+    """Fixture for mocked CDP SDK Wallet import data."""
+    with patch("cdp.Wallet.import_data", return_value=mock_wallet) as mock_import:
+        yield mock_import
+
+
+def test_lazy_wrapper_does_not_import_wallet(
+    env_vars, mock_cdp_configure: Mock, mock_wallet_import_data: Mock
+):
+    """Test that a lazy wrapper answers wallet details and exports without importing the wallet."""
+    wrapper = CdpAgentkitWrapper(cdp_wallet_data=json.dumps(MOCK_WALLET_DATA))
+
+    assert isinstance(wrapper.wallet, LazyWallet)
+    assert wrapper.wallet.id == MOCK_WALLET_ID
+    assert wrapper.wallet.network_id == MOCK_NETWORK_ID
+    assert wrapper.wallet.default_address.address_id == MOCK_ADDRESS_ID
+    assert json.loads(wrapper.export_wallet()) == MOCK_WALLET_DATA
+    assert not wrapper.wallet.hydrated
+    mock_cdp_configure.assert_called_once()
+    mock_wallet_import_data.assert_not_called()
+
+
+def test_lazy_wallet_hydrates_once_on_first_use(
+    env_vars, mock_cdp_configure: Mock, mock_wallet_import_data: Mock, mock_wallet: Mock
+):
+    """Test that using the wallet beyond its metadata imports it once."""
+    wrapper = CdpAgentkitWrapper(cdp_wallet_data=json.dumps(MOCK_WALLET_DATA))
+
+    wrapper.wallet.invoke_contract(contract_address=MOCK_OTHER_ADDRESS_ID, method="approve")
+    wrapper.wallet.default_address.balance("eth")
+
+    mock_wallet_import_data.assert_called_once()
+    mock_wallet.invoke_contract.assert_called_once_with(
+        contract_address=MOCK_OTHER_ADDRESS_ID, method="approve"
+    )
+    mock_wallet.default_address.balance.assert_called_once_with("eth")
+    assert wrapper.wallet.hydrated
+
+
+def test_lazy_wallet_without_wallet_data(env_vars, mock_cdp_configure: Mock, mock_wallet: Mock):
+    """Test that a new wallet is created on first use."""
+    with patch("cdp.Wallet.create", return_value=mock_wallet) as mock_create:
+        wrapper = CdpAgentkitWrapper()
+        mock_create.assert_not_called()
+
+        assert wrapper.wallet.id == MOCK_WALLET_ID
+
+    mock_create.assert_called_once_with(network_id=MOCK_NETWORK_ID)
+
+
+def test_background_hydration(
+    env_vars,
+    monkeypatch: pytest.MonkeyPatch,
+    mock_cdp_configure: Mock,
+    mock_wallet_import_data: Mock,
+):
+    """Test that background hydration imports the wallet in a thread."""
+    monkeypatch.setenv("CDP_WALLET_HYDRATION", "background")
+    hydrate_in_background = LazyWallet.hydrate_in_background
+    threads = []
+
+    with patch.object(
+        LazyWallet,
+        "hydrate_in_background",
+        autospec=True,
+        side_effect=lambda wallet: threads.append(hydrate_in_background(wallet)),
+    ):
+        wrapper = CdpAgentkitWrapper(cdp_wallet_data=json.dumps(MOCK_WALLET_DATA))
+
+    threads[0].join()
+
+    mock_wallet_import_data.assert_called_once()
+    assert wrapper.wallet.hydrated
+
+
+def test_invalid_wallet_hydration(env_vars, monkeypatch: pytest.MonkeyPatch):
+    """Test that an unknown hydration mode is rejected."""
+    monkeypatch.setenv("CDP_WALLET_HYDRATION", "sometimes")
+
+    with pytest.raises(ValidationError, match="Invalid wallet hydration"):
+        CdpAgentkitWrapper()
+
+
+def test_wallet_cache_serves_address_ids(
+    env_vars, tmp_path, mock_cdp_configure: Mock, mock_wallet_import_data: Mock
+):
+    """Test that hydration stores the wallet metadata, which later wrappers read."""
+    cache_file = str(tmp_path / "wallet_cache.json")
+    wallet_data = {key: value for key, value in MOCK_WALLET_DATA.items() if key != "network_id"}
+    values = {"cdp_wallet_data": json.dumps(wallet_data), "wallet_cache_file": cache_file}
+
+    CdpAgentkitWrapper(**values).wallet.hydrate()
+    wrapper = CdpAgentkitWrapper(**values)
+
+    assert wrapper.wallet.address_ids == [MOCK_ADDRESS_ID, MOCK_OTHER_ADDRESS_ID]
+    assert wrapper.wallet.network_id == MOCK_NETWORK_ID
+    assert not wrapper.wallet.hydrated
+    mock_wallet_import_data.assert_called_once()
+
+
+def test_wallet_cache_store_skips_unchanged_metadata(tmp_path):
+    """Test that storing unchanged metadata does not rewrite the cache file."""
+    cache = WalletCache(str(tmp_path / "wallet_cache.json"))
+    metadata = WalletMetadata(MOCK_WALLET_ID, MOCK_NETWORK_ID, MOCK_ADDRESS_ID, [MOCK_ADDRESS_ID])
+
+    assert cache.store(metadata)
+    assert not cache.store(metadata)
+    assert cache.load(MOCK_WALLET_ID) == metadata
+    assert cache.load("other-wallet-id") is None
+
+
+def test_save_wallet_skips_unchanged_file(
+    env_vars, tmp_path, mock_cdp_configure: Mock, mock_wallet_import_data: Mock
+):
+    """Test that saving the wallet only writes the file when its data changed."""
+    wallet_data_file = tmp_path / "wallet_data.txt"
+    wrapper = CdpAgentkitWrapper(cdp_wallet_data=json.dumps(MOCK_WALLET_DATA))
+
+    assert wrapper.save_wallet(str(wallet_data_file))
+    assert not wrapper.save_wallet(str(wallet_data_file))
+    assert json.loads(wallet_data_file.read_text()) == MOCK_WALLET_DATA
+    mock_wallet_import_data.assert_not_called()
@@ -0,0 +1,234 @@
+"""Tests for the wallet pool."""
+
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cdp import Cdp, Wallet, WalletAddress
+from cdp.client.models.address import Address as AddressModel
+from cdp.client.models.wallet import Wallet as WalletModel
+from cdp_langchain.tools import CdpTool
+from cdp_langchain.utils import AddressWallet, CdpAgentkitWrapper, WalletPool
+
+MOCK_WALLET_ID = "test-wallet-id"
+MOCK_NETWORK_ID = "base-sepolia"
+
+
+def address_model(index: int) -> AddressModel:
+    """Build the model of a wallet address."""
+    return AddressModel(
+        wallet_id=MOCK_WALLET_ID,
+        network_id=MOCK_NETWORK_ID,
+        public_key="0x",
+        address_id=f"0x{index:040x}",
+        index=index,
+    )
+
+
+def create_wallet(addresses: int = 1) -> Wallet:
+    """Build a wallet with a number of addresses, without calling the CDP API."""
+    wallet = Wallet(
+        WalletModel(
+            id=MOCK_WALLET_ID,
+            network_id=MOCK_NETWORK_ID,
+            default_address=address_model(0),
+            feature_set={
+                "faucet": True,
+                "server_signer": False,
+                "transfer": True,
+                "trade": True,
+                "stake": True,
+                "gasless_send": True,
+            },
+        )
+    )
+    wallet._addresses = [WalletAddress(address_model(index)) for index in range(addresses)]
+    return wallet
+
+
+def signer_address(wallet: Wallet) -> str:
+    """Test action which returns the address it runs from."""
+    return wallet.default_address.address_id
+
+
+def test_address_wallet_acts_from_its_address():
+    """Test that an address view of a wallet uses its address as the default address."""
+    wallet = create_wallet(addresses=2)
+
+    view = AddressWallet(wallet, wallet.addresses[1])
+
+    assert isinstance(view, Wallet)
+    assert view.id == MOCK_WALLET_ID
+    assert view.default_address.address_id == f"0x{1:040x}"
+    assert wallet.default_address.address_id == f"0x{0:040x}"
+
+
+def test_from_addresses_creates_missing_addresses():
+    """Test that a pool of addresses creates addresses the wallet does not have yet."""
+    wallet = create_wallet(addresses=2)
+
+    def create_address():
+        address = WalletAddress(address_model(len(wallet.addresses)))
+        wallet.addresses.append(address)
+        return address
+
+    with patch.object(Wallet, "create_address", side_effect=create_address) as mock_create:
+        pool = WalletPool.from_addresses(wallet, 3)
+
+    assert mock_create.call_count == 1
+    assert pool.signers[0] is wallet
+    assert [signer_address(signer) for signer in pool.signers] == [
+        f"0x{index:040x}" for index in range(3)
+    ]
+
+
+def test_empty_pool():
+    """Test that a pool needs a signer."""
+    with pytest.raises(ValueError, match="at least one signer"):
+        WalletPool([])
+
+
+def test_writes_run_in_parallel_on_different_signers():
+    """Test that concurrent writes each run on their own signer."""
+    pool = WalletPool.from_addresses(create_wallet(addresses=3), 3)
+    barrier = threading.Barrier(3, timeout=5)
+    used = []
+
+    def write():
+        with pool.write_signer() as signer:
+            used.append(signer_address(signer))
+            barrier.wait()
+
+    threads = [threading.Thread(target=write) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(used) == sorted(signer_address(signer) for signer in pool.signers)
+    assert pool.busy() == [0, 0, 0]
+
+
+def test_writes_on_one_signer_are_serialized():
+    """Test that a write waits for the running write of the same signer."""
+    pool = WalletPool([create_wallet()])
+    second_done = threading.Event()
+
+    def second_write():
+        with pool.write_signer():
+            second_done.set()
+
+    with pool.write_signer():
+        thread = threading.Thread(target=second_write)
+        thread.start()
+        assert not second_done.wait(0.1)
+    thread.join()
+
+    assert second_done.is_set()
+
+
+def test_write_uses_least_busy_signer():
+    """Test that writes go to the signer with the fewest writes running."""
+    pool = WalletPool.from_addresses(create_wallet(addresses=2), 2)
+
+    with pool.write_signer() as first, pool.write_signer() as second:
+        assert first is not second
+        assert pool.busy() == [1, 1]
+
+
+def test_reads_rotate_over_signers():
+    """Test that reads use the signers in turn, even while they are writing."""
+    pool = WalletPool.from_addresses(create_wallet(addresses=2), 2)
+
+    with pool.write_signer():
+        reads = [pool.read_signer() for _ in range(4)]
+
+    assert reads == [pool.signers[0], pool.signers[1], pool.signers[0], pool.signers[1]]
+
+
+def test_async_write_signer():
+    """Test that async writes reserve a signer and release it afterwards."""
+    pool = WalletPool.from_addresses(create_wallet(addresses=2), 2)
+
+    async def write() -> str:
+        async with pool.awrite_signer() as signer:
+            await asyncio.sleep(0)
+            return signer_address(signer)
+
+    async def run() -> list[str]:
+        return await asyncio.gather(write(), write())
+
+    assert sorted(asyncio.run(run())) == [f"0x{0:040x}", f"0x{1:040x}"]
+    assert pool.busy() == [0, 0]
+
+
+def test_cancelled_async_write_releases_signer():
+    """Test that a cancelled async write waiting for a signer does not keep its lock."""
+    pool = WalletPool([create_wallet()])
+
+    async def write() -> None:
+        async with pool.awrite_signer():
+            pass
+
+    async def run() -> None:
+        with pool.write_signer():
+            waiter = asyncio.create_task(write())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        # Let the worker thread of the cancelled waiter finish.
+        await asyncio.sleep(0.2)
+        await asyncio.wait_for(write(), timeout=1)
+
+    asyncio.run(run())
+
+    assert pool.busy() == [0]
+    assert not pool._signer_locks[0].locked()
+
+
+def test_wrapper_pools_addresses(monkeypatch: pytest.MonkeyPatch):
+    """Test that the wrapper routes writes and reads through a pool of addresses."""
+    monkeypatch.setenv("CDP_API_KEY_NAME", "test-cdp-api-key-name")
+    monkeypatch.setenv("CDP_API_KEY_PRIVATE_KEY", "test-cdp-api-key-private-key")
+    monkeypatch.setenv("CDP_WALLET_POOL_SIZE", "2")
+    wallet = create_wallet(addresses=2)
+
+    with patch.object(Cdp, "configure"), patch.object(Wallet, "create", return_value=wallet):
+        wrapper = CdpAgentkitWrapper()
+
+    assert wrapper.wallet is wallet
+    assert wrapper.wallet_pool.size == 2
+    assert wrapper.run_action(signer_address) in {f"0x{0:040x}", f"0x{1:040x}"}
+    assert {wrapper.run_read_action(signer_address) for _ in range(2)} == {
+        f"0x{0:040x}",
+        f"0x{1:040x}",
+    }
+
+
+def test_wrapper_without_pool():
+    """Test that actions run on the wallet without a pool."""
+    wallet = create_wallet()
+    wrapper = CdpAgentkitWrapper.model_construct(wallet=wallet)
+
+    assert wrapper.run_action(signer_address) == f"0x{0:040x}"
+    assert wrapper.run_read_action(signer_address) == f"0x{0:040x}"
+
+
+def test_read_only_tool_runs_read_action():
+    """Test that read-only tools do not reserve a signer for writing."""
+    wrapper = Mock(spec=CdpAgentkitWrapper)
+    wrapper.run_read_action.return_value = "read"
+    tool = CdpTool(
+        name="signer_address",
+        description="",
+        cdp_agentkit_wrapper=CdpAgentkitWrapper.model_construct(),
+        func=signer_address,
+        read_only=True,
+    )
+    object.__setattr__(tool, "cdp_agentkit_wrapper", wrapper)
+
+    assert tool._run() == "read"
+    wrapper.run_action.assert_not_called()
@@ -39,6 +39,8 @@ from audio_util import AudioPlayerAsync, SAMPLE_RATE, CHANNELS
 
 # Configure a file to persist the agent's CDP MPC Wallet Data.
 wallet_data_file = "wallet_data.txt"
+# Configure a file to cache the wallet's metadata, so that start up does not import the wallet.
+wallet_cache_file = "wallet_cache.json"
 
 load_dotenv()
 
@@ -854,13 +856,16 @@ def initialize_agent():
         print("Starting with fresh wallet")
 
     print("Creating CDP Agentkit wrapper...")
+    # The wallet is imported from the CDP API on first use, with its metadata cached locally.
+    values.setdefault("wallet_hydration", os.environ.get("CDP_WALLET_HYDRATION", "lazy"))
+    values.setdefault("wallet_cache_file", wallet_cache_file)
     agentkit = CdpAgentkitWrapper(**values)
 
     print("Exporting wallet data...")
-    wallet_data = agentkit.export_wallet()
-    with open(wallet_data_file, "w") as f:
-        f.write(wallet_data)
-    print(f"Wallet data saved to {wallet_data_file}")
+    if agentkit.save_wallet(wallet_data_file):
+        print(f"Wallet data saved to {wallet_data_file}")
+    else:
+        print(f"Wallet data in {wallet_data_file} is up to date")
 
     print("Creating CDP toolkit and loading tools...")
     cdp_toolkit = CdpToolkit.from_cdp_agentkit_wrapper(agentkit)